@@ -147,6 +147,91 @@ async def export_corpus(
     )
 
 
+@router.post("/corpus/sharded", response_model=ExportResponse)
+async def export_sharded_corpus(
+    request: ExportRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> ExportResponse:
+    """
+    Export land data to a sharded corpus
+    Shards are built in parallel and can be downloaded independently;
+    the job file is a manifest mapping expression ids to shard members
+    """
+    from app.services.export_service_sync import CORPUS_SHARD_FORMATS
+    from app.tasks.export_tasks import create_export_task
+    
+    # Validate land exists and user has access
+    land = await land_crud.get(db, id=request.land_id)
+    if not land:
+        raise HTTPException(status_code=404, detail="Land not found")
+    
+    if land.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    if request.shard_format not in CORPUS_SHARD_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid shard format. Must be one of: {', '.join(CORPUS_SHARD_FORMATS)}"
+        )
+    
+    task = create_export_task.delay(
+        export_type="shardedcorpus",
+        land_id=request.land_id,
+        minimum_relevance=request.minimum_relevance,
+        user_id=current_user.id,
+        filename=request.filename,
+        options={"shards": request.shards, "shard_format": request.shard_format}
+    )
+    
+    return ExportResponse(
+        job_id=task.id,
+        export_type="shardedcorpus",
+        land_id=request.land_id,
+        status="pending",
+        message="Sharded corpus export job created successfully"
+    )
+
+
+@router.post("/embeddings", response_model=ExportResponse)
+async def export_embeddings(
+    request: ExportRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> ExportResponse:
+    """
+    Export paragraph embeddings as a memory-mappable NumPy matrix
+    The job produces embeddings.npy plus a paragraphs.parquet sidecar,
+    downloadable through /download/{job_id}/files/{filename}
+    """
+    from app.tasks.export_tasks import create_export_task
+    
+    # Validate land exists and user has access
+    land = await land_crud.get(db, id=request.land_id)
+    if not land:
+        raise HTTPException(status_code=404, detail="Land not found")
+    
+    if land.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    task = create_export_task.delay(
+        export_type="embeddings",
+        land_id=request.land_id,
+        minimum_relevance=request.minimum_relevance,
+        user_id=current_user.id,
+        filename=request.filename,
+        options={"provider": request.embedding_provider, "model": request.embedding_model}
+    )
+    
+    return ExportResponse(
+        job_id=task.id,
+        export_type="embeddings",
+        land_id=request.land_id,
+        status="pending",
+        message="Embeddings export job created successfully"
+    )
+
+
 @router.get("/jobs/{job_id}", response_model=ExportJob)
 async def get_export_job_status(
     job_id: str,
@@ -226,6 +311,8 @@ async def download_export_file(
         media_type = 'application/xml'
     elif filename.endswith('.zip'):
         media_type = 'application/zip'
+    elif filename.endswith('.json'):
+        media_type = 'application/json'
     else:
         media_type = 'application/octet-stream'
     
@@ -236,6 +323,98 @@ async def download_export_file(
     )
 
 
+@router.get("/download/{job_id}/shards/{shard_index}")
+async def download_export_shard(
+    job_id: str,
+    shard_index: int,
+    current_user: User = Depends(get_current_user)
+) -> FileResponse:
+    """
+    Download a single shard of a completed sharded corpus export
+    """
+    import json
+    from celery.result import AsyncResult
+    from app.core.celery_app import celery_app
+    
+    result = AsyncResult(job_id, app=celery_app)
+    
+    if not result or result.status != "SUCCESS":
+        raise HTTPException(
+            status_code=404, 
+            detail="Export job not found or not completed"
+        )
+    
+    job_info = result.info or {}
+    manifest_path = job_info.get("file_path")
+    
+    if not manifest_path or not manifest_path.endswith(".json") or not os.path.exists(manifest_path):
+        raise HTTPException(status_code=404, detail="Sharded export manifest not found")
+    
+    with open(manifest_path, encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    
+    shard = next((s for s in manifest.get("shards", []) if s["index"] == shard_index), None)
+    if shard is None:
+        raise HTTPException(status_code=404, detail=f"Shard {shard_index} not found")
+    
+    shard_path = os.path.join(os.path.dirname(manifest_path), shard["filename"])
+    if not os.path.exists(shard_path):
+        raise HTTPException(status_code=404, detail="Shard file not found")
+    
+    media_type = 'application/zip' if shard["filename"].endswith('.zip') else 'application/zstd'
+    
+    return FileResponse(
+        path=shard_path,
+        filename=shard["filename"],
+        media_type=media_type
+    )
+
+
+@router.get("/download/{job_id}/files/{filename}")
+async def download_export_member_file(
+    job_id: str,
+    filename: str,
+    current_user: User = Depends(get_current_user)
+) -> FileResponse:
+    """
+    Download one data file of a completed directory export (e.g. embeddings.npy)
+    """
+    import json
+    from celery.result import AsyncResult
+    from app.core.celery_app import celery_app
+    
+    result = AsyncResult(job_id, app=celery_app)
+    
+    if not result or result.status != "SUCCESS":
+        raise HTTPException(
+            status_code=404, 
+            detail="Export job not found or not completed"
+        )
+    
+    job_info = result.info or {}
+    manifest_path = job_info.get("file_path")
+    
+    if not manifest_path or not manifest_path.endswith(".json") or not os.path.exists(manifest_path):
+        raise HTTPException(status_code=404, detail="Export manifest not found")
+    
+    with open(manifest_path, encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    
+    # Only files declared in the manifest can be served
+    if filename not in manifest.get("files", []):
+        raise HTTPException(status_code=404, detail=f"File {filename} not found in export")
+    
+    file_path = os.path.join(os.path.dirname(manifest_path), filename)
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="Export file not found")
+    
+    return FileResponse(
+        path=file_path,
+        filename=filename,
+        media_type='application/octet-stream'
+    )
+
+
 @router.post("/direct", response_model=dict)
 async def export_direct(
     request: ExportRequest,
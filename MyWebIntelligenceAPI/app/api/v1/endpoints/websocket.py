@@ -8,6 +8,7 @@ import json
 import asyncio
 from datetime import datetime
 from app.api import dependencies
+from app.core.job_progress import ProgressFanout
 from app.db.models import User
 
 router = APIRouter()
@@ -56,6 +57,14 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+async def _relay_progress(job_id: str, update: dict):
+    await manager.broadcast(update, job_id)
+
+
+# Progression publiée par les workers sur Redis, relayée aux WebSocket de ce processus
+progress_fanout = ProgressFanout(_relay_progress)
+
+
 @router.websocket("/jobs/{job_id}")
 async def websocket_endpoint(
     websocket: WebSocket,
@@ -90,6 +99,7 @@ async def websocket_endpoint(
 
     # Connecter le WebSocket
     await manager.connect(websocket, job_id)
+    last_update = await progress_fanout.subscribe(job_id)
     
     try:
         # Envoyer un message de bienvenue
@@ -101,6 +111,9 @@ async def websocket_endpoint(
             }),
             websocket
         )
+        # Dernier état publié par le worker (client connecté en cours de job)
+        if last_update:
+            await manager.send_personal_message(json.dumps(last_update), websocket)
         
         # Garder la connexion ouverte
         while True:
@@ -121,6 +134,9 @@ async def websocket_endpoint(
             },
             job_id
         )
+    finally:
+        manager.disconnect(websocket, job_id)
+        await progress_fanout.unsubscribe(job_id)
 
 
 async def send_job_update(job_id: str, update: dict):
@@ -128,8 +144,9 @@ async def send_job_update(job_id: str, update: dict):
     Fonction utilitaire pour envoyer des mises à jour à tous les clients
     connectés à un job spécifique.
     
-    Cette fonction peut être appelée depuis les tâches Celery ou d'autres
-    parties de l'application pour envoyer des mises à jour en temps réel.
+    Les clients connectés à ce processus API seulement : les tâches Celery
+    publient via app.core.job_progress.ProgressPublisher (Redis pub/sub),
+    relayé par chaque réplique.
     
     Args:
         job_id: L'ID du job
@@ -14,7 +14,8 @@ Endpoints:
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 import logging
 
@@ -29,6 +30,7 @@ from app.schemas.domain_crawl import (
 from app.services.domain_crawl_service import DomainCrawlService
 from app.tasks.domain_crawl_task import domain_crawl_task, domain_recrawl_task
 from app.db.models import Domain
+from app.utils.pagination import cursor_headers, decode_cursor, encode_cursor, estimate_count
 
 logger = logging.getLogger(__name__)
 
@@ -154,17 +156,25 @@ def get_domain_stats(
 
 @router.get("/", response_model=List[dict])
 def list_crawled_domains(
+    response: Response,
     land_id: Optional[int] = Query(None, description="Filter by land ID"),
     limit: int = Query(10, ge=1, le=100, description="Max results"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    count: str = Query("none", pattern="^(exact|estimate|none)$", description="Total in X-Total-Count: exact, estimate or none"),
     db: Session = Depends(get_sync_db),
     current_user: User = Depends(get_current_active_user_sync)
 ):
     """
     Liste les domaines récemment crawlés (SYNC endpoint).
 
+    Pagination par curseur (keyset sur fetched_at, id) : la page suivante
+    s'obtient en renvoyant l'en-tête X-Next-Cursor dans cursor.
+
     Args:
         land_id: ID du land (None = tous)
         limit: Nombre max de domaines
+        cursor: Curseur de la page précédente
+        count: Mode de comptage du total (exact, estimate, none)
         db: Session DB (SYNC)
         current_user: Utilisateur authentifié
 
@@ -176,9 +186,36 @@ def list_crawled_domains(
         f"(land_id={land_id}, limit={limit})"
     )
 
+    before = None
+    if cursor:
+        try:
+            fetched_at, domain_id = decode_cursor(cursor, 2)
+            before = (fetched_at, int(domain_id))
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
     service = DomainCrawlService(db)
 
-    domains = service.get_recent_crawled_domains(land_id=land_id, limit=limit)
+    domains = service.get_recent_crawled_domains(land_id=land_id, limit=limit + 1, before=before)
+    has_next = len(domains) > limit
+    domains = domains[:limit]
+
+    next_cursor = None
+    if has_next and domains:
+        next_cursor = encode_cursor([domains[-1].fetched_at, domains[-1].id])
+
+    total = None
+    if count != "none":
+        count_query = db.query(Domain.id if count == "estimate" else func.count(Domain.id)).filter(
+            Domain.fetched_at.isnot(None)
+        )
+        if land_id is not None:
+            count_query = count_query.filter(Domain.land_id == land_id)
+        if count == "estimate":
+            total = estimate_count(db, count_query.statement)
+        else:
+            total = count_query.scalar() or 0
+    response.headers.update(cursor_headers(next_cursor, total))
 
     # Formater la réponse
     result = []
@@ -192,6 +229,8 @@ def list_crawled_domains(
             "keywords": domain.keywords,
             "language": domain.language,
             "http_status": domain.http_status,
+            "total_expressions": domain.total_expressions or 0,
+            "avg_http_status": domain.avg_http_status,
             "source_method": domain.source_method,
             "fetched_at": domain.fetched_at.isoformat() if domain.fetched_at else None,
             "last_crawled_at": domain.last_crawled_at.isoformat() if domain.last_crawled_at else None,
@@ -20,8 +20,10 @@ from app.schemas.readable import ReadableRequestV2, ReadableProcessingResult
 from app.crud.crud_land import land as crud_land
 from app.schemas.job import CrawlRequest, CrawlJobResponse, CrawlStatus
 from app.services.crawling_service import start_crawl_for_land
+from app.services.land_stats import get_land_stats
 from app.schemas.user import User
 from app.api.versioning import get_api_version_from_request
+from app.utils.pagination import decode_cursor, encode_cursor
 from pydantic import BaseModel
 from app.core.media_processor import MediaProcessorSync
 from app.crud import crud_media
@@ -39,12 +41,14 @@ router = APIRouter()
 class PaginatedResponse(BaseModel):
     """Réponse paginée standardisée pour v2"""
     items: List[Land]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
     has_next: bool
     has_previous: bool
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
 
 class V2ErrorResponse(BaseModel):
@@ -62,6 +66,8 @@ async def list_lands_v2(
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     name_filter: Optional[str] = Query(None, description="Filter by land name"),
     status_filter: Optional[str] = Query(None, description="Filter by status"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous next_cursor (keyset pagination, page is ignored)"),
+    count: str = Query("exact", pattern="^(exact|estimate|none)$", description="Total count mode: exact COUNT(*), planner estimate, or none"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> PaginatedResponse:
@@ -72,27 +78,56 @@ async def list_lands_v2(
     - Pagination is now mandatory (page and page_size required)
     - Enhanced response format with pagination metadata
     - Additional filtering options
+    
+    Lands are ordered by id. Follow next_cursor for constant-cost deep
+    pagination; count=estimate or count=none avoids the COUNT(*) query.
     """
+    after_id = None
+    if cursor:
+        try:
+            after_id = int(decode_cursor(cursor, 1)[0])
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error_code": "INVALID_CURSOR",
+                    "message": "Invalid pagination cursor",
+                    "details": {"cursor": cursor},
+                    "suggestion": "Use the next_cursor value returned by the previous page"
+                }
+            )
+    
     # Calculate offset
     offset = (page - 1) * page_size
     
-    # Get total count for pagination
-    total = await crud_land.count_user_lands(db, user_id=current_user.id)
-    
-    # Get paginated lands
+    # Get paginated lands (one extra row tells whether a next page exists)
     lands = await crud_land.get_user_lands_paginated(
         db, 
         user_id=current_user.id,
         offset=offset,
-        limit=page_size,
+        limit=page_size + 1,
         name_filter=name_filter,
-        status_filter=status_filter
+        status_filter=status_filter,
+        after_id=after_id
     )
+    has_next = len(lands) > page_size
+    lands = lands[:page_size]
+    next_cursor = encode_cursor([lands[-1].id]) if has_next and lands else None
+    
+    # Get total count for pagination
+    total = None
+    if count != "none":
+        total = await crud_land.count_user_lands(
+            db,
+            user_id=current_user.id,
+            name_filter=name_filter,
+            status_filter=status_filter,
+            estimate=count == "estimate"
+        )
     
     # Calculate pagination metadata
-    total_pages = (total + page_size - 1) // page_size
-    has_next = page < total_pages
-    has_previous = page > 1
+    total_pages = (total + page_size - 1) // page_size if total is not None else None
+    has_previous = after_id is not None or page > 1
     
     return PaginatedResponse(
         items=lands,
@@ -101,7 +136,9 @@ async def list_lands_v2(
         page_size=page_size,
         total_pages=total_pages,
         has_next=has_next,
-        has_previous=has_previous
+        has_previous=has_previous,
+        next_cursor=next_cursor,
+        total_is_estimate=count == "estimate"
     )
 
 
@@ -417,6 +454,135 @@ async def analyze_land_media_async_v2(
         )
 
 
+@router.get("/{land_id}/media/clusters", response_model=Dict[str, Any])
+async def get_land_image_clusters_v2(
+    land_id: int,
+    request: Request,
+    max_distance: Optional[int] = Query(None, ge=0, le=16, description="Distance de Hamming max entre pHash (défaut: MEDIA_DEDUP_MAX_DISTANCE)"),
+    min_size: int = Query(2, ge=2, description="Taille minimale d'un groupe"),
+    limit: int = Query(100, ge=1, le=1000, description="Nombre max de groupes renvoyés"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    Groupes d'images quasi identiques du land (même photo redimensionnée ou
+    recompressée), d'après les empreintes perceptuelles (pHash) des médias analysés.
+    """
+    land = await crud_land.get(db, id=land_id)
+    if not land:
+        raise HTTPException(status_code=404, detail="Land not found")
+
+    if land.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    from sqlalchemy import select
+    from app.config import settings
+    from app.services.media_dedup import build_image_clusters
+
+    distance = settings.MEDIA_DEDUP_MAX_DISTANCE if max_distance is None else max_distance
+    result = await db.execute(
+        select(
+            models.Media.id,
+            models.Media.url,
+            models.Media.expression_id,
+            models.Media.width,
+            models.Media.height,
+            models.Media.phash,
+        )
+        .join(models.Expression, models.Expression.id == models.Media.expression_id)
+        .where(models.Expression.land_id == land_id, models.Media.phash.isnot(None))
+    )
+    rows = [dict(row) for row in result.mappings().all()]
+    clusters = [cluster for cluster in build_image_clusters(rows, distance) if cluster["size"] >= min_size]
+
+    return {
+        "land_id": land_id,
+        "land_name": land.name,
+        "max_distance": distance,
+        "hashed_media": len(rows),
+        "clusters_count": len(clusters),
+        "duplicate_media": sum(cluster["size"] - 1 for cluster in clusters),
+        "clusters": clusters[:limit],
+    }
+
+
+@router.get("/{land_id}/media/{media_id}/file")
+async def get_land_media_file_v2(
+    land_id: int,
+    media_id: int,
+    thumbnail: bool = Query(False, description="Miniature WebP (MEDIA_THUMBNAIL_SIZE px) au lieu de l'image d'origine"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Image d'un média servie depuis le stockage local (adressé par contenu).
+
+    Si l'image n'y est pas (jamais téléchargée ou évincée), elle est
+    téléchargée depuis son URL d'origine puis conservée. Sans stockage local
+    (MEDIA_BLOB_STORE_ENABLED=false), redirection vers l'URL d'origine.
+    """
+    from fastapi.concurrency import run_in_threadpool
+    from fastapi.responses import FileResponse, RedirectResponse
+    from sqlalchemy import select
+    from app.core.media_processor import StreamedBody, keep_stored, new_analysis_result
+    from app.core.media_store import get_media_blob_store
+    from app.config import settings
+
+    land = await crud_land.get(db, id=land_id)
+    if not land:
+        raise HTTPException(status_code=404, detail="Land not found")
+
+    if land.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    media = (await db.execute(
+        select(models.Media)
+        .join(models.Expression, models.Expression.id == models.Media.expression_id)
+        .where(models.Media.id == media_id, models.Expression.land_id == land_id)
+    )).scalar_one_or_none()
+    if media is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    store = get_media_blob_store()
+    if store is None:
+        return RedirectResponse(media.url)
+
+    digest = media.image_hash
+    if not digest or not store.has(digest):
+        result = new_analysis_result(media.url)
+        try:
+            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+                async with client.stream("GET", media.url) as response:
+                    response.raise_for_status()
+                    body = StreamedBody(settings.MAX_FILE_SIZE_MB * 1024 * 1024, response.headers, result)
+                    async for chunk in response.aiter_bytes():
+                        body.feed(chunk)
+        except (httpx.HTTPError, ValueError) as exc:
+            raise HTTPException(status_code=502, detail=f"Media unavailable: {exc}")
+
+        content = body.finish(result)
+        await run_in_threadpool(keep_stored, store, content, result)
+        if not result['file_path']:
+            raise HTTPException(status_code=503, detail="Media store unavailable")
+        digest = result['image_hash']
+        media.image_hash = digest
+        media.file_path = result['file_path']
+        media.mime_type = media.mime_type or result['mime_type']
+        await db.commit()
+
+    headers = {"Cache-Control": "private, max-age=31536000, immutable", "ETag": f'"{digest}"'}
+    if thumbnail:
+        path = await run_in_threadpool(store.thumbnail, digest)
+        if path is None:
+            raise HTTPException(status_code=415, detail="No thumbnail for this media")
+        return FileResponse(path, media_type="image/webp", headers=headers)
+    return FileResponse(
+        store.blob_path(digest),
+        media_type=media.mime_type or "application/octet-stream",
+        headers=headers
+    )
+
+
 @router.post("/{land_id}/readable", response_model=Dict[str, Any])
 async def process_readable_v2(
     land_id: int,
@@ -725,13 +891,15 @@ async def crawl_land_v2(
 async def get_land_stats_v2(
     land_id: int,
     request: Request,
+    refresh: bool = Query(False, description="Recalculer les compteurs avant lecture"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> dict:
     """
     Get enhanced statistics for a land
     
-    New endpoint in v2 with detailed analytics
+    New endpoint in v2 with detailed analytics, read from the land's
+    incrementally maintained counters (refresh=true recomputes them).
     """
     # Check if land exists and user has access
     land = await crud_land.get(db, id=land_id)
@@ -758,40 +926,59 @@ async def get_land_stats_v2(
             }
         )
     
-    # Get enhanced statistics (mock data for now)
+    # Statistiques lues dans les compteurs agrégés (land_stat_counters)
+    stats = await db.run_sync(lambda session: get_land_stats(session, land_id, refresh=refresh))
+
+    expressions = stats["expressions"]
+    jobs = stats["jobs"]
+    crawl_jobs = jobs.get("crawl", {"by_status": {}})
+    crawl_status = crawl_jobs["by_status"]
+    finished = crawl_status.get("completed", 0) + crawl_status.get("failed", 0)
+    fetched = expressions["fetched"]
+    successful_pages = sum(
+        count for status, count in stats["by_http_status"].items()
+        if status.isdigit() and 200 <= int(status) < 400
+    )
+
     return {
         "land_id": land_id,
         "name": land.name,
         "crawl_stats": {
-            "total_crawls": 5,
-            "successful_crawls": 4,
-            "failed_crawls": 1,
-            "last_crawl_date": "2025-07-03T14:30:00Z",
-            "avg_crawl_duration": "00:15:30"
+            "total_crawls": sum(crawl_status.values()),
+            "successful_crawls": crawl_status.get("completed", 0),
+            "failed_crawls": crawl_status.get("failed", 0),
+            "running_crawls": crawl_status.get("running", 0) + crawl_status.get("pending", 0),
+            "last_crawl_date": crawl_jobs.get("last_completed_at"),
+            "avg_crawl_duration_seconds": crawl_jobs.get("avg_duration_seconds", 0.0),
+            "jobs_by_type": jobs,
         },
         "content_stats": {
-            "total_pages": 1250,
-            "total_expressions": 3400,
-            "total_media": 850,
-            "content_types": {
-                "html": 1200,
-                "pdf": 35,
-                "images": 850,
-                "other": 15
-            }
+            "total_pages": fetched,
+            "total_expressions": expressions["total"],
+            "total_media": stats["media"]["total"],
+            "processed_media": stats["media"]["processed"],
+            "media_types": stats["media"]["by_type"],
+            "expressions": expressions,
+            "by_depth": stats["by_depth"],
+            "by_lang": stats["by_lang"],
+            "by_http_status": stats["by_http_status"],
+            "relevance": stats["relevance"],
+            "timeline": stats["timeline"],
         },
         "export_stats": {
-            "total_exports": 12,
-            "recent_exports": [
-                {"format": "csv", "date": "2025-07-02T10:15:00Z", "records": 1250},
-                {"format": "gexf", "date": "2025-07-01T16:45:00Z", "records": 3400}
-            ]
+            "total_exports": stats["exports"]["total"],
+            "total_records": stats["exports"]["records"],
+            "by_format": stats["exports"]["by_type"],
+            "last_export_date": stats["exports"]["last_export_at"],
         },
         "performance_metrics": {
-            "avg_response_time": "200ms",
-            "success_rate": "94.2%",
-            "data_quality_score": "87%"
-        }
+            "crawl_success_rate": round(crawl_status.get("completed", 0) / finished, 4) if finished else None,
+            "page_success_rate": round(successful_pages / fetched, 4) if fetched else None,
+            "approval_rate": round(expressions["approved"] / fetched, 4) if fetched else None,
+            "avg_relevance": stats["relevance"]["avg"],
+            "data_quality_score": stats["quality"]["avg"],
+        },
+        "refreshed_at": stats["refreshed_at"],
     }
 
 
@@ -935,11 +1122,7 @@ async def analyze_land_media_v2(
         )
         
         expressions = expressions_query.fetchall()
-        total_expressions = await db.execute(
-            text("SELECT COUNT(*) FROM expressions WHERE land_id = :land_id"),
-            {"land_id": land_id}
-        )
-        total_count = total_expressions.scalar()
+        total_count = land.total_expressions or 0  # Compteur maintenu (land_counters)
         
         # Get media for filtered expressions
         expression_ids = [exp.id for exp in expressions]
@@ -1184,10 +1367,11 @@ async def llm_validate_land_v2(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     limit: Optional[int] = Query(None, description="Max number of expressions to validate"),
-    force: bool = Query(False, description="Force revalidation even if valid_llm exists")
+    force: bool = Query(False, description="Force revalidation even if valid_llm exists"),
+    batched: bool = Query(False, description="Validate several pages per LLM request")
 ) -> Dict[str, Any]:
     """
-    Start LLM validation reprocessing for a land's expressions.
+    Start LLM validation reprocessing for a land's expressions as a Celery job.
 
     Validates expressions that:
     - Have relevance > 0 (are considered relevant by keyword matching)
@@ -1198,8 +1382,11 @@ async def llm_validate_land_v2(
     - OPENROUTER_ENABLED=True
     - OPENROUTER_API_KEY=<your-key>
 
+    Progress, throughput (pages/min) and token usage are reported in the
+    job's result_data; responses are cached by (model, prompt hash).
+
     Returns:
-        Statistics about the validation process
+        Job tracking information
     """
     # Verify land exists and user has access
     land = await crud_land.get(db, id=land_id)
@@ -1234,34 +1421,50 @@ async def llm_validate_land_v2(
         )
 
     try:
-        from app.scripts.reprocess_llm_validation import reprocess_llm_validation
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import Session as SyncSession
-
-        # Create sync engine for the reprocessing script
-        sync_url = settings.DATABASE_URL.replace("+asyncpg", "")
-        engine = create_engine(sync_url, echo=False)
+        from app.crud import crud_job
+        from app.schemas.job import CrawlJobCreate
+        from app.tasks.llm_validation_task import llm_validation_task
 
-        # Run reprocessing in background
-        # Note: For production, this should be a Celery task
-        stats = reprocess_llm_validation(
+        parameters = {
+            "limit": limit,
+            "force": force,
+            "batch_size": 50,
+            "model": settings.OPENROUTER_MODEL,
+            "max_concurrency": settings.OPENROUTER_MAX_CONCURRENCY,
+            "batched": batched
+        }
+        job_data = CrawlJobCreate(
             land_id=land_id,
+            job_type="llm_validation",
+            task_id="",  # Set after task creation
+            parameters=parameters
+        )
+        job = await crud_job.job.create(db, obj_in=job_data)
+
+        task_result = llm_validation_task.delay(
+            job_id=job.id,
             limit=limit,
-            dry_run=False,
             force=force,
-            batch_size=50
+            batch_size=parameters["batch_size"],
+            model=parameters["model"],
+            batched=batched
         )
+        await crud_job.job.update(db, db_obj=job, obj_in={"task_id": task_result.id})
 
         return {
+            "job_id": job.id,
+            "celery_task_id": task_result.id,
             "land_id": land_id,
             "land_name": land.name,
-            "stats": stats,
-            "message": f"LLM validation completed: {stats['validated']} validated, {stats['rejected']} rejected"
+            "status": "pending",
+            "message": "LLM validation started in background",
+            "parameters": parameters,
+            "check_status_url": f"/api/v2/jobs/{job.id}"
         }
 
     except Exception as e:
-        logger.error(f"LLM validation failed for land {land_id}: {e}")
+        logger.error(f"Failed to start LLM validation for land {land_id}: {e}")
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to run LLM validation: {str(e)}"
+            detail=f"Failed to start LLM validation: {str(e)}"
         )
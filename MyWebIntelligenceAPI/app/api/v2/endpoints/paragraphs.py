@@ -3,8 +3,8 @@ API endpoints pour la gestion des paragraphes et embeddings
 """
 
 import logging
-from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+from typing import List, Dict, Any, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response, status
 from sqlalchemy.orm import Session
 from celery.result import AsyncResult
 
@@ -18,6 +18,7 @@ from app.db.models import Land, Expression, Paragraph
 from app.schemas.user import User
 from app.schemas.paragraph import (
     ParagraphResponse,
+    ParagraphSummary,
     ParagraphStats,
     ParagraphCreate,
     ParagraphUpdate
@@ -31,6 +32,7 @@ from app.schemas.embedding import (
     EmbeddingHealthCheck
 )
 from app.core.settings import embeddings_settings
+from app.utils.pagination import cursor_headers, decode_cursor, encode_cursor
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -64,26 +66,75 @@ def _ensure_paragraph_access(db: Session, paragraph_id: int, user: User) -> Para
     _ensure_expression_access(db, paragraph.expression_id, user)
     return paragraph
 
-@router.get("/land/{land_id}/paragraphs", response_model=List[ParagraphResponse])
+@router.get(
+    "/land/{land_id}/paragraphs",
+    response_model=List[Union[ParagraphResponse, ParagraphSummary]]
+)
 async def get_paragraphs_by_land(
+    response: Response,
     land_id: int = Path(..., gt=0),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     with_embeddings_only: bool = Query(False),
+    include_embeddings: bool = Query(
+        False,
+        description="Inclure les vecteurs d'embedding (sinon liste allégée sans lecture de la colonne)"
+    ),
+    cursor: Optional[str] = Query(None, description="Curseur opaque (en-tête X-Next-Cursor de la page précédente)"),
+    count: str = Query("none", pattern="^(exact|estimate|none)$", description="Total dans X-Total-Count : exact, estimé ou absent"),
     db: Session = Depends(get_sync_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Récupère les paragraphes d'un land"""
+    """
+    Récupère les paragraphes d'un land.
+    
+    Par défaut la réponse est allégée (ParagraphSummary) : la colonne
+    embedding est différée en SQL et les vecteurs ne sont renvoyés
+    qu'avec include_embeddings=true.
+    
+    Pagination par curseur : passer la valeur de l'en-tête X-Next-Cursor
+    dans cursor pour obtenir la page suivante à coût constant.
+    """
+    after = None
+    if cursor:
+        try:
+            after = tuple(int(value) for value in decode_cursor(cursor, 2))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    
     try:
         _ensure_land_access(db, land_id, current_user)
         paragraphs = paragraph_crud.get_by_land(
             db, 
             land_id, 
             skip=skip, 
-            limit=limit,
-            with_embeddings_only=with_embeddings_only
+            limit=limit + 1,
+            with_embeddings_only=with_embeddings_only,
+            include_embeddings=include_embeddings,
+            after=after
         )
-        return paragraphs
+        has_next = len(paragraphs) > limit
+        paragraphs = paragraphs[:limit]
+        
+        next_cursor = None
+        if has_next and paragraphs:
+            last = paragraphs[-1]
+            next_cursor = encode_cursor([last.expression_id, last.position])
+        
+        total = None
+        if count != "none":
+            total = paragraph_crud.count_by_land(
+                db,
+                land_id,
+                with_embeddings_only=with_embeddings_only,
+                estimate=count == "estimate"
+            )
+        response.headers.update(cursor_headers(next_cursor, total))
+        
+        schema = ParagraphResponse if include_embeddings else ParagraphSummary
+        return [schema.model_validate(paragraph) for paragraph in paragraphs]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving paragraphs for land {land_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -352,7 +403,7 @@ async def generate_embeddings_for_land(
             )
         
         # Estimer le nombre d'expressions
-        total_expressions = db.query(Expression).filter(Expression.land_id == land_id).count()
+        total_expressions = land.total_expressions or 0
         
         logger.info(
             "User %s requested embedding generation for land %s using provider %s",
@@ -2,9 +2,14 @@
 Configuration de l'application Celery
 """
 
+import logging
+
 from celery import Celery
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
 from ..config import settings
 
+logger = logging.getLogger(__name__)
+
 celery_app = Celery("tasks")
 
 celery_app.conf.broker_url = settings.CELERY_BROKER_URL
@@ -23,6 +28,20 @@ celery_app.conf.update(
     broker_connection_retry_on_startup=True,
 )
 
+beat_schedule = {}
+if settings.LAND_COUNTERS_RECONCILE_INTERVAL > 0:
+    beat_schedule["reconcile-land-counters"] = {
+        "task": "tasks.reconcile_land_counters_task",
+        "schedule": float(settings.LAND_COUNTERS_RECONCILE_INTERVAL),
+    }
+if settings.EXPORT_CLEANUP_INTERVAL > 0:
+    # Fichiers d'export expirés et éviction LRU du cache des exports
+    beat_schedule["cleanup-export-files"] = {
+        "task": "app.tasks.export_tasks.cleanup_export_files_task",
+        "schedule": float(settings.EXPORT_CLEANUP_INTERVAL),
+    }
+celery_app.conf.beat_schedule = beat_schedule
+
 autoscale_setting = settings.CELERY_AUTOSCALE
 if autoscale_setting:
     try:
@@ -33,3 +52,31 @@ if autoscale_setting:
             celery_app.conf.worker_autoscale = (max_workers, min_workers)
     except (ValueError, TypeError):
         pass
+
+
+@worker_process_init.connect
+def warmup_worker_process(**kwargs):
+    """Charger les ressources NLP dans chaque processus worker avant la première tâche."""
+    from app.core.text_processing import warmup_nlp_resources
+
+    try:
+        warmup_nlp_resources()
+    except Exception as exc:  # le worker doit démarrer même sans ressources NLP
+        logger.warning(f"NLP warmup failed: {exc}")
+
+
+@worker_init.connect
+def start_worker_metrics(**kwargs):
+    """Exposer les métriques Prometheus du worker (METRICS_PORT) depuis le processus principal."""
+    from app.core.metrics import start_metrics_server
+
+    start_metrics_server()
+
+
+@worker_process_shutdown.connect
+def release_worker_metrics(pid=None, **kwargs):
+    """Libérer les séries d'un processus enfant terminé (PROMETHEUS_MULTIPROC_DIR)."""
+    from app.core.metrics import mark_process_dead
+
+    if pid is not None:
+        mark_process_dead(pid)
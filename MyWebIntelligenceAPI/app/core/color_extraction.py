@@ -0,0 +1,181 @@
+"""
+Extraction vectorisée des couleurs dominantes
+
+Remplace le KMeans scikit-learn ajusté image par image :
+- l'image est réduite à 100x100 px (comme avant), puis résumée par un
+  histogramme de couleurs sur 4 bits par canal (au plus 4 096 cases, chacune
+  avec la couleur moyenne de ses pixels) ;
+- un k-means pondéré, initialisé de façon déterministe (k-means++ glouton),
+  tourne en numpy sur un lot d'images à la fois ;
+- la palette web safe (6 niveaux par canal) est une table de correspondance :
+  la couleur la plus proche s'obtient canal par canal, sans parcourir les 216
+  couleurs.
+
+Tolérance par rapport à l'ancien KMeans, vérifiée par
+tests/unit/test_color_extraction.py et app/scripts/benchmark_color_extraction.py :
+- chaque couleur du KMeans a une couleur proche ici : distance RGB moyenne,
+  pondérée par les pourcentages, au plus COLOR_TOLERANCE ;
+- erreur de quantification (écart RGB quadratique moyen d'un pixel à sa
+  couleur) au plus RMS_TOLERANCE au-dessus de celle du KMeans.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+from app.config import settings
+
+SAMPLE_SIZE = (100, 100)
+BATCH_SIZE = 64  # Images traitées ensemble
+BIN_BITS = 4  # Précision de l'histogramme des couleurs (bits par canal)
+N_BINS = 1 << (3 * BIN_BITS)
+MAX_ITERATIONS = 20
+CONVERGENCE_DELTA = 0.5  # Arrêt quand aucun centre ne bouge de plus d'un demi-niveau
+
+COLOR_TOLERANCE = 30.0
+RMS_TOLERANCE = 8.0
+
+WEB_SAFE_STEP = 51
+# Niveau web safe le plus proche de chaque valeur de canal (0..255)
+WEB_SAFE_LUT = (np.round(np.arange(256) / WEB_SAFE_STEP) * WEB_SAFE_STEP).astype(np.uint8)
+
+
+def to_web_safe(rgb: Sequence[int]) -> tuple[int, int, int]:
+    """Couleur web safe la plus proche (distance euclidienne, canaux indépendants)."""
+    r, g, b = (int(WEB_SAFE_LUT[int(value)]) for value in rgb)
+    return r, g, b
+
+
+def image_pixels(img: Image.Image) -> np.ndarray:
+    """Pixels RGB (10 000 x 3, uint8) de l'image réduite à SAMPLE_SIZE."""
+    return np.asarray(img.resize(SAMPLE_SIZE).convert('RGB'), dtype=np.uint8).reshape(-1, 3)
+
+
+def _bin_keys(pixels: np.ndarray) -> np.ndarray:
+    """Case de l'histogramme (0..N_BINS-1) de chaque pixel."""
+    quantized = (pixels >> (8 - BIN_BITS)).astype(np.int64)
+    return (quantized[..., 0] << (2 * BIN_BITS)) | (quantized[..., 1] << BIN_BITS) | quantized[..., 2]
+
+
+def _colour_bins(pixels: np.ndarray):
+    """
+    Histogramme des pixels sur BIN_BITS bits par canal.
+
+    Returns:
+        (couleurs moyennes N x B x 3, poids N x B) ; B = nombre max de cases
+        occupées dans le lot, les cases de bourrage ont un poids nul
+    """
+    n_images = pixels.shape[0]
+    flat = (_bin_keys(pixels) + np.arange(n_images)[:, None] * N_BINS).ravel()
+    size = n_images * N_BINS
+    counts = np.bincount(flat, minlength=size).reshape(n_images, N_BINS)
+    sums = np.stack(
+        [np.bincount(flat, weights=pixels[..., channel].ravel(), minlength=size) for channel in range(3)],
+        axis=-1
+    ).reshape(n_images, N_BINS, 3)
+
+    occupied = [np.flatnonzero(row) for row in counts]
+    width = max(len(index) for index in occupied)
+    colours = np.zeros((n_images, width, 3), dtype=np.float32)
+    weights = np.zeros((n_images, width), dtype=np.float32)
+    for i, index in enumerate(occupied):
+        weights[i, :len(index)] = counts[i, index]
+        colours[i, :len(index)] = sums[i, index] / counts[i, index, None]
+    return colours, weights
+
+
+def _squared_distances(points: np.ndarray, centres: np.ndarray) -> np.ndarray:
+    """
+    Distances au carré N x B x K, à ||point||² près (constante par point,
+    sans effet sur l'argmin) : ||c||² - 2 p.c, en produit matriciel par lot.
+    """
+    return (centres ** 2).sum(-1)[:, None, :] - 2 * (points @ centres.transpose(0, 2, 1))
+
+
+def _seed(points: np.ndarray, weights: np.ndarray, n_colors: int) -> np.ndarray:
+    """
+    Initialisation k-means++ déterministe : la case la plus lourde, puis à
+    chaque étape la case maximisant poids x distance² aux centres déjà choisis.
+    """
+    rows = np.arange(points.shape[0])
+    centres = [points[rows, weights.argmax(1)]]
+    nearest = ((points - centres[0][:, None, :]) ** 2).sum(-1)
+    for _ in range(1, n_colors):
+        chosen = points[rows, (weights * nearest).argmax(1)]
+        centres.append(chosen)
+        nearest = np.minimum(nearest, ((points - chosen[:, None, :]) ** 2).sum(-1))
+    return np.stack(centres, axis=1)
+
+
+def _accumulate(points: np.ndarray, weights: np.ndarray, labels: np.ndarray, n_colors: int):
+    """Poids (N x K) et sommes RGB pondérées (N x K x 3) de chaque centre."""
+    n_images = labels.shape[0]
+    flat = (labels + np.arange(n_images)[:, None] * n_colors).ravel()
+    size = n_images * n_colors
+    totals = np.bincount(flat, weights=weights.ravel(), minlength=size).reshape(n_images, n_colors)
+    sums = np.stack(
+        [np.bincount(flat, weights=(weights * points[..., channel]).ravel(), minlength=size)
+         for channel in range(3)],
+        axis=-1
+    ).reshape(n_images, n_colors, 3)
+    return totals, sums
+
+
+def quantize(pixels: np.ndarray, n_colors: int, max_iterations: int = MAX_ITERATIONS):
+    """
+    K-means pondéré, par lot, sur l'histogramme des couleurs.
+
+    Args:
+        pixels: N x P x 3 (uint8)
+
+    Returns:
+        (centres N x K x 3, nombre de pixels par centre N x K)
+    """
+    points, weights = _colour_bins(pixels)
+    centres = _seed(points, weights, n_colors)
+    for _ in range(max_iterations):
+        labels = _squared_distances(points, centres).argmin(-1)
+        totals, sums = _accumulate(points, weights, labels, n_colors)
+        updated = np.where(totals[..., None] > 0, sums / np.maximum(totals, 1)[..., None], centres)
+        moved = np.abs(updated - centres).max()
+        centres = updated.astype(np.float32)
+        if moved < CONVERGENCE_DELTA:
+            break
+    labels = _squared_distances(points, centres).argmin(-1)
+    totals, _ = _accumulate(points, weights, labels, n_colors)
+    return centres, np.rint(totals).astype(np.int64)
+
+
+def _summarise(centres: np.ndarray, counts: np.ndarray) -> Dict[str, Any]:
+    """Couleurs dominantes (par effectif décroissant) et histogramme web safe."""
+    total = int(counts.sum())
+    dominant = [
+        {'rgb': tuple(int(value) for value in centres[k]), 'percentage': round(int(counts[k]) / total * 100, 2)}
+        for k in np.argsort(-counts, kind='stable') if counts[k]
+    ]
+    websafe: Dict[str, float] = {}
+    for item in dominant:
+        websafe_hex = '#%02x%02x%02x' % to_web_safe(item['rgb'])
+        websafe[websafe_hex] = websafe.get(websafe_hex, 0.0) + item['percentage']
+    return {'dominant_colors': dominant, 'websafe_colors': websafe}
+
+
+def extract_dominant_colors(images: Sequence[Image.Image], n_colors: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Couleurs dominantes de plusieurs images en un appel.
+
+    Returns:
+        Pour chaque image : {'dominant_colors': [{'rgb', 'percentage'}, ...], 'websafe_colors': {hex: %}}
+    """
+    n_colors = n_colors or settings.N_DOMINANT_COLORS
+    pixels = [image_pixels(img) for img in images]
+    # Lots d'images de complexité voisine : le bourrage des histogrammes reste faible
+    order = sorted(range(len(pixels)), key=lambda i: len(np.unique(_bin_keys(pixels[i]))))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(pixels)
+    for start in range(0, len(order), BATCH_SIZE):
+        batch = order[start:start + BATCH_SIZE]
+        centres, counts = quantize(np.stack([pixels[i] for i in batch]), n_colors)
+        for i, c, n in zip(batch, centres, counts):
+            results[i] = _summarise(c, n)
+    return results
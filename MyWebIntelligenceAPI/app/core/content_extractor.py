@@ -11,6 +11,8 @@ import json
 import re
 from urllib.parse import urljoin, urlparse
 
+from app.core.host_health import ARCHIVE_HOST, get_host_breaker, host_of
+
 def get_readable_content(html: str) -> Tuple[str, BeautifulSoup, Optional[str]]:
     """
     Extrait le contenu lisible d'un HTML avec stratégie de fallback en cascade:
@@ -433,12 +435,21 @@ async def _extract_from_archive_org(url: str) -> Optional[Dict[str, Any]]:
 
     Uses trafilatura.fetch_url and reproduces full markdown enrichment pipeline.
     """
+    breaker = get_host_breaker()
+    if not breaker.allow(ARCHIVE_HOST):
+        return None
+
     try:
         # Get archived snapshot info
         archive_api_url = f"http://archive.org/wayback/available?url={url}"
 
         async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(archive_api_url)
+            try:
+                response = await client.get(archive_api_url)
+            except httpx.RequestError as exc:
+                breaker.record(ARCHIVE_HOST, exc)
+                raise
+            breaker.record_success(ARCHIVE_HOST)
             response.raise_for_status()
             archive_data = response.json()
 
@@ -448,6 +459,9 @@ async def _extract_from_archive_org(url: str) -> Optional[Dict[str, Any]]:
 
             print(f"Archive.org snapshot found: {archived_url}")
 
+            if not breaker.allow(host_of(archived_url)):
+                return None
+
             # Use trafilatura.fetch_url (legacy behavior) instead of httpx
             archived_html = await asyncio.to_thread(trafilatura.fetch_url, archived_url)
 
@@ -12,15 +12,19 @@ import asyncio
 import logging
 from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import httpx
+from sqlalchemy import update
 from sqlalchemy.orm import Session, selectinload
 
 from app.core import content_extractor, text_processing
+from app.core.host_health import HOST_SKIPPED_STATUS, get_host_breaker, host_of
 from app.core.media_processor import MediaProcessorSync
+from app.core.metrics import stage
 from app.db import models
+from app.services.llm_sentiment import LLMSentimentAnalyzer
 from app.services.sentiment_service import SentimentService
 from app.services.quality_scorer import QualityScorer
 from app.config import settings
@@ -34,8 +38,11 @@ class SyncCrawlerEngine:
     def __init__(self, db: Session):
         self.db = db
         self.http_client = httpx.Client(timeout=15.0, follow_redirects=True)
+        self.host_breaker = get_host_breaker()  # Shared with the domain crawler and media analysis
         self.sentiment_service = SentimentService()  # Initialize sentiment service
         self.quality_scorer = QualityScorer()  # Initialize quality scorer
+        self.llm_sentiment: Optional[LLMSentimentAnalyzer] = None  # Created on first LLM sentiment flush
+        self._pending_sentiment: List[Tuple[int, int, Optional[str], Optional[str], Optional[str]]] = []
 
     # ------------------------------------------------------------------ #
     # High level API                                                     #
@@ -105,8 +112,9 @@ class SyncCrawlerEngine:
         expressions: Iterable[models.Expression],
         analyze_media: bool = False,
         enable_llm: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
     ) -> Tuple[int, int, Dict[str, int]]:
-        """Process expressions sequentially."""
+        """Process expressions sequentially; progress(processed, errors) is called after each one."""
         processed = 0
         errors = 0
         http_stats: Dict[str, int] = defaultdict(int)
@@ -128,7 +136,8 @@ class SyncCrawlerEngine:
                     analyze_media=analyze_media,
                     enable_llm=enable_llm
                 )
-                self.db.commit()
+                with stage("crawl", "db_commit"):
+                    self.db.commit()
                 processed += 1
                 if status_code is not None:
                     http_stats[str(status_code)] += 1
@@ -138,8 +147,46 @@ class SyncCrawlerEngine:
                 errors += 1
                 http_stats["error"] += 1
 
+            if progress is not None:
+                progress(processed, errors)
+
+            if len(self._pending_sentiment) >= self._sentiment_flush_size():
+                self.flush_llm_sentiment()
+
+        self.flush_llm_sentiment()
+
         return processed, errors, dict(http_stats)
 
+    def _sentiment_flush_size(self) -> int:
+        """Enough deferred texts to fill every concurrent LLM request."""
+        return settings.SENTIMENT_LLM_TEXTS_PER_REQUEST * settings.OPENROUTER_MAX_CONCURRENCY
+
+    def flush_llm_sentiment(self) -> None:
+        """Analyze deferred texts in batched LLM requests and bulk-update their expressions."""
+        if not self._pending_sentiment:
+            return
+        pending, self._pending_sentiment = self._pending_sentiment, []
+        if self.llm_sentiment is None:
+            self.llm_sentiment = LLMSentimentAnalyzer(self.db)
+
+        by_land: Dict[int, list] = defaultdict(list)
+        for expr_id, land_id, content, readable, language in pending:
+            by_land[land_id].append((expr_id, content, readable, language))
+
+        try:
+            for land_id, items in by_land.items():
+                fields = self.sentiment_service.enrich_many_llm(items, self.llm_sentiment, land_id=land_id)
+                self.db.execute(
+                    update(models.Expression),
+                    [{"id": expr_id, **values} for expr_id, values in fields.items()]
+                )
+            self.db.commit()
+            logger.info("[SYNC] LLM sentiment flushed for %s expressions: %s", len(pending), self.llm_sentiment.stats)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("[SYNC] LLM sentiment flush failed for %s expressions: %s", len(pending), exc)
+            self.db.rollback()
+            # Continue without sentiment (non-blocking)
+
     def crawl_expression(
         self,
         expr: models.Expression,
@@ -155,34 +202,43 @@ class SyncCrawlerEngine:
         content_type: Optional[str] = None
         content_length: Optional[int] = None
 
-        try:
-            response = self.http_client.get(expr_url)
-            response.raise_for_status()
-            html_content = response.text
-            http_status_code = response.status_code
-
-            # Extract HTTP headers
-            content_type = response.headers.get('content-type', None)
-            content_length_str = response.headers.get('content-length', None)
-            if content_length_str:
+        host = host_of(expr_url)
+        if not self.host_breaker.allow(host):
+            # Host circuit open: skip the fetch instead of waiting for another timeout
+            logger.info("Skipping %s: host circuit open for %s", expr_url, host)
+            http_status_code = HOST_SKIPPED_STATUS
+        else:
+            with stage("crawl", "fetch"):
                 try:
-                    content_length = int(content_length_str)
-                except ValueError:
-                    pass
-        except httpx.HTTPStatusError as exc:
-            logger.error("HTTP error for %s: %s", expr_url, exc)
-            html_content = exc.response.text if exc.response is not None else ""
-            http_status_code = exc.response.status_code if exc.response is not None else None
-            if exc.response is not None:
-                content_type = exc.response.headers.get('content-type', None)
-        except httpx.RequestError as exc:
-            logger.error("Request error for %s: %s", expr_url, exc)
-            http_status_code = 0
+                    response = self.http_client.get(expr_url)
+                    self.host_breaker.record_success(host)
+                    response.raise_for_status()
+                    html_content = response.text
+                    http_status_code = response.status_code
+
+                    # Extract HTTP headers
+                    content_type = response.headers.get('content-type', None)
+                    content_length_str = response.headers.get('content-length', None)
+                    if content_length_str:
+                        try:
+                            content_length = int(content_length_str)
+                        except ValueError:
+                            pass
+                except httpx.HTTPStatusError as exc:
+                    logger.error("HTTP error for %s: %s", expr_url, exc)
+                    html_content = exc.response.text if exc.response is not None else ""
+                    http_status_code = exc.response.status_code if exc.response is not None else None
+                    if exc.response is not None:
+                        content_type = exc.response.headers.get('content-type', None)
+                except httpx.RequestError as exc:
+                    logger.error("Request error for %s: %s", expr_url, exc)
+                    self.host_breaker.record(host, exc)
+                    http_status_code = 0
 
         # Extract HTTP headers: Last-Modified and ETag
         last_modified_str = None
         etag_str = None
-        if http_status_code and http_status_code < 400:
+        if http_status_code and 0 < http_status_code < 400:
             try:
                 if hasattr(response, 'headers'):
                     last_modified_str = response.headers.get('last-modified', None)
@@ -202,24 +258,25 @@ class SyncCrawlerEngine:
         # Extract readable content - function now returns a Dict, not tuple
         extraction_result = {}
         extraction_source = "unknown"
-        try:
-            extractor = content_extractor.ContentExtractor()
-            extraction_result = asyncio.run(
-                extractor.get_readable_content_with_fallbacks(expr_url, html_content)
-            )
-            extraction_source = extraction_result.get('extraction_source', 'unknown')
-            logger.info("Crawling %s using %s", expr_url, extraction_source)
-        except RuntimeError:
-            # We might already be running in an event loop if the caller wraps asyncio.run
-            extractor = content_extractor.ContentExtractor()
-            extraction_result = asyncio.get_event_loop().run_until_complete(
-                extractor.get_readable_content_with_fallbacks(expr_url, html_content)
-            )
-            extraction_source = extraction_result.get('extraction_source', 'unknown')
-            logger.info("Crawling %s using %s", expr_url, extraction_source)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Readable extraction failed for %s: %s", expr_url, exc)
-            extraction_result = {}
+        with stage("crawl", "extract"):
+            try:
+                extractor = content_extractor.ContentExtractor()
+                extraction_result = asyncio.run(
+                    extractor.get_readable_content_with_fallbacks(expr_url, html_content)
+                )
+                extraction_source = extraction_result.get('extraction_source', 'unknown')
+                logger.info("Crawling %s using %s", expr_url, extraction_source)
+            except RuntimeError:
+                # We might already be running in an event loop if the caller wraps asyncio.run
+                extractor = content_extractor.ContentExtractor()
+                extraction_result = asyncio.get_event_loop().run_until_complete(
+                    extractor.get_readable_content_with_fallbacks(expr_url, html_content)
+                )
+                extraction_source = extraction_result.get('extraction_source', 'unknown')
+                logger.info("Crawling %s using %s", expr_url, extraction_source)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Readable extraction failed for %s: %s", expr_url, exc)
+                extraction_result = {}
 
         # Extract values from result dict
         readable_content = extraction_result.get('readable')
@@ -252,7 +309,8 @@ class SyncCrawlerEngine:
         if readable_content:
             # Calculer word_count, reading_time et détecter la langue depuis le contenu lisible
             from app.utils.text_utils import analyze_text_metrics
-            text_metrics = analyze_text_metrics(readable_content)
+            with stage("crawl", "text_metrics"):
+                text_metrics = analyze_text_metrics(readable_content)
             word_count = text_metrics.get('word_count', 0)
             reading_time = max(1, word_count // 200) if word_count > 0 else None  # 200 mots/min
             detected_lang = text_metrics.get('language')  # Langue détectée par langdetect
@@ -287,186 +345,191 @@ class SyncCrawlerEngine:
                 }
             )
 
-            land_dict = text_processing.get_land_dictionary_sync(self.db, expr.land_id)
+            with stage("crawl", "relevance"):
+                land_dict = text_processing.get_land_dictionary_sync(self.db, expr.land_id)
 
-            class TempExpr:
-                def __init__(self, title: Optional[str], readable: Optional[str], expr_id: int):
-                    self.title = title
-                    self.readable = readable
-                    self.id = expr_id
+                class TempExpr:
+                    def __init__(self, title: Optional[str], readable: Optional[str], expr_id: int):
+                        self.title = title
+                        self.readable = readable
+                        self.id = expr_id
 
-            temp_expr = TempExpr(metadata.get("title"), readable_content, expr.id)
-            try:
-                relevance = asyncio.run(
-                    text_processing.expression_relevance(land_dict, temp_expr, final_lang or "fr")
-                )
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                relevance = loop.run_until_complete(
-                    text_processing.expression_relevance(land_dict, temp_expr, final_lang or "fr")
-                )
-                loop.close()
+                temp_expr = TempExpr(metadata.get("title"), readable_content, expr.id)
+                try:
+                    relevance = asyncio.run(
+                        text_processing.expression_relevance(land_dict, temp_expr, final_lang or "fr")
+                    )
+                except RuntimeError:
+                    loop = asyncio.new_event_loop()
+                    relevance = loop.run_until_complete(
+                        text_processing.expression_relevance(land_dict, temp_expr, final_lang or "fr")
+                    )
+                    loop.close()
             update_data["relevance"] = relevance
 
             # LLM Validation (if enabled and expression is relevant)
             if enable_llm and settings.OPENROUTER_ENABLED and relevance > 0:
-                try:
-                    from app.services.llm_validation_service import LLMValidationService
-
-                    # Get land from DB
-                    land = self.db.query(models.Land).filter(models.Land.id == expr.land_id).first()
-
-                    if land:
-                        # Create temp expression with current update_data for validation
-                        class TempExprLLM:
-                            def __init__(self):
-                                self.id = expr.id
-                                self.url = expr_url
-                                self.title = update_data.get("title")
-                                self.description = update_data.get("description")
-                                self.readable = readable_content
-                                self.lang = final_lang
-
-                        temp_expr_llm = TempExprLLM()
-
-                        # V2 SYNC-ONLY: Direct synchronous call (no async)
-                        llm_service = LLMValidationService(self.db)
-
-                        validation_result = llm_service.validate_expression_relevance(
-                            temp_expr_llm,
-                            land
-                        )
-
-                        # Update validation fields
-                        update_data["valid_llm"] = 'oui' if validation_result.is_relevant else 'non'
-                        update_data["valid_model"] = validation_result.model_used
-
-                        # If not relevant according to LLM, set relevance to 0
-                        if not validation_result.is_relevant:
-                            update_data["relevance"] = 0
-                            logger.info(
-                                f"[LLM] Expression {expr.id} marked as non-relevant by {validation_result.model_used}"
-                            )
+                with stage("crawl", "llm_validation"):
+                    try:
+                        from app.services.llm_validation_service import LLMValidationService
+
+                        # Get land from DB
+                        land = self.db.query(models.Land).filter(models.Land.id == expr.land_id).first()
+
+                        if land:
+                            # Create temp expression with current update_data for validation
+                            class TempExprLLM:
+                                def __init__(self):
+                                    self.id = expr.id
+                                    self.url = expr_url
+                                    self.title = update_data.get("title")
+                                    self.description = update_data.get("description")
+                                    self.readable = readable_content
+                                    self.lang = final_lang
+                                    self.relevance = relevance
+                                    self.http_status = update_data.get("http_status")
+                                    self.content_type = update_data.get("content_type")
+                                    self.word_count = update_data.get("word_count")
+
+                            temp_expr_llm = TempExprLLM()
+
+                            # Cheap pre-filter cascade first (no duplicate index at crawl time)
+                            decision = None
+                            if settings.LLM_PREFILTER_ENABLED:
+                                from app.services.llm_prefilter import LLMPrefilter
+                                decision = LLMPrefilter(duplicate_distance=-1).decide(temp_expr_llm, land)
+
+                            if decision is not None and decision.verdict is not None:
+                                is_relevant = decision.verdict
+                                model_used = decision.model_label
+                            else:
+                                # V2 SYNC-ONLY: Direct synchronous call (no async)
+                                llm_service = LLMValidationService(self.db)
+
+                                validation_result = llm_service.validate_expression_relevance(
+                                    temp_expr_llm,
+                                    land
+                                )
+                                is_relevant = validation_result.is_relevant
+                                model_used = validation_result.model_used
+
+                            # Update validation fields
+                            update_data["valid_llm"] = 'oui' if is_relevant else 'non'
+                            update_data["valid_model"] = model_used
+
+                            # If not relevant according to LLM, set relevance to 0
+                            if not is_relevant:
+                                update_data["relevance"] = 0
+                                logger.info(
+                                    f"[LLM] Expression {expr.id} marked as non-relevant by {model_used}"
+                                )
+                            else:
+                                logger.info(
+                                    f"[LLM] Expression {expr.id} validated as relevant by {model_used}"
+                                )
                         else:
-                            logger.info(
-                                f"[LLM] Expression {expr.id} validated as relevant by {validation_result.model_used}"
-                            )
-                    else:
-                        logger.warning(f"[LLM] Could not validate: land {expr.land_id} not found")
+                            logger.warning(f"[LLM] Could not validate: land {expr.land_id} not found")
 
-                except Exception as e:
-                    logger.error(f"[LLM] Validation failed for {expr_url}: {e}")
-                    # Continue without LLM validation (non-blocking)
+                    except Exception as e:
+                        logger.error(f"[LLM] Validation failed for {expr_url}: {e}")
+                        # Continue without LLM validation (non-blocking)
 
             # Sentiment Analysis (if enabled)
-            if settings.ENABLE_SENTIMENT_ANALYSIS:
-                try:
-                    # Determine if we should use LLM (this would come from crawl parameters)
-                    # For now, always use TextBlob (default) unless explicitly requested
-                    use_llm = False  # TODO: Get from crawl parameters (llm_validation flag)
-
-                    # Note: sentiment_service methods are sync-compatible via asyncio.run
+            if settings.ENABLE_SENTIMENT_ANALYSIS and settings.SENTIMENT_LLM_ENABLED:
+                # Deferred: analyzed with other pages in batched LLM requests (flush_llm_sentiment)
+                self._pending_sentiment.append(
+                    (expr.id, expr.land_id, update_data.get("content"), readable_content, final_lang)
+                )
+            elif settings.ENABLE_SENTIMENT_ANALYSIS:
+                with stage("crawl", "sentiment"):
                     try:
-                        sentiment_data = asyncio.run(
-                            self.sentiment_service.enrich_expression_sentiment(
-                                content=update_data.get("content"),
-                                readable=readable_content,
-                                language=final_lang,
-                                use_llm=use_llm
-                            )
+                        sentiment_data = self.sentiment_service.enrich_textblob(
+                            content=update_data.get("content"),
+                            readable=readable_content,
+                            language=final_lang
                         )
-                    except RuntimeError:
-                        # Already in event loop
-                        loop = asyncio.new_event_loop()
-                        sentiment_data = loop.run_until_complete(
-                            self.sentiment_service.enrich_expression_sentiment(
-                                content=update_data.get("content"),
-                                readable=readable_content,
-                                language=final_lang,
-                                use_llm=use_llm
-                            )
+
+                        # Add sentiment data to update
+                        update_data["sentiment_score"] = sentiment_data["sentiment_score"]
+                        update_data["sentiment_label"] = sentiment_data["sentiment_label"]
+                        update_data["sentiment_confidence"] = sentiment_data["sentiment_confidence"]
+                        update_data["sentiment_status"] = sentiment_data["sentiment_status"]
+                        update_data["sentiment_model"] = sentiment_data["sentiment_model"]
+                        update_data["sentiment_computed_at"] = sentiment_data["sentiment_computed_at"]
+
+                        logger.debug(
+                            f"[SYNC] Sentiment enriched for {expr_url}: "
+                            f"{sentiment_data['sentiment_label']} ({sentiment_data['sentiment_score']}) "
+                            f"via {sentiment_data['sentiment_model']}"
                         )
-                        loop.close()
-
-                    # Add sentiment data to update
-                    update_data["sentiment_score"] = sentiment_data["sentiment_score"]
-                    update_data["sentiment_label"] = sentiment_data["sentiment_label"]
-                    update_data["sentiment_confidence"] = sentiment_data["sentiment_confidence"]
-                    update_data["sentiment_status"] = sentiment_data["sentiment_status"]
-                    update_data["sentiment_model"] = sentiment_data["sentiment_model"]
-                    update_data["sentiment_computed_at"] = sentiment_data["sentiment_computed_at"]
-
-                    logger.debug(
-                        f"[SYNC] Sentiment enriched for {expr_url}: "
-                        f"{sentiment_data['sentiment_label']} ({sentiment_data['sentiment_score']}) "
-                        f"via {sentiment_data['sentiment_model']}"
-                    )
-                except Exception as e:
-                    logger.error(f"[SYNC] Sentiment enrichment failed for {expr_url}: {e}")
-                    # Continue without sentiment (non-blocking)
+                    except Exception as e:
+                        logger.error(f"[SYNC] Sentiment enrichment failed for {expr_url}: {e}")
+                        # Continue without sentiment (non-blocking)
 
             # Quality Score (if enabled)
             if settings.ENABLE_QUALITY_SCORING:
-                try:
-                    # Get land from DB for quality computation
-                    land = self.db.query(models.Land).filter(models.Land.id == expr.land_id).first()
-
-                    if land:
-                        # Build temporary expression object for quality computation
-                        class TempExprQuality:
-                            def __init__(self, data, existing_expr):
-                                # Copy all fields from update_data
-                                for key, value in data.items():
-                                    setattr(self, key, value)
-                                # Add fields needed for quality computation
-                                self.http_status = data.get("http_status")
-                                self.content_type = data.get("content_type")
-                                self.title = data.get("title")
-                                self.description = data.get("description")
-                                self.keywords = data.get("keywords")
-                                self.canonical_url = data.get("canonical_url")
-                                self.word_count = data.get("word_count")
-                                self.content_length = data.get("content_length")
-                                self.reading_time = data.get("reading_time")
-                                self.language = data.get("lang")  # Note: update_data uses 'lang', model uses 'language'
-                                self.relevance = data.get("relevance")
-                                self.validllm = getattr(existing_expr, 'validllm', None)  # From existing expr
-                                self.readable = data.get("readable")
-                                self.readable_at = getattr(existing_expr, 'readable_at', None)
-                                self.crawled_at = data.get("crawled_at")
-
-                        temp_expr_quality = TempExprQuality(update_data, expr)
-
-                        quality_result = self.quality_scorer.compute_quality_score(
-                            expression=temp_expr_quality,
-                            land=land
-                        )
+                with stage("crawl", "quality"):
+                    try:
+                        # Get land from DB for quality computation
+                        land = self.db.query(models.Land).filter(models.Land.id == expr.land_id).first()
+
+                        if land:
+                            # Build temporary expression object for quality computation
+                            class TempExprQuality:
+                                def __init__(self, data, existing_expr):
+                                    # Copy all fields from update_data
+                                    for key, value in data.items():
+                                        setattr(self, key, value)
+                                    # Add fields needed for quality computation
+                                    self.http_status = data.get("http_status")
+                                    self.content_type = data.get("content_type")
+                                    self.title = data.get("title")
+                                    self.description = data.get("description")
+                                    self.keywords = data.get("keywords")
+                                    self.canonical_url = data.get("canonical_url")
+                                    self.word_count = data.get("word_count")
+                                    self.content_length = data.get("content_length")
+                                    self.reading_time = data.get("reading_time")
+                                    self.language = data.get("lang")  # Note: update_data uses 'lang', model uses 'language'
+                                    self.relevance = data.get("relevance")
+                                    self.validllm = getattr(existing_expr, 'validllm', None)  # From existing expr
+                                    self.readable = data.get("readable")
+                                    self.readable_at = getattr(existing_expr, 'readable_at', None)
+                                    self.crawled_at = data.get("crawled_at")
+
+                            temp_expr_quality = TempExprQuality(update_data, expr)
+
+                            quality_result = self.quality_scorer.compute_quality_score(
+                                expression=temp_expr_quality,
+                                land=land
+                            )
 
-                        update_data["quality_score"] = quality_result["score"]
+                            update_data["quality_score"] = quality_result["score"]
 
-                        logger.debug(
-                            f"[SYNC] Quality computed for {expr_url}: "
-                            f"{quality_result['score']:.2f} ({quality_result['category']})"
-                        )
-                    else:
-                        logger.warning(f"[SYNC] Could not compute quality: land {expr.land_id} not found")
+                            logger.debug(
+                                f"[SYNC] Quality computed for {expr_url}: "
+                                f"{quality_result['score']:.2f} ({quality_result['category']})"
+                            )
+                        else:
+                            logger.warning(f"[SYNC] Could not compute quality: land {expr.land_id} not found")
 
-                except Exception as e:
-                    logger.error(f"[SYNC] Quality scoring failed for {expr_url}: {e}")
-                    # Continue without quality (non-blocking)
+                    except Exception as e:
+                        logger.error(f"[SYNC] Quality scoring failed for {expr_url}: {e}")
+                        # Continue without quality (non-blocking)
 
             # approved_at is set whenever readable content is saved
             update_data["approved_at"] = datetime.utcnow()
 
             # Extract links and media using appropriate strategy
-            self._handle_links_and_media(
-                readable_content=readable_content,
-                extraction_source=extraction_source,
-                filtered_soup=filtered_soup,
-                expr=expr,
-                expr_url=expr_url,
-                analyze_media=analyze_media,
-            )
+            with stage("crawl", "links_media"):
+                self._handle_links_and_media(
+                    readable_content=readable_content,
+                    extraction_source=extraction_source,
+                    filtered_soup=filtered_soup,
+                    expr=expr,
+                    expr_url=expr_url,
+                    analyze_media=analyze_media,
+                )
 
         for field, value in update_data.items():
             setattr(expr, field, value)
@@ -917,9 +980,13 @@ class SyncCrawlerEngine:
                                 "dominant_colors": analysis.get("dominant_colors"),
                                 "websafe_colors": analysis.get("websafe_colors"),
                                 "image_hash": analysis.get("image_hash"),
+                                "ahash": analysis.get("ahash"),
+                                "dhash": analysis.get("dhash"),
+                                "phash": analysis.get("phash"),
                                 "exif_data": analysis.get("exif_data"),
                                 "color_mode": analysis.get("color_mode"),
                                 "mime_type": analysis.get("mime_type"),
+                                "file_path": analysis.get("file_path"),
                                 "processed_at": datetime.now(timezone.utc),
                                 "is_processed": True,
                                 "analysis_error": None,
@@ -1009,9 +1076,13 @@ class SyncCrawlerEngine:
                                 "dominant_colors": analysis.get("dominant_colors"),
                                 "websafe_colors": analysis.get("websafe_colors"),
                                 "image_hash": analysis.get("image_hash"),
+                                "ahash": analysis.get("ahash"),
+                                "dhash": analysis.get("dhash"),
+                                "phash": analysis.get("phash"),
                                 "exif_data": analysis.get("exif_data"),
                                 "color_mode": analysis.get("color_mode"),
                                 "mime_type": analysis.get("mime_type"),
+                                "file_path": analysis.get("file_path"),
                                 "processed_at": datetime.now(timezone.utc),
                                 "is_processed": True,
                                 "analysis_error": None,
@@ -23,6 +23,7 @@ from bs4 import BeautifulSoup
 
 from app.schemas.domain_crawl import DomainFetchResult
 from app.config import settings
+from app.core.host_health import ARCHIVE_HOST, HOST_SKIPPED_STATUS, get_host_breaker, host_of
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,9 @@ class DomainCrawler:
             'Upgrade-Insecure-Requests': '1'
         })
 
+        # Disjoncteur par hôte partagé avec le crawler de pages et l'analyse des médias
+        self.host_breaker = get_host_breaker()
+
         logger.info(f"DomainCrawler initialized (timeout={self.timeout}s)")
 
     def fetch_domain(self, domain_name: str) -> DomainFetchResult:
@@ -74,9 +78,28 @@ class DomainCrawler:
 
         logger.info(f"🕷️  Fetching domain: {domain_name}")
 
+        host = host_of(domain_name)
+        if not self.host_breaker.allow(host):
+            # Hôte coupé : seules les archives restent utiles
+            logger.warning(f"⏭️  {domain_name} - Host circuit open, skipping live strategies")
+            result = self._try_archive_org(domain_name)
+            if result.http_status != 200:
+                result = DomainFetchResult(
+                    domain_name=domain_name,
+                    http_status=HOST_SKIPPED_STATUS,
+                    source_method="error",
+                    fetched_at=datetime.now(),
+                    error_code="ERR_HOST_CIRCUIT_OPEN",
+                    error_message=f"Skipped: host circuit open for {host}",
+                    fetch_duration_ms=0
+                )
+            result.fetch_duration_ms = int((time.time() - start_time) * 1000)
+            return result
+
         # Stratégie 1: Trafilatura
         result = self._try_trafilatura(domain_name)
         if result.http_status == 200:
+            self.host_breaker.record_success(host)
             result.fetch_duration_ms = int((time.time() - start_time) * 1000)
             result.retry_count = retry_count
             logger.info(f"✅ {domain_name} - Success via Trafilatura (HTTP {result.http_status})")
@@ -98,6 +121,10 @@ class DomainCrawler:
 
         # Stratégie 3: HTTP direct
         result = self._try_http_direct(domain_name)
+        if result.http_status:
+            self.host_breaker.record_success(host)
+        elif result.error_code in ("ERR_CONNECTION", "ERR_TIMEOUT"):
+            self.host_breaker.record_failure(host)
         result.fetch_duration_ms = int((time.time() - start_time) * 1000)
         result.retry_count = retry_count
 
@@ -203,11 +230,27 @@ class DomainCrawler:
 
         Récupère la dernière snapshot disponible.
         """
+        if not self.host_breaker.allow(ARCHIVE_HOST):
+            return DomainFetchResult(
+                domain_name=domain_name,
+                http_status=HOST_SKIPPED_STATUS,
+                source_method="error",
+                fetched_at=datetime.now(),
+                error_code="ERR_ARCHIVE_CIRCUIT_OPEN",
+                error_message=f"Skipped: host circuit open for {ARCHIVE_HOST}",
+                fetch_duration_ms=0
+            )
+
         try:
             # API Wayback Machine - dernière snapshot
             availability_url = f"http://archive.org/wayback/available?url={domain_name}"
 
-            resp = self.session.get(availability_url, timeout=self.timeout)
+            try:
+                resp = self.session.get(availability_url, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                self.host_breaker.record(ARCHIVE_HOST, e)
+                raise
+            self.host_breaker.record_success(ARCHIVE_HOST)
             resp.raise_for_status()
 
             data = resp.json()
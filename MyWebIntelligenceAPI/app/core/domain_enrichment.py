@@ -0,0 +1,305 @@
+"""
+Enrichissement concurrent des domaines (V2 SYNC côté DB)
+
+Comme la validation LLM, la concurrence est limitée au réseau : la tâche
+Celery reste synchrone et lance une boucle asyncio (asyncio.run) avec un pool
+HTTP partagé. Les écritures DB restent dans le callback synchrone de la tâche.
+
+Par domaine, les stratégies de DomainCrawler sont court-circuitées :
+1. Sonde DNS/TCP rapide (443 puis 80) : un hôte mort passe directement à Archive.org
+2. Une seule requête live (HTTPS puis HTTP) ; métadonnées Trafilatura si possible
+3. Archive.org Wayback Machine si la page live n'est pas exploitable
+"""
+
+import asyncio
+import socket
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+import trafilatura
+from bs4 import BeautifulSoup
+
+from app.config import settings
+from app.core.host_health import ARCHIVE_HOST, HOST_SKIPPED_STATUS, get_host_breaker, host_of
+from app.schemas.domain_crawl import DomainFetchResult
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ResultCallback = Callable[[DomainFetchResult], None]
+
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'DNT': '1',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+
+def extract_domain_metadata(domain_name: str, html: str, source_method: str) -> DomainFetchResult:
+    """
+    Métadonnées d'une page d'accueil : Trafilatura d'abord, balises meta ensuite
+    (mêmes règles que les stratégies de DomainCrawler).
+    """
+    metadata = trafilatura.extract_metadata(html)
+    soup = BeautifulSoup(html, 'html.parser')
+
+    title = metadata.title if metadata else None
+    description = metadata.description if metadata else None
+    language = metadata.language if metadata else None
+    keywords = None
+
+    if not title:
+        title_tag = soup.find('title')
+        if title_tag:
+            title = title_tag.get_text(strip=True)
+
+    if not description:
+        desc_tag = soup.find('meta', attrs={'name': 'description'})
+        if not desc_tag:
+            desc_tag = soup.find('meta', attrs={'property': 'og:description'})
+        if desc_tag:
+            description = desc_tag.get('content', '').strip()
+
+    kw_tag = soup.find('meta', attrs={'name': 'keywords'})
+    if kw_tag:
+        keywords = kw_tag.get('content', '').strip()
+
+    if not language:
+        html_tag = soup.find('html')
+        if html_tag:
+            language = html_tag.get('lang', '').strip()
+
+    content = trafilatura.extract(html) or soup.get_text(separator=' ', strip=True)[:5000]
+
+    return DomainFetchResult(
+        domain_name=domain_name,
+        http_status=200,
+        title=title,
+        description=description,
+        keywords=keywords,
+        language=language,
+        content=content,
+        source_method=source_method,
+        fetched_at=datetime.now(),
+        fetch_duration_ms=0
+    )
+
+
+def _error(domain_name: str, http_status: int, error_code: str, error_message: str) -> DomainFetchResult:
+    return DomainFetchResult(
+        domain_name=domain_name,
+        http_status=http_status,
+        source_method="error",
+        fetched_at=datetime.now(),
+        error_code=error_code,
+        error_message=error_message,
+        fetch_duration_ms=0
+    )
+
+
+class DomainEnrichmentEngine:
+    """
+    Enrichit de nombreux domaines en parallèle (max_concurrency en vol).
+
+    Usage (dans une tâche Celery synchrone):
+        engine = DomainEnrichmentEngine()
+        results = engine.run(["example.com", ...], on_result=save)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        probe_timeout: Optional[float] = None,
+        archive_concurrency: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.max_concurrency = max(1, max_concurrency or settings.DOMAIN_CRAWL_CONCURRENCY)
+        self.timeout = timeout or settings.DOMAIN_CRAWL_TIMEOUT
+        self.probe_timeout = probe_timeout or settings.DOMAIN_CRAWL_PROBE_TIMEOUT
+        self.archive_concurrency = max(1, archive_concurrency or settings.DOMAIN_CRAWL_ARCHIVE_CONCURRENCY)
+        self.transport = transport
+        self.host_breaker = get_host_breaker()
+        self.stats: Dict[str, float] = {}
+
+    def run(self, domain_names: List[str], on_result: Optional[ResultCallback] = None) -> List[DomainFetchResult]:
+        """
+        Enrichit les domaines et renvoie leurs résultats (ordre d'achèvement).
+
+        on_result est appelé (dans le thread de la tâche) dès qu'un domaine est terminé.
+        """
+        started = time.perf_counter()
+        results = asyncio.run(self._run(list(dict.fromkeys(domain_names)), on_result))
+        elapsed = time.perf_counter() - started
+        self.stats = {
+            "domains": len(results),
+            "duration_s": round(elapsed, 3),
+            "domains_per_second": round(len(results) / elapsed, 3) if elapsed > 0 else 0.0,
+        }
+        logger.info(
+            f"Domain enrichment: {len(results)} domains in {elapsed:.1f}s "
+            f"({self.stats['domains_per_second']} domains/s, concurrency={self.max_concurrency})"
+        )
+        return results
+
+    async def _run(self, domain_names: List[str], on_result: Optional[ResultCallback]) -> List[DomainFetchResult]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        archive_semaphore = asyncio.Semaphore(self.archive_concurrency)
+        timeout = httpx.Timeout(self.timeout, connect=self.probe_timeout)
+        limits = httpx.Limits(max_connections=self.max_concurrency + self.archive_concurrency)
+        user_agent = getattr(settings, 'DOMAIN_CRAWL_USER_AGENT',
+                             'MyWebIntelligence/2.0 (+https://mywebintelligence.com)')
+
+        results: List[DomainFetchResult] = []
+        async with httpx.AsyncClient(
+            headers={'User-Agent': user_agent, **DEFAULT_HEADERS},
+            timeout=timeout,
+            limits=limits,
+            follow_redirects=True,
+            verify=False,  # Accepter les certificats SSL invalides (comme HTTP direct)
+            transport=self.transport
+        ) as client:
+            async def bounded(domain_name: str) -> DomainFetchResult:
+                async with semaphore:
+                    return await self.enrich(client, archive_semaphore, domain_name)
+
+            for future in asyncio.as_completed([bounded(name) for name in domain_names]):
+                result = await future
+                results.append(result)
+                if on_result:
+                    on_result(result)
+        return results
+
+    async def enrich(
+        self,
+        client: httpx.AsyncClient,
+        archive_semaphore: asyncio.Semaphore,
+        domain_name: str
+    ) -> DomainFetchResult:
+        """Enrichit un domaine : sonde, page live, puis Archive.org."""
+        start_time = time.time()
+        retry_count = 0
+
+        host = host_of(domain_name)
+        try:
+            if not self.host_breaker.allow(host):
+                result = _error(
+                    domain_name, HOST_SKIPPED_STATUS, "ERR_HOST_CIRCUIT_OPEN",
+                    f"Skipped: host circuit open for {host}"
+                )
+            else:
+                reachable, probe_error = await self.probe(domain_name)
+                if reachable:
+                    self.host_breaker.record_success(host)
+                    result = await self._fetch_live(client, domain_name)
+                else:
+                    self.host_breaker.record_failure(host)
+                    logger.debug(f"{domain_name} unreachable ({probe_error}), skipping live strategies")
+                    result = _error(domain_name, 0, "ERR_PROBE", probe_error)
+
+            if result.http_status != 200:
+                retry_count += 1
+                async with archive_semaphore:
+                    archived = await self._fetch_archive(client, domain_name)
+                if archived.http_status == 200:
+                    result = archived
+                else:
+                    # Garder l'erreur live (plus parlante) comme dans DomainCrawler
+                    retry_count += 1
+        except Exception as e:
+            logger.warning(f"Domain enrichment error for {domain_name}: {e}")
+            result = _error(domain_name, 0, "ERR_HTTP_UNKNOWN", str(e))
+
+        result.fetch_duration_ms = int((time.time() - start_time) * 1000)
+        result.retry_count = retry_count
+        return result
+
+    async def probe(self, domain_name: str) -> Tuple[bool, Optional[str]]:
+        """
+        Résolution DNS puis connexion TCP (443, sinon 80) avec un délai court,
+        sur chaque adresse résolue (IPv6 injoignable, IP hors service...).
+
+        Returns:
+            (joignable, message d'erreur)
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            addresses = await asyncio.wait_for(
+                loop.getaddrinfo(domain_name, 443, type=socket.SOCK_STREAM),
+                self.probe_timeout
+            )
+        except (socket.gaierror, asyncio.TimeoutError, OSError) as e:
+            return False, f"DNS resolution failed: {str(e) or 'timeout'}"
+        if not addresses:
+            return False, "DNS resolution returned no address"
+
+        hosts = list(dict.fromkeys(address[4][0] for address in addresses))
+        last_error = None
+        for port in (443, 80):
+            for host in hosts:
+                try:
+                    _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self.probe_timeout)
+                    writer.close()
+                    return True, None
+                except (asyncio.TimeoutError, OSError) as e:
+                    last_error = f"TCP connect to {host}:{port} failed: {str(e) or 'timeout'}"
+        return False, last_error
+
+    async def _fetch_live(self, client: httpx.AsyncClient, domain_name: str) -> DomainFetchResult:
+        """Page d'accueil live : HTTPS puis HTTP, une seule requête réussie par domaine."""
+        result = _error(domain_name, 0, "ERR_HTTP_ALL", "All HTTP attempts failed")
+        for protocol in ('https', 'http'):
+            url = f"{protocol}://{domain_name}"
+            try:
+                resp = await client.get(url)
+            except httpx.TimeoutException:
+                result = _error(domain_name, 0, "ERR_TIMEOUT", f"Timeout after {self.timeout}s")
+                continue
+            except httpx.ConnectError as e:
+                code = "ERR_SSL" if "SSL" in str(e) or "certificate" in str(e) else "ERR_CONNECTION"
+                result = _error(domain_name, 0, code, str(e))
+                continue
+            except httpx.HTTPError as e:
+                result = _error(domain_name, 0, "ERR_HTTP_UNKNOWN", str(e))
+                continue
+
+            if resp.status_code != 200:
+                result = _error(
+                    domain_name, resp.status_code, f"ERR_HTTP_{resp.status_code}",
+                    f"HTTP {resp.status_code} - {resp.reason_phrase}"
+                )
+                continue
+
+            source = "trafilatura" if protocol == 'https' else "http_direct"
+            # Extraction CPU (BeautifulSoup/Trafilatura) hors de la boucle
+            return await asyncio.to_thread(extract_domain_metadata, domain_name, resp.text, source)
+        return result
+
+    async def _fetch_archive(self, client: httpx.AsyncClient, domain_name: str) -> DomainFetchResult:
+        """Dernière snapshot Archive.org du domaine."""
+        if not self.host_breaker.allow(ARCHIVE_HOST):
+            return _error(domain_name, HOST_SKIPPED_STATUS, "ERR_ARCHIVE_CIRCUIT_OPEN",
+                          f"Skipped: host circuit open for {ARCHIVE_HOST}")
+        try:
+            try:
+                resp = await client.get("http://archive.org/wayback/available", params={"url": domain_name})
+            except httpx.HTTPError as e:
+                self.host_breaker.record(ARCHIVE_HOST, e)
+                raise
+            self.host_breaker.record_success(ARCHIVE_HOST)
+            resp.raise_for_status()
+            closest = (resp.json().get('archived_snapshots') or {}).get('closest')
+            if not closest:
+                return _error(domain_name, 404, "ERR_ARCHIVE_NOTFOUND", "No archive.org snapshot available")
+
+            snapshot = await client.get(closest['url'])
+            snapshot.raise_for_status()
+        except httpx.HTTPError as e:
+            return _error(domain_name, 0, "ERR_ARCHIVE_HTTP", str(e))
+        except Exception as e:
+            return _error(domain_name, 0, "ERR_ARCHIVE", str(e))
+
+        return await asyncio.to_thread(extract_domain_metadata, domain_name, snapshot.text, "archive_org")
@@ -0,0 +1,250 @@
+"""
+Santé des hôtes partagée par tous les fetchers du processus
+
+- ResolverCache : cache des résolutions DNS (positives et négatives) installé
+  à la place de socket.getaddrinfo, donc utilisé par httpx, requests et
+  trafilatura sans modification de leurs appels
+- HostCircuitBreaker : disjoncteur par hôte ; ouvert après N échecs de
+  connexion consécutifs, il fait sauter les requêtes vers l'hôte, puis laisse
+  passer une requête de test (half-open) après HOST_BREAKER_RESET_TIMEOUT
+
+Utilisés par SyncCrawlerEngine, DomainCrawler, DomainEnrichmentEngine,
+MediaProcessorSync et le fallback Archive.org.
+"""
+
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+import requests
+
+from app.config import settings
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# http_status enregistré quand le fetch est sauté (disjoncteur ouvert)
+HOST_SKIPPED_STATUS = -1
+
+ARCHIVE_HOST = "archive.org"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+CONNECTION_ERRORS = (
+    httpx.ConnectError,
+    httpx.TimeoutException,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    socket.gaierror,
+    socket.timeout,
+    ConnectionError,
+)
+
+
+def host_of(url: Optional[str]) -> Optional[str]:
+    """Nom d'hôte normalisé d'une URL (ou d'un nom de domaine nu)."""
+    if not url:
+        return None
+    parsed = urlparse(url if "://" in url else f"//{url}")
+    return parsed.hostname.lower() if parsed.hostname else None
+
+
+def is_connection_failure(exc: BaseException) -> bool:
+    """Échec de connexion à l'hôte (DNS, refus, délai), par opposition à une réponse HTTP."""
+    return isinstance(exc, CONNECTION_ERRORS)
+
+
+class ResolverCache:
+    """
+    Cache de socket.getaddrinfo : résultats gardés `ttl` secondes, échecs
+    (gaierror) `negative_ttl` secondes, au plus `max_entries` entrées (LRU).
+    """
+
+    def __init__(self, ttl: float = 300, negative_ttl: float = 60, max_entries: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any, Optional[socket.gaierror]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._resolve = socket.getaddrinfo
+        self.hits = 0
+        self.misses = 0
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if entry[2] is not None:
+                    raise entry[2]
+                return list(entry[1])
+            self.misses += 1
+
+        try:
+            result = self._resolve(host, port, family, type, proto, flags)
+            entry = (now + self.ttl, result, None)
+        except socket.gaierror as exc:
+            entry = (now + self.negative_ttl, None, exc)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        if entry[2] is not None:
+            raise entry[2]
+        return list(entry[1])
+
+    def install(self) -> None:
+        """Remplace socket.getaddrinfo pour tout le processus."""
+        if socket.getaddrinfo != self.getaddrinfo:
+            self._resolve = socket.getaddrinfo
+            socket.getaddrinfo = self.getaddrinfo
+
+    def uninstall(self) -> None:
+        if socket.getaddrinfo == self.getaddrinfo:
+            socket.getaddrinfo = self._resolve
+
+
+class HostCircuitBreaker:
+    """
+    Disjoncteur par hôte.
+
+    closed -> open après `failure_threshold` échecs de connexion consécutifs ;
+    open -> half_open après `reset_timeout` secondes (une requête de test à la fois) ;
+    half_open -> closed si elle réussit, -> open sinon.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host: str) -> Dict[str, Any]:
+        return self._hosts.setdefault(host, {
+            "state": CLOSED, "failures": 0, "opened_at": None, "probing": False, "skipped": 0, "trips": 0
+        })
+
+    def allow(self, host: Optional[str]) -> bool:
+        """True si une requête vers l'hôte peut partir ; sinon elle est comptée comme sautée."""
+        if not host:
+            return True
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None or entry["state"] == CLOSED:
+                return True
+            if entry["state"] == OPEN and self.clock() - entry["opened_at"] >= self.reset_timeout:
+                entry["state"] = HALF_OPEN
+                entry["probing"] = False
+            if entry["state"] == HALF_OPEN and not entry["probing"]:
+                entry["probing"] = True
+                return True
+            entry["skipped"] += 1
+            return False
+
+    def record_success(self, host: Optional[str]) -> None:
+        """L'hôte a répondu (quel que soit le code HTTP)."""
+        if not host:
+            return
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None:
+                return
+            if entry["state"] != CLOSED:
+                logger.info(f"Host circuit closed for {host}")
+            entry.update(state=CLOSED, failures=0, opened_at=None, probing=False)
+
+    def record_failure(self, host: Optional[str]) -> None:
+        """Échec de connexion (DNS, refus, délai)."""
+        if not host:
+            return
+        with self._lock:
+            entry = self._host(host)
+            entry["failures"] += 1
+            if entry["state"] == HALF_OPEN or entry["failures"] >= self.failure_threshold:
+                if entry["state"] != OPEN:
+                    entry["trips"] += 1
+                    logger.warning(f"Host circuit opened for {host} after {entry['failures']} connection failures")
+                entry.update(state=OPEN, opened_at=self.clock(), probing=False)
+
+    def record(self, host: Optional[str], exc: Optional[BaseException] = None) -> None:
+        """
+        Enregistre l'issue d'une requête : échec si exc est une erreur de
+        connexion, succès sinon (l'hôte a répondu, même par une erreur HTTP ou
+        de lecture). Libère dans tous les cas la requête de test half_open.
+        """
+        if exc is not None and is_connection_failure(exc):
+            self.record_failure(host)
+        else:
+            self.record_success(host)
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            entry = self._hosts.get(host)
+            return entry["state"] if entry else CLOSED
+
+    def snapshot(self) -> Dict[str, Any]:
+        """États des disjoncteurs, pour les statistiques de job."""
+        with self._lock:
+            hosts = {host: dict(entry) for host, entry in self._hosts.items()}
+        return {
+            "open": sorted(host for host, entry in hosts.items() if entry["state"] == OPEN),
+            "half_open": sorted(host for host, entry in hosts.items() if entry["state"] == HALF_OPEN),
+            "skipped": sum(entry["skipped"] for entry in hosts.values()),
+            "skipped_by_host": {host: entry["skipped"] for host, entry in hosts.items() if entry["skipped"]},
+            "trips": sum(entry["trips"] for entry in hosts.values()),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+
+_breaker: Optional[HostCircuitBreaker] = None
+_resolver: Optional[ResolverCache] = None
+_init_lock = threading.Lock()
+
+
+def get_host_breaker() -> HostCircuitBreaker:
+    """Disjoncteur partagé du processus (installe aussi le cache DNS)."""
+    global _breaker
+    if _breaker is None:
+        with _init_lock:
+            if _breaker is None:
+                _breaker = HostCircuitBreaker(
+                    failure_threshold=settings.HOST_BREAKER_FAILURE_THRESHOLD,
+                    reset_timeout=settings.HOST_BREAKER_RESET_TIMEOUT,
+                )
+    install_resolver_cache()
+    return _breaker
+
+
+def install_resolver_cache() -> Optional[ResolverCache]:
+    """Installe le cache DNS partagé (une fois par processus, si DNS_CACHE_ENABLED)."""
+    global _resolver
+    if not settings.DNS_CACHE_ENABLED:
+        return None
+    if _resolver is None:
+        with _init_lock:
+            if _resolver is None:
+                _resolver = ResolverCache(
+                    ttl=settings.DNS_CACHE_TTL,
+                    negative_ttl=settings.DNS_CACHE_NEGATIVE_TTL,
+                )
+                _resolver.install()
+    return _resolver
@@ -0,0 +1,219 @@
+"""
+Progression des jobs en temps réel via Redis pub/sub
+
+Les workers Celery publient la progression d'un job sur le canal Redis
+« <JOB_PROGRESS_CHANNEL_PREFIX><job_id> » (le Redis déjà utilisé par
+Celery) ; chaque réplique de l'API s'abonne aux canaux des jobs suivis par
+ses propres WebSocket et relaie les messages. Aucun polling de Postgres.
+
+- ProgressPublisher (worker, synchrone) : au plus un message toutes les
+  JOB_PROGRESS_MIN_INTERVAL secondes par job ; les mises à jour plus
+  rapprochées sont fusionnées (la dernière est envoyée au message suivant
+  ou au flush final). Le dernier état est aussi gardé dans une clé Redis
+  pour qu'un client qui se connecte en cours de job le reçoive aussitôt.
+- ProgressFanout (API, asyncio) : une connexion pub/sub par processus,
+  abonnée aux seuls jobs ayant un WebSocket local.
+
+Redis indisponible : la progression est perdue, jamais le job.
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.config import settings
+from app.utils.logging import get_logger
+
+try:
+    import redis
+    import redis.asyncio as redis_async
+except ImportError:  # pragma: no cover - redis est une dépendance de Celery ici
+    redis = None
+    redis_async = None
+
+logger = get_logger(__name__)
+
+LAST_STATE_TTL = 24 * 3600  # Secondes de conservation du dernier état d'un job
+FINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+
+def progress_channel(job_id: Any) -> str:
+    return f"{settings.JOB_PROGRESS_CHANNEL_PREFIX}{job_id}"
+
+
+def last_state_key(job_id: Any) -> str:
+    return f"{progress_channel(job_id)}:last"
+
+
+class ProgressPublisher:
+    """Publication throttlée de la progression d'un job (côté worker)."""
+
+    def __init__(self, job_id: int, client: Any = None, min_interval: Optional[float] = None):
+        self.job_id = job_id
+        self.channel = progress_channel(job_id)
+        self.min_interval = settings.JOB_PROGRESS_MIN_INTERVAL if min_interval is None else min_interval
+        self._client = client
+        self._disabled = client is None and (redis is None or not settings.JOB_PROGRESS_ENABLED)
+        self._last_sent = 0.0
+        self._pending: Optional[Dict[str, Any]] = None
+        self.sent = 0
+        self.coalesced = 0
+
+    def publish(
+        self,
+        processed: int,
+        total: int,
+        message: str = "",
+        status: str = "running",
+        force: bool = False,
+        **details: Any
+    ) -> bool:
+        """
+        Enregistre une mise à jour ; l'envoie si l'intervalle minimal est écoulé.
+
+        Les statuts finaux (completed, failed, cancelled) et force=True sont
+        envoyés immédiatement. Renvoie True si un message est parti.
+        """
+        self._pending = {
+            "type": "progress",
+            "job_id": self.job_id,
+            "processed": processed,
+            "total": total,
+            "progress": round(processed / total, 4) if total else (1.0 if status == "completed" else 0.0),
+            "status": status,
+            "message": message,
+            "details": details,
+        }
+        if force or status in FINAL_STATUSES or time.monotonic() - self._last_sent >= self.min_interval:
+            return self.flush()
+        self.coalesced += 1
+        return False
+
+    def flush(self) -> bool:
+        """Envoie la dernière mise à jour en attente, s'il y en a une."""
+        if self._pending is None or self._disabled:
+            return False
+        payload, self._pending = self._pending, None
+        payload["timestamp"] = datetime.now(timezone.utc).isoformat()
+        data = json.dumps(payload, default=str)
+        try:
+            client = self._get_client()
+            pipe = client.pipeline(transaction=False)
+            pipe.set(last_state_key(self.job_id), data, ex=LAST_STATE_TTL)
+            pipe.publish(self.channel, data)
+            pipe.execute()
+        except Exception as exc:  # noqa: BLE001 - la progression ne doit jamais interrompre le job
+            logger.warning(f"Job {self.job_id}: progress publishing disabled ({exc})")
+            self._disabled = True
+            return False
+        self._last_sent = time.monotonic()
+        self.sent += 1
+        return True
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+        return self._client
+
+    def close(self) -> None:
+        self.flush()
+        if self._client is not None and hasattr(self._client, "close"):
+            self._client.close()
+
+
+Dispatch = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class ProgressFanout:
+    """
+    Relais Redis -> WebSocket d'une réplique de l'API.
+
+    subscribe/unsubscribe suivent le nombre de WebSocket locaux par job ;
+    une tâche asyncio lit la connexion pub/sub et appelle dispatch(job_id, message).
+    """
+
+    def __init__(self, dispatch: Dispatch, client: Any = None):
+        self.dispatch = dispatch
+        self._client = client
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._subscribers: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None or (redis_async is not None and settings.JOB_PROGRESS_ENABLED)
+
+    async def subscribe(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Abonne la réplique au job ; renvoie son dernier état connu."""
+        if not self.enabled:
+            return None
+        try:
+            async with self._lock:
+                client = self._get_client()
+                if self._pubsub is None:
+                    self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+                self._subscribers[job_id] = self._subscribers.get(job_id, 0) + 1
+                if self._subscribers[job_id] == 1:
+                    await self._pubsub.subscribe(progress_channel(job_id))
+                if self._reader is None or self._reader.done():
+                    self._reader = asyncio.create_task(self._read())
+            last = await client.get(last_state_key(job_id))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Progress fan-out unavailable for job {job_id}: {exc}")
+            return None
+        return json.loads(last) if last else None
+
+    async def unsubscribe(self, job_id: str) -> None:
+        async with self._lock:
+            count = self._subscribers.get(job_id, 0) - 1
+            if count > 0:
+                self._subscribers[job_id] = count
+                return
+            self._subscribers.pop(job_id, None)
+            if self._pubsub is not None:
+                try:
+                    await self._pubsub.unsubscribe(progress_channel(job_id))
+                except Exception as exc:  # noqa: BLE001
+                    logger.debug(f"Unsubscribe from job {job_id} failed: {exc}")
+
+    async def _read(self) -> None:
+        prefix = settings.JOB_PROGRESS_CHANNEL_PREFIX
+        while self._subscribers:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(f"Progress fan-out read failed: {exc}")
+                await asyncio.sleep(1.0)
+                continue
+            if not message or message.get("type") != "message":
+                continue
+            channel = message["channel"]
+            channel = channel.decode() if isinstance(channel, bytes) else channel
+            try:
+                payload = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            try:
+                await self.dispatch(channel[len(prefix):], payload)
+            except Exception as exc:  # noqa: BLE001 - un WebSocket fermé ne doit pas arrêter le relais
+                logger.debug(f"Progress dispatch failed on {channel}: {exc}")
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = redis_async.Redis.from_url(settings.REDIS_URL)
+        return self._client
+
+    async def close(self) -> None:
+        self._subscribers.clear()
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
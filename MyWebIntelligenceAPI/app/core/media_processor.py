@@ -4,6 +4,15 @@ Synchronous media processor used by Celery workers.
 This mirrors the behaviour of the async MediaProcessor but relies on the
 synchronous SQLAlchemy session and httpx.Client so it can run safely in a
 prefork Celery worker without the async greenlet bridge.
+
+Memory bound of ``analyze_image``: the body is streamed and aborted as soon as
+it exceeds ``MAX_FILE_SIZE_MB`` (Content-Length is checked before reading), so
+at most MAX_FILE_SIZE_MB of encoded bytes are held. Decoding is reduced to
+``MEDIA_ANALYSIS_MAX_SIDE`` pixels per side: JPEGs are decoded at 1/2 to 1/8
+scale via ``draft()``, other formats are decoded once then thumbnailed and are
+skipped for colour analysis above ``MEDIA_MAX_DECODE_PIXELS`` (4 bytes each).
+Peak per analysis is therefore about MAX_FILE_SIZE_MB + 4 * MEDIA_MAX_DECODE_PIXELS
+bytes (100 MB + 100 MB with the defaults), and far less for typical images.
 """
 
 from __future__ import annotations
@@ -13,22 +22,36 @@ import hashlib
 import io
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse, urlunparse
 import os
 
 import httpx
-import numpy as np
 from PIL import Image
-from sklearn.cluster import KMeans
 from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.core.color_extraction import extract_dominant_colors
+from app.core.host_health import get_host_breaker, host_of
+from app.core.media_store import MediaBlobStore, get_media_blob_store
+from app.core.perceptual_hash import compute_hashes
 from app.db import models
+from app.services.media_dedup import (
+    PERCEPTUAL_REUSE_FIELDS,
+    MediaHashIndex,
+    copy_analysis,
+    find_analysed_by_url,
+    find_stored_hashes,
+    get_media_hash_index,
+)
 
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE = 64 * 1024
+# Content types that are never images: rejected before the body is downloaded
+NON_IMAGE_CONTENT_TYPES = ('video/', 'audio/', 'text/')
+
 try:
     from playwright.async_api import async_playwright
 
@@ -38,30 +61,96 @@ except ImportError:
     logger.warning("Playwright not available. Dynamic media extraction will be skipped.")
 
 
-def _generate_web_safe_palette() -> List[tuple[int, int, int]]:
-    """Generate the 216 RGB values of the classic web safe palette."""
-    levels = [0, 51, 102, 153, 204, 255]
-    return [(r, g, b) for r in levels for g in levels for b in levels]
-
-
-def _rgb_distance(color_a: tuple[int, int, int], color_b: tuple[int, int, int]) -> int:
-    """Squared euclidean distance between two RGB triples."""
-    return sum((a - b) ** 2 for a, b in zip(color_a, color_b))
-
-
-def _convert_to_web_safe(rgb: tuple[int, int, int]) -> tuple[int, int, int]:
-    """Return the closest colour in the web safe palette."""
-    palette = _generate_web_safe_palette()
-    return min(palette, key=lambda candidate: _rgb_distance(rgb, candidate))
+def new_analysis_result(url: str) -> Dict[str, Any]:
+    """Empty analysis result, as returned by MediaProcessorSync.analyze_image."""
+    return {
+        'url': url,
+        'error': None,
+        'width': None,
+        'height': None,
+        'format': None,
+        'file_size': None,
+        'color_mode': None,
+        'has_transparency': False,
+        'aspect_ratio': None,
+        'exif_data': None,
+        'image_hash': None,
+        'ahash': None,
+        'dhash': None,
+        'phash': None,
+        'dominant_colors': [],
+        'websafe_colors': {},
+        'mime_type': None,
+        'file_path': None,
+    }
+
+
+def load_stored(store: Optional[MediaBlobStore], digest: Optional[str], result: Dict[str, Any]) -> Optional[bytes]:
+    """Bytes of an already stored blob, with file_size/image_hash/file_path filled in result."""
+    content = store.get(digest) if store is not None else None
+    if content is not None:
+        result['file_size'] = len(content)
+        result['image_hash'] = digest
+        result['file_path'] = store.relative_path(digest)
+    return content
+
+
+def keep_stored(store: Optional[MediaBlobStore], content: bytes, result: Dict[str, Any]) -> None:
+    """Persist downloaded bytes in the blob store (no-op when the store is disabled)."""
+    if store is None:
+        return
+    try:
+        result['file_path'] = store.relative_path(store.put(bytes(content), result.get('image_hash')))
+    except OSError as exc:
+        logger.warning("Could not store media %s: %s", result.get('url'), exc)
+
+
+class StreamedBody:
+    """
+    Byte-budgeted accumulator for a streamed media body (sync or async client).
+
+    The response headers are checked first: a non-image content type or a
+    Content-Length over budget raises ValueError before any byte is read.
+    """
+
+    def __init__(self, max_size: int, headers: Any, result: Dict[str, Any]):
+        self.max_size = max_size
+        content_type = headers.get('Content-Type')
+        result['mime_type'] = content_type
+        if content_type and content_type.lower().startswith(NON_IMAGE_CONTENT_TYPES):
+            raise ValueError(f"Not an image ({content_type})")
+
+        declared = headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > max_size:
+            raise ValueError(f"File size exceeds limit ({declared} bytes)")
+
+        self.digest = hashlib.sha256()
+        self.buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> None:
+        self.buffer += chunk
+        if len(self.buffer) > self.max_size:
+            raise ValueError(f"File size exceeds limit (more than {self.max_size} bytes)")
+        self.digest.update(chunk)
+
+    def finish(self, result: Dict[str, Any]) -> bytearray:
+        result['file_size'] = len(self.buffer)
+        result['image_hash'] = self.digest.hexdigest()
+        return self.buffer
 
 
 class MediaProcessorSync:
     """Synchronous replacement for the async media processor."""
 
-    def __init__(self, db: Session, http_client: httpx.Client):
+    def __init__(self, db: Session, http_client: httpx.Client, dedup_index: Optional[MediaHashIndex] = None):
         self.db = db
         self.http_client = http_client
         self.max_size = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+        self.host_breaker = get_host_breaker()
+        if dedup_index is None and settings.MEDIA_DEDUP_ENABLED:
+            dedup_index = get_media_hash_index()
+        self.dedup_index = dedup_index
+        self.blob_store = get_media_blob_store()
 
     # ------------------------------------------------------------------ #
     # Public helpers                                                     #
@@ -92,46 +181,125 @@ class MediaProcessorSync:
 
     def analyze_image(self, url: str) -> Dict[str, Any]:
         """Synchronously download and analyse an image."""
-        result: Dict[str, Any] = {
-            'url': url,
-            'error': None,
-            'width': None,
-            'height': None,
-            'format': None,
-            'file_size': None,
-            'color_mode': None,
-            'has_transparency': False,
-            'aspect_ratio': None,
-            'exif_data': None,
-            'image_hash': None,
-            'dominant_colors': [],
-            'websafe_colors': {},
-            'mime_type': None,
-        }
+        result = new_analysis_result(url)
 
-        try:
-            response = self.http_client.get(url, timeout=30.0)
-            response.raise_for_status()
+        if self.dedup_index is not None:
+            existing = find_analysed_by_url(self.db, url)
+            if existing is not None:
+                return copy_analysis(existing, result)
 
-            result['mime_type'] = response.headers.get('Content-Type')
-            content = response.content
+        content = self._read_stored(url, result)
+        if content is None:
+            host = host_of(url)
+            if not self.host_breaker.allow(host):
+                result['error'] = f"skipped: host circuit open for {host}"
+                return result
 
-            if len(content) > self.max_size:
-                raise ValueError(f"File size exceeds limit ({len(content)} bytes)")
+            try:
+                try:
+                    content = self._download(url, result)
+                except httpx.RequestError as exc:
+                    self.host_breaker.record(host, exc)
+                    raise
+            except Exception as exc:  # noqa: BLE001 - keep unexpected errors surfaced
+                result['error'] = str(exc)
+                return result
+            keep_stored(self.blob_store, content, result)
+
+        return self.analyze_content(content, result)
+
+    def _read_stored(self, url: str, result: Dict[str, Any]) -> Optional[bytes]:
+        """Bytes of this URL from the local blob store, if a previous download kept them."""
+        if self.blob_store is None:
+            return None
+        digest = find_stored_hashes(self.db, [url]).get(url)
+        return load_stored(self.blob_store, digest, result)
 
-            result['file_size'] = len(content)
-            result['image_hash'] = hashlib.sha256(content).hexdigest()
+    def analyze_content(self, content: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode downloaded image bytes and fill the analysis fields of result."""
+        return self.analyze_contents([(content, result)])[0]
 
+    def analyze_contents(self, items: List[Tuple[bytes, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Analyse several downloaded images.
+
+        Each image is decoded and hashed on its own; the dominant colours of
+        all the images that need them are then extracted in one vectorised
+        batch.
+        """
+        pending: List[Tuple[Image.Image, Dict[str, Any]]] = []
+        for content, result in items:
+            reduced = self._decode_and_hash(content, result)
+            if reduced is not None:
+                pending.append((reduced, result))
+        if pending:
+            self._extract_colors(pending)
+        return [result for _, result in items]
+
+    def _decode_and_hash(self, content: bytes, result: Dict[str, Any]) -> Optional[Image.Image]:
+        """Fill properties, hashes and EXIF; return the reduced image if its colours are still needed."""
+        try:
             with Image.open(io.BytesIO(content)) as img:
                 self._analyse_image_properties(img, result)
+                reduced = None
                 if settings.ANALYZE_MEDIA:
-                    self._extract_colors(img, result)
+                    reduced = self._decode_reduced(img)
+                    if reduced is not None:
+                        result.update(compute_hashes(reduced))
+                        if self._reuse_near_duplicate(result):
+                            reduced = None
                     self._extract_exif(img, result)
+                return reduced
 
         except Exception as exc:  # noqa: BLE001 - keep unexpected errors surfaced
             result['error'] = str(exc)
+            return None
+
+    def _download(self, url: str, result: Dict[str, Any]) -> bytearray:
+        """
+        Stream the media body, hashing it on the fly.
+
+        Raises ValueError as soon as the declared Content-Length, the content
+        type or the bytes received show the media cannot be an acceptable image.
+        """
+        with self.http_client.stream("GET", url, timeout=30.0) as response:
+            self.host_breaker.record_success(host_of(url))
+            response.raise_for_status()
+            body = StreamedBody(self.max_size, response.headers, result)
+            for chunk in response.iter_bytes(STREAM_CHUNK_SIZE):
+                body.feed(chunk)
+        return body.finish(result)
+
+    def _reuse_near_duplicate(self, result: Dict[str, Any]) -> bool:
+        """Copy the colour analysis of an already analysed near-identical image, if any."""
+        if self.dedup_index is None:
+            return False
+        self.dedup_index.refresh(self.db)
+        twin_id = self.dedup_index.find(result['phash'], result['dhash'])
+        twin = self.db.get(models.Media, twin_id) if twin_id is not None else None
+        if twin is None or not twin.dominant_colors:
+            return False
+        copy_analysis(twin, result, PERCEPTUAL_REUSE_FIELDS)
+        return True
 
-        return result
+    @staticmethod
+    def _decode_reduced(img: Image.Image) -> Optional[Image.Image]:
+        """
+        Decode the image at reduced size for colour analysis.
+
+        JPEGs are decoded directly at a smaller DCT scale; other formats are
+        decoded in full (unless above MEDIA_MAX_DECODE_PIXELS) then thumbnailed.
+        """
+        max_side = settings.MEDIA_ANALYSIS_MAX_SIDE
+        if img.format == 'JPEG':
+            img.draft('RGB', (max_side, max_side))
+        elif img.width * img.height > settings.MEDIA_MAX_DECODE_PIXELS:
+            logger.debug("Skipping colour analysis of %sx%s image", img.width, img.height)
+            return None
+
+        reduced = img.convert('RGB')
+        reduced.thumbnail((max_side, max_side))
+        return reduced
 
     def media_exists(self, expression_id: int, url: str) -> bool:
         """Return True if a media entry already exists for expression/url pair."""
@@ -154,6 +322,8 @@ class MediaProcessorSync:
         self.db.add(media_obj)
         self.db.commit()
         self.db.refresh(media_obj)
+        if self.dedup_index is not None:
+            self.dedup_index.add(media_obj.id, media_obj.phash, media_obj.dhash)
         return media_obj
 
     def extract_dynamic_medias(self, url: str, expression: models.Expression) -> None:
@@ -355,36 +525,18 @@ class MediaProcessorSync:
             }
         )
 
-    def _extract_colors(self, img: Image.Image, result: Dict[str, Any]) -> None:
-        """Run KMeans to determine dominant colours."""
-        n_colors = settings.N_DOMINANT_COLORS
+    @staticmethod
+    def _extract_colors(pending: List[Tuple[Image.Image, Dict[str, Any]]]) -> None:
+        """Determine dominant colours of reduced RGB images, in one batch."""
         try:
-            resized = img.resize((100, 100)).convert('RGB')
-            pixels = np.array(resized).reshape(-1, 3)
-
-            kmeans = KMeans(n_clusters=n_colors, n_init='auto', random_state=42)
-            kmeans.fit(pixels)
-
-            counts = np.bincount(kmeans.labels_)
-            total = sum(counts)
-
-            sorted_colors = sorted(zip(kmeans.cluster_centers_, counts), key=lambda pair: pair[1], reverse=True)
-            dominant = [
-                {'rgb': tuple(map(int, colour)), 'percentage': round(count / total * 100, 2)}
-                for colour, count in sorted_colors
-            ]
-            result['dominant_colors'] = dominant
-
-            websafe: Dict[str, float] = {}
-            for item in dominant:
-                websafe_colour = _convert_to_web_safe(tuple(item['rgb']))
-                websafe_hex = '#%02x%02x%02x' % websafe_colour
-                websafe.setdefault(websafe_hex, 0.0)
-                websafe[websafe_hex] += item['percentage']
-            result['websafe_colors'] = websafe
+            colours = extract_dominant_colors([img for img, _ in pending], settings.N_DOMINANT_COLORS)
         except Exception as exc:
-            if not result.get('error'):
-                result['error'] = f"Color analysis error: {exc}"
+            for _, result in pending:
+                if not result.get('error'):
+                    result['error'] = f"Color analysis error: {exc}"
+            return
+        for (_, result), analysis in zip(pending, colours):
+            result.update(analysis)
 
     @staticmethod
     def _extract_exif(img: Image.Image, result: Dict[str, Any]) -> None:
@@ -0,0 +1,251 @@
+"""
+Stockage local des médias, adressé par contenu
+
+Les octets d'une image sont rangés sous MEDIA_STORAGE_PATH d'après leur
+SHA-256 (la valeur de Media.image_hash), dans des répertoires à deux niveaux :
+
+    blobs/ab/cd/abcd…      octets d'origine
+    thumbs/ab/cd/abcd….webp miniature WebP, générée à la première demande
+
+Une même image vue dans plusieurs lands n'est donc écrite qu'une fois.
+Media.file_path reçoit le chemin relatif du blob.
+
+Éviction : la date de modification sert de date de dernier usage (elle est
+rafraîchie à la lecture) ; au-delà de MEDIA_BLOB_STORE_MAX_BYTES, les blobs
+les moins récemment utilisés sont supprimés avec leur miniature. Le contrôle
+est fait après chaque tranche d'écritures de 10 % du budget.
+
+Aucun stockage objet externe : un volume local (ou partagé) suffit, les
+écritures passent par un fichier temporaire renommé (atomique).
+"""
+
+import hashlib
+import io
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from app.config import settings
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+BLOB_DIR = "blobs"
+THUMBNAIL_DIR = "thumbs"
+THUMBNAIL_SUFFIX = ".webp"
+TOUCH_INTERVAL = 60  # Secondes : un blob lu plus souvent n'est pas re-daté à chaque lecture
+EVICTION_CHECK_RATIO = 0.1  # Part du budget écrite entre deux contrôles de taille
+
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+
+class MediaBlobStore:
+    """Blobs d'images et miniatures WebP sur le système de fichiers."""
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        thumbnail_size: Optional[int] = None,
+        thumbnail_quality: Optional[int] = None
+    ):
+        self.root = Path(root or settings.MEDIA_STORAGE_PATH)
+        self.max_bytes = settings.MEDIA_BLOB_STORE_MAX_BYTES if max_bytes is None else max_bytes
+        self.thumbnail_size = thumbnail_size or settings.MEDIA_THUMBNAIL_SIZE
+        self.thumbnail_quality = thumbnail_quality or settings.MEDIA_THUMBNAIL_QUALITY
+        self._written_since_check = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Chemins                                                            #
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def digest(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def _shard(digest: str) -> str:
+        if not _DIGEST.match(digest or ""):
+            raise ValueError(f"Invalid media digest: {digest!r}")
+        return f"{digest[:2]}/{digest[2:4]}/{digest}"
+
+    def relative_path(self, digest: str) -> str:
+        """Chemin du blob relatif à la racine (valeur de Media.file_path)."""
+        return f"{BLOB_DIR}/{self._shard(digest)}"
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / self.relative_path(digest)
+
+    def thumbnail_path(self, digest: str) -> Path:
+        return self.root / THUMBNAIL_DIR / f"{self._shard(digest)}{THUMBNAIL_SUFFIX}"
+
+    # ------------------------------------------------------------------ #
+    # Lecture / écriture                                                 #
+    # ------------------------------------------------------------------ #
+    def has(self, digest: str) -> bool:
+        return self.blob_path(digest).is_file()
+
+    def put(self, content: bytes, digest: Optional[str] = None) -> str:
+        """Range les octets (une seule copie par contenu) et renvoie leur SHA-256."""
+        digest = digest or self.digest(content)
+        path = self.blob_path(digest)
+        if path.is_file():
+            self._touch(path)
+            return digest
+
+        self._write_atomic(path, content)
+        with self._lock:
+            self._written_since_check += len(content)
+            check = self.max_bytes and self._written_since_check >= self.max_bytes * EVICTION_CHECK_RATIO
+            if check:
+                self._written_since_check = 0
+        if check:
+            self.evict()
+        return digest
+
+    def get(self, digest: Optional[str]) -> Optional[bytes]:
+        """Octets du blob, ou None s'il n'est pas (ou plus) stocké."""
+        if not digest:
+            return None
+        path = self.blob_path(digest)
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+        return content
+
+    def thumbnail(self, digest: str) -> Optional[Path]:
+        """Miniature WebP du blob, générée si besoin ; None si le blob manque ou n'est pas une image."""
+        path = self.thumbnail_path(digest)
+        if path.is_file():
+            self._touch(path)
+            return path
+
+        content = self.get(digest)
+        if content is None:
+            return None
+        try:
+            with Image.open(io.BytesIO(content)) as img:
+                size = (self.thumbnail_size, self.thumbnail_size)
+                if img.format == 'JPEG':
+                    img.draft('RGB', size)
+                thumb = img.convert('RGBA' if img.mode in ('RGBA', 'LA', 'P') else 'RGB')
+                thumb.thumbnail(size)
+                buffer = io.BytesIO()
+                thumb.save(buffer, 'WEBP', quality=self.thumbnail_quality)
+        except Exception as exc:  # noqa: BLE001 - format non décodable ou WebP indisponible
+            logger.debug(f"Thumbnail generation failed for {digest}: {exc}")
+            return None
+
+        self._write_atomic(path, buffer.getvalue())
+        return path
+
+    # ------------------------------------------------------------------ #
+    # Éviction                                                           #
+    # ------------------------------------------------------------------ #
+    def usage(self) -> Dict[str, int]:
+        entries = self._entries()
+        return {
+            "blobs": len(entries),
+            "thumbnails": sum(1 for _, _, _, thumb in entries if thumb is not None),
+            "bytes": sum(size for _, size, _, _ in entries),
+        }
+
+    def evict(self, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Supprime les blobs les moins récemment utilisés jusqu'à tenir dans le budget.
+
+        Returns:
+            {'evicted': nombre de blobs supprimés, 'freed_bytes', 'bytes': taille restante}
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        entries = self._entries()
+        total = sum(size for _, size, _, _ in entries)
+        evicted = freed = 0
+        if budget:
+            for blob, size, _, thumb in sorted(entries, key=lambda entry: entry[2]):
+                if total <= budget:
+                    break
+                for path in (blob, thumb):
+                    if path is not None:
+                        path.unlink(missing_ok=True)
+                total -= size
+                freed += size
+                evicted += 1
+        if evicted:
+            logger.info(f"Media store eviction: {evicted} blobs removed, {freed} bytes freed")
+        return {"evicted": evicted, "freed_bytes": freed, "bytes": total}
+
+    def _entries(self) -> List[Tuple[Path, int, float, Optional[Path]]]:
+        """(blob, taille blob + miniature, dernier usage, miniature) de chaque blob stocké."""
+        entries = []
+        blobs = self.root / BLOB_DIR
+        if not blobs.is_dir():
+            return entries
+        for first in os.scandir(blobs):
+            if not first.is_dir():
+                continue
+            for second in os.scandir(first.path):
+                if not second.is_dir():
+                    continue
+                for item in os.scandir(second.path):
+                    if not item.is_file() or not _DIGEST.match(item.name):
+                        continue
+                    stat = item.stat()
+                    size, last_used = stat.st_size, stat.st_mtime
+                    thumb = self.thumbnail_path(item.name)
+                    try:
+                        thumb_stat = thumb.stat()
+                    except FileNotFoundError:
+                        thumb = None
+                    else:
+                        size += thumb_stat.st_size
+                        last_used = max(last_used, thumb_stat.st_mtime)
+                    entries.append((Path(item.path), size, last_used, thumb))
+        return entries
+
+    # ------------------------------------------------------------------ #
+    # Fichiers                                                           #
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _write_atomic(path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                stream.write(content)
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        try:
+            if time.time() - path.stat().st_mtime > TOUCH_INTERVAL:
+                os.utime(path)
+        except FileNotFoundError:
+            pass
+
+
+_store: Optional[MediaBlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_media_blob_store() -> Optional[MediaBlobStore]:
+    """Stockage partagé du processus, ou None si MEDIA_BLOB_STORE_ENABLED est faux."""
+    global _store
+    if not settings.MEDIA_BLOB_STORE_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = MediaBlobStore()
+    return _store
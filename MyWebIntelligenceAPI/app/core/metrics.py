@@ -0,0 +1,187 @@
+"""
+Instrumentation des pipelines : durées par étape et métriques Prometheus
+
+    with stage("crawl", "fetch"):
+        response = client.get(url)
+
+Chaque étape alimente :
+- l'histogramme Prometheus mwi_stage_duration_seconds{pipeline, stage}
+  (et mwi_stage_failures_total si l'étape lève une exception) ;
+- les résumés actifs (collect_job_metrics, imbriquables), enregistrés par
+  les tâches Celery dans CrawlJob.result_data["stage_timings"].
+
+Exposition, sans service externe :
+- API : GET /metrics (app.main) ;
+- workers Celery : serveur HTTP local sur METRICS_PORT, démarré par le
+  processus principal du worker. Avec le pool prefork, définir
+  PROMETHEUS_MULTIPROC_DIR (répertoire partagé par les processus enfants)
+  pour que la page agrège tous les enfants.
+
+prometheus_client absent ou ENABLE_METRICS faux : seuls les résumés par job
+sont calculés.
+"""
+
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.config import settings
+from app.utils.logging import get_logger
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Histogram,
+        generate_latest,
+        multiprocess,
+        start_http_server,
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:  # pragma: no cover - dépendance listée dans requirements.txt
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = get_logger(__name__)
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+if PROMETHEUS_AVAILABLE:
+    STAGE_SECONDS = Histogram(
+        "mwi_stage_duration_seconds",
+        "Duration of a pipeline stage",
+        ["pipeline", "stage"],
+        buckets=STAGE_BUCKETS,
+    )
+    STAGE_FAILURES = Counter(
+        "mwi_stage_failures_total",
+        "Pipeline stages that raised an exception",
+        ["pipeline", "stage"],
+    )
+
+
+class JobMetrics:
+    """Durées cumulées par étape pendant un job."""
+
+    def __init__(self):
+        self.stages: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def record(self, pipeline: str, name: str, seconds: float, failed: bool = False) -> None:
+        entry = self.stages.get((pipeline, name))
+        if entry is None:
+            entry = self.stages[(pipeline, name)] = {"count": 0, "total": 0.0, "max": 0.0, "failures": 0}
+        entry["count"] += 1
+        entry["total"] += seconds
+        entry["max"] = max(entry["max"], seconds)
+        entry["failures"] += int(failed)
+
+    def summary(self) -> Dict[str, Any]:
+        """Résumé JSON : étapes triées par durée totale décroissante."""
+        wall = (self.finished or time.perf_counter()) - self.started
+        stages = {}
+        for (pipeline, name), entry in sorted(self.stages.items(), key=lambda item: -item[1]["total"]):
+            stages[f"{pipeline}.{name}"] = {
+                "count": int(entry["count"]),
+                "total_seconds": round(entry["total"], 3),
+                "avg_ms": round(1000 * entry["total"] / entry["count"], 2),
+                "max_ms": round(1000 * entry["max"], 2),
+                "share": round(entry["total"] / wall, 4) if wall > 0 else 0.0,
+                "failures": int(entry["failures"]),
+            }
+        return {"wall_seconds": round(wall, 3), "stages": stages}
+
+
+_job_metrics: ContextVar[Tuple[JobMetrics, ...]] = ContextVar("job_metrics", default=())
+
+
+@contextmanager
+def collect_job_metrics() -> Iterator[JobMetrics]:
+    """
+    Active un résumé par étape pour le code exécuté dans le bloc (job Celery).
+
+    Les résumés englobants continuent de recevoir les étapes (ex. un benchmark
+    qui enchaîne plusieurs jobs).
+    """
+    metrics = JobMetrics()
+    token = _job_metrics.set(_job_metrics.get() + (metrics,))
+    try:
+        yield metrics
+    finally:
+        metrics.finished = time.perf_counter()
+        _job_metrics.reset(token)
+
+
+def record_stage(pipeline: str, name: str, seconds: float, failed: bool = False) -> None:
+    """Enregistre une durée mesurée ailleurs (ex. dans un processus enfant)."""
+    if PROMETHEUS_AVAILABLE and settings.ENABLE_METRICS:
+        STAGE_SECONDS.labels(pipeline, name).observe(seconds)
+        if failed:
+            STAGE_FAILURES.labels(pipeline, name).inc()
+    for job in _job_metrics.get():
+        job.record(pipeline, name, seconds, failed)
+
+
+@contextmanager
+def stage(pipeline: str, name: str) -> Iterator[None]:
+    """Chronomètre une étape ; l'exception éventuelle est comptée puis propagée."""
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        record_stage(pipeline, name, time.perf_counter() - start, failed)
+
+
+# ---------------------------------------------------------------------- #
+# Exposition                                                             #
+# ---------------------------------------------------------------------- #
+def metrics_registry():
+    """Registre à exposer : agrégat des processus si PROMETHEUS_MULTIPROC_DIR est défini."""
+    if os.environ.get(MULTIPROC_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """(page de scrape, content-type)."""
+    if not PROMETHEUS_AVAILABLE:
+        return b"", CONTENT_TYPE_LATEST
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: Optional[int] = None) -> bool:
+    """Serveur HTTP de scrape local (processus principal d'un worker Celery)."""
+    if not (PROMETHEUS_AVAILABLE and settings.ENABLE_METRICS):
+        return False
+    multiproc_dir = os.environ.get(MULTIPROC_ENV)
+    if multiproc_dir:
+        # Fichiers des processus d'une exécution précédente
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+    port = port or settings.METRICS_PORT
+    try:
+        start_http_server(port, registry=metrics_registry())
+    except OSError as exc:
+        logger.warning(f"Metrics server not started on port {port}: {exc}")
+        return False
+    logger.info(f"Prometheus metrics served on :{port}/metrics")
+    return True
+
+
+def mark_process_dead(pid: int) -> None:
+    """Libère les séries d'un processus enfant terminé (mode multiprocessus)."""
+    if PROMETHEUS_AVAILABLE and os.environ.get(MULTIPROC_ENV):
+        multiprocess.mark_process_dead(pid)
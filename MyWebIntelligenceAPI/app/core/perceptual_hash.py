@@ -0,0 +1,155 @@
+"""
+Empreintes perceptuelles des images et recherche par distance de Hamming
+
+- average_hash / difference_hash / perceptual_hash : empreintes 64 bits
+  (aHash, dHash, pHash DCT) stables au redimensionnement et à la recompression,
+  contrairement au SHA-256 des octets (Media.image_hash) ; la déduplication
+  compare pHash et dHash, l'aHash (moins stable sur les aplats) est seulement stocké
+- MultiIndexHashTable : index multi-bandes ; deux empreintes à distance <= d
+  ont au moins une bande identique sur d + 1 (principe des tiroirs), les
+  candidats sont donc trouvés par lookup au lieu d'un parcours complet
+- cluster_hashes : regroupement des images quasi identiques (union-find)
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+HASH_BITS = 64
+HASH_SIZE = 8
+PHASH_SIZE = 32
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Matrice de la DCT-II orthonormée (size x size)."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.sqrt(2 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+def _grey(img: Image.Image, size: Tuple[int, int]) -> np.ndarray:
+    return np.asarray(img.convert('L').resize(size, Image.Resampling.LANCZOS), dtype=np.float64)
+
+
+def _to_int(bits: np.ndarray) -> int:
+    value = 0
+    for bit in bits.ravel():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def average_hash(img: Image.Image) -> int:
+    """aHash : pixels 8x8 au-dessus de la moyenne."""
+    pixels = _grey(img, (HASH_SIZE, HASH_SIZE))
+    return _to_int(pixels > pixels.mean())
+
+
+def difference_hash(img: Image.Image) -> int:
+    """dHash : gradient horizontal sur 9x8 pixels."""
+    pixels = _grey(img, (HASH_SIZE + 1, HASH_SIZE))
+    return _to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def perceptual_hash(img: Image.Image) -> int:
+    """pHash : basses fréquences (8x8) de la DCT de l'image 32x32, comparées à leur médiane."""
+    pixels = _grey(img, (PHASH_SIZE, PHASH_SIZE))
+    low = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    return _to_int(low > np.median(low))
+
+
+def to_hex(value: int) -> str:
+    return f"{value:016x}"
+
+
+def from_hex(value: Optional[str]) -> Optional[int]:
+    return int(value, 16) if value else None
+
+
+def compute_hashes(img: Image.Image) -> Dict[str, str]:
+    """Les trois empreintes, en hexadécimal (colonnes Media.ahash/dhash/phash)."""
+    return {
+        'ahash': to_hex(average_hash(img)),
+        'dhash': to_hex(difference_hash(img)),
+        'phash': to_hex(perceptual_hash(img)),
+    }
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class MultiIndexHashTable:
+    """
+    Index d'empreintes 64 bits pour les requêtes à distance de Hamming <= max_distance.
+
+    L'empreinte est découpée en max_distance + 1 bandes ; chaque bande est une
+    table de hachage. Seules les entrées partageant une bande sont comparées.
+    """
+
+    def __init__(self, max_distance: int = 6):
+        self.max_distance = max_distance
+        n_bands = max_distance + 1
+        widths = [HASH_BITS // n_bands + (1 if band < HASH_BITS % n_bands else 0) for band in range(n_bands)]
+        self._bands: List[Tuple[int, int]] = []
+        shift = 0
+        for width in widths:
+            self._bands.append((shift, (1 << width) - 1))
+            shift += width
+        self._tables: List[Dict[int, List[Tuple[int, Hashable]]]] = [{} for _ in self._bands]
+        self.size = 0
+
+    def add(self, key: Hashable, value: int) -> None:
+        entry = (value, key)
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            table.setdefault(value >> shift & mask, []).append(entry)
+        self.size += 1
+
+    def query(self, value: int, max_distance: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """(clé, distance) des entrées à distance <= max_distance, les plus proches d'abord."""
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        found: Dict[Hashable, int] = {}
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            for other, key in table.get(value >> shift & mask, ()):
+                if key not in found:
+                    distance = hamming(value, other)
+                    if distance <= max_distance:
+                        found[key] = distance
+        return sorted(found.items(), key=lambda item: item[1])
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def cluster_hashes(items: Iterable[Tuple[Hashable, int]], max_distance: int) -> List[List[Hashable]]:
+    """
+    Groupes d'éléments quasi identiques (composantes connexes du graphe
+    « distance <= max_distance »), du plus grand au plus petit ; singletons exclus.
+    """
+    items = list(items)
+    table = MultiIndexHashTable(max_distance)
+    parent: Dict[Hashable, Hashable] = {}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for key, value in items:
+        parent[key] = key
+        for other, _ in table.query(value):
+            root_a, root_b = find(key), find(other)
+            if root_a != root_b:
+                parent[root_b] = root_a
+        table.add(key, value)
+
+    groups: Dict[Hashable, List[Hashable]] = {}
+    for key, _ in items:
+        groups.setdefault(find(key), []).append(key)
+    return sorted((group for group in groups.values() if len(group) > 1), key=len, reverse=True)
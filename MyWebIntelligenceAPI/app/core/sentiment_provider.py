@@ -9,6 +9,7 @@ Supports FR/EN with automatic fallback.
 """
 
 import logging
+from functools import lru_cache
 from typing import Optional, Dict, Any, Literal
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,31 @@ logger = logging.getLogger(__name__)
 SentimentLabel = Literal["positive", "neutral", "negative"]
 
 
+@lru_cache(maxsize=None)
+def get_textblob_analyzer(language: str):
+    """
+    Sentiment analyzer for a language, built once per process.
+
+    Building PatternAnalyzer (and its lexicon) per text dominated the
+    cost of TextBlob sentiment; analyzers are stateless and reusable.
+    """
+    if language == "fr":
+        try:
+            from textblob_fr import PatternAnalyzer
+            return PatternAnalyzer()
+        except ImportError:
+            logger.warning("textblob-fr not available, using English analyzer")
+    from textblob.sentiments import PatternAnalyzer
+    return PatternAnalyzer()
+
+
+def textblob_polarity(text: str, language: str) -> float:
+    """Polarity (-1.0 to +1.0) of a text with the warm analyzer of its language."""
+    sentiment = get_textblob_analyzer(language).analyze(text)
+    # TextBlob-FR returns (polarity, subjectivity), TextBlob a namedtuple
+    return sentiment[0] if isinstance(sentiment, tuple) else sentiment.polarity
+
+
 class SentimentModelProvider:
     """
     Hybrid sentiment analysis provider.
@@ -57,28 +83,8 @@ class SentimentModelProvider:
         Fast, lightweight, rule-based approach.
         """
         try:
-            from textblob import TextBlob
-
-            # Use French-specific TextBlob if needed
-            if language == "fr":
-                try:
-                    from textblob_fr import PatternTagger, PatternAnalyzer
-                    blob = TextBlob(text, pos_tagger=PatternTagger(), analyzer=PatternAnalyzer())
-                except ImportError:
-                    logger.warning("textblob-fr not available, using English analyzer")
-                    blob = TextBlob(text)
-            else:
-                blob = TextBlob(text)
-
-            # Get polarity (-1.0 to +1.0)
-            # TextBlob-FR returns a tuple (polarity, subjectivity) instead of an object
-            sentiment = blob.sentiment
-            if isinstance(sentiment, tuple):
-                # TextBlob-FR returns (polarity, subjectivity)
-                polarity = sentiment[0]
-            else:
-                # Standard TextBlob returns an object with .polarity attribute
-                polarity = sentiment.polarity
+            # Warm per-process analyzer instead of a new TextBlob/PatternAnalyzer per call
+            polarity = textblob_polarity(text, language)
 
             # Determine label with thresholds
             if polarity > 0.1:
@@ -110,48 +116,15 @@ class SentimentModelProvider:
         """
         Analyze sentiment using OpenRouter LLM.
 
-        High quality, but slower and costs money.
+        High quality, but slower and costs money. Single-text entry point of
+        LLMSentimentAnalyzer (falls back to TextBlob when rate limited);
+        crawls batch their texts through the analyzer directly.
         """
         try:
-            from app.services.llm_validation_service import LLMValidationService
-            from app.config import settings
-            import json
-
-            # Prepare prompt
-            prompt = f"""Analyze the sentiment of the following text in {language.upper()}.
-
-Text: {text[:1000]}
-
-Respond with ONLY a valid JSON object (no markdown, no extra text):
-{{"sentiment": "positive" or "neutral" or "negative", "score": -1.0 to 1.0, "confidence": 0.0 to 1.0}}
-
-Example response:
-{{"sentiment": "positive", "score": 0.75, "confidence": 0.9}}"""
-
-            # Call LLM service
-            llm_service = LLMValidationService()
-            response_text = await llm_service._call_openrouter(
-                prompt=prompt,
-                temperature=0.0  # Deterministic for sentiment
-            )
+            from app.services.llm_sentiment import LLMSentimentAnalyzer
 
-            # Parse JSON response
-            # Remove markdown code blocks if present
-            response_clean = response_text.strip()
-            if response_clean.startswith("```"):
-                # Extract JSON from markdown
-                lines = response_clean.split("\n")
-                response_clean = "\n".join(lines[1:-1])
-
-            result = json.loads(response_clean)
-
-            return {
-                "score": round(float(result["score"]), 3),
-                "label": result["sentiment"],
-                "confidence": round(float(result["confidence"]), 3),
-                "status": "computed",
-                "model": f"llm/{settings.OPENROUTER_MODEL}"
-            }
+            results = await LLMSentimentAnalyzer().analyze_many_async([(0, text, language)])
+            return results[0]
 
         except Exception as e:
             logger.error(f"OpenRouter analysis failed: {e}", exc_info=True)
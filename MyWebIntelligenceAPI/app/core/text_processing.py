@@ -2,13 +2,12 @@ import logging
 import os
 import re
 import shutil
+import threading
 import zipfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, FrozenSet, List
 
-import nltk
-from nltk.stem import SnowballStemmer, WordNetLemmatizer
-from nltk.tokenize import word_tokenize
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -16,11 +15,23 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# NLTK (et scipy qu'il importe) coûte plusieurs secondes à l'import : il n'est
+# chargé qu'au premier besoin, ou explicitement par warmup_nlp_resources().
+_NLTK_LOCK = threading.Lock()
+_NLTK_STATE: Dict[str, bool] = {}
+
+NLTK_CORPORA = {
+    "wordnet": "corpora/wordnet",
+    "stopwords": "corpora/stopwords",
+}
+
 
 def _cleanup_nltk_resource(resource: str) -> bool:
     """
     Remove corrupted NLTK resource artifacts so they can be re-downloaded.
     """
+    import nltk
+
     removed = False
     candidates: List[Path] = []
     for base in list(nltk.data.path):
@@ -47,10 +58,12 @@ def _cleanup_nltk_resource(resource: str) -> bool:
     return removed
 
 
-def _ensure_nltk_tokenizers() -> bool:
+def _configure_nltk_data_path() -> None:
     """
-    Ensure required NLTK tokenizers are available with resilient SSL and local cache.
+    Register the local NLTK data directory and resilient SSL for downloads.
     """
+    import nltk
+
     try:
         data_root = getattr(settings, "DATA_LOCATION", None) or os.environ.get("MWI_DATA_LOCATION")
         if not data_root:
@@ -63,6 +76,9 @@ def _ensure_nltk_tokenizers() -> bool:
     except Exception:
         pass
 
+    if not settings.NLTK_AUTO_DOWNLOAD:
+        return
+
     try:
         import ssl  # type: ignore
         import certifi  # type: ignore
@@ -72,21 +88,59 @@ def _ensure_nltk_tokenizers() -> bool:
     except Exception:
         pass
 
-    # Only punkt is required for word_tokenize, punkt_tab is optional
+
+def _ensure_nltk_resource(resource: str, path: str) -> bool:
+    """
+    Find a bundled NLTK resource, downloading it only if NLTK_AUTO_DOWNLOAD allows it.
+    """
+    import nltk
+
     try:
-        nltk.data.find("tokenizers/punkt")
+        nltk.data.find(path)
         return True
     except Exception as exc:
         if isinstance(exc, zipfile.BadZipFile):
-            _cleanup_nltk_resource("punkt")
+            _cleanup_nltk_resource(resource)
+        if not settings.NLTK_AUTO_DOWNLOAD:
+            return False
         try:
-            nltk.download("punkt", quiet=True)
-            nltk.data.find("tokenizers/punkt")
+            nltk.download(resource, quiet=True)
+            nltk.data.find(path)
             return True
         except Exception:
             return False
 
 
+def _ensure_nltk_tokenizers() -> bool:
+    """
+    Ensure required NLTK tokenizers are available with resilient SSL and local cache.
+    """
+    # Only punkt is required for word_tokenize, punkt_tab is optional
+    return _ensure_nltk_resource("punkt", "tokenizers/punkt")
+
+
+def _nltk_available(resource: str) -> bool:
+    """
+    Check (once per process) that an NLTK resource is usable: "punkt" or a corpus.
+    """
+    if resource not in _NLTK_STATE:
+        with _NLTK_LOCK:
+            if resource not in _NLTK_STATE:
+                if not _NLTK_STATE.get("_configured"):
+                    _configure_nltk_data_path()
+                    _NLTK_STATE["_configured"] = True
+                if resource == "punkt":
+                    available = _ensure_nltk_tokenizers()
+                    if not available:
+                        logger.warning("NLTK 'punkt'/'punkt_tab' not available; using simple tokenizer fallback")
+                else:
+                    available = _ensure_nltk_resource(resource, NLTK_CORPORA[resource])
+                    if not available:
+                        logger.warning(f"NLTK '{resource}' not available; using fallback")
+                _NLTK_STATE[resource] = available
+    return _NLTK_STATE[resource]
+
+
 def _simple_word_tokenize(text: str) -> List[str]:
     """
     Provide a simple fallback tokenizer mirroring the legacy behaviour.
@@ -96,16 +150,13 @@ def _simple_word_tokenize(text: str) -> List[str]:
     return re.findall(r"[A-Za-zÀ-ÖØ-öø-ÿ]+", text.lower())
 
 
-_NLTK_OK = _ensure_nltk_tokenizers()
-if not _NLTK_OK:
-    logger.warning("NLTK 'punkt'/'punkt_tab' not available; using simple tokenizer fallback")
-
-
 def _tokenize(text: str, lang: str = "en") -> List[str]:
     """
     Tokenize text using NLTK when available, with a legacy-compatible fallback.
     """
-    if _NLTK_OK:
+    if _nltk_available("punkt"):
+        from nltk.tokenize import word_tokenize
+
         try:
             if lang == "fr":
                 return word_tokenize(text, language="french")
@@ -115,24 +166,71 @@ def _tokenize(text: str, lang: str = "en") -> List[str]:
             pass
     return _simple_word_tokenize(text)
 
-# Download additional NLTK corpora used by advanced text processing features
-nltk.download("wordnet", quiet=True)
-nltk.download("stopwords", quiet=True)
 
-# Initialize stemmers for different languages
-english_lemmatizer = WordNetLemmatizer()
-french_stemmer = SnowballStemmer('french')
-english_stemmer = SnowballStemmer('english')
+@lru_cache(maxsize=None)
+def get_stemmer(lang: str):
+    """Snowball stemmer for a language ("french", "english"), built once per process."""
+    from nltk.stem import SnowballStemmer
+
+    return SnowballStemmer(lang)
+
+
+@lru_cache(maxsize=1)
+def get_lemmatizer():
+    """
+    WordNet lemmatizer, or None when the wordnet corpus is unavailable.
+    """
+    if not _nltk_available("wordnet"):
+        return None
+    from nltk.stem import WordNetLemmatizer
+
+    lemmatizer = WordNetLemmatizer()
+    try:
+        # WordNet se charge au premier appel : le faire ici plutôt qu'en plein traitement
+        lemmatizer.lemmatize("warmup")
+    except LookupError:
+        return None
+    return lemmatizer
+
+
+@lru_cache(maxsize=None)
+def get_stopwords(lang: str) -> FrozenSet[str]:
+    """NLTK stopwords for a language ("french", "english"); LookupError if the corpus is unavailable."""
+    if not _nltk_available("stopwords"):
+        raise LookupError("NLTK stopwords corpus not available")
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words(lang))
+
+
+def warmup_nlp_resources() -> None:
+    """
+    Load tokenizers, stemmers, lemmatizer, stopwords and the language model now.
+
+    Called by Celery workers at process start (worker_process_init) so the
+    first task does not pay for it; the API loads them on first use.
+    """
+    _nltk_available("punkt")
+    for lang in ("french", "english"):
+        get_stemmer(lang)
+        try:
+            get_stopwords(lang)
+        except LookupError:
+            pass
+    get_lemmatizer()
+
+    from app.utils.language_detection import ProfileLanguageDetector, get_language_detector
+
+    if isinstance(get_language_detector(), ProfileLanguageDetector):
+        ProfileLanguageDetector.load_model()
+    logger.info("NLP resources warmed up")
 
 
 def stem_word(word: str) -> str:
     """
     Stem a word using the French Snowball stemmer with caching, matching legacy behaviour.
     """
-    if not hasattr(stem_word, "_stemmer"):
-        setattr(stem_word, "_stemmer", SnowballStemmer("french"))
-    cached_stemmer: SnowballStemmer = getattr(stem_word, "_stemmer")
-    return cached_stemmer.stem((word or "").lower())
+    return get_stemmer("french").stem((word or "").lower())
 
 def get_lemma(term: str, lang: str = "en") -> str:
     """
@@ -148,17 +246,20 @@ def get_lemma(term: str, lang: str = "en") -> str:
     if lang == "fr":
         # French: Use Snowball stemmer
         tokens = _tokenize(cleaned_term, lang="fr")
+        french_stemmer = get_stemmer("french")
         stemmed_tokens = [french_stemmer.stem(token) for token in tokens if token.isalnum()]
         return " ".join(stemmed_tokens).lower().strip()
     
     elif lang == "en":
         # English: Use WordNet lemmatizer + Snowball stemmer for better coverage
         tokens = _tokenize(cleaned_term, lang="en")
+        english_lemmatizer = get_lemmatizer()
+        english_stemmer = get_stemmer("english")
         processed_tokens = []
         for token in tokens:
             if token.isalnum():
                 # Try lemmatization first, then stemming as fallback
-                lemmatized = english_lemmatizer.lemmatize(token.lower())
+                lemmatized = english_lemmatizer.lemmatize(token.lower()) if english_lemmatizer else token.lower()
                 if lemmatized == token.lower():
                     # Lemmatization didn't change the word, try stemming
                     stemmed = english_stemmer.stem(token.lower())
@@ -206,15 +307,13 @@ def extract_keywords(text: str, lang: str = "fr", max_keywords: int = 10) -> lis
         return []
     
     try:
-        from nltk.corpus import stopwords
-        
         # Get stopwords for the language
         if lang == "fr":
-            stop_words = set(stopwords.words('french'))
+            stop_words = set(get_stopwords('french'))
             # Add common French words not in NLTK
             stop_words.update(['cela', 'celui', 'celle', 'ceux', 'celles', 'ça', 'où'])
         elif lang == "en":
-            stop_words = set(stopwords.words('english'))
+            stop_words = set(get_stopwords('english'))
         else:
             stop_words = set()
         
@@ -8,6 +8,7 @@ from sqlalchemy.orm import selectinload
 from app.db.models import Land, Word, LandDictionary, CrawlStatus
 from app.schemas.land import LandCreate, LandUpdate
 from app.core.text_processing import get_lemma
+from app.utils.pagination import estimate_count_async
 
 class CRUDLand:
     async def get(self, db: AsyncSession, id: int):
@@ -113,23 +114,14 @@ class CRUDLand:
         )
         return result.scalars().first()
 
-    async def count_user_lands(self, db: AsyncSession, user_id: int) -> int:
-        result = await db.execute(
-            select(func.count(Land.id)).filter(Land.owner_id == user_id)
-        )
-        count = result.scalar()
-        return int(count or 0)
-
-    async def get_user_lands_paginated(
+    def _user_lands_query(
         self,
-        db: AsyncSession,
+        columns: Any,
         user_id: int,
-        offset: int,
-        limit: int,
         name_filter: Optional[str] = None,
         status_filter: Optional[str] = None,
-    ) -> List[Land]:
-        query = select(Land).options(selectinload(Land.words)).filter(Land.owner_id == user_id)
+    ):
+        query = select(columns).filter(Land.owner_id == user_id)
 
         if name_filter:
             like_pattern = f"%{name_filter}%"
@@ -142,7 +134,50 @@ class CRUDLand:
             except ValueError:
                 pass
 
-        query = query.offset(offset).limit(limit)
+        return query
+
+    async def count_user_lands(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        name_filter: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        estimate: bool = False,
+    ) -> int:
+        if estimate:
+            query = self._user_lands_query(Land.id, user_id, name_filter, status_filter)
+            return await estimate_count_async(db, query)
+
+        query = self._user_lands_query(func.count(Land.id), user_id, name_filter, status_filter)
+        result = await db.execute(query)
+        count = result.scalar()
+        return int(count or 0)
+
+    async def get_user_lands_paginated(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        offset: int,
+        limit: int,
+        name_filter: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        after_id: Optional[int] = None,
+    ) -> List[Land]:
+        """
+        Liste paginée des lands d'un utilisateur, triée par id.
+
+        Avec after_id (pagination par curseur), l'offset est ignoré et la
+        page commence après ce land (keyset sur la clé primaire).
+        """
+        query = self._user_lands_query(Land, user_id, name_filter, status_filter)
+        query = query.options(selectinload(Land.words)).order_by(Land.id)
+
+        if after_id is not None:
+            query = query.filter(Land.id > after_id)
+        else:
+            query = query.offset(offset)
+
+        query = query.limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
 
@@ -2,12 +2,13 @@
 CRUD operations pour les paragraphes
 """
 
-from typing import List, Optional, Dict, Any, Union
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_, or_, text
+from typing import List, Optional, Dict, Any, Tuple, Union
+from sqlalchemy.orm import Session, joinedload, defer
+from sqlalchemy import func, and_, or_, select, text, tuple_
 from app.crud.base import CRUDBase
 from app.db.models import Paragraph, Expression
 from app.schemas.paragraph import ParagraphCreate, ParagraphUpdate
+from app.utils.pagination import estimate_count
 import hashlib
 import logging
 
@@ -74,14 +75,14 @@ class CRUDParagraph(CRUDBase[Paragraph, ParagraphCreate, ParagraphUpdate]):
             return existing
         
         # Analyser le texte
-        metrics = analyze_text_metrics(obj_in.text) if analyze_text else {}
+        metrics = analyze_text_metrics(obj_in.text, language=obj_in.language) if analyze_text else {}
         
         db_obj = Paragraph(
             expression_id=obj_in.expression_id,
             text=obj_in.text,
             text_hash=text_hash,
             position=obj_in.position,
-            language=obj_in.language,
+            language=obj_in.language or metrics.get('language'),
             word_count=metrics.get('word_count'),
             char_count=metrics.get('char_count'),
             sentence_count=metrics.get('sentence_count'),
@@ -180,13 +181,32 @@ class CRUDParagraph(CRUDBase[Paragraph, ParagraphCreate, ParagraphUpdate]):
         land_id: int,
         skip: int = 0,
         limit: int = 1000,
-        with_embeddings_only: bool = False
+        with_embeddings_only: bool = False,
+        include_embeddings: bool = True,
+        after: Optional[Tuple[int, int]] = None
     ) -> List[Paragraph]:
-        """Récupère tous les paragraphes d'un land."""
+        """
+        Récupère tous les paragraphes d'un land.
+        
+        Avec include_embeddings=False, la colonne embedding n'est pas lue
+        (defer) : les vecteurs ne transitent pas depuis Postgres.
+        Avec after=(expression_id, position), la page commence après ce
+        paragraphe (keyset sur ix_paragraphs_expression_position) et skip
+        est ignoré.
+        """
         query = db.query(Paragraph).join(Expression).filter(
             Expression.land_id == land_id
         )
         
+        if after is not None:
+            query = query.filter(
+                tuple_(Paragraph.expression_id, Paragraph.position) > tuple_(*after)
+            )
+            skip = 0
+        
+        if not include_embeddings:
+            query = query.options(defer(Paragraph.embedding, raiseload=True))
+        
         if with_embeddings_only:
             query = query.filter(
                 Paragraph.embedding.isnot(None),
@@ -194,10 +214,32 @@ class CRUDParagraph(CRUDBase[Paragraph, ParagraphCreate, ParagraphUpdate]):
             )
         
         return query.order_by(
-            Expression.id, 
+            Paragraph.expression_id, 
             Paragraph.position
         ).offset(skip).limit(limit).all()
     
+    def count_by_land(
+        self,
+        db: Session,
+        land_id: int,
+        with_embeddings_only: bool = False,
+        estimate: bool = False
+    ) -> int:
+        """Compte les paragraphes d'un land (exact ou estimé par le planificateur)."""
+        columns = Paragraph.id if estimate else func.count(Paragraph.id)
+        query = select(columns).join(Expression, Expression.id == Paragraph.expression_id).where(
+            Expression.land_id == land_id
+        )
+        if with_embeddings_only:
+            query = query.where(
+                Paragraph.embedding.isnot(None),
+                func.array_length(Paragraph.embedding, 1) > 0
+            )
+        
+        if estimate:
+            return estimate_count(db, query)
+        return int(db.execute(query).scalar() or 0)
+    
     def update_embedding(
         self,
         db: Session,
@@ -404,10 +446,17 @@ class CRUDParagraph(CRUDBase[Paragraph, ParagraphCreate, ParagraphUpdate]):
         analyze_text: bool = True
     ) -> List[Paragraph]:
         """Création en lot optimisée."""
-        from app.utils.text_utils import analyze_text_metrics
+        from app.utils.text_utils import analyze_text_metrics, detect_languages
+        
+        # Détection de langue en un seul lot pour les paragraphes sans langue
+        languages = [para.language for para in paragraphs]
+        if analyze_text:
+            missing = [i for i, language in enumerate(languages) if not language]
+            for i, language in zip(missing, detect_languages([paragraphs[i].text for i in missing])):
+                languages[i] = language
         
         db_objects = []
-        for para in paragraphs:
+        for para, language in zip(paragraphs, languages):
             text_hash = hashlib.sha256(para.text.encode('utf-8')).hexdigest()
             
             # Vérifier la déduplication
@@ -421,15 +470,18 @@ class CRUDParagraph(CRUDBase[Paragraph, ParagraphCreate, ParagraphUpdate]):
             if existing:
                 continue  # Skip les doublons
             
-            metrics = analyze_text_metrics(para.text) if analyze_text else {}
+            metrics = analyze_text_metrics(para.text, language=language) if analyze_text else {}
             
             db_obj = Paragraph(
                 expression_id=para.expression_id,
                 text=para.text,
                 text_hash=text_hash,
                 position=para.position,
-                language=para.language,
-                **metrics
+                language=language,
+                word_count=metrics.get('word_count'),
+                char_count=metrics.get('char_count'),
+                sentence_count=metrics.get('sentence_count'),
+                reading_level=metrics.get('reading_level')
             )
             db_objects.append(db_obj)
         
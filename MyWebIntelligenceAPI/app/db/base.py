@@ -36,3 +36,29 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+
+async def create_tables():
+    """Créer les tables manquantes (Base.metadata.create_all)"""
+    print("🔧 Début de l'initialisation de la base de données...", flush=True)
+    print(f"📊 Création de {len(Base.metadata.tables)} tables...", flush=True)
+
+    # Créer un engine avec isolation_level AUTOCOMMIT pour éviter les rollbacks
+    autocommit_engine = create_async_engine(
+        settings.DATABASE_URL,
+        isolation_level="AUTOCOMMIT"
+    )
+
+    try:
+        async with autocommit_engine.connect() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        print("✅ Tables de base de données créées avec succès!", flush=True)
+    except Exception as e:
+        # Ignorer les erreurs si les tables existent déjà
+        if "already exists" in str(e):
+            print("✅ Tables de base de données déjà existantes", flush=True)
+        else:
+            print(f"❌ Erreur: {e}", flush=True)
+            raise
+    finally:
+        await autocommit_engine.dispose()
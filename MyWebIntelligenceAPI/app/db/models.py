@@ -10,15 +10,16 @@ Ces modèles représentent les entités principales :
 - TaggedContent : Contenu taggé
 - Media : Médias associés aux expressions
 - ExpressionLink : Liens entre expressions
+- LandStatCounter : Agrégats des statistiques d'un land
 """
 
 from sqlalchemy import (
     Column, Integer, String, Text, Float, DateTime, Boolean,
     ForeignKey, Index, JSON, Enum, UniqueConstraint, CheckConstraint,
-    event
+    event, inspect
 )
 from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, relationship
 from sqlalchemy.sql import func
 import enum
 import hashlib
@@ -159,6 +160,7 @@ class Domain(Base):
     # Statistiques
     total_expressions = Column(Integer, default=0)
     avg_http_status = Column(Float, nullable=True)
+    http_status_count = Column(Integer, default=0)  # Expressions ayant un http_status (base de avg_http_status)
     first_crawled = Column(DateTime(timezone=True), nullable=True)
     last_crawled = Column(DateTime(timezone=True), nullable=True)
     fetched_at = Column(DateTime(timezone=True), nullable=True)
@@ -352,6 +354,9 @@ class Paragraph(Base):
     @property
     def has_embedding(self) -> bool:
         """Vérifie si le paragraphe a un embedding."""
+        if "embedding" in inspect(self).unloaded:
+            # Colonne différée : on s'appuie sur les métadonnées sans charger le vecteur
+            return bool(self.embedding_dimensions)
         return (
             self.embedding is not None 
             and isinstance(self.embedding, list) 
@@ -549,6 +554,10 @@ class Media(Base):
     dominant_colors = Column(JSON, nullable=True)
     websafe_colors = Column(JSON, nullable=True)
     image_hash = Column(String(128), nullable=True)
+    # Empreintes perceptuelles 64 bits (hex) pour la déduplication entre lands
+    ahash = Column(String(16), nullable=True)
+    dhash = Column(String(16), nullable=True)
+    phash = Column(String(16), nullable=True)
     
     # Contexte d'extraction
     alt_text = Column(Text, nullable=True)
@@ -575,6 +584,8 @@ class Media(Base):
     __table_args__ = (
         Index('ix_media_expression_type', 'expression_id', 'type'),
         Index('ix_media_processed', 'is_processed'),
+        Index('ix_media_phash', 'phash'),
+        Index('ix_media_processed_at', 'processed_at'),
     )
 
     @staticmethod
@@ -741,6 +752,11 @@ class Export(Base):
     status = Column(String(50), default="completed")
     error_message = Column(Text, nullable=True)
     
+    # Cache des exports (réutilisation par empreinte du contenu)
+    fingerprint = Column(String(64), nullable=True, index=True)
+    hit_count = Column(Integer, default=0)
+    last_accessed_at = Column(DateTime(timezone=True), nullable=True)
+    
     # Métadonnées temporelles
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime(timezone=True), nullable=True)
@@ -755,4 +771,76 @@ class Export(Base):
         Index('ix_exports_land_type', 'land_id', 'export_type'),
         Index('ix_exports_created', 'created_at'),
         Index('ix_exports_expires', 'expires_at'),
+        Index('ix_exports_last_accessed', 'last_accessed_at'),
     )
+
+
+class LLMResponse(Base):
+    """
+    Modèle LLMResponse - Cache des réponses LLM (OpenRouter)
+    
+    Une réponse est identifiée par le modèle et l'empreinte du prompt :
+    relancer une validation ou valider une page dupliquée ne rappelle pas l'API.
+    """
+    __tablename__ = "llm_responses"
+
+    id = Column(Integer, primary_key=True, index=True)
+    model = Column(String(100), nullable=False)
+    prompt_hash = Column(String(64), nullable=False)
+    
+    # Réponse
+    content = Column(Text, nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    
+    # Utilisation du cache
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Index
+    __table_args__ = (
+        UniqueConstraint('model', 'prompt_hash', name='uq_llm_responses_model_prompt'),
+    )
+
+
+class LandStatCounter(Base):
+    """
+    Modèle LandStatCounter - Agrégats des statistiques d'un land
+
+    Une ligne par (land, métrique, case) : nombre d'expressions par statut,
+    profondeur, langue ou code HTTP, sommes de pertinence et de qualité,
+    médias, jobs et exports. Maintenus par app.services.land_stats à chaque
+    flush, dans la transaction qui modifie les données.
+    """
+    __tablename__ = "land_stat_counters"
+
+    land_id = Column(Integer, ForeignKey("lands.id", ondelete="CASCADE"), primary_key=True)
+    metric = Column(String(50), primary_key=True)
+    bucket = Column(String(100), primary_key=True, default="")
+    value = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+@event.listens_for(Session, "before_flush")
+def collect_land_stats(session, flush_context, instances):
+    from app.services.land_counters import collect_counter_changes
+    from app.services.land_stats import collect_flush_changes
+    collect_flush_changes(session)
+    collect_counter_changes(session)
+
+
+@event.listens_for(Session, "after_flush")
+def apply_land_stats(session, flush_context):
+    from app.services.land_counters import apply_counter_changes
+    from app.services.land_stats import apply_flush_changes
+    apply_flush_changes(session)
+    apply_counter_changes(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_land_stats(session, previous_transaction):
+    from app.services.land_counters import discard_counter_changes
+    from app.services.land_stats import discard_flush_changes
+    discard_flush_changes(session)
+    discard_counter_changes(session)
@@ -3,14 +3,14 @@ Point d'entrée principal de l'application FastAPI
 """
 
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from starlette.middleware.cors import CORSMiddleware
 
 from .api.router import api_router
 from .api.v2.router import api_router as api_v2_router
 from .api.versioning import VersioningMiddleware
 from app.config import settings
-from app.db.base import Base, engine
+from app.db.base import Base, create_tables
 
 logger = logging.getLogger(__name__)
 
@@ -43,32 +43,32 @@ app.include_router(api_v2_router, prefix="/api/v2")
 
 @app.on_event("startup")
 async def startup_event():
-    """Créer les tables au démarrage de l'application"""
-    print("🔧 Début de l'initialisation de la base de données...", flush=True)
-    print(f"📊 Création de {len(Base.metadata.tables)} tables...", flush=True)
-
-    # Créer un engine avec isolation_level AUTOCOMMIT pour éviter les rollbacks
-    from sqlalchemy.ext.asyncio import create_async_engine
-    autocommit_engine = create_async_engine(
-        settings.DATABASE_URL,
-        isolation_level="AUTOCOMMIT"
-    )
+    """
+    Le schéma est créé hors du démarrage de l'API (python -m app.scripts.init_db,
+    service db_init de docker-compose); DB_CREATE_ALL_ON_STARTUP rétablit l'ancien comportement.
+    """
+    if settings.DB_CREATE_ALL_ON_STARTUP:
+        await create_tables()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Ferme la connexion pub/sub de la progression des jobs."""
+    from app.api.v1.endpoints.websocket import progress_fanout
 
-    try:
-        async with autocommit_engine.connect() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        print("✅ Tables de base de données créées avec succès!", flush=True)
-    except Exception as e:
-        # Ignorer les erreurs si les tables existent déjà
-        if "already exists" in str(e):
-            print("✅ Tables de base de données déjà existantes", flush=True)
-        else:
-            print(f"❌ Erreur: {e}", flush=True)
-            raise
-    finally:
-        await autocommit_engine.dispose()
+    await progress_fanout.close()
 
 
 @app.get("/")
 def read_root():
     return {"message": f"Welcome to {settings.APP_NAME}"}
+
+
+if settings.ENABLE_METRICS:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """Page de scrape Prometheus (durées des étapes exécutées par l'API)."""
+        from app.core.metrics import render_metrics
+
+        content, content_type = render_metrics()
+        return Response(content=content, headers={"Content-Type": content_type})
@@ -12,9 +12,13 @@ from .base import TimeStampedSchema
 class ExportRequest(BaseModel):
     """Request schema for export operations"""
     land_id: int = Field(..., description="ID of the land to export")
-    export_type: str = Field(..., description="Type of export (pagecsv, fullpagecsv, nodecsv, mediacsv, pagegexf, nodegexf, corpus)")
+    export_type: str = Field(..., description="Type of export (pagecsv, fullpagecsv, nodecsv, mediacsv, pagegexf, nodegexf, corpus, shardedcorpus, embeddings)")
     minimum_relevance: int = Field(default=1, ge=0, le=10, description="Minimum relevance score filter")
     filename: Optional[str] = Field(None, description="Optional custom filename (without extension)")
+    shards: Optional[int] = Field(None, ge=1, le=256, description="Number of shards for shardedcorpus exports")
+    shard_format: str = Field(default="zip", description="Shard archive format for shardedcorpus exports (zip, tar.zst)")
+    embedding_provider: Optional[str] = Field(None, description="Restrict embeddings exports to one provider")
+    embedding_model: Optional[str] = Field(None, description="Restrict embeddings exports to one model")
 
 
 class ExportResponse(BaseModel):
@@ -18,6 +18,7 @@ class MediaBase(BaseModel):
     type: MediaType
     mime_type: Optional[str] = None
     file_size: Optional[int] = None
+    file_path: Optional[str] = None
     width: Optional[int] = None
     height: Optional[int] = None
     duration: Optional[float] = None
@@ -29,6 +30,9 @@ class MediaBase(BaseModel):
     dominant_colors: Optional[List[Dict[str, Any]]] = None
     websafe_colors: Optional[Dict[str, float]] = None
     image_hash: Optional[str] = None
+    ahash: Optional[str] = None
+    dhash: Optional[str] = None
+    phash: Optional[str] = None
     exif_data: Optional[Dict[str, Any]] = None
     analysis_error: Optional[str] = None
     processing_error: Optional[str] = None
@@ -73,6 +73,15 @@ class ParagraphResponse(ParagraphWithEmbedding):
         embedding = values.get('embedding')
         return embedding is not None and len(embedding) > 0
 
+class ParagraphSummary(ParagraphInDB):
+    """Schéma allégé pour les listes : métadonnées d'embedding sans le vecteur."""
+    embedding_provider: Optional[str] = None
+    embedding_model: Optional[str] = None
+    embedding_dimensions: Optional[int] = None
+    embedding_computed_at: Optional[datetime] = None
+    preview_text: str
+    has_embedding: bool
+
 class ParagraphStats(BaseModel):
     """Statistiques pour un paragraphe."""
     total_paragraphs: int
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'extraction des couleurs dominantes : moteur vectorisé vs KMeans scikit-learn.
+
+Les deux moteurs analysent les mêmes images réduites à 100x100 px ; on compare
+le débit (images/seconde) et l'écart au KMeans avec les métriques de tolérance
+documentées dans app.core.color_extraction.
+
+Échantillon:
+    --images DOSSIER   images (jpg, png, webp, gif) du dossier
+    --synthetic N      N images générées (aplats, dégradés, bruit)
+
+Usage:
+    python -m app.scripts.benchmark_color_extraction --images ./media/sample
+    OMP_NUM_THREADS=1 python -m app.scripts.benchmark_color_extraction --synthetic 500
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from app.config import settings
+from app.core.color_extraction import (
+    COLOR_TOLERANCE,
+    RMS_TOLERANCE,
+    extract_dominant_colors,
+    image_pixels,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+
+
+def load_images(directory: str) -> List[Image.Image]:
+    """Images of a directory, decoded in RGB."""
+    images = []
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix.lower() in IMAGE_SUFFIXES:
+            try:
+                with Image.open(path) as img:
+                    images.append(img.convert('RGB'))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(f"Skipping {path}: {exc}")
+    return images
+
+
+def synthetic_images(count: int, seed: int = 0) -> List[Image.Image]:
+    """Shapes on a flat background, some blurred or noisy."""
+    rng = np.random.default_rng(seed)
+    images = []
+    for index in range(count):
+        img = Image.new('RGB', (400, 300), tuple(int(v) for v in rng.integers(0, 256, 3)))
+        draw = ImageDraw.Draw(img)
+        for _ in range(int(rng.integers(1, 9))):
+            x, y = int(rng.integers(0, 380)), int(rng.integers(0, 280))
+            draw.ellipse([x, y, x + int(rng.integers(20, 200)), y + int(rng.integers(20, 200))],
+                         fill=tuple(int(v) for v in rng.integers(0, 256, 3)))
+        if index % 2:
+            img = img.filter(ImageFilter.GaussianBlur(5))
+        if index % 3 == 0:
+            noisy = np.asarray(img, dtype=float) + rng.normal(0, 20, (300, 400, 3))
+            img = Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8))
+        images.append(img)
+    return images
+
+
+def _rms(pixels: np.ndarray, colours) -> float:
+    distances = ((pixels[:, None, :] - np.asarray(colours, float)[None]) ** 2).sum(-1).min(1)
+    return float(np.sqrt(distances.mean()))
+
+
+def benchmark(images: List[Image.Image], n_colors: int) -> dict:
+    """Run both engines and return throughput and tolerance metrics."""
+    from sklearn.cluster import KMeans
+
+    started = time.perf_counter()
+    reference = []
+    for img in images:
+        pixels = image_pixels(img).astype(float)
+        kmeans = KMeans(n_clusters=n_colors, n_init='auto', random_state=42).fit(pixels)
+        reference.append((pixels, kmeans.cluster_centers_, np.bincount(kmeans.labels_, minlength=n_colors)))
+    kmeans_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = extract_dominant_colors(images, n_colors)
+    vectorized_seconds = time.perf_counter() - started
+
+    colour_distances, rms_deltas = [], []
+    for (pixels, centres, counts), result in zip(reference, results):
+        ours = np.asarray([item['rgb'] for item in result['dominant_colors']], float)
+        nearest = np.sqrt(((centres[:, None] - ours[None]) ** 2).sum(-1)).min(1)
+        colour_distances.append(float((nearest * counts).sum() / counts.sum()))
+        rms_deltas.append(_rms(pixels, ours) - _rms(pixels, centres))
+
+    colour_distances, rms_deltas = np.array(colour_distances), np.array(rms_deltas)
+    return {
+        "kmeans_images_per_second": len(images) / kmeans_seconds,
+        "vectorized_images_per_second": len(images) / vectorized_seconds,
+        "colour_distance": colour_distances,
+        "rms_delta": rms_deltas,
+        "within_tolerance": float(np.mean((colour_distances <= COLOR_TOLERANCE) & (rms_deltas <= RMS_TOLERANCE))),
+    }
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark dominant colour extraction")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--images", help="Directory of sample images")
+    source.add_argument("--synthetic", type=int, help="Number of generated images")
+    parser.add_argument("--colors", type=int, help="Dominant colours per image (default: N_DOMINANT_COLORS)")
+    args = parser.parse_args()
+
+    images = load_images(args.images) if args.images else synthetic_images(args.synthetic)
+    if not images:
+        logger.error("Empty sample")
+        sys.exit(1)
+
+    results = benchmark(images, args.colors or settings.N_DOMINANT_COLORS)
+
+    print("\n" + "=" * 80)
+    print(f"DOMINANT COLOUR BENCHMARK ({len(images)} images)")
+    print("=" * 80)
+    print(f"KMeans (scikit-learn):   {results['kmeans_images_per_second']:>10.1f} images/s")
+    print(f"Vectorized engine:       {results['vectorized_images_per_second']:>10.1f} images/s")
+    print("-" * 80)
+    for name, tolerance in (("colour_distance", COLOR_TOLERANCE), ("rms_delta", RMS_TOLERANCE)):
+        values = results[name]
+        print(f"{name:<24} mean {values.mean():6.2f}  p95 {np.percentile(values, 95):6.2f}  "
+              f"max {values.max():6.2f}  (tolerance {tolerance})")
+    print(f"Within tolerance:        {results['within_tolerance'] * 100:>9.1f}%")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
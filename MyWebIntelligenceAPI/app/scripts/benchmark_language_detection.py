@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la détection de langue : moteur "profile" vs langdetect.
+
+Les moteurs sont évalués sur le même échantillon étiqueté, cache désactivé
+(chaque texte est réellement analysé), et comparés en textes/seconde et en
+exactitude par langue.
+
+Échantillon:
+    --sample FICHIER   JSONL {"text": ..., "lang": ...} (une ligne par texte)
+    --land-id ID       readable des expressions du land, étiquetées par leur langue stockée
+
+Usage:
+    python -m app.scripts.benchmark_language_detection --sample samples.jsonl
+    python -m app.scripts.benchmark_language_detection --land-id 15 --limit 2000
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import Expression
+from app.utils.language_detection import ENGINES, LANG_MAPPING
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def load_sample_file(path: str) -> List[Tuple[str, str]]:
+    """(text, lang) pairs from a JSONL file."""
+    sample = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                sample.append((row["text"], LANG_MAPPING.get(row["lang"], row["lang"])))
+    return sample
+
+
+def load_sample_land(land_id: int, limit: int) -> List[Tuple[str, str]]:
+    """(readable, lang) pairs of a land's expressions with a known language."""
+    engine = create_engine(settings.DATABASE_URL.replace("+asyncpg", ""), echo=False)
+    with Session(engine) as session:
+        rows = session.execute(
+            select(Expression.readable, Expression.lang)
+            .where(
+                Expression.land_id == land_id,
+                Expression.readable.isnot(None),
+                Expression.lang.isnot(None)
+            )
+            .order_by(Expression.id)
+            .limit(limit)
+        ).all()
+    return [(readable, LANG_MAPPING.get(lang, lang)) for readable, lang in rows]
+
+
+def run_engine(name: str, sample: List[Tuple[str, str]], max_chars: int) -> dict:
+    """Detect every text of the sample with one engine."""
+    options = {"max_chars": max_chars, "cache_size": 0}
+    if name == "profile":
+        options["prior_languages"] = [
+            lang.strip() for lang in settings.LANGUAGE_DETECTION_PRIOR_LANGUAGES.split(",") if lang.strip()
+        ]
+    detector = ENGINES[name](**options)
+    detector.detect("Warm-up du détecteur de langue")
+
+    started = time.perf_counter()
+    predictions = detector.detect_many([text for text, _ in sample])
+    elapsed = time.perf_counter() - started
+
+    totals, correct = Counter(), Counter()
+    for (_, expected), predicted in zip(sample, predictions):
+        totals[expected] += 1
+        correct[expected] += predicted == expected
+    return {
+        "seconds": elapsed,
+        "texts_per_second": len(sample) / elapsed if elapsed else None,
+        "accuracy": sum(correct.values()) / len(sample) if sample else None,
+        "per_language": {lang: correct[lang] / totals[lang] for lang in totals},
+        "predictions": predictions,
+    }
+
+
+def benchmark(sample: List[Tuple[str, str]], max_chars: Optional[int] = None) -> dict:
+    """Run every engine on the sample and return their metrics."""
+    max_chars = max_chars or settings.LANGUAGE_DETECTION_MAX_CHARS
+    results = {name: run_engine(name, sample, max_chars) for name in ENGINES}
+    profile, reference = results["profile"]["predictions"], results["langdetect"]["predictions"]
+    results["agreement"] = (
+        sum(1 for a, b in zip(profile, reference) if a == b) / len(sample) if sample else None
+    )
+    return results
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark language detection engines")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--sample", help="Labelled JSONL file ({\"text\", \"lang\"} per line)")
+    source.add_argument("--land-id", type=int, help="Land whose expressions are used as sample")
+    parser.add_argument("--limit", type=int, default=1000, help="Expressions read with --land-id (default: 1000)")
+    parser.add_argument("--max-chars", type=int, help="Characters analyzed per text (default: LANGUAGE_DETECTION_MAX_CHARS)")
+    args = parser.parse_args()
+
+    sample = load_sample_file(args.sample) if args.sample else load_sample_land(args.land_id, args.limit)
+    if not sample:
+        logger.error("Empty sample")
+        sys.exit(1)
+
+    results = benchmark(sample, args.max_chars)
+
+    print("\n" + "=" * 80)
+    print(f"LANGUAGE DETECTION BENCHMARK ({len(sample)} texts)")
+    print("=" * 80)
+    print(f"{'engine':<12}{'texts/s':>12}{'seconds':>10}{'accuracy':>10}")
+    for name in ENGINES:
+        r = results[name]
+        print(f"{name:<12}{r['texts_per_second']:>12.1f}{r['seconds']:>10.2f}{r['accuracy'] * 100:>9.1f}%")
+    print("-" * 80)
+    print(f"{'lang':<12}" + "".join(f"{name:>12}" for name in ENGINES))
+    for lang in sorted(results["profile"]["per_language"]):
+        print(f"{lang:<12}" + "".join(f"{results[name]['per_language'][lang] * 100:>11.1f}%" for name in ENGINES))
+    print(f"Engine agreement:    {results['agreement'] * 100:.1f}%")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
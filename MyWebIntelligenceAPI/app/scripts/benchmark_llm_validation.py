@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la validation LLM : une page par requête vs prompts multi-pages.
+
+Les deux modes valident le même échantillon d'expressions en dry-run
+(aucune écriture sur les expressions), sans cache ni pré-filtrage, et
+comparent tokens et temps par page validée ainsi que l'accord des verdicts.
+
+Usage:
+    python -m app.scripts.benchmark_llm_validation --land-id 15
+    python -m app.scripts.benchmark_llm_validation --land-id 15 --sample 100 --batch-size 50
+"""
+
+import argparse
+import logging
+import sys
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.services.llm_validation_pipeline import LLMValidationPipeline
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MODES = (("single", False), ("batched", True))
+
+
+class _VerdictRecorder:
+    """Intercepts _apply to keep the verdicts of a dry-run."""
+
+    def __init__(self, pipeline: LLMValidationPipeline):
+        self.verdicts: Dict[int, bool] = {}
+        apply = pipeline._apply
+
+        def record(expr, is_relevant, model_used, dry_run, stats):
+            self.verdicts[expr.id] = is_relevant
+            apply(expr, is_relevant, model_used, dry_run, stats)
+
+        pipeline._apply = record
+
+
+def run_mode(session: Session, land_id: int, sample: int, batched: bool, batch_size: int, model: Optional[str]) -> dict:
+    """Validate the sample in one mode and return per-page costs."""
+    pipeline = LLMValidationPipeline(session, model=model, use_cache=False, batched=batched)
+    pipeline.prefilter = None
+    recorder = _VerdictRecorder(pipeline)
+
+    started = time.perf_counter()
+    stats = pipeline.run(land_id=land_id, limit=sample, force=True, batch_size=batch_size, dry_run=True)
+    elapsed = time.perf_counter() - started
+
+    validated = stats["processed"] or 1
+    return {
+        "pages": stats["processed"],
+        "errors": stats["errors"],
+        "api_calls": stats["api_calls"],
+        "batch_fallbacks": stats["batch_fallbacks"],
+        "total_tokens": stats["total_tokens"],
+        "tokens_per_page": stats["total_tokens"] / validated,
+        "seconds": elapsed,
+        "seconds_per_page": elapsed / validated,
+        "verdicts": recorder.verdicts,
+    }
+
+
+def benchmark(land_id: int, sample: int = 50, batch_size: int = 50, model: Optional[str] = None) -> dict:
+    """Run both modes on the same sample and return their metrics."""
+    engine = create_engine(settings.DATABASE_URL.replace("+asyncpg", ""), echo=False)
+    results = {}
+
+    with Session(engine) as session:
+        for name, batched in MODES:
+            logger.info("Benchmark mode %s on land %s (%s expressions)", name, land_id, sample)
+            results[name] = run_mode(session, land_id, sample, batched, batch_size, model)
+
+    single, batched = results["single"]["verdicts"], results["batched"]["verdicts"]
+    common = set(single) & set(batched)
+    results["agreement"] = (
+        sum(1 for expression_id in common if single[expression_id] == batched[expression_id]) / len(common)
+        if common else None
+    )
+    return results
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark single-page vs batched LLM validation")
+    parser.add_argument("--land-id", type=int, required=True, help="Land to sample expressions from")
+    parser.add_argument("--sample", type=int, default=50, help="Number of expressions (default: 50)")
+    parser.add_argument("--batch-size", type=int, default=50, help="Expressions per pipeline batch")
+    parser.add_argument("--model", help="Model override (default: OPENROUTER_MODEL)")
+    args = parser.parse_args()
+
+    if not settings.OPENROUTER_ENABLED or not settings.OPENROUTER_API_KEY:
+        logger.error("OpenRouter is not configured (OPENROUTER_ENABLED / OPENROUTER_API_KEY)")
+        sys.exit(1)
+
+    results = benchmark(args.land_id, args.sample, args.batch_size, args.model)
+
+    print("\n" + "=" * 80)
+    print("LLM VALIDATION BENCHMARK")
+    print("=" * 80)
+    print(f"{'mode':<10}{'pages':>8}{'calls':>8}{'fallbacks':>11}{'tokens':>10}{'tok/page':>10}{'s/page':>10}")
+    for name, _ in MODES:
+        r = results[name]
+        print(
+            f"{name:<10}{r['pages']:>8}{r['api_calls']:>8}{r['batch_fallbacks']:>11}"
+            f"{r['total_tokens']:>10}{r['tokens_per_page']:>10.1f}{r['seconds_per_page']:>10.3f}"
+        )
+    if results["agreement"] is not None:
+        print(f"Verdict agreement:    {results['agreement'] * 100:.1f}%")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
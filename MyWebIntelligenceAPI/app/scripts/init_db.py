@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Création du schéma de la base de données, hors du démarrage de l'API.
+
+Crée les tables manquantes (Base.metadata.create_all) ; les évolutions de
+colonnes restent dans migrations/*.sql.
+
+Usage:
+    python -m app.scripts.init_db
+"""
+
+import asyncio
+import logging
+
+from app.db.base import create_tables
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    """CLI entry point."""
+    asyncio.run(create_tables())
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,9 @@ Usage:
 
     # Mode batch (commit toutes les N expressions)
     python -m app.scripts.reprocess_llm_validation --batch-size 50
+
+    # Plusieurs pages par requête LLM
+    python -m app.scripts.reprocess_llm_validation --land-id 15 --batched
 """
 
 import argparse
@@ -28,12 +31,11 @@ import sys
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.db import models
-from app.services.llm_validation_service import LLMValidationService
+from app.services.llm_validation_pipeline import LLMValidationPipeline
 
 # Configure logging
 logging.basicConfig(
@@ -55,7 +57,8 @@ def reprocess_llm_validation(
     limit: Optional[int] = None,
     dry_run: bool = False,
     force: bool = False,
-    batch_size: int = 100
+    batch_size: int = 100,
+    batched: bool = False
 ) -> dict:
     """
     Reprocess LLM validation for existing expressions.
@@ -65,7 +68,8 @@ def reprocess_llm_validation(
         limit: Max number of expressions to process
         dry_run: If True, simulate without writing to DB
         force: If True, revalidate even if valid_llm exists
-        batch_size: Commit after N expressions (0 = commit all at end)
+        batch_size: Expressions per concurrent batch, committed together
+        batched: Validate several pages per LLM request
 
     Returns:
         Statistics dict with processed, updated, errors counts
@@ -108,29 +112,7 @@ def reprocess_llm_validation(
     }
 
     with Session(engine) as session:
-        # Build query for candidate expressions
-        query = session.query(models.Expression).options(
-            selectinload(models.Expression.land)
-        )
-
-        # Filter by land
-        if land_id:
-            query = query.filter(models.Expression.land_id == land_id)
-
-        # Filter: only relevant expressions (relevance > 0)
-        query = query.filter(models.Expression.relevance > 0)
-
-        # Filter: only expressions without LLM validation (unless force)
-        if not force:
-            query = query.filter(models.Expression.valid_llm.is_(None))
-
-        # Apply limit
-        if limit:
-            query = query.limit(limit)
-
-        # Get candidates
-        expressions = query.all()
-        stats["total_candidates"] = len(expressions)
+        pipeline = LLMValidationPipeline(session, batched=batched)
 
         logger.info("=" * 80)
         logger.info("LLM VALIDATION REPROCESSING")
@@ -139,90 +121,29 @@ def reprocess_llm_validation(
         logger.info("Land filter: %s", land_id if land_id else "ALL")
         logger.info("Force revalidation: %s", force)
         logger.info("Batch size: %s", batch_size)
-        logger.info("Total candidates: %s", stats["total_candidates"])
+        logger.info("Model: %s (concurrency %s)", pipeline.model, pipeline.max_concurrency)
         logger.info("=" * 80)
 
+        def report(done: int, total: int, batch_stats: dict) -> None:
+            logger.info(
+                f"[{done}/{total}] {batch_stats['validated']} validated, {batch_stats['rejected']} rejected, "
+                f"{batch_stats['cache_hits']} cache hits, {batch_stats['pages_per_minute']} pages/min"
+            )
+
+        # Concurrent API calls, cached responses, one commit per batch
+        stats.update(pipeline.run(
+            land_id=land_id,
+            limit=limit,
+            force=force,
+            batch_size=batch_size or 100,
+            dry_run=dry_run,
+            progress=report
+        ))
+
         if stats["total_candidates"] == 0:
             logger.info("No expressions to process")
             return stats
 
-        # Create LLM service (None for session as we use sync method)
-        llm_service = LLMValidationService(None)
-
-        # Process expressions
-        for i, expr in enumerate(expressions, 1):
-            try:
-                # Get land
-                land = expr.land
-                if not land:
-                    logger.warning(f"Expression {expr.id}: Land not found, skipping")
-                    stats["skipped"] += 1
-                    continue
-
-                # Skip if no readable content
-                if not expr.readable or len(expr.readable.strip()) < 50:
-                    logger.warning(f"Expression {expr.id}: No readable content, skipping")
-                    stats["skipped"] += 1
-                    continue
-
-                logger.info(
-                    f"[{i}/{stats['total_candidates']}] Processing expression {expr.id} "
-                    f"(land={land.id}, relevance={expr.relevance:.2f})"
-                )
-
-                # Validate with LLM (V2 SYNC-ONLY: no async)
-                validation_result = llm_service.validate_expression_relevance(
-                    expr,
-                    land
-                )
-
-                stats["api_calls"] += 1
-                if validation_result.prompt_tokens:
-                    stats["total_tokens"] += validation_result.prompt_tokens
-                if validation_result.completion_tokens:
-                    stats["total_tokens"] += validation_result.completion_tokens
-
-                # Update stats
-                if validation_result.is_relevant:
-                    stats["validated"] += 1
-                    result_label = "✅ VALIDATED"
-                else:
-                    stats["rejected"] += 1
-                    result_label = "❌ REJECTED"
-
-                logger.info(
-                    f"  {result_label} by {validation_result.model_used} "
-                    f"(tokens: {validation_result.prompt_tokens or 0})"
-                )
-
-                # Update expression (unless dry-run)
-                if not dry_run:
-                    expr.valid_llm = 'oui' if validation_result.is_relevant else 'non'
-                    expr.valid_model = validation_result.model_used
-
-                    # If not relevant, set relevance to 0
-                    if not validation_result.is_relevant:
-                        expr.relevance = 0
-
-                    # Batch commit
-                    if batch_size > 0 and (i % batch_size == 0):
-                        session.commit()
-                        logger.info(f"  💾 Committed batch at {i} expressions")
-
-                stats["processed"] += 1
-
-            except Exception as e:
-                logger.error(f"Expression {expr.id}: Validation failed - {e}")
-                stats["errors"] += 1
-                if not dry_run:
-                    session.rollback()
-                continue
-
-        # Final commit
-        if not dry_run and batch_size != 0:
-            session.commit()
-            logger.info("💾 Final commit completed")
-
         # Calculate duration
         stats["end_time"] = datetime.now()
         stats["duration_seconds"] = (stats["end_time"] - stats["start_time"]).total_seconds()
@@ -238,7 +159,9 @@ def reprocess_llm_validation(
         print(f"Skipped:              {stats['skipped']}")
         print(f"Errors:               {stats['errors']}")
         print(f"Duration:             {stats['duration_seconds']:.1f}s")
+        print(f"Throughput:           {stats['pages_per_minute']} pages/min")
         print(f"API calls:            {stats['api_calls']}")
+        print(f"Cache hits:           {stats['cache_hits']}")
         print(f"Total tokens:         {stats['total_tokens']}")
         if stats['api_calls'] > 0:
             estimated_cost = stats['total_tokens'] * 0.000015  # ~$0.015 per 1K tokens for Claude 3.5 Sonnet
@@ -279,6 +202,11 @@ def main():
         default=100,
         help="Commit after N expressions (default: 100, 0 = commit all at end)"
     )
+    parser.add_argument(
+        "--batched",
+        action="store_true",
+        help="Validate several pages per LLM request"
+    )
 
     args = parser.parse_args()
 
@@ -288,7 +216,8 @@ def main():
             limit=args.limit,
             dry_run=args.dry_run,
             force=args.force,
-            batch_size=args.batch_size
+            batch_size=args.batch_size,
+            batched=args.batched
         )
 
         if stats.get("error"):
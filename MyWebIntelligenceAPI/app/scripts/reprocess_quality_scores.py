@@ -18,8 +18,8 @@ Usage:
     # Forcer le recalcul même si quality_score existe
     python -m app.scripts.reprocess_quality_scores --force
 
-    # Mode batch (commit toutes les N expressions)
-    python -m app.scripts.reprocess_quality_scores --batch-size 50
+    # Mode batch (lecture, UPDATE groupé et commit toutes les N expressions)
+    python -m app.scripts.reprocess_quality_scores --batch-size 500
 """
 
 import argparse
@@ -28,12 +28,14 @@ import sys
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import create_engine, select, func
-from sqlalchemy.orm import Session, selectinload
+import pandas as pd
+from sqlalchemy import create_engine, select, func, update
+from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.db import models
-from app.services.quality_scorer import QualityScorer
+from app.services.land_stats import refresh_land_stats, tracking_enabled
+from app.services.quality_scorer import QUALITY_COLUMNS, QualityScorer
 
 # Configure logging
 logging.basicConfig(
@@ -50,7 +52,29 @@ def get_db_engine():
     return create_engine(sync_url, echo=False)
 
 
-def reprocess_quality_scores(
+def _candidates_query(land_id: Optional[int], force: bool):
+    """Expressions to score, with the columns read by the scorer and the land languages."""
+    columns = [
+        getattr(models.Expression, name).label(name)
+        for name in QUALITY_COLUMNS if hasattr(models.Expression, name)
+    ]
+    query = select(
+        models.Expression.id,
+        models.Expression.quality_score.label("old_score"),
+        models.Land.id.label("land_found"),
+        models.Land.lang.label("land_lang"),
+        *columns
+    ).outerjoin(models.Land, models.Land.id == models.Expression.land_id)
+
+    if land_id:
+        query = query.where(models.Expression.land_id == land_id)
+    if not force:
+        query = query.where(models.Expression.quality_score.is_(None))
+    return query
+
+
+def reprocess_quality_scores_in_session(
+    session: Session,
     land_id: Optional[int] = None,
     limit: Optional[int] = None,
     dry_run: bool = False,
@@ -58,19 +82,12 @@ def reprocess_quality_scores(
     batch_size: int = 100
 ) -> dict:
     """
-    Reprocess quality scores for existing expressions.
+    Reprocess quality scores with an open session.
 
-    Args:
-        land_id: Filter by specific land (None = all lands)
-        limit: Max number of expressions to process
-        dry_run: If True, simulate without writing to DB
-        force: If True, recalculate even if quality_score exists
-        batch_size: Commit after N expressions (0 = commit all at end)
-
-    Returns:
-        Statistics dict with processed, updated, errors counts
+    Expressions are read in id-ordered chunks (only the scored columns),
+    scored as a DataFrame by QualityScorer.compute_quality_scores and
+    written back with one bulk UPDATE per chunk.
     """
-    engine = get_db_engine()
     scorer = QualityScorer()
 
     stats = {
@@ -89,109 +106,99 @@ def reprocess_quality_scores(
         }
     }
 
-    with Session(engine) as session:
-        # Build query
-        query = session.query(models.Expression).options(
-            selectinload(models.Expression.land)
-        )
-
-        # Filter by land
-        if land_id:
-            query = query.filter(models.Expression.land_id == land_id)
-            logger.info(f"Filtering by land_id={land_id}")
-
-        # Filter by quality_score status
-        if not force:
-            query = query.filter(models.Expression.quality_score.is_(None))
-            logger.info("Processing only expressions with NULL quality_score")
-        else:
-            logger.info("FORCE mode: reprocessing ALL expressions")
-
-        # Order by ID for deterministic processing (BEFORE limit)
-        query = query.order_by(models.Expression.id)
-
-        # Apply limit (AFTER order_by)
-        if limit:
-            query = query.limit(limit)
-            logger.info(f"Limited to {limit} expressions")
-
-        # Count candidates
-        stats["total_candidates"] = query.count()
-        logger.info(f"Found {stats['total_candidates']} expressions to process")
-
-        if stats["total_candidates"] == 0:
-            logger.info("No expressions to process. Exiting.")
-            return stats
-
-        if dry_run:
-            logger.info("DRY-RUN mode: Simulating without DB writes")
-
-        # Process expressions
-        batch_counter = 0
-        for expr in query:
-            try:
-                # Check if expression has minimum required data
-                if not expr.http_status:
-                    logger.debug(f"Expression {expr.id}: Skipping (no http_status)")
-                    stats["skipped"] += 1
-                    continue
-
-                # Get land for computation
-                if not expr.land:
-                    logger.warning(f"Expression {expr.id}: Land not found")
-                    stats["errors"] += 1
-                    continue
-
-                # Compute quality score
-                quality_result = scorer.compute_quality_score(
-                    expression=expr,
-                    land=expr.land
+    if land_id:
+        logger.info(f"Filtering by land_id={land_id}")
+    if not force:
+        logger.info("Processing only expressions with NULL quality_score")
+    else:
+        logger.info("FORCE mode: reprocessing ALL expressions")
+
+    query = _candidates_query(land_id, force)
+
+    # Count candidates
+    total = session.execute(select(func.count()).select_from(query.subquery())).scalar_one()
+    if limit:
+        total = min(total, limit)
+        logger.info(f"Limited to {limit} expressions")
+    stats["total_candidates"] = total
+    logger.info(f"Found {stats['total_candidates']} expressions to process")
+
+    if total == 0:
+        logger.info("No expressions to process. Exiting.")
+        return stats
+
+    if dry_run:
+        logger.info("DRY-RUN mode: Simulating without DB writes")
+
+    # batch_size = 0: same chunked reads, single commit at the end
+    chunk_size = batch_size if batch_size > 0 else 1000
+    seen = 0
+    last_id = 0
+    updated_lands = set()
+
+    while seen < total:
+        rows = session.execute(
+            query.where(models.Expression.id > last_id)
+            .order_by(models.Expression.id)
+            .limit(min(chunk_size, total - seen))
+        ).mappings().all()
+        if not rows:
+            break
+        seen += len(rows)
+        last_id = rows[-1]["id"]
+
+        frame = pd.DataFrame([dict(row) for row in rows])
+
+        # Check if expression has minimum required data
+        no_status = frame["http_status"].isna() | (frame["http_status"] == 0)
+        no_land = ~no_status & frame["land_found"].isna()
+        stats["skipped"] += int(no_status.sum())
+        stats["errors"] += int(no_land.sum())
+        for expression_id in frame.loc[no_land, "id"]:
+            logger.warning(f"Expression {expression_id}: Land not found")
+
+        frame = frame[~no_status & ~no_land]
+        if frame.empty:
+            continue
+
+        results = scorer.compute_quality_scores(frame)
+        stats["processed"] += len(results)
+        for category, count in results["category"].value_counts().items():
+            stats["score_distribution"][category] += int(count)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for expression_id, old_score, new_score, category in zip(
+                frame["id"], frame["old_score"], results["score"], results["category"]
+            ):
+                logger.debug(f"Expression {expression_id}: {old_score} -> {new_score:.3f} ({category})")
+
+        # Update expressions (unless dry-run)
+        if not dry_run:
+            session.execute(
+                update(models.Expression),
+                [
+                    {"id": int(expression_id), "quality_score": float(score)}
+                    for expression_id, score in zip(frame["id"], results["score"])
+                ]
+            )
+            stats["updated"] += len(results)
+            updated_lands.update(int(land) for land in frame["land_found"].unique())
+            if batch_size > 0:
+                session.commit()
+                logger.info(
+                    f"Progress: {seen}/{stats['total_candidates']} "
+                    f"({100.0 * seen / stats['total_candidates']:.1f}%)"
                 )
 
-                old_score = expr.quality_score
-                new_score = quality_result["score"]
-                category = quality_result["category"]
-
-                # Update statistics
-                stats["processed"] += 1
-                stats["score_distribution"][category] += 1
-
-                # Log result
-                if old_score is not None:
-                    logger.debug(
-                        f"Expression {expr.id}: {old_score:.3f} -> {new_score:.3f} ({category})"
-                    )
-                else:
-                    logger.debug(
-                        f"Expression {expr.id}: {new_score:.3f} ({category})"
-                    )
-
-                # Update expression (unless dry-run)
-                if not dry_run:
-                    expr.quality_score = new_score
-                    session.add(expr)
-                    stats["updated"] += 1
-
-                    batch_counter += 1
-
-                    # Batch commit
-                    if batch_size > 0 and batch_counter >= batch_size:
-                        session.commit()
-                        logger.info(
-                            f"Progress: {stats['processed']}/{stats['total_candidates']} "
-                            f"({100.0 * stats['processed'] / stats['total_candidates']:.1f}%)"
-                        )
-                        batch_counter = 0
-
-            except Exception as e:
-                logger.error(f"Expression {expr.id}: Error computing quality - {e}")
-                stats["errors"] += 1
-                continue
-
-        # Final commit
-        if not dry_run and batch_counter > 0:
-            session.commit()
-            logger.info("Final batch committed")
+    # Final commit
+    if not dry_run and batch_size <= 0:
+        session.commit()
+        logger.info("Final batch committed")
+
+    # UPDATE groupés : statistiques des lands touchés recalculées
+    if updated_lands and tracking_enabled(session):
+        for updated_land_id in sorted(updated_lands):
+            refresh_land_stats(session, updated_land_id)
 
     # Summary
     stats["end_time"] = datetime.now()
@@ -200,6 +207,38 @@ def reprocess_quality_scores(
     return stats
 
 
+def reprocess_quality_scores(
+    land_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    dry_run: bool = False,
+    force: bool = False,
+    batch_size: int = 100
+) -> dict:
+    """
+    Reprocess quality scores for existing expressions.
+
+    Args:
+        land_id: Filter by specific land (None = all lands)
+        limit: Max number of expressions to process
+        dry_run: If True, simulate without writing to DB
+        force: If True, recalculate even if quality_score exists
+        batch_size: Expressions per chunk, one bulk UPDATE and commit each (0 = commit all at end)
+
+    Returns:
+        Statistics dict with processed, updated, errors counts
+    """
+    engine = get_db_engine()
+    with Session(engine) as session:
+        return reprocess_quality_scores_in_session(
+            session,
+            land_id=land_id,
+            limit=limit,
+            dry_run=dry_run,
+            force=force,
+            batch_size=batch_size
+        )
+
+
 def print_summary(stats: dict):
     """Print summary statistics."""
     print("\n" + "="*60)
@@ -250,7 +289,7 @@ def main():
         "--batch-size",
         type=int,
         default=100,
-        help="Commit after N expressions (default: 100, 0 = commit all at end)"
+        help="Expressions per chunk, one bulk UPDATE each (default: 100, 0 = commit all at end)"
     )
     parser.add_argument(
         "--verbose",
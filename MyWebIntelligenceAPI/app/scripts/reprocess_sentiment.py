@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Script de reprocessing du sentiment pour expressions existantes.
+
+Usage:
+    # Dry-run (simulation)
+    python -m app.scripts.reprocess_sentiment --dry-run
+
+    # Reprocess toutes les expressions sans sentiment
+    python -m app.scripts.reprocess_sentiment
+
+    # Reprocess un land spécifique
+    python -m app.scripts.reprocess_sentiment --land-id 15
+
+    # Reprocess avec limite
+    python -m app.scripts.reprocess_sentiment --limit 100
+
+    # Forcer le recalcul même si le sentiment existe
+    python -m app.scripts.reprocess_sentiment --force
+
+    # Taille des lots et nombre de processus d'analyse
+    python -m app.scripts.reprocess_sentiment --batch-size 1000 --workers 4
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.services.sentiment_batch import reprocess_sentiment as run_reprocessing
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def get_db_engine():
+    """Create synchronous DB engine."""
+    # Convert async URL to sync URL
+    sync_url = settings.DATABASE_URL.replace("+asyncpg", "")
+    return create_engine(sync_url, echo=False)
+
+
+def reprocess_sentiment(
+    land_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    dry_run: bool = False,
+    force: bool = False,
+    batch_size: int = 500,
+    workers: Optional[int] = None
+) -> dict:
+    """
+    Reprocess sentiment for existing expressions.
+
+    Args:
+        land_id: Filter by specific land (None = all lands)
+        limit: Max number of expressions to process
+        dry_run: If True, simulate without writing to DB
+        force: If True, recalculate even if sentiment exists
+        batch_size: Expressions analyzed and written per bulk update
+        workers: Analysis processes (None = SENTIMENT_BATCH_WORKERS or CPU count)
+
+    Returns:
+        Statistics dict with processed, updated counts and status distribution
+    """
+    engine = get_db_engine()
+    start_time = datetime.now()
+
+    def report(done: int, total: int, stats: dict) -> None:
+        logger.info(
+            f"Progress: {done}/{total} ({100.0 * done / total:.1f}%) - "
+            f"{stats['texts_per_second']} texts/s"
+        )
+
+    with Session(engine) as session:
+        stats = run_reprocessing(
+            session,
+            land_id=land_id,
+            limit=limit,
+            force=force,
+            batch_size=batch_size,
+            workers=workers,
+            dry_run=dry_run,
+            progress=report
+        )
+
+    stats["start_time"] = start_time
+    stats["end_time"] = datetime.now()
+    return stats
+
+
+def print_summary(stats: dict):
+    """Print summary statistics."""
+    print("\n" + "="*60)
+    print("REPROCESSING SUMMARY")
+    print("="*60)
+    print(f"Total candidates:     {stats['total_candidates']}")
+    print(f"Processed:            {stats['processed']}")
+    print(f"Updated:              {stats['updated']}")
+    print(f"Duration:             {stats['duration_seconds']:.1f}s")
+    print(f"Throughput:           {stats['texts_per_second']} texts/s")
+
+    if stats['processed'] > 0:
+        print("\nStatus Distribution:")
+        for status, count in sorted(stats['by_status'].items()):
+            pct = 100.0 * count / stats['processed']
+            print(f"  {status:16s}: {count:5d} ({pct:5.1f}%)")
+
+    print("="*60 + "\n")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Reprocess sentiment for existing expressions"
+    )
+    parser.add_argument(
+        "--land-id",
+        type=int,
+        help="Process only expressions from this land"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Max number of expressions to process"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Simulate without writing to DB"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recalculate even if sentiment already exists"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.SENTIMENT_BATCH_SIZE,
+        help=f"Expressions per bulk update (default: {settings.SENTIMENT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Analysis processes (default: SENTIMENT_BATCH_WORKERS or CPU count)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging"
+    )
+
+    args = parser.parse_args()
+
+    # Configure logging level
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    # Display configuration
+    logger.info("Sentiment Reprocessing Script")
+    logger.info(f"Configuration:")
+    logger.info(f"  Land ID:     {args.land_id or 'ALL'}")
+    logger.info(f"  Limit:       {args.limit or 'NONE'}")
+    logger.info(f"  Dry-run:     {args.dry_run}")
+    logger.info(f"  Force:       {args.force}")
+    logger.info(f"  Batch size:  {args.batch_size}")
+    logger.info(f"  Workers:     {args.workers or 'AUTO'}")
+    logger.info("")
+
+    # Confirm if not dry-run
+    if not args.dry_run:
+        response = input("This will modify the database. Continue? [y/N] ")
+        if response.lower() != 'y':
+            logger.info("Aborted by user")
+            sys.exit(0)
+
+    # Run reprocessing
+    try:
+        stats = reprocess_sentiment(
+            land_id=args.land_id,
+            limit=args.limit,
+            dry_run=args.dry_run,
+            force=args.force,
+            batch_size=args.batch_size,
+            workers=args.workers
+        )
+
+        print_summary(stats)
+
+        if stats["by_status"].get("failed", 0) > 0:
+            logger.warning(f"Completed with {stats['by_status']['failed']} failed analyses")
+            sys.exit(1)
+        else:
+            logger.info("Completed successfully")
+            sys.exit(0)
+
+    except KeyboardInterrupt:
+        logger.info("\nInterrupted by user")
+        sys.exit(130)
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ from app.schemas.job import (
     CrawlStatus as SchemaCrawlStatus,
 )
 from app.core.celery_app import celery_app
+from app.services.land_stats import get_land_stats, refresh_land_stats
 from fastapi import HTTPException, status
 import logging
 
@@ -126,91 +127,38 @@ async def get_crawl_pipeline_stats(db: AsyncSession, land_id: int) -> Dict[str,
     1. created_at: Date de création de l'expression  
     2. fetched_at: Date de récupération du contenu (crawled_at)
     3. approved_at: Date d'approbation (si pertinence > 0)
+
+    Les valeurs viennent des compteurs agrégés du land (voir land_stats).
     """
     try:
-        # Statistiques générales du land
-        land_stats_query = await db.execute(text("""
-            SELECT 
-                COUNT(*) as total_expressions,
-                COUNT(CASE WHEN crawled_at IS NOT NULL THEN 1 END) as fetched_expressions,
-                COUNT(CASE WHEN approved_at IS NOT NULL THEN 1 END) as approved_expressions,
-                COUNT(CASE WHEN relevance > 0 THEN 1 END) as relevant_expressions,
-                AVG(relevance) as avg_relevance,
-                MAX(relevance) as max_relevance,
-                COUNT(CASE WHEN depth = 0 THEN 1 END) as start_url_expressions,
-                COUNT(CASE WHEN depth = 1 THEN 1 END) as depth_1_expressions,
-                COUNT(CASE WHEN depth >= 2 THEN 1 END) as deeper_expressions
-            FROM expressions 
-            WHERE land_id = :land_id
-        """), {"land_id": land_id})
-        
-        land_stats = land_stats_query.fetchone()
-        
-        # Statistiques par profondeur
-        depth_stats_query = await db.execute(text("""
-            SELECT 
-                depth,
-                COUNT(*) as count,
-                COUNT(CASE WHEN approved_at IS NOT NULL THEN 1 END) as approved_count,
-                AVG(relevance) as avg_relevance
-            FROM expressions 
-            WHERE land_id = :land_id
-            GROUP BY depth
-            ORDER BY depth
-        """), {"land_id": land_id})
-        
-        depth_stats = [dict(row._mapping) for row in depth_stats_query.fetchall()]
-        
-        # Progression temporelle
-        timeline_query = await db.execute(text("""
-            SELECT 
-                DATE(created_at) as date,
-                COUNT(*) as created_count,
-                COUNT(CASE WHEN crawled_at IS NOT NULL THEN 1 END) as crawled_count,
-                COUNT(CASE WHEN approved_at IS NOT NULL THEN 1 END) as approved_count
-            FROM expressions 
-            WHERE land_id = :land_id
-            GROUP BY DATE(created_at)
-            ORDER BY DATE(created_at) DESC
-            LIMIT 10
-        """), {"land_id": land_id})
-        
-        timeline = [dict(row._mapping) for row in timeline_query.fetchall()]
-        
-        # Expressions non traitées (respectant la logique du pipeline)
-        unprocessed_query = await db.execute(text("""
-            SELECT 
-                COUNT(CASE WHEN crawled_at IS NULL THEN 1 END) as not_fetched,
-                COUNT(CASE WHEN crawled_at IS NOT NULL AND approved_at IS NULL AND relevance = 0 THEN 1 END) as fetched_not_relevant,
-                COUNT(CASE WHEN crawled_at IS NOT NULL AND relevance > 0 AND approved_at IS NULL THEN 1 END) as relevant_not_approved
-            FROM expressions 
-            WHERE land_id = :land_id
-        """), {"land_id": land_id})
-        
-        unprocessed = unprocessed_query.fetchone()
-        
+        # Compteurs agrégés du land (land_stat_counters) : pas de parcours des expressions
+        stats = await db.run_sync(lambda session: get_land_stats(session, land_id))
+        expressions = stats["expressions"]
+
         return {
             "land_id": land_id,
             "pipeline_stats": {
-                "total_expressions": land_stats.total_expressions if land_stats else 0,
-                "fetched_expressions": land_stats.fetched_expressions if land_stats else 0,
-                "approved_expressions": land_stats.approved_expressions if land_stats else 0,
-                "relevant_expressions": land_stats.relevant_expressions if land_stats else 0,
-                "avg_relevance": float(land_stats.avg_relevance) if land_stats and land_stats.avg_relevance else 0.0,
-                "max_relevance": float(land_stats.max_relevance) if land_stats and land_stats.max_relevance else 0.0,
-                "completion_rate": (land_stats.approved_expressions / land_stats.total_expressions * 100) if land_stats and land_stats.total_expressions > 0 else 0.0
+                "total_expressions": expressions["total"],
+                "fetched_expressions": expressions["fetched"],
+                "approved_expressions": expressions["approved"],
+                "relevant_expressions": expressions["relevant"],
+                "avg_relevance": stats["relevance"]["avg"],
+                "max_relevance": stats["relevance"]["max"],
+                "completion_rate": (expressions["approved"] / expressions["total"] * 100) if expressions["total"] > 0 else 0.0
             },
-            "depth_distribution": depth_stats,
-            "processing_timeline": timeline,
+            "depth_distribution": stats["by_depth"],
+            "processing_timeline": stats["timeline"],
             "unprocessed_breakdown": {
-                "not_fetched": unprocessed.not_fetched if unprocessed else 0,
-                "fetched_not_relevant": unprocessed.fetched_not_relevant if unprocessed else 0,
-                "relevant_not_approved": unprocessed.relevant_not_approved if unprocessed else 0
+                "not_fetched": expressions["not_fetched"],
+                "fetched_not_relevant": expressions["fetched_not_relevant"],
+                "relevant_not_approved": expressions["relevant_not_approved"]
             },
             "health_indicators": {
                 "dictionary_populated": await _check_dictionary_health(db, land_id),
-                "pipeline_consistent": await _check_pipeline_consistency(db, land_id)
-            }
+                # approved_at seulement si relevance > 0
+                "pipeline_consistent": expressions["inconsistent"] == 0
+            },
+            "refreshed_at": stats["refreshed_at"]
         }
         
     except Exception as e:
@@ -235,27 +183,6 @@ async def _check_dictionary_health(db: AsyncSession, land_id: int) -> bool:
         return False
 
 
-async def _check_pipeline_consistency(db: AsyncSession, land_id: int) -> bool:
-    """Vérifie la cohérence du pipeline (approved_at seulement si relevance > 0)"""
-    try:
-        inconsistency_query = await db.execute(text("""
-            SELECT COUNT(*) as inconsistent_count
-            FROM expressions 
-            WHERE land_id = :land_id 
-            AND (
-                (approved_at IS NOT NULL AND relevance = 0) OR
-                (approved_at IS NULL AND relevance > 0 AND crawled_at IS NOT NULL)
-            )
-        """), {"land_id": land_id})
-        
-        inconsistent_count = inconsistency_query.scalar()
-        return inconsistent_count == 0
-        
-    except Exception as e:
-        logger.error(f"Error checking pipeline consistency for land {land_id}: {e}")
-        return False
-
-
 async def fix_pipeline_inconsistencies(db: AsyncSession, land_id: int) -> Dict[str, Any]:
     """
     Répare les incohérences du pipeline crawl pour un land.
@@ -289,6 +216,9 @@ async def fix_pipeline_inconsistencies(db: AsyncSession, land_id: int) -> Dict[s
         disapproved_count = disapprove_query.rowcount
         
         await db.commit()
+        # UPDATE SQL : les compteurs du land ne sont pas suivis par l'ORM
+        if approved_count or disapproved_count:
+            await db.run_sync(lambda session: refresh_land_stats(session, land_id))
         
         result = {
             "land_id": land_id,
@@ -12,12 +12,12 @@ Service layer pour:
 - Calcul des statistiques
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 import logging
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, cast, Integer
+from sqlalchemy import func, cast, Integer, tuple_
 
 from app.db.models import Domain, Land, CrawlJob
 from app.schemas.domain_crawl import DomainFetchResult, DomainStatsResponse
@@ -153,7 +153,11 @@ class DomainCrawlService:
         if land_id is not None:
             query = query.filter(Domain.land_id == land_id)
 
-        total_domains = query.count()
+        if land_id is not None:
+            # Compteur maintenu (land_counters) plutôt qu'un COUNT(*)
+            total_domains = self.db.query(Land.total_domains).filter(Land.id == land_id).scalar() or 0
+        else:
+            total_domains = query.count()
         fetched_domains = query.filter(Domain.fetched_at.isnot(None)).count()
         unfetched_domains = total_domains - fetched_domains
 
@@ -317,7 +321,8 @@ class DomainCrawlService:
     def get_recent_crawled_domains(
         self,
         land_id: Optional[int] = None,
-        limit: int = 10
+        limit: int = 10,
+        before: Optional[Tuple[datetime, int]] = None
     ) -> List[Domain]:
         """
         Récupère les domaines récemment crawlés (SYNC).
@@ -325,17 +330,22 @@ class DomainCrawlService:
         Args:
             land_id: ID du land (None = tous)
             limit: Nombre max de domaines
+            before: (fetched_at, id) du dernier domaine de la page précédente
+                (pagination keyset, ordre décroissant)
 
         Returns:
             Liste de domaines récemment crawlés
         """
         query = self.db.query(Domain).filter(
             Domain.fetched_at.isnot(None)
-        ).order_by(Domain.fetched_at.desc())
+        ).order_by(Domain.fetched_at.desc(), Domain.id.desc())
 
         if land_id is not None:
             query = query.filter(Domain.land_id == land_id)
 
+        if before is not None:
+            query = query.filter(tuple_(Domain.fetched_at, Domain.id) < tuple_(*before))
+
         domains = query.limit(limit).all()
 
         logger.info(
@@ -0,0 +1,269 @@
+"""
+Export result cache
+Reuses export files from the exports table when the land data has not changed
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models import Domain, Export, Expression, ExpressionLink, Media, Paragraph
+
+
+MIME_TYPES = {
+    '.csv': 'text/csv',
+    '.gexf': 'application/xml',
+    '.zip': 'application/zip',
+    '.json': 'application/json',
+}
+
+
+class SyncExportCache:
+    """
+    Content-addressed cache of export files
+
+    An export is identified by a fingerprint of its parameters and of the
+    state of the land data it reads (latest update timestamps and row
+    counts). While the fingerprint is unchanged the previous file is served
+    as-is instead of re-querying and rewriting everything.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def compute_fingerprint(
+        self,
+        export_type: str,
+        land_id: int,
+        minimum_relevance: int,
+        options: Optional[Dict[str, Any]] = None,
+        filename: Optional[str] = None
+    ) -> str:
+        """
+        Compute the fingerprint of an export
+
+        Args:
+            export_type: Export format type
+            land_id: Land ID to export
+            minimum_relevance: Minimum relevance filter
+            options: Writer specific options
+            filename: Requested output filename (a cached file keeps its name)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        expression_state = self.db.query(
+            func.count(Expression.id),
+            func.max(func.coalesce(Expression.updated_at, Expression.created_at))
+        ).filter(
+            Expression.land_id == land_id,
+            Expression.relevance >= minimum_relevance
+        ).one()
+
+        domain_state = self.db.query(
+            func.count(Domain.id),
+            func.max(Domain.fetched_at)
+        ).filter(Domain.land_id == land_id).one()
+
+        media_count = self.db.query(func.count(Media.id)).join(
+            Expression, Expression.id == Media.expression_id
+        ).filter(
+            Expression.land_id == land_id,
+            Expression.relevance >= minimum_relevance
+        ).scalar()
+
+        # Paragraph based exports (shardedcorpus, embeddings) change when
+        # paragraphs are re-extracted or their embeddings recomputed
+        paragraph_state = self.db.query(
+            func.count(Paragraph.id),
+            func.max(func.coalesce(Paragraph.updated_at, Paragraph.created_at)),
+            func.max(Paragraph.embedding_computed_at)
+        ).join(
+            Expression, Expression.id == Paragraph.expression_id
+        ).filter(
+            Expression.land_id == land_id,
+            Expression.relevance >= minimum_relevance
+        ).one()
+
+        link_count = self.db.query(func.count(ExpressionLink.id)).join(
+            Expression, Expression.id == ExpressionLink.source_id
+        ).filter(Expression.land_id == land_id).scalar()
+
+        payload = {
+            'land_id': land_id,
+            'export_type': export_type,
+            'minimum_relevance': minimum_relevance,
+            'options': options or {},
+            'filename': filename,
+            'expressions': [expression_state[0], self._isoformat(expression_state[1])],
+            'domains': [domain_state[0], self._isoformat(domain_state[1])],
+            'media': media_count,
+            'paragraphs': [
+                paragraph_state[0],
+                self._isoformat(paragraph_state[1]),
+                self._isoformat(paragraph_state[2]),
+            ],
+            'links': link_count,
+        }
+        raw = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def lookup(self, fingerprint: str) -> Optional[Export]:
+        """
+        Return the cached export for a fingerprint and mark it as used
+
+        Entries whose file disappeared are marked as evicted and ignored.
+        """
+        candidates = self.db.query(Export).filter(
+            Export.fingerprint == fingerprint,
+            Export.status == 'completed'
+        ).order_by(Export.created_at.desc()).all()
+
+        for entry in candidates:
+            if os.path.exists(entry.file_path):
+                entry.hit_count = (entry.hit_count or 0) + 1
+                entry.last_accessed_at = self._now()
+                self.db.commit()
+                return entry
+            entry.status = 'evicted'
+
+        if candidates:
+            self.db.commit()
+        return None
+
+    def store(
+        self,
+        fingerprint: str,
+        export_type: str,
+        land_id: int,
+        user_id: int,
+        minimum_relevance: int,
+        file_path: str,
+        record_count: int,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Export:
+        """
+        Record a freshly written export file in the exports table
+        """
+        now = self._now()
+        entry = Export(
+            land_id=land_id,
+            created_by=user_id,
+            export_type=export_type,
+            parameters={'minimum_relevance': minimum_relevance, **(options or {})},
+            filename=os.path.basename(file_path),
+            file_path=file_path,
+            file_size=self._artifact_size(file_path),
+            mime_type=MIME_TYPES.get(os.path.splitext(file_path)[1], 'application/octet-stream'),
+            total_records=record_count,
+            status='completed',
+            fingerprint=fingerprint,
+            hit_count=0,
+            last_accessed_at=now,
+        )
+        self.db.add(entry)
+        self.db.commit()
+        return entry
+
+    def evict(self, max_bytes: int, max_idle_hours: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Evict cached exports by idle time then by LRU until under the size budget
+
+        Args:
+            max_bytes: Total size budget for cached artifacts
+            max_idle_hours: Evict entries not used for this long (optional)
+
+        Returns:
+            List of evicted entries (filename, size, reason)
+        """
+        entries = self.db.query(Export).filter(
+            Export.fingerprint.isnot(None),
+            Export.status == 'completed'
+        ).all()
+        entries.sort(key=lambda entry: self._last_used(entry))
+
+        now = self._now()
+        evicted = []
+        live = []
+
+        for entry in entries:
+            if not os.path.exists(entry.file_path):
+                entry.status = 'evicted'
+                continue
+            idle_hours = (now - self._last_used(entry)).total_seconds() / 3600
+            if max_idle_hours is not None and idle_hours > max_idle_hours:
+                evicted.append(self._remove(entry, 'idle'))
+            else:
+                live.append(entry)
+
+        total = sum(entry.file_size or 0 for entry in live)
+        for entry in live:
+            if total <= max_bytes:
+                break
+            total -= entry.file_size or 0
+            evicted.append(self._remove(entry, 'size_budget'))
+
+        self.db.commit()
+        return evicted
+
+    def cached_paths(self) -> Dict[str, datetime.datetime]:
+        """
+        Map cached artifact paths to their last use, for age based cleanup
+        """
+        entries = self.db.query(Export).filter(
+            Export.fingerprint.isnot(None),
+            Export.status == 'completed'
+        ).all()
+        return {entry.file_path: self._last_used(entry) for entry in entries}
+
+    def _remove(self, entry: Export, reason: str) -> Dict[str, Any]:
+        """Delete the artifact of a cache entry and mark it evicted"""
+        path = entry.file_path
+        if os.path.basename(path) == 'manifest.json':
+            # Directory exports (sharded corpus, embeddings): the whole directory is the artifact
+            shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+        elif os.path.exists(path):
+            os.unlink(path)
+        entry.status = 'evicted'
+        return {'filename': entry.filename, 'size': entry.file_size or 0, 'reason': reason}
+
+    def _artifact_size(self, file_path: str) -> int:
+        """Size on disk of an export (every file of a directory export)"""
+        if os.path.basename(file_path) == 'manifest.json':
+            directory = os.path.dirname(file_path)
+            return sum(
+                os.path.getsize(os.path.join(directory, name))
+                for name in os.listdir(directory)
+            )
+        return os.path.getsize(file_path)
+
+    def _last_used(self, entry: Export) -> datetime.datetime:
+        """Most recent use of a cache entry (timezone aware)"""
+        moments = [
+            self._aware(moment)
+            for moment in (entry.last_accessed_at, entry.downloaded_at)
+            if moment is not None
+        ]
+        if moments:
+            return max(moments)
+        return self._aware(entry.created_at) if entry.created_at else self._now()
+
+    @staticmethod
+    def _aware(moment: datetime.datetime) -> datetime.datetime:
+        if moment.tzinfo is None:
+            return moment.replace(tzinfo=datetime.timezone.utc)
+        return moment
+
+    @staticmethod
+    def _isoformat(moment: Optional[datetime.datetime]) -> Optional[str]:
+        return moment.isoformat() if moment else None
+
+    @staticmethod
+    def _now() -> datetime.datetime:
+        return datetime.datetime.now(datetime.timezone.utc)
@@ -5,19 +5,91 @@ Since Celery workers run in synchronous context, we need a sync version
 
 import csv
 import datetime
+import json
 import re
+import tarfile
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
 from typing import Dict, List, Optional, Any, Tuple
 from textwrap import dedent
 from lxml import etree
-from zipfile import ZipFile
+from zipfile import ZipFile, ZIP_DEFLATED
 import tempfile
 import os
 
+import numpy as np
+import pandas as pd
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import func, select, text
 
-from app.db.models import Land, Expression, Domain, Media
+from app.config import settings
+from app.core.metrics import stage
+from app.db.models import Land, Expression, Domain, Media, Paragraph
+from app.utils.processes import can_spawn_processes
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+
+CORPUS_SHARD_FORMATS = ('zip', 'tar.zst')
+CORPUS_MANIFEST_NAME = 'manifest.json'
+
+# Export types written as a directory of files described by manifest.json
+DIRECTORY_EXPORT_TYPES = ('shardedcorpus', 'embeddings')
+EMBEDDINGS_MATRIX_NAME = 'embeddings.npy'
+EMBEDDINGS_SIDECAR_NAME = 'paragraphs.parquet'
+
+
+def _corpus_shard_filename(index: int, shard_format: str) -> str:
+    """Return the archive name of a corpus shard"""
+    return f"corpus-{index:03d}.{shard_format}"
+
+
+def _build_corpus_shard(directory: str, index: int, rows: List[Dict[str, Any]], shard_format: str) -> Dict[str, Any]:
+    """
+    Build one corpus shard archive
+
+    Runs in a worker process: it only receives plain row dictionaries and
+    never touches the database session.
+
+    Returns:
+        Shard description with the member name of every expression
+    """
+    formatter = SyncExportService(db=None)
+    shard_name = _corpus_shard_filename(index, shard_format)
+    shard_path = os.path.join(directory, shard_name)
+    members = {}
+
+    if shard_format == 'zip':
+        with ZipFile(shard_path, 'w', compression=ZIP_DEFLATED) as archive:
+            for row in rows:
+                member, content = formatter.corpus_member(row)
+                archive.writestr(member, content)
+                members[row['id']] = member
+    else:
+        compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+        with open(shard_path, 'wb') as raw, compressor.stream_writer(raw) as stream:
+            with tarfile.open(fileobj=stream, mode='w|') as archive:
+                for row in rows:
+                    member, content = formatter.corpus_member(row)
+                    payload = content.encode('utf-8')
+                    info = tarfile.TarInfo(member)
+                    info.size = len(payload)
+                    archive.addfile(info, BytesIO(payload))
+                    members[row['id']] = member
+
+    return {
+        'index': index,
+        'filename': shard_name,
+        'records': len(members),
+        'size': os.path.getsize(shard_path),
+        'members': members,
+    }
 
 
 class SyncExportService:
@@ -36,19 +108,22 @@ class SyncExportService:
         export_type: str, 
         land_id: int, 
         minimum_relevance: int = 1,
-        filename: Optional[str] = None
+        filename: Optional[str] = None,
+        **options: Any
     ) -> Tuple[str, int]:
         """
         Main export method - proxy to specific format writers
         
         Args:
-            export_type: Format type (pagecsv, fullpagecsv, nodecsv, mediacsv, pagegexf, nodegexf, corpus)
+            export_type: Format type (pagecsv, fullpagecsv, nodecsv, mediacsv, pagegexf, nodegexf, corpus, shardedcorpus, embeddings)
             land_id: Land ID to export
             minimum_relevance: Minimum relevance filter
             filename: Optional filename (auto-generated if not provided)
+            **options: Extra keyword arguments forwarded to the writer (e.g. shards, shard_format)
             
         Returns:
-            Tuple of (file_path, record_count)
+            Tuple of (file_path, record_count). For shardedcorpus and
+            embeddings, file_path is the manifest inside the export directory.
         """
         if not filename:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -62,6 +137,9 @@ class SyncExportService:
             filename += '.csv'
         elif export_type.endswith('gexf'):
             filename += '.gexf'
+        elif export_type in DIRECTORY_EXPORT_TYPES:
+            # Written to a directory holding the data files + manifest
+            pass
         elif export_type.endswith('corpus'):
             filename += '.zip'
         
@@ -70,7 +148,11 @@ class SyncExportService:
         file_path = os.path.join(temp_dir, filename)
         
         # Execute export
-        count = write_method(file_path, land_id, minimum_relevance)
+        with stage("export", export_type):
+            count = write_method(file_path, land_id, minimum_relevance, **options)
+        
+        if export_type in DIRECTORY_EXPORT_TYPES:
+            file_path = os.path.join(file_path, CORPUS_MANIFEST_NAME)
         
         return file_path, count
     
@@ -92,10 +174,11 @@ class SyncExportService:
         
         # Execute query
         query = text(sql.format(cols))
-        result = self.db.execute(query, {"land_id": land_id, "relevance": relevance})
-        
-        # Convert to list of dictionaries
-        rows = result.fetchall()
+        with stage("export", "sql_query"):
+            result = self.db.execute(query, {"land_id": land_id, "relevance": relevance})
+            
+            # Convert to list of dictionaries
+            rows = result.fetchall()
         return [dict(zip(column_map.keys(), row)) for row in rows]
     
     def write_pagecsv(self, filename: str, land_id: int, minimum_relevance: int) -> int:
@@ -222,7 +305,7 @@ class SyncExportService:
             Number of records written
         """
         count = 0
-        with open(filename, 'w', newline='\n', encoding="utf-8") as file:
+        with stage("export", "csv_write"), open(filename, 'w', newline='\n', encoding="utf-8") as file:
             writer = csv.writer(file, quoting=csv.QUOTE_ALL)
             
             # Write header
@@ -465,17 +548,273 @@ class SyncExportService:
         with ZipFile(filename, 'w') as archive:
             for row in data:
                 count += 1
-                file_title = self.slugify(row.get('title', ''))
-                archive_filename = f"{row['id']}-{file_title}.txt"
-                
-                # Create file content with metadata header
-                metadata = self.create_metadata(row)
-                content = metadata + (row.get('readable', '') or '')
-                
+                archive_filename, content = self.corpus_member(row)
                 archive.writestr(archive_filename, content)
         
         return count
     
+    def write_shardedcorpus(
+        self,
+        directory: str,
+        land_id: int,
+        minimum_relevance: int,
+        shards: Optional[int] = None,
+        shard_format: str = 'zip',
+        workers: Optional[int] = None
+    ) -> int:
+        """
+        Write corpus export split into independently downloadable shards
+        
+        Shards are built in parallel in a process pool (a thread pool inside
+        a Celery prefork child, which cannot fork). A manifest.json
+        written next to the shards maps every expression id to its shard
+        and archive member.
+        
+        Args:
+            directory: Output directory (created if missing)
+            land_id: Land ID to export
+            minimum_relevance: Minimum relevance filter
+            shards: Number of shards (defaults to EXPORT_CORPUS_SHARDS)
+            shard_format: 'zip' or 'tar.zst'
+            workers: Process pool size (defaults to EXPORT_CORPUS_WORKERS or CPU count)
+            
+        Returns:
+            Number of records written
+        """
+        if shard_format not in CORPUS_SHARD_FORMATS:
+            raise ValueError(f"Invalid shard format: {shard_format}. Must be one of: {', '.join(CORPUS_SHARD_FORMATS)}")
+        if shard_format == 'tar.zst' and not ZSTD_AVAILABLE:
+            raise ValueError("tar.zst shards require the 'zstandard' package")
+        
+        column_map = {
+            'id': 'e.id',
+            'url': 'e.url',
+            'title': 'e.title',
+            'description': 'e.description',
+            'readable': 'e.readable',
+            'domain': 'd.name'
+        }
+        
+        sql = """
+            SELECT
+                {}
+            FROM expressions AS e
+            JOIN domains AS d ON d.id = e.domain_id
+            WHERE e.land_id = :land_id AND e.relevance >= :relevance
+            ORDER BY e.id
+        """
+        
+        data = self.get_sql_data(sql, column_map, land_id, minimum_relevance)
+        
+        shard_count = max(1, shards or settings.EXPORT_CORPUS_SHARDS)
+        shard_count = min(shard_count, max(len(data), 1))
+        
+        # Contiguous id ranges keep each shard ordered like the plain corpus
+        chunk_size = -(-len(data) // shard_count) if data else 0
+        partitions = [data[i * chunk_size:(i + 1) * chunk_size] for i in range(shard_count)]
+        
+        os.makedirs(directory, exist_ok=True)
+        pool_size = min(workers or settings.EXPORT_CORPUS_WORKERS or os.cpu_count() or 1, shard_count)
+        
+        if pool_size > 1:
+            # zlib and zstd release the GIL, so threads still compress shards in parallel
+            executor_class = ProcessPoolExecutor if can_spawn_processes() else ThreadPoolExecutor
+            with executor_class(max_workers=pool_size) as executor:
+                futures = [
+                    executor.submit(_build_corpus_shard, directory, index, rows, shard_format)
+                    for index, rows in enumerate(partitions)
+                ]
+                results = [future.result() for future in futures]
+        else:
+            results = [
+                _build_corpus_shard(directory, index, rows, shard_format)
+                for index, rows in enumerate(partitions)
+            ]
+        
+        manifest = {
+            'land_id': land_id,
+            'minimum_relevance': minimum_relevance,
+            'format': shard_format,
+            'created_at': datetime.datetime.now().isoformat(),
+            'total_records': sum(result['records'] for result in results),
+            'shards': [
+                {key: result[key] for key in ('index', 'filename', 'records', 'size')}
+                for result in results
+            ],
+            'expressions': {
+                str(expression_id): {'shard': result['index'], 'member': member}
+                for result in results
+                for expression_id, member in result['members'].items()
+            }
+        }
+        
+        with open(os.path.join(directory, CORPUS_MANIFEST_NAME), 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+        
+        return manifest['total_records']
+    
+    def write_embeddings(
+        self,
+        directory: str,
+        land_id: int,
+        minimum_relevance: int,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        batch_size: int = 5000
+    ) -> int:
+        """
+        Write paragraph embeddings as a memory-mappable NumPy matrix
+        
+        Produces embeddings.npy (float32, one row per paragraph) and a
+        paragraphs.parquet sidecar (row, paragraph_id, expression_id,
+        embedding_provider, embedding_model) in the same row order, so the
+        matrix can be opened with np.load(path, mmap_mode='r'). Rows are
+        streamed from the database straight into the memory-mapped file.
+        
+        Args:
+            directory: Output directory (created if missing)
+            land_id: Land ID to export
+            minimum_relevance: Minimum relevance filter on the expressions
+            provider: Only export embeddings from this provider
+            model: Only export embeddings from this model
+            batch_size: Rows fetched per database round-trip
+            
+        Returns:
+            Number of vectors written
+        """
+        filters = [
+            Expression.land_id == land_id,
+            Expression.relevance >= minimum_relevance,
+            Paragraph.embedding.isnot(None),
+        ]
+        if provider:
+            filters.append(Paragraph.embedding_provider == provider)
+        if model:
+            filters.append(Paragraph.embedding_model == model)
+        
+        dimension_rows = self.db.execute(
+            select(func.cardinality(Paragraph.embedding), func.count(Paragraph.id))
+            .join(Expression, Expression.id == Paragraph.expression_id)
+            .where(*filters)
+            .group_by(func.cardinality(Paragraph.embedding))
+        ).all()
+        
+        if len(dimension_rows) > 1:
+            dimensions = sorted(row[0] for row in dimension_rows)
+            raise ValueError(
+                f"Mixed embedding dimensions {dimensions} for land {land_id}; "
+                "filter the export with the provider or model option"
+            )
+        
+        dimension, total = dimension_rows[0] if dimension_rows else (0, 0)
+        
+        os.makedirs(directory, exist_ok=True)
+        matrix_path = os.path.join(directory, EMBEDDINGS_MATRIX_NAME)
+        matrix = np.lib.format.open_memmap(
+            matrix_path, mode='w+', dtype=np.float32, shape=(total, dimension or 0)
+        )
+        
+        query = (
+            select(
+                Paragraph.id,
+                Paragraph.expression_id,
+                Paragraph.embedding_provider,
+                Paragraph.embedding_model,
+                Paragraph.embedding,
+            )
+            .join(Expression, Expression.id == Paragraph.expression_id)
+            .where(*filters)
+            .order_by(Paragraph.id)
+            .execution_options(yield_per=batch_size)
+        )
+        
+        sidecar = {
+            'paragraph_id': [],
+            'expression_id': [],
+            'embedding_provider': [],
+            'embedding_model': [],
+        }
+        count = 0
+        with stage("export", "embeddings_scan"):
+            for partition in self.db.execute(query).partitions(batch_size):
+                # Rows added between the COUNT and this scan are left for the next export
+                partition = partition[:total - count]
+                if not partition:
+                    break
+                matrix[count:count + len(partition)] = np.asarray(
+                    [row.embedding for row in partition], dtype=np.float32
+                )
+                for row in partition:
+                    sidecar['paragraph_id'].append(row.id)
+                    sidecar['expression_id'].append(row.expression_id)
+                    sidecar['embedding_provider'].append(row.embedding_provider)
+                    sidecar['embedding_model'].append(row.embedding_model)
+                count += len(partition)
+            
+            matrix.flush()
+        del matrix
+        
+        if count < total:
+            # Paragraphs deleted between the COUNT and the scan: drop the
+            # trailing rows so that the matrix and the sidecar stay aligned
+            self._truncate_matrix(matrix_path, count, dimension or 0, batch_size)
+        
+        with stage("export", "embeddings_sidecar"):
+            frame = pd.DataFrame(sidecar)
+            frame.insert(0, 'row', np.arange(count, dtype=np.int64))
+            frame.to_parquet(os.path.join(directory, EMBEDDINGS_SIDECAR_NAME), index=False)
+        
+        manifest = {
+            'land_id': land_id,
+            'minimum_relevance': minimum_relevance,
+            'format': 'npy',
+            'created_at': datetime.datetime.now().isoformat(),
+            'total_records': count,
+            'dtype': 'float32',
+            'shape': [count, dimension or 0],
+            'provider': provider,
+            'model': model,
+            'files': [EMBEDDINGS_MATRIX_NAME, EMBEDDINGS_SIDECAR_NAME],
+        }
+        
+        with open(os.path.join(directory, CORPUS_MANIFEST_NAME), 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+        
+        return count
+    
+    @staticmethod
+    def _truncate_matrix(matrix_path: str, rows: int, dimension: int, batch_size: int) -> None:
+        """
+        Keep the first `rows` rows of a .npy matrix
+        
+        The header stores the shape, so the rows are copied block by block
+        into a new memory-mapped file that replaces the original.
+        """
+        source = np.load(matrix_path, mmap_mode='r')
+        truncated_path = f"{matrix_path}.tmp"
+        target = np.lib.format.open_memmap(
+            truncated_path, mode='w+', dtype=np.float32, shape=(rows, dimension)
+        )
+        step = max(batch_size, 1)
+        for start in range(0, rows, step):
+            end = min(start + step, rows)
+            target[start:end] = source[start:end]
+        target.flush()
+        del target, source
+        os.replace(truncated_path, matrix_path)
+    
+    def corpus_member(self, row: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Build the archive member name and content of one corpus expression
+        
+        Returns:
+            Tuple of (member_name, content with metadata header)
+        """
+        file_title = self.slugify(row.get('title', ''))
+        member_name = f"{row['id']}-{file_title}.txt"
+        content = self.create_metadata(row) + (row.get('readable', '') or '')
+        return member_name, content
+    
     def slugify(self, string: str) -> str:
         """
         Convert string to URL-safe slug
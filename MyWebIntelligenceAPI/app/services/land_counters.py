@@ -0,0 +1,271 @@
+"""
+Compteurs dénormalisés des lands et des domaines
+
+Land.total_expressions, Land.total_domains, Domain.total_expressions et
+Domain.avg_http_status (moyenne pondérée par Domain.http_status_count) sont
+tenus à jour à chaque flush, dans la transaction qui crée, déplace ou
+supprime les expressions et les domaines (crawl, ajout d'URLs, création des
+liens) :
+- before_flush : état précédent (land, domaine, http_status) des expressions
+  et domaines modifiés ou supprimés ;
+- after_flush : un UPDATE « total = total + delta » ... RETURNING par land et
+  par domaine touché ; les valeurs renvoyées sont reportées sur les objets
+  présents dans la session (pas de rechargement paresseux en contexte async).
+
+reconcile_land_counters recalcule les compteurs d'un land (GROUP BY) et
+corrige les écarts (tâche tasks.reconcile_land_counters_task).
+"""
+
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from app.config import settings
+from app.db import models
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+PENDING_KEY = "land_counters_pending"
+EXPRESSION_FIELDS = ("land_id", "domain_id", "http_status")
+DOMAIN_FIELDS = ("land_id",)
+AVG_TOLERANCE = 1e-6
+
+_TRACKED = {models.Expression: EXPRESSION_FIELDS, models.Domain: DOMAIN_FIELDS}
+
+# Tables maintenables, par moteur : {"lands": bool, "domains": bool}
+_schema: "weakref.WeakKeyDictionary[Any, Dict[str, bool]]" = weakref.WeakKeyDictionary()
+
+
+def _available(session: Session) -> Dict[str, bool]:
+    """Tables dont les compteurs peuvent être maintenus (migration appliquée)."""
+    engine = session.get_bind()
+    available = _schema.get(engine)
+    if available is None:
+        inspector = inspect(session.connection())
+        domains = inspector.has_table(models.Domain.__tablename__) and any(
+            column["name"] == "http_status_count"
+            for column in inspector.get_columns(models.Domain.__tablename__)
+        )
+        available = {"lands": inspector.has_table(models.Land.__tablename__), "domains": domains}
+        _schema[engine] = available
+        if inspector.has_table(models.Domain.__tablename__) and not domains:
+            logger.warning("domains.http_status_count missing: domain counters are not maintained")
+    return available
+
+
+# ---------------------------------------------------------------------- #
+# Suivi des flushs                                                       #
+# ---------------------------------------------------------------------- #
+def collect_counter_changes(session: Session) -> None:
+    """before_flush : état précédent des expressions et domaines modifiés ou supprimés."""
+    if not settings.LAND_COUNTERS_ENABLED:
+        return
+    groups = (session.new, session.dirty, session.deleted)
+    if not any(type(obj) in _TRACKED for group in groups for obj in group):
+        return
+    if not any(_available(session).values()):
+        return
+
+    pending = session.info.setdefault(
+        PENDING_KEY, {"new": [], "changed": [], "deleted": [], "lands": set(), "domains": set()}
+    )
+    pending["new"].extend(obj for obj in session.new if type(obj) in _TRACKED)
+
+    lookups: Dict[Any, Dict[int, Dict[str, Any]]] = defaultdict(dict)
+    for obj in session.dirty:
+        model = type(obj)
+        if model not in _TRACKED or obj.id is None:
+            continue
+        attrs = inspect(obj).attrs
+        added = {
+            field: attrs[field].history.added[0]
+            for field in _TRACKED[model] if attrs[field].history.added
+        }
+        if added:
+            lookups[model][obj.id] = added
+
+    deleted: Dict[Any, List[int]] = defaultdict(list)
+    for obj in session.deleted:
+        if isinstance(obj, models.Land):
+            pending["lands"].add(obj.id)
+        if isinstance(obj, models.Domain):
+            pending["domains"].add(obj.id)
+        if type(obj) in _TRACKED and obj.id is not None:
+            deleted[type(obj)].append(obj.id)
+
+    connection = session.connection()
+    for model, fields in _TRACKED.items():
+        ids = list(lookups[model]) + deleted[model]
+        if not ids:
+            continue
+        columns = [getattr(model, field).label(field) for field in fields]
+        rows = connection.execute(select(model.id, *columns).where(model.id.in_(ids))).mappings()
+        stored = {row["id"]: dict(row) for row in rows}
+        for obj_id, added in lookups[model].items():
+            if obj_id in stored:
+                pending["changed"].append((model, stored[obj_id], {**stored[obj_id], **added}))
+        for obj_id in deleted[model]:
+            if obj_id in stored:
+                pending["deleted"].append((model, stored[obj_id]))
+
+
+def _add(land_deltas, domain_deltas, model, state: Dict[str, Any], sign: int) -> None:
+    if model is models.Domain:
+        if state["land_id"] is not None:
+            land_deltas[state["land_id"]]["total_domains"] += sign
+        return
+    if state["land_id"] is not None:
+        land_deltas[state["land_id"]]["total_expressions"] += sign
+    if state["domain_id"] is not None:
+        delta = domain_deltas[state["domain_id"]]
+        delta["total_expressions"] += sign
+        if state["http_status"] is not None:
+            delta["status_count"] += sign
+            delta["status_sum"] += sign * float(state["http_status"])
+
+
+def discard_counter_changes(session: Session) -> None:
+    """after_soft_rollback : oublie les changements d'un flush qui a échoué (sinon appliqués au suivant)."""
+    session.info.pop(PENDING_KEY, None)
+
+
+def apply_counter_changes(session: Session) -> None:
+    """after_flush : UPDATE incrémental des lands et domaines touchés."""
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+
+    land_deltas: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    domain_deltas: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for obj in pending["new"]:
+        values = inspect(obj).dict
+        state = {field: values.get(field) for field in _TRACKED[type(obj)]}
+        _add(land_deltas, domain_deltas, type(obj), state, 1)
+    for model, old, new in pending["changed"]:
+        _add(land_deltas, domain_deltas, model, old, -1)
+        _add(land_deltas, domain_deltas, model, new, 1)
+    for model, old in pending["deleted"]:
+        _add(land_deltas, domain_deltas, model, old, -1)
+
+    available = _available(session)
+    connection = session.connection()
+
+    # Lignes mises à jour par id croissant : les flushs concurrents verrouillent
+    # lands et domains dans le même ordre et ne peuvent pas s'interbloquer
+    if available["lands"]:
+        table = models.Land.__table__
+        for land_id, delta in sorted(land_deltas.items()):
+            if land_id in pending["lands"] or not any(delta.values()):
+                continue
+            row = connection.execute(
+                update(table).where(table.c.id == land_id).values(
+                    total_expressions=func.coalesce(table.c.total_expressions, 0) + delta["total_expressions"],
+                    total_domains=func.coalesce(table.c.total_domains, 0) + delta["total_domains"],
+                ).returning(table.c.total_expressions, table.c.total_domains)
+            ).mappings().first()
+            _sync(session, models.Land, land_id, row)
+
+    if available["domains"]:
+        table = models.Domain.__table__
+        for domain_id, delta in sorted(domain_deltas.items()):
+            if domain_id in pending["domains"] or not any(delta.values()):
+                continue
+            count = func.coalesce(table.c.http_status_count, 0)
+            new_count = count + int(delta["status_count"])
+            row = connection.execute(
+                update(table).where(table.c.id == domain_id).values(
+                    total_expressions=func.coalesce(table.c.total_expressions, 0) + int(delta["total_expressions"]),
+                    http_status_count=new_count,
+                    avg_http_status=case(
+                        (new_count > 0,
+                         (func.coalesce(table.c.avg_http_status, 0.0) * count + delta["status_sum"]) / new_count),
+                        else_=None,
+                    ),
+                ).returning(table.c.total_expressions, table.c.http_status_count, table.c.avg_http_status)
+            ).mappings().first()
+            _sync(session, models.Domain, domain_id, row)
+
+
+def _sync(session: Session, model, obj_id: int, row: Optional[Dict[str, Any]]) -> None:
+    """Reporte les compteurs écrits sur l'objet de la session, sans le marquer modifié."""
+    if row is None:
+        return
+    obj = session.identity_map.get(identity_key(model, obj_id))
+    if obj is not None:
+        for field, value in row.items():
+            set_committed_value(obj, field, value)
+
+
+# ---------------------------------------------------------------------- #
+# Réconciliation                                                         #
+# ---------------------------------------------------------------------- #
+def reconcile_land_counters(db: Session, land_id: int) -> Dict[str, int]:
+    """
+    Recalcule les compteurs d'un land et de ses domaines et corrige les écarts.
+
+    Returns:
+        {'lands_fixed': 0|1, 'domains_checked', 'domains_fixed'}
+    """
+    expressions = models.Expression
+    land = db.execute(
+        select(
+            models.Land.total_expressions,
+            models.Land.total_domains,
+            select(func.count(expressions.id)).where(expressions.land_id == land_id).scalar_subquery(),
+            select(func.count(models.Domain.id)).where(models.Domain.land_id == land_id).scalar_subquery(),
+        ).where(models.Land.id == land_id)
+    ).first()
+    if land is None:
+        return {"lands_fixed": 0, "domains_checked": 0, "domains_fixed": 0}
+
+    lands_fixed = 0
+    stored_expressions, stored_domains, total_expressions, total_domains = land
+    if (stored_expressions, stored_domains) != (total_expressions, total_domains):
+        db.execute(update(models.Land), [{
+            "id": land_id, "total_expressions": total_expressions, "total_domains": total_domains,
+        }])
+        lands_fixed = 1
+        logger.info(
+            f"Land {land_id} counters fixed: expressions {stored_expressions} -> {total_expressions}, "
+            f"domains {stored_domains} -> {total_domains}"
+        )
+
+    rows = db.execute(
+        select(
+            models.Domain.id,
+            models.Domain.total_expressions,
+            models.Domain.http_status_count,
+            models.Domain.avg_http_status,
+            func.count(expressions.id),
+            func.count(expressions.http_status),
+            func.avg(expressions.http_status),
+        )
+        .outerjoin(expressions, expressions.domain_id == models.Domain.id)
+        .where(models.Domain.land_id == land_id)
+        .group_by(models.Domain.id)
+    ).all()
+
+    updates = []
+    for domain_id, stored_total, stored_count, stored_avg, total, count, average in rows:
+        average = float(average) if average is not None else None
+        drifted = (stored_total, stored_count) != (total, count) or (
+            (stored_avg is None) != (average is None)
+            or (average is not None and abs(stored_avg - average) > AVG_TOLERANCE)
+        )
+        if drifted:
+            updates.append({
+                "id": domain_id, "total_expressions": total,
+                "http_status_count": count, "avg_http_status": average,
+            })
+    if updates:
+        db.execute(update(models.Domain), updates)
+        logger.info(f"Land {land_id}: counters of {len(updates)}/{len(rows)} domains fixed")
+
+    db.commit()
+    return {"lands_fixed": lands_fixed, "domains_checked": len(rows), "domains_fixed": len(updates)}
@@ -0,0 +1,551 @@
+"""
+Statistiques des lands, maintenues par agrégats
+
+Les statistiques d'un land sont des compteurs (table land_stat_counters) :
+une ligne par (land, métrique, case). Ils sont mis à jour à chaque flush de
+session, dans la même transaction que les données :
+- before_flush : état précédent (lu en base, une requête par type d'objet)
+  et valeurs modifiées des expressions, médias, jobs et exports touchés ;
+- after_flush : état nouveau, différence avec l'état précédent, puis un
+  UPSERT « value = value + delta » par case.
+
+Le crawler, l'analyse des médias, les jobs (CrawlJob) et les exports
+(table exports) les alimentent donc sans requête d'agrégat. Les écritures
+qui contournent l'ORM (UPDATE SQL ou groupés) appellent apply_land_deltas ou
+refresh_land_stats.
+
+Lecture : une requête sur la clé primaire du land, quel que soit le nombre
+d'expressions. refresh_land_stats recalcule tout (paramètre refresh=true).
+Les métriques last_* et relevance_max sont des maximums (jamais diminués
+avant le prochain recalcul).
+"""
+
+import math
+import weakref
+from collections import Counter, defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Float, case, delete, insert, inspect, literal, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import models
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+CounterKey = Tuple[int, str, str]  # (land_id, métrique, case)
+State = Dict[str, Any]
+
+PENDING_KEY = "land_stats_pending"
+REFRESHED_AT = ("meta", "refreshed_at")
+# Métriques dont la valeur est un maximum (mise à jour par GREATEST, pas par addition)
+MAX_METRICS = {"last_activity", "relevance_max"}
+TIMELINE_DAYS = 10
+
+EXPRESSION_FIELDS = (
+    "land_id", "depth", "lang", "http_status", "relevance", "quality_score",
+    "crawled_at", "approved_at", "readable", "created_at",
+)
+MEDIA_FIELDS = ("expression_id", "type", "is_processed")
+JOB_FIELDS = ("land_id", "job_type", "status", "started_at", "completed_at")
+EXPORT_FIELDS = ("land_id", "export_type", "status", "total_records", "created_at")
+
+_TRACKED = {
+    models.Expression: EXPRESSION_FIELDS,
+    models.Media: MEDIA_FIELDS,
+    models.CrawlJob: JOB_FIELDS,
+    models.Export: EXPORT_FIELDS,
+}
+
+# Tables de compteurs présentes, par moteur (le suivi est désactivé tant que la migration n'est pas appliquée)
+_table_present: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+# ---------------------------------------------------------------------- #
+# Compteurs d'un objet                                                   #
+# ---------------------------------------------------------------------- #
+def _day(moment: Optional[datetime]) -> str:
+    return (moment or datetime.now(timezone.utc)).date().isoformat()
+
+
+def _epoch(moment: Optional[datetime]) -> Optional[float]:
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _enum_value(value: Any) -> Optional[str]:
+    return getattr(value, "value", value)
+
+
+def expression_counters(state: State) -> Iterable[Tuple[str, str, float]]:
+    """(métrique, case, valeur) d'une expression ; mêmes règles que fix_pipeline_inconsistencies."""
+    fetched = state["crawled_at"] is not None
+    approved = state["approved_at"] is not None
+    relevance = state["relevance"]
+    relevant = relevance is not None and relevance > 0
+    depth = str(state["depth"]) if state["depth"] is not None else "none"
+    day = _day(state["created_at"])
+
+    yield "expressions", "total", 1
+    yield "expressions", "fetched" if fetched else "not_fetched", 1
+    if approved:
+        yield "expressions", "approved", 1
+    if relevant:
+        yield "expressions", "relevant", 1
+    if state["readable"]:
+        yield "expressions", "readable", 1
+    if fetched and not approved and relevance == 0:
+        yield "expressions", "fetched_not_relevant", 1
+    if fetched and relevant and not approved:
+        yield "expressions", "relevant_not_approved", 1
+    if (approved and relevance == 0) or (not approved and relevant and fetched):
+        yield "expressions", "inconsistent", 1
+
+    yield "depth", depth, 1
+    if approved:
+        yield "depth_approved", depth, 1
+    yield "lang", state["lang"] or "unknown", 1
+    yield "http_status", str(state["http_status"]) if state["http_status"] is not None else "none", 1
+
+    yield "created_day", day, 1
+    if fetched:
+        yield "crawled_by_created_day", day, 1
+    if approved:
+        yield "approved_by_created_day", day, 1
+
+    if relevance is not None:
+        yield "relevance", "sum", relevance
+        yield "relevance", "count", 1
+        yield "relevance_floor", str(math.floor(relevance)), 1
+        yield "depth_relevance_sum", depth, relevance
+        yield "depth_relevance_count", depth, 1
+    if state["quality_score"] is not None:
+        yield "quality", "sum", state["quality_score"]
+        yield "quality", "count", 1
+
+
+def media_counters(state: State) -> Iterable[Tuple[str, str, float]]:
+    yield "media", "total", 1
+    yield "media_type", _enum_value(state["type"]) or "unknown", 1
+    if state["is_processed"]:
+        yield "media", "processed", 1
+
+
+def job_counters(state: State) -> Iterable[Tuple[str, str, float]]:
+    job_type = state["job_type"] or "unknown"
+    status = _enum_value(state["status"]) or "pending"
+    yield "jobs", f"{job_type}:{status}", 1
+    if status == models.CrawlStatus.COMPLETED.value and state["started_at"] and state["completed_at"]:
+        duration = _epoch(state["completed_at"]) - _epoch(state["started_at"])
+        yield "job_seconds", job_type, max(duration, 0.0)
+
+
+def export_counters(state: State) -> Iterable[Tuple[str, str, float]]:
+    if state["status"] == "failed":
+        return
+    yield "exports", "total", 1
+    yield "exports", "records", state["total_records"] or 0
+    yield "export_type", state["export_type"] or "unknown", 1
+
+
+def max_counters(model, state: State) -> Iterable[Tuple[str, str, float]]:
+    """Maximums (GREATEST) : dernière activité et pertinence maximale."""
+    if model is models.Expression and state["relevance"] is not None:
+        yield "relevance_max", "", state["relevance"]
+    elif model is models.CrawlJob and state["completed_at"] is not None:
+        status = _enum_value(state["status"])
+        yield "last_activity", f"{state['job_type']}:{status}", _epoch(state["completed_at"])
+    elif model is models.Export and state["status"] != "failed":
+        yield "last_activity", "export", _epoch(state["created_at"]) or datetime.now(timezone.utc).timestamp()
+
+
+_COUNTERS = {
+    models.Expression: expression_counters,
+    models.Media: media_counters,
+    models.CrawlJob: job_counters,
+    models.Export: export_counters,
+}
+
+
+def _land_of(model, state: State) -> Optional[int]:
+    return state.get("land_id") if model is not models.Media else state.get("_land_id")
+
+
+def add_state(deltas: Counter, maxima: Dict[CounterKey, float], model, state: State, sign: int = 1) -> None:
+    """Ajoute (sign=1) ou retire (sign=-1) les compteurs d'un objet."""
+    land_id = _land_of(model, state)
+    if land_id is None:
+        return
+    for metric, bucket, value in _COUNTERS[model](state):
+        deltas[(land_id, metric, bucket)] += sign * value
+    if sign > 0:
+        for metric, bucket, value in max_counters(model, state):
+            key = (land_id, metric, bucket)
+            maxima[key] = max(maxima.get(key, value), value)
+
+
+# ---------------------------------------------------------------------- #
+# Suivi des flushs                                                       #
+# ---------------------------------------------------------------------- #
+def tracking_enabled(session: Session) -> bool:
+    """Compteurs maintenus : LAND_STATS_ENABLED et table land_stat_counters présente."""
+    if not settings.LAND_STATS_ENABLED:
+        return False
+    engine = session.get_bind()
+    present = _table_present.get(engine)
+    if present is None:
+        present = inspect(session.connection()).has_table(models.LandStatCounter.__tablename__)
+        _table_present[engine] = present
+        if not present:
+            logger.warning("land_stat_counters table missing: land statistics are not maintained")
+    return present
+
+
+def _columns(model, fields) -> List[Any]:
+    columns = [model.id]
+    for field in fields:
+        column = getattr(model, field)
+        columns.append((column.isnot(None) if field == "readable" else column).label(field))
+    return columns
+
+
+def _stored_states(connection: Connection, model, ids: List[int]) -> Dict[int, State]:
+    """État en base (avant le flush) des objets modifiés ou supprimés."""
+    if not ids:
+        return {}
+    rows = connection.execute(select(*_columns(model, _TRACKED[model])).where(model.id.in_(ids))).mappings()
+    return {row["id"]: dict(row) for row in rows}
+
+
+def _presence(field: str, value: Any) -> Any:
+    return value is not None if field == "readable" else value
+
+
+def collect_flush_changes(session: Session) -> None:
+    """before_flush : états précédents et valeurs modifiées des objets suivis."""
+    if not (session.new or session.dirty or session.deleted):
+        return
+    if not any(type(obj) in _TRACKED for group in (session.new, session.dirty, session.deleted) for obj in group):
+        return
+    if not tracking_enabled(session):
+        return
+
+    pending = session.info.setdefault(PENDING_KEY, {"new": [], "changed": [], "deleted": [], "lands": set()})
+    changed: Dict[Any, Dict[int, Dict[str, Any]]] = defaultdict(dict)
+    objects: Dict[Any, Dict[int, Any]] = defaultdict(dict)
+
+    for obj in session.new:
+        if type(obj) in _TRACKED:
+            pending["new"].append(obj)
+
+    for obj in session.dirty:
+        model = type(obj)
+        if model not in _TRACKED or obj.id is None:
+            continue
+        attrs = inspect(obj).attrs
+        values = {}
+        for field in _TRACKED[model]:
+            history = attrs[field].history
+            if history.added:
+                values[field] = _presence(field, history.added[0])
+        if values:
+            changed[model][obj.id] = values
+            objects[model][obj.id] = obj
+
+    deleted: Dict[Any, List[int]] = defaultdict(list)
+    for obj in session.deleted:
+        if isinstance(obj, models.Land):
+            pending["lands"].add(obj.id)
+        elif type(obj) in _TRACKED and obj.id is not None:
+            deleted[type(obj)].append(obj.id)
+
+    connection = session.connection()
+    for model in _TRACKED:
+        ids = list(changed[model]) + deleted[model]
+        stored = _stored_states(connection, model, ids)
+        for obj_id, values in changed[model].items():
+            if obj_id in stored:
+                pending["changed"].append((model, stored[obj_id], {**stored[obj_id], **values}))
+        for obj_id in deleted[model]:
+            if obj_id in stored:
+                pending["deleted"].append((model, stored[obj_id]))
+
+
+def _new_state(obj) -> State:
+    values = inspect(obj).dict
+    state = {field: _presence(field, values.get(field)) for field in _TRACKED[type(obj)]}
+    if state.get("land_id") is None and getattr(values.get("land"), "id", None) is not None:
+        state["land_id"] = values["land"].id
+    if type(obj) is models.Media and state["expression_id"] is None and values.get("expression") is not None:
+        state["expression_id"] = values["expression"].id
+    return state
+
+
+def discard_flush_changes(session: Session) -> None:
+    """after_soft_rollback : oublie les changements d'un flush qui a échoué (sinon appliqués au suivant)."""
+    session.info.pop(PENDING_KEY, None)
+
+
+def apply_flush_changes(session: Session) -> None:
+    """after_flush : différence nouvel état - ancien état, appliquée dans la transaction du flush."""
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+
+    entries: List[Tuple[Any, State, int]] = []
+    for obj in pending["new"]:
+        entries.append((type(obj), _new_state(obj), 1))
+    for model, old, new in pending["changed"]:
+        entries.append((model, old, -1))
+        entries.append((model, new, 1))
+    for model, old in pending["deleted"]:
+        entries.append((model, old, -1))
+
+    connection = session.connection()
+    expression_ids = {state["expression_id"] for model, state, _ in entries if model is models.Media}
+    if expression_ids:
+        lands = dict(connection.execute(
+            select(models.Expression.id, models.Expression.land_id)
+            .where(models.Expression.id.in_(expression_ids))
+        ).all())
+        for model, state, _ in entries:
+            if model is models.Media:
+                state["_land_id"] = lands.get(state["expression_id"])
+
+    deltas: Counter = Counter()
+    maxima: Dict[CounterKey, float] = {}
+    for model, state, sign in entries:
+        add_state(deltas, maxima, model, state, sign)
+
+    removed_lands = pending["lands"]
+    if removed_lands:
+        deltas = Counter({key: value for key, value in deltas.items() if key[0] not in removed_lands})
+        maxima = {key: value for key, value in maxima.items() if key[0] not in removed_lands}
+    apply_counters(connection, deltas, maxima)
+
+
+# ---------------------------------------------------------------------- #
+# Écriture des compteurs                                                 #
+# ---------------------------------------------------------------------- #
+# Bases avec INSERT ... ON CONFLICT ; ailleurs, UPDATE puis INSERT ligne par ligne
+UPSERT_DIALECTS = ("postgresql", "sqlite")
+
+
+def _insert(connection: Connection):
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(models.LandStatCounter)
+
+
+def _upsert(connection: Connection, rows: List[Dict[str, Any]], merge: Callable[[Any, Any], Any]) -> None:
+    """Écrit les lignes ; merge(valeur stockée, nouvelle valeur) donne la valeur d'un compteur existant."""
+    table = models.LandStatCounter
+    now = datetime.now(timezone.utc)
+    if connection.dialect.name in UPSERT_DIALECTS:
+        stmt = _insert(connection)
+        connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.land_id, table.metric, table.bucket],
+                set_={"value": merge(table.value, stmt.excluded.value), "updated_at": now},
+            ),
+            rows,
+        )
+        return
+
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(table.land_id == row["land_id"], table.metric == row["metric"], table.bucket == row["bucket"])
+            .values(value=merge(table.value, literal(row["value"], Float)), updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(**row, updated_at=now))
+
+
+def apply_counters(
+    connection: Connection,
+    deltas: Dict[CounterKey, float],
+    maxima: Optional[Dict[CounterKey, float]] = None
+) -> None:
+    """
+    Ajoute les deltas (et applique les maximums) aux compteurs, par UPSERT groupé.
+
+    Les lignes sont écrites dans l'ordre (land_id, metric, bucket) : deux
+    transactions concurrentes verrouillent alors les compteurs dans le même
+    ordre et ne peuvent pas s'interbloquer.
+    """
+    rows = [
+        {"land_id": land_id, "metric": metric, "bucket": bucket, "value": value}
+        for (land_id, metric, bucket), value in sorted(deltas.items()) if value
+    ]
+    if rows:
+        _upsert(connection, rows, lambda stored, new: stored + new)
+
+    rows = [
+        {"land_id": land_id, "metric": metric, "bucket": bucket, "value": value}
+        for (land_id, metric, bucket), value in sorted((maxima or {}).items())
+    ]
+    if rows:
+        _upsert(connection, rows, lambda stored, new: case((new > stored, new), else_=stored))
+
+
+def apply_land_deltas(db: Session, deltas: Dict[CounterKey, float]) -> None:
+    """Deltas fournis par un écrivain qui contourne l'ORM (UPDATE groupé), dans sa transaction."""
+    if tracking_enabled(db):
+        apply_counters(db.connection(), deltas)
+
+
+def refresh_land_stats(db: Session, land_id: int) -> None:
+    """Recalcul complet des compteurs d'un land (lecture en flux de ses lignes)."""
+    deltas: Counter = Counter()
+    maxima: Dict[CounterKey, float] = {}
+
+    queries = (
+        (models.Expression, select(*_columns(models.Expression, EXPRESSION_FIELDS))
+         .where(models.Expression.land_id == land_id)),
+        (models.Media, select(*_columns(models.Media, MEDIA_FIELDS), models.Expression.land_id.label("_land_id"))
+         .join(models.Expression, models.Expression.id == models.Media.expression_id)
+         .where(models.Expression.land_id == land_id)),
+        (models.CrawlJob, select(*_columns(models.CrawlJob, JOB_FIELDS)).where(models.CrawlJob.land_id == land_id)),
+        (models.Export, select(*_columns(models.Export, EXPORT_FIELDS)).where(models.Export.land_id == land_id)),
+    )
+    for model, query in queries:
+        for row in db.execute(query.execution_options(yield_per=2000)).mappings():
+            add_state(deltas, maxima, model, dict(row))
+    maxima[(land_id, *REFRESHED_AT)] = datetime.now(timezone.utc).timestamp()
+
+    db.execute(delete(models.LandStatCounter).where(models.LandStatCounter.land_id == land_id))
+    apply_counters(db.connection(), deltas, maxima)
+    db.commit()
+    logger.info(f"Land {land_id} statistics recomputed ({int(deltas.get((land_id, 'expressions', 'total'), 0))} expressions)")
+
+
+# ---------------------------------------------------------------------- #
+# Lecture                                                                #
+# ---------------------------------------------------------------------- #
+def read_counters(db: Session, land_id: int) -> Dict[str, Dict[str, float]]:
+    """{métrique: {case: valeur}} d'un land."""
+    counters: Dict[str, Dict[str, float]] = defaultdict(dict)
+    rows = db.execute(
+        select(models.LandStatCounter.metric, models.LandStatCounter.bucket, models.LandStatCounter.value)
+        .where(models.LandStatCounter.land_id == land_id)
+    ).all()
+    for metric, bucket, value in rows:
+        counters[metric][bucket] = value
+    return counters
+
+
+def get_land_stats(db: Session, land_id: int, refresh: bool = False) -> Dict[str, Any]:
+    """
+    Statistiques d'un land à partir des compteurs.
+
+    Les compteurs sont recalculés si refresh est vrai ou s'ils n'ont jamais
+    été initialisés pour ce land (land antérieur à la migration).
+    """
+    counters = read_counters(db, land_id)
+    if refresh or REFRESHED_AT[1] not in counters.get(REFRESHED_AT[0], {}):
+        refresh_land_stats(db, land_id)
+        counters = read_counters(db, land_id)
+    return build_land_stats(counters)
+
+
+def _counts(bucket: Dict[str, float]) -> Dict[str, int]:
+    return {key: int(round(value)) for key, value in sorted(bucket.items(), key=lambda item: -item[1]) if round(value)}
+
+
+def _average(total: float, count: float) -> float:
+    return round(total / count, 4) if count else 0.0
+
+
+def _iso(epoch: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat() if epoch else None
+
+
+def build_land_stats(counters: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    """Mise en forme des compteurs (aucune requête)."""
+    get = lambda metric, bucket="": counters.get(metric, {}).get(bucket, 0.0)  # noqa: E731
+    expressions = {key: int(round(get("expressions", key))) for key in (
+        "total", "fetched", "not_fetched", "approved", "relevant", "readable",
+        "fetched_not_relevant", "relevant_not_approved", "inconsistent",
+    )}
+
+    def depth_key(depth: str):
+        return (depth == "none", int(depth) if depth != "none" else 0)
+
+    by_depth = [
+        {
+            "depth": int(depth) if depth != "none" else None,
+            "count": int(round(count)),
+            "approved_count": int(round(get("depth_approved", depth))),
+            "avg_relevance": _average(get("depth_relevance_sum", depth), get("depth_relevance_count", depth)),
+        }
+        for depth, count in sorted(counters.get("depth", {}).items(), key=lambda item: depth_key(item[0]))
+        if round(count)
+    ]
+
+    days = sorted((day for day, count in counters.get("created_day", {}).items() if round(count)), reverse=True)
+    timeline = [
+        {
+            "date": date.fromisoformat(day).isoformat(),
+            "created_count": int(round(get("created_day", day))),
+            "crawled_count": int(round(get("crawled_by_created_day", day))),
+            "approved_count": int(round(get("approved_by_created_day", day))),
+        }
+        for day in days[:TIMELINE_DAYS]
+    ]
+
+    jobs: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"by_status": {}})
+    for key, count in counters.get("jobs", {}).items():
+        job_type, _, status = key.rpartition(":")
+        if round(count):
+            jobs[job_type]["by_status"][status] = int(round(count))
+    for key, epoch in counters.get("last_activity", {}).items():
+        job_type, _, status = key.rpartition(":")
+        if job_type in jobs:
+            jobs[job_type][f"last_{status}_at"] = _iso(epoch)
+    for job_type, entry in jobs.items():
+        completed = entry["by_status"].get(models.CrawlStatus.COMPLETED.value, 0)
+        entry["avg_duration_seconds"] = _average(get("job_seconds", job_type), completed)
+
+    return {
+        "expressions": expressions,
+        "by_depth": by_depth,
+        "by_lang": _counts(counters.get("lang", {})),
+        "by_http_status": _counts(counters.get("http_status", {})),
+        "relevance": {
+            "avg": _average(get("relevance", "sum"), get("relevance", "count")),
+            "max": get("relevance_max"),
+            "scored": int(round(get("relevance", "count"))),
+            "histogram": {
+                key: int(round(value))
+                for key, value in sorted(counters.get("relevance_floor", {}).items(), key=lambda item: float(item[0]))
+                if round(value)
+            },
+        },
+        "quality": {
+            "avg": _average(get("quality", "sum"), get("quality", "count")),
+            "scored": int(round(get("quality", "count"))),
+        },
+        "media": {
+            "total": int(round(get("media", "total"))),
+            "processed": int(round(get("media", "processed"))),
+            "by_type": _counts(counters.get("media_type", {})),
+        },
+        "jobs": dict(jobs),
+        "exports": {
+            "total": int(round(get("exports", "total"))),
+            "records": int(round(get("exports", "records"))),
+            "by_type": _counts(counters.get("export_type", {})),
+            "last_export_at": _iso(get("last_activity", "export")),
+        },
+        "timeline": timeline,
+        "refreshed_at": _iso(get(*REFRESHED_AT)),
+    }
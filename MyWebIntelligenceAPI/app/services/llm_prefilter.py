@@ -0,0 +1,194 @@
+"""
+Pre-filter cascade in front of LLM relevance validation.
+
+Cheap deterministic stages decide the obvious cases so that the LLM is only
+called on the uncertain band:
+    1. relevance  - dictionary relevance below / above configured thresholds
+    2. quality    - blocking QualityScorer flags (HTTP error, no content, ...)
+    3. language   - expression language not among the land languages
+    4. duplicate  - near-duplicate (SimHash) of an already validated page
+"""
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import Expression
+from app.services.quality_scorer import QualityScorer
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+PREFILTER_STAGES = ("relevance", "quality", "language", "duplicate")
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class PrefilterDecision:
+    """Outcome of the cascade: verdict None means the LLM must decide."""
+    verdict: Optional[bool]
+    stage: str
+    reason: str = ""
+
+    @property
+    def model_label(self) -> str:
+        """Value stored in valid_model when the cascade decided."""
+        return f"prefilter/{self.stage}"
+
+
+def simhash(text: str, shingle_size: int = 3) -> Optional[int]:
+    """64-bit SimHash of word shingles (None for texts without words)."""
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return None
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+
+    votes = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            votes[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit in range(SIMHASH_BITS) if votes[bit] > 0)
+
+
+class DuplicateIndex:
+    """
+    SimHash index of validated pages.
+
+    Fingerprints are split in SIMHASH_BANDS bands: two fingerprints within
+    max_distance < SIMHASH_BANDS bits share at least one identical band, so
+    candidates are found by band lookup instead of a full scan.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self._band_bits = SIMHASH_BITS // SIMHASH_BANDS
+        self._bands: List[Dict[int, List[Tuple[int, int, bool]]]] = [{} for _ in range(SIMHASH_BANDS)]
+        self.size = 0
+
+    def add(self, expression_id: int, text: Optional[str], is_relevant: bool) -> None:
+        fingerprint = simhash(text) if text else None
+        if fingerprint is None:
+            return
+        entry = (fingerprint, expression_id, is_relevant)
+        for band, key in enumerate(self._keys(fingerprint)):
+            self._bands[band].setdefault(key, []).append(entry)
+        self.size += 1
+
+    def find(self, expression_id: int, text: Optional[str]) -> Optional[Tuple[int, bool]]:
+        """Return (expression_id, verdict) of a validated near-duplicate, if any."""
+        fingerprint = simhash(text) if text else None
+        if fingerprint is None:
+            return None
+        for band, key in enumerate(self._keys(fingerprint)):
+            for other, other_id, is_relevant in self._bands[band].get(key, ()):
+                if other_id != expression_id and bin(fingerprint ^ other).count("1") <= self.max_distance:
+                    return other_id, is_relevant
+        return None
+
+    def _keys(self, fingerprint: int) -> List[int]:
+        mask = (1 << self._band_bits) - 1
+        return [fingerprint >> (band * self._band_bits) & mask for band in range(SIMHASH_BANDS)]
+
+
+class LLMPrefilter:
+    """
+    Configurable cascade deciding expressions before any LLM call.
+
+    Counts per stage are kept in self.stats; the "llm" entry is the number
+    of expressions left to the model, the others are saved calls.
+    """
+
+    def __init__(
+        self,
+        min_relevance: Optional[float] = None,
+        accept_relevance: Optional[float] = None,
+        reject_flags: Optional[List[str]] = None,
+        check_language: Optional[bool] = None,
+        duplicate_distance: Optional[int] = None
+    ):
+        self.min_relevance = settings.LLM_PREFILTER_MIN_RELEVANCE if min_relevance is None else min_relevance
+        self.accept_relevance = settings.LLM_PREFILTER_ACCEPT_RELEVANCE if accept_relevance is None else accept_relevance
+        if reject_flags is None:
+            reject_flags = [flag.strip() for flag in settings.LLM_PREFILTER_REJECT_FLAGS.split(",") if flag.strip()]
+        self.reject_flags = set(reject_flags)
+        self.check_language = settings.LLM_PREFILTER_LANGUAGE_CHECK if check_language is None else check_language
+        distance = settings.LLM_PREFILTER_DUPLICATE_DISTANCE if duplicate_distance is None else duplicate_distance
+        self.duplicates = DuplicateIndex(distance) if 0 <= distance < SIMHASH_BANDS else None
+        self.scorer = QualityScorer()
+        self.stats: Dict[str, int] = {stage: 0 for stage in PREFILTER_STAGES + ("llm",)}
+
+    def load_validated(self, db: Session, land_id: int, batch_size: int = 500) -> int:
+        """Seed the duplicate index with the land's already validated expressions."""
+        if self.duplicates is None:
+            return 0
+        rows = db.query(Expression.id, Expression.readable, Expression.valid_llm).filter(
+            Expression.land_id == land_id,
+            Expression.valid_llm.isnot(None),
+            Expression.readable.isnot(None)
+        ).yield_per(batch_size)
+        for expression_id, readable, valid_llm in rows:
+            self.duplicates.add(expression_id, readable, valid_llm == 'oui')
+        return self.duplicates.size
+
+    def remember(self, expression, is_relevant: bool) -> None:
+        """Register a freshly validated expression for later duplicate checks."""
+        if self.duplicates is not None:
+            self.duplicates.add(expression.id, getattr(expression, 'readable', None), is_relevant)
+
+    def decide(self, expression, land) -> PrefilterDecision:
+        """Run the cascade; the first stage that can decide wins."""
+        decision = self._decide(expression, land)
+        self.stats[decision.stage if decision.verdict is not None else "llm"] += 1
+        return decision
+
+    @property
+    def calls_saved(self) -> int:
+        return sum(self.stats[stage] for stage in PREFILTER_STAGES)
+
+    def _decide(self, expression, land) -> PrefilterDecision:
+        relevance = getattr(expression, 'relevance', None)
+        if relevance is not None:
+            if relevance <= self.min_relevance:
+                return PrefilterDecision(False, "relevance", f"relevance {relevance} <= {self.min_relevance}")
+            if self.accept_relevance is not None and relevance >= self.accept_relevance:
+                return PrefilterDecision(True, "relevance", f"relevance {relevance} >= {self.accept_relevance}")
+
+        if self.reject_flags:
+            flags = set(self.scorer.compute_quality_score(expression, land)["flags"])
+            blocking = sorted(flags & self.reject_flags)
+            if blocking:
+                return PrefilterDecision(False, "quality", ", ".join(blocking))
+
+        if self.check_language:
+            expr_lang = getattr(expression, 'lang', None)
+            land_languages = self._land_languages(land)
+            if expr_lang and land_languages and expr_lang.lower()[:2] not in land_languages:
+                return PrefilterDecision(False, "language", f"{expr_lang} not in {sorted(land_languages)}")
+
+        if self.duplicates is not None:
+            match = self.duplicates.find(expression.id, getattr(expression, 'readable', None))
+            if match:
+                return PrefilterDecision(match[1], "duplicate", f"near-duplicate of expression {match[0]}")
+
+        return PrefilterDecision(None, "llm")
+
+    @staticmethod
+    def _land_languages(land) -> set:
+        """Land languages as lower-case ISO 639-1 codes (JSON list or "fr,en")."""
+        value = getattr(land, 'lang', None)
+        if not value:
+            return set()
+        if isinstance(value, str):
+            value = value.split(",")
+        return {str(lang).strip().lower()[:2] for lang in value if str(lang).strip()}
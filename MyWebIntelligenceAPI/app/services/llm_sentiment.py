@@ -0,0 +1,322 @@
+"""
+Batched LLM sentiment analysis through OpenRouter.
+
+Several texts share one request, requests run concurrently on one HTTP
+pool (bounded by OPENROUTER_MAX_CONCURRENCY and the per-model token
+bucket), and answers are cached in llm_responses by (model, text hash).
+Each land has a token budget; once it is spent, or while the API is rate
+limiting, texts are analyzed with TextBlob instead of waiting.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.sentiment_provider import SentimentModelProvider
+from app.services.llm_validation_pipeline import LLMResponseCache, TokenBucket
+from app.services.llm_validation_service import LLMValidationService, estimate_tokens
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SENTIMENT_SYSTEM_PROMPT = (
+    "You are a sentiment analysis engine. For each numbered text you return its overall sentiment. "
+    "You answer only with a valid JSON object, without markdown, comment or additional text."
+)
+
+MAX_TEXT_LENGTH = 1000
+COMPLETION_TOKENS_PER_TEXT = 30
+LABELS = ("positive", "neutral", "negative")
+
+SentimentItem = Tuple[Hashable, str, str]  # (key, text, language)
+
+
+def sentiment_key(text: str, language: str) -> str:
+    """Cache key of a text (stored as prompt_hash with the model name)."""
+    payload = f"sentiment\n{language}\n{text[:MAX_TEXT_LENGTH]}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SentimentRateLimited(Exception):
+    """OpenRouter answered 429; carries the Retry-After delay if any."""
+
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__(f"Rate limited (retry after {retry_after}s)")
+        self.retry_after = retry_after
+
+
+class LandTokenBudget:
+    """Tokens spent per land, against a fixed limit (0 = unlimited)."""
+
+    def __init__(self, limit: int):
+        self.limit = max(limit, 0)
+        self.used: Dict[Optional[int], int] = {}
+
+    def allows(self, land_id: Optional[int], tokens: int) -> bool:
+        return not self.limit or self.used.get(land_id, 0) + tokens <= self.limit
+
+    def consume(self, land_id: Optional[int], tokens: int) -> None:
+        self.used[land_id] = self.used.get(land_id, 0) + tokens
+
+    def exhaust(self, land_id: Optional[int]) -> None:
+        """Keep the land on TextBlob for the rest of the run."""
+        self.used[land_id] = max(self.used.get(land_id, 0), self.limit)
+
+    def exhausted(self, land_id: Optional[int]) -> bool:
+        return bool(self.limit) and self.used.get(land_id, 0) >= self.limit
+
+
+class LLMSentimentAnalyzer:
+    """
+    Analyze lists of texts with an LLM, degrading to TextBlob.
+
+    Returns provider-style results ({score, label, confidence, status, model}).
+    One instance lives as long as a crawl or a reprocessing run: token
+    budgets and rate-limit cooldowns are tracked on it.
+    """
+
+    def __init__(
+        self,
+        db: Optional[Session] = None,
+        model: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        texts_per_request: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        use_cache: Optional[bool] = None
+    ):
+        self.db = db
+        self.model = model or settings.SENTIMENT_LLM_MODEL or settings.OPENROUTER_MODEL
+        self.max_concurrency = max_concurrency or settings.OPENROUTER_MAX_CONCURRENCY
+        self.texts_per_request = max(texts_per_request or settings.SENTIMENT_LLM_TEXTS_PER_REQUEST, 1)
+        self.budget = LandTokenBudget(
+            settings.SENTIMENT_LLM_TOKEN_BUDGET_PER_LAND if token_budget is None else token_budget
+        )
+        use_cache = settings.LLM_RESPONSE_CACHE_ENABLED if use_cache is None else use_cache
+        self.cache = LLMResponseCache(db) if db is not None and use_cache else None
+        self.provider = SentimentModelProvider()
+        self.service = LLMValidationService(db)
+        rate = settings.OPENROUTER_MODEL_RATE_LIMITS.get(self.model, settings.OPENROUTER_REQUESTS_PER_MINUTE)
+        self.bucket = TokenBucket(rate)
+        self.cooldown_until = 0.0
+        self.stats: Dict[str, int] = {
+            "llm": 0,
+            "cache_hits": 0,
+            "textblob": 0,
+            "api_calls": 0,
+            "total_tokens": 0,
+            "rate_limited": 0,
+            "budget_exhausted": 0,
+        }
+
+    @property
+    def llm_available(self) -> bool:
+        return bool(settings.OPENROUTER_ENABLED and settings.OPENROUTER_API_KEY)
+
+    def analyze_many(self, items: List[SentimentItem], land_id: Optional[int] = None) -> Dict[Hashable, Dict[str, Any]]:
+        """Synchronous entry point (Celery workers, crawler)."""
+        return asyncio.run(self.analyze_many_async(items, land_id))
+
+    async def analyze_many_async(
+        self,
+        items: List[SentimentItem],
+        land_id: Optional[int] = None
+    ) -> Dict[Hashable, Dict[str, Any]]:
+        """
+        Sentiment of every item, keyed like the input.
+
+        New cache entries are added to the session; the caller commits.
+        """
+        results: Dict[Hashable, Dict[str, Any]] = {}
+        texts: Dict[str, Tuple[str, str]] = {}
+        keys: Dict[Hashable, str] = {}
+        for key, text, language in items:
+            if not text or len(text.strip()) < 10:
+                results[key] = self._empty("no_content")
+            elif not language or not self.provider.is_language_supported(language):
+                results[key] = self._empty("unsupported_lang")
+            else:
+                text = text.strip()[:MAX_TEXT_LENGTH]
+                keys[key] = sentiment_key(text, language)
+                texts.setdefault(keys[key], (text, language))
+
+        analyzed: Dict[str, Dict[str, Any]] = {}
+        if self.cache and texts:
+            for text_hash, entry in self.cache.get_many(self.model, list(texts)).items():
+                result = self._coerce(self._load(entry.content))
+                if result is not None:
+                    analyzed[text_hash] = result
+            self.stats["cache_hits"] += sum(1 for text_hash in keys.values() if text_hash in analyzed)
+
+        # Identical texts share one slot in a request
+        pending = [text_hash for text_hash in texts if text_hash not in analyzed]
+        if pending and self.llm_available:
+            packs = [pending[i:i + self.texts_per_request] for i in range(0, len(pending), self.texts_per_request)]
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+            async with httpx.AsyncClient(limits=limits) as client:
+                answers = await asyncio.gather(
+                    *(self._call_pack(client, semaphore, pack, texts, land_id) for pack in packs),
+                    return_exceptions=True
+                )
+            for pack, answer in zip(packs, answers):
+                if isinstance(answer, BaseException):
+                    logger.error(f"LLM sentiment call failed: {answer}")
+                    continue
+                for text_hash, result in answer.items():
+                    analyzed[text_hash] = result
+                    if self.cache:
+                        self.cache.store(self.model, text_hash, {"content": json.dumps(result), "usage": {}})
+
+        for key, text_hash in keys.items():
+            if text_hash in analyzed:
+                results[key] = self._to_result(analyzed[text_hash])
+                self.stats["llm"] += 1
+            else:
+                text, language = texts[text_hash]
+                results[key] = self.provider._analyze_textblob(text, language)
+                self.stats["textblob"] += 1
+        return results
+
+    async def _call_pack(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        pack: List[str],
+        texts: Dict[str, Tuple[str, str]],
+        land_id: Optional[int]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Analyze one pack; returns {} (TextBlob fallback) when degraded."""
+        prompt = self.build_prompt([texts[text_hash] for text_hash in pack])
+        estimate = estimate_tokens(SENTIMENT_SYSTEM_PROMPT + prompt) + COMPLETION_TOKENS_PER_TEXT * len(pack)
+
+        async with semaphore:
+            if time.monotonic() < self.cooldown_until:
+                return {}
+            if not self.budget.allows(land_id, estimate):
+                if not self.budget.exhausted(land_id):
+                    logger.warning(f"LLM sentiment token budget reached for land {land_id}, using TextBlob")
+                self.budget.exhaust(land_id)
+                self.stats["budget_exhausted"] += 1
+                return {}
+            if not self.bucket.try_acquire():
+                self.stats["rate_limited"] += 1
+                return {}
+
+            try:
+                response = await self._post(client, prompt)
+            except SentimentRateLimited as exc:
+                cooldown = exc.retry_after or settings.SENTIMENT_LLM_RATE_LIMIT_COOLDOWN
+                self.cooldown_until = time.monotonic() + cooldown
+                self.stats["rate_limited"] += 1
+                logger.warning(f"LLM sentiment rate limited, using TextBlob for {cooldown}s")
+                return {}
+
+        usage = response.get("usage") or {}
+        tokens = (usage.get("prompt_tokens") or 0) + (usage.get("completion_tokens") or 0) or estimate
+        self.budget.consume(land_id, tokens)
+        self.stats["api_calls"] += 1
+        self.stats["total_tokens"] += tokens
+
+        parsed = self.parse_response(response.get("content", ""), len(pack))
+        return {pack[index]: result for index, result in parsed.items()}
+
+    async def _post(self, client: httpx.AsyncClient, prompt: str) -> Dict[str, Any]:
+        """Single attempt: a 429 degrades to TextBlob rather than being retried."""
+        headers, payload = self.service._build_request(prompt, self.model, SENTIMENT_SYSTEM_PROMPT)
+        response = await client.post(
+            self.service.base_url,
+            headers=headers,
+            json=payload,
+            timeout=self.service.timeout
+        )
+        if response.status_code == 429:
+            try:
+                retry_after = float(response.headers.get("Retry-After") or 0) or None
+            except ValueError:
+                retry_after = None
+            raise SentimentRateLimited(retry_after)
+        if response.status_code != 200:
+            raise ValueError(f"API error {response.status_code}: {response.text}")
+        return self.service._parse_api_response(response.json())
+
+    @staticmethod
+    def build_prompt(texts: List[Tuple[str, str]]) -> str:
+        """Numbered texts (1-based) and the expected JSON answer."""
+        blocks = "\n\n".join(
+            f"[{index}] ({language})\n{text}" for index, (text, language) in enumerate(texts, start=1)
+        )
+        return f"""Analyze the sentiment of each numbered text below (language code in parentheses).
+
+{blocks}
+
+Respond with ONLY a JSON object mapping each text number to its result:
+{{"1": {{"sentiment": "positive" or "neutral" or "negative", "score": -1.0 to 1.0, "confidence": 0.0 to 1.0}}}}"""
+
+    @classmethod
+    def parse_response(cls, content: str, count: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Parse an answer into {pack index (0-based): sentiment}.
+
+        Texts missing or malformed in the answer are left out (TextBlob fallback).
+        """
+        data = cls._load(content)
+        if isinstance(data, dict) and "sentiment" in data and count == 1:
+            data = {"1": data}
+        if isinstance(data, list):
+            data = {str(index): item for index, item in enumerate(data, start=1)}
+        if not isinstance(data, dict):
+            return {}
+
+        parsed: Dict[int, Dict[str, Any]] = {}
+        for number, item in data.items():
+            try:
+                index = int(number) - 1
+            except (TypeError, ValueError):
+                continue
+            result = cls._coerce(item)
+            if result is not None and 0 <= index < count:
+                parsed[index] = result
+        return parsed
+
+    @staticmethod
+    def _load(content: Optional[str]) -> Any:
+        """JSON value embedded in an answer (code fences and prose are tolerated)."""
+        if not content:
+            return None
+        for opening, closing in (("{", "}"), ("[", "]")):
+            start, end = content.find(opening), content.rfind(closing)
+            if 0 <= start < end:
+                try:
+                    return json.loads(content[start:end + 1])
+                except ValueError:
+                    continue
+        return None
+
+    @staticmethod
+    def _coerce(item: Any) -> Optional[Dict[str, Any]]:
+        if not isinstance(item, dict) or item.get("sentiment") not in LABELS:
+            return None
+        try:
+            score = max(-1.0, min(1.0, float(item["score"])))
+            confidence = max(0.0, min(1.0, float(item.get("confidence", abs(score)))))
+        except (KeyError, TypeError, ValueError):
+            return None
+        return {"sentiment": item["sentiment"], "score": round(score, 3), "confidence": round(confidence, 3)}
+
+    def _to_result(self, sentiment: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "score": sentiment["score"],
+            "label": sentiment["sentiment"],
+            "confidence": sentiment["confidence"],
+            "status": "computed",
+            "model": f"llm/{self.model}"
+        }
+
+    @staticmethod
+    def _empty(status: str) -> Dict[str, Any]:
+        return {"score": None, "label": None, "confidence": None, "status": status, "model": None}
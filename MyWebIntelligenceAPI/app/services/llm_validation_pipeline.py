@@ -0,0 +1,442 @@
+"""
+Concurrent LLM validation pipeline for a whole land.
+Runs inside a Celery worker: one event loop, one shared HTTP connection pool,
+token-bucket rate limiting per model and a response cache in llm_responses.
+A pre-filter cascade (llm_prefilter) decides the obvious cases first.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import settings
+from app.db.models import Expression, LLMResponse
+from app.services.llm_prefilter import LLMPrefilter
+from app.services.llm_validation_service import (
+    BATCH_SYSTEM_PROMPT,
+    LLMValidationService,
+    estimate_tokens,
+    prompt_hash,
+)
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+MIN_READABLE_LENGTH = 50
+
+ProgressCallback = Callable[[int, int, Dict[str, Any]], None]
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING; the cache is off elsewhere
+CACHE_DIALECTS = ('postgresql', 'sqlite')
+_unsupported_dialects_logged = set()
+
+
+class TokenBucket:
+    """
+    Async token bucket: at most `rate_per_minute` acquisitions per minute,
+    with bursts up to `capacity`.
+    """
+
+    def __init__(self, rate_per_minute: int, capacity: Optional[int] = None):
+        self.rate = max(rate_per_minute, 1) / 60.0
+        self.capacity = float(capacity or max(1, min(rate_per_minute, 10)))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while not self.try_acquire():
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without waiting."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class LLMResponseCache:
+    """
+    Responses already paid for, keyed by (model, prompt hash).
+
+    On a database without ON CONFLICT support the cache is disabled: lookups
+    miss and responses are not stored.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        dialect = db.get_bind().dialect.name
+        self.enabled = dialect in CACHE_DIALECTS
+        if not self.enabled and dialect not in _unsupported_dialects_logged:
+            _unsupported_dialects_logged.add(dialect)
+            logger.warning(f"LLM response cache disabled: no ON CONFLICT support on {dialect}")
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, LLMResponse]:
+        if not hashes or not self.enabled:
+            return {}
+        entries = self.db.query(LLMResponse).filter(
+            LLMResponse.model == model,
+            LLMResponse.prompt_hash.in_(hashes)
+        ).all()
+        now = datetime.now(timezone.utc)
+        for entry in entries:
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_used_at = now
+        return {entry.prompt_hash: entry for entry in entries}
+
+    def store(self, model: str, key: str, response: Dict[str, Any]) -> None:
+        """
+        Insert a response; a row already written for the same (model, prompt
+        hash), e.g. by a concurrent worker, is kept as is.
+        """
+        if not self.enabled:
+            return
+        usage = response.get('usage') or {}
+        stmt = self._insert().values(
+            model=model,
+            prompt_hash=key,
+            content=response.get('content', ''),
+            prompt_tokens=usage.get('prompt_tokens'),
+            completion_tokens=usage.get('completion_tokens'),
+            hit_count=0,
+            last_used_at=datetime.now(timezone.utc),
+        ).on_conflict_do_nothing(index_elements=['model', 'prompt_hash'])
+        self.db.execute(stmt)
+
+    def _insert(self):
+        if self.db.get_bind().dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(LLMResponse)
+
+
+class LLMValidationPipeline:
+    """
+    Validate the relevant expressions of a land with bounded concurrency.
+
+    Expressions are processed in batches: prompts are built and looked up
+    in the cache, the remaining unique prompts are sent concurrently through
+    the shared client, then results are written and committed per batch.
+    With batched=True, several pages share one request (bounded by
+    LLM_VALIDATION_BATCH_TOKEN_BUDGET); pages whose verdict cannot be parsed
+    fall back to single-page calls.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        model: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        use_cache: Optional[bool] = None,
+        prefilter: Optional[LLMPrefilter] = None,
+        batched: bool = False
+    ):
+        self.db = db
+        self.model = model or settings.OPENROUTER_MODEL
+        self.max_concurrency = max_concurrency or settings.OPENROUTER_MAX_CONCURRENCY
+        self.use_cache = settings.LLM_RESPONSE_CACHE_ENABLED if use_cache is None else use_cache
+        self.service = LLMValidationService(db)
+        self.cache = LLMResponseCache(db)
+        if prefilter is None and settings.LLM_PREFILTER_ENABLED:
+            prefilter = LLMPrefilter()
+        self.prefilter = prefilter
+        self.batched = batched
+        self.batch_token_budget = settings.LLM_VALIDATION_BATCH_TOKEN_BUDGET
+        self.batch_max_pages = settings.LLM_VALIDATION_BATCH_MAX_PAGES
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def candidate_ids(
+        self,
+        land_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        force: bool = False
+    ) -> List[int]:
+        """IDs of relevant expressions to validate (same rules as the reprocess script)."""
+        query = self.db.query(Expression.id).filter(Expression.relevance > 0)
+        if land_id:
+            query = query.filter(Expression.land_id == land_id)
+        if not force:
+            query = query.filter(Expression.valid_llm.is_(None))
+        query = query.order_by(Expression.id)
+        if limit:
+            query = query.limit(limit)
+        return [row[0] for row in query.all()]
+
+    def run(
+        self,
+        land_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        force: bool = False,
+        batch_size: int = 100,
+        dry_run: bool = False,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate candidates of a land and return statistics.
+
+        Args:
+            land_id: Filter by land (None = all lands)
+            limit: Max number of expressions
+            force: Revalidate expressions that already have valid_llm
+            batch_size: Expressions per batch (one commit per batch)
+            dry_run: Call the model but do not write expressions
+            progress: Called after each batch with (done, total, stats)
+        """
+        ids = self.candidate_ids(land_id, limit, force)
+        if self.prefilter and land_id:
+            self.prefilter.load_validated(self.db, land_id)
+        return asyncio.run(self._run(ids, max(batch_size, 1), dry_run, progress))
+
+    async def _run(
+        self,
+        ids: List[int],
+        batch_size: int,
+        dry_run: bool,
+        progress: Optional[ProgressCallback]
+    ) -> Dict[str, Any]:
+        stats = {
+            "model": self.model,
+            "total_candidates": len(ids),
+            "processed": 0,
+            "validated": 0,
+            "rejected": 0,
+            "skipped": 0,
+            "errors": 0,
+            "api_calls": 0,
+            "cache_hits": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "duration_seconds": 0.0,
+            "pages_per_minute": 0.0,
+            "batched_requests": 0,
+            "batch_fallbacks": 0,
+        }
+        if self.prefilter:
+            stats["prefilter"] = dict(self.prefilter.stats)
+            stats["llm_calls_saved"] = 0
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency
+        )
+
+        async with httpx.AsyncClient(limits=limits) as client:
+            for start in range(0, len(ids), batch_size):
+                batch_ids = ids[start:start + batch_size]
+                # DB work is synchronous and happens between batches, while no request is in flight
+                await self._process_batch(client, semaphore, batch_ids, dry_run, stats)
+
+                done = min(start + batch_size, len(ids))
+                elapsed = time.monotonic() - started
+                stats["duration_seconds"] = round(elapsed, 2)
+                stats["pages_per_minute"] = round(stats["processed"] / elapsed * 60, 1) if elapsed > 0 else 0.0
+                if self.prefilter:
+                    stats["prefilter"] = dict(self.prefilter.stats)
+                    stats["llm_calls_saved"] = self.prefilter.calls_saved
+                if progress:
+                    progress(done, len(ids), dict(stats))
+
+        logger.info(
+            f"LLM validation done: {stats['processed']} processed, {stats['cache_hits']} cache hits, "
+            f"{stats['api_calls']} API calls, {stats['total_tokens']} tokens, "
+            f"{stats['pages_per_minute']} pages/min"
+        )
+        return stats
+
+    async def _process_batch(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        batch_ids: List[int],
+        dry_run: bool,
+        stats: Dict[str, Any]
+    ) -> None:
+        expressions = self.db.query(Expression).options(
+            selectinload(Expression.land)
+        ).filter(Expression.id.in_(batch_ids)).all()
+
+        keys: Dict[int, str] = {}
+        prompts: Dict[str, str] = {}
+        pages: Dict[str, Expression] = {}
+        for expr in expressions:
+            if not expr.land or not expr.readable or len(expr.readable.strip()) < MIN_READABLE_LENGTH:
+                stats["skipped"] += 1
+                continue
+            if self.prefilter:
+                decision = self.prefilter.decide(expr, expr.land)
+                if decision.verdict is not None:
+                    self._apply(expr, decision.verdict, decision.model_label, dry_run, stats)
+                    continue
+            prompt = self.service._build_relevance_prompt(expr, expr.land)
+            key = prompt_hash(prompt)
+            keys[expr.id] = key
+            prompts[key] = prompt
+            pages.setdefault(key, expr)
+
+        contents: Dict[str, str] = {}
+        if self.use_cache:
+            for key, entry in self.cache.get_many(self.model, list(prompts)).items():
+                contents[key] = entry.content or ''
+        stats["cache_hits"] += sum(1 for key in keys.values() if key in contents)
+
+        # Duplicate pages share one prompt hash, hence one API call
+        pending = [key for key in prompts if key not in contents]
+        if self.batched and len(pending) > 1:
+            pending = await self._call_packs(client, semaphore, pending, pages, contents, stats)
+
+        responses = await asyncio.gather(
+            *(self._call(client, semaphore, prompts[key]) for key in pending),
+            return_exceptions=True
+        )
+        for key, response in zip(pending, responses):
+            if isinstance(response, BaseException):
+                logger.error(f"LLM validation call failed: {response}")
+                continue
+            self._count_usage(response, stats)
+            contents[key] = response.get('content', '')
+            if self.use_cache:
+                self.cache.store(self.model, key, response)
+
+        for expr in expressions:
+            key = keys.get(expr.id)
+            if key is None:
+                continue
+            if key not in contents:
+                stats["errors"] += 1
+                continue
+
+            is_relevant = self.service._parse_yes_no_response(contents[key])
+            self._apply(expr, is_relevant, self.model, dry_run, stats)
+            if self.prefilter:
+                self.prefilter.remember(expr, is_relevant)
+
+        self.db.commit()
+
+    async def _call_packs(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        pending: List[str],
+        pages: Dict[str, Expression],
+        contents: Dict[str, str],
+        stats: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Validate pending pages with multi-page prompts.
+
+        Verdicts are stored in contents (and in the cache under the single-page
+        prompt hash). Returns the keys left undecided by unparsable or
+        incomplete answers, to be sent as single-page calls.
+        """
+        packs = self._pack(pending, pages)
+        results = await asyncio.gather(
+            *(self._call_pack(client, semaphore, [pages[key] for key in pack]) for pack in packs),
+            return_exceptions=True
+        )
+
+        fallback = []
+        for pack, result in zip(packs, results):
+            verdicts: Dict[int, bool] = {}
+            if isinstance(result, BaseException):
+                logger.error(f"Batched LLM validation call failed: {result}")
+            else:
+                response, verdicts = result
+                stats["batched_requests"] += 1
+                self._count_usage(response, stats)
+
+            for key in pack:
+                expression_id = pages[key].id
+                if expression_id not in verdicts:
+                    fallback.append(key)
+                    continue
+                contents[key] = 'oui' if verdicts[expression_id] else 'non'
+                if self.use_cache:
+                    self.cache.store(self.model, key, {'content': contents[key], 'usage': {}})
+
+        stats["batch_fallbacks"] += len(fallback)
+        return fallback
+
+    def _pack(self, keys: List[str], pages: Dict[str, Expression]) -> List[List[str]]:
+        """Group pages of the same land into packs bounded by the token budget."""
+        packs: List[List[str]] = []
+        current: List[str] = []
+        current_land = None
+        used = 0
+        for key in sorted(keys, key=lambda k: pages[k].land_id):
+            expr = pages[key]
+            if expr.land_id != current_land:
+                current, current_land = [], expr.land_id
+                used = estimate_tokens(self.service._build_batch_prompt_header(expr.land))
+                packs.append(current)
+            cost = estimate_tokens(self.service._build_batch_page_block(expr))
+            if current and (len(current) >= self.batch_max_pages or used + cost > self.batch_token_budget):
+                current = []
+                used = estimate_tokens(self.service._build_batch_prompt_header(expr.land))
+                packs.append(current)
+            current.append(key)
+            used += cost
+        return packs
+
+    async def _call_pack(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        expressions: List[Expression]
+    ):
+        prompt = self.service._build_batch_prompt(expressions[0].land, expressions)
+        async with semaphore:
+            await self._bucket(self.model).acquire()
+            response = await self.service._call_openrouter_api_async(
+                client, prompt, self.model, system_prompt=BATCH_SYSTEM_PROMPT
+            )
+        verdicts = self.service._parse_batch_response(
+            response.get('content', ''), [expr.id for expr in expressions]
+        )
+        return response, verdicts
+
+    @staticmethod
+    def _count_usage(response: Dict[str, Any], stats: Dict[str, Any]) -> None:
+        stats["api_calls"] += 1
+        usage = response.get('usage') or {}
+        stats["prompt_tokens"] += usage.get('prompt_tokens') or 0
+        stats["completion_tokens"] += usage.get('completion_tokens') or 0
+        stats["total_tokens"] = stats["prompt_tokens"] + stats["completion_tokens"]
+
+    @staticmethod
+    def _apply(expr: Expression, is_relevant: bool, model_used: str, dry_run: bool, stats: Dict[str, Any]) -> None:
+        """Record a verdict on the expression (same rules as the crawler)."""
+        stats["validated" if is_relevant else "rejected"] += 1
+        stats["processed"] += 1
+        if dry_run:
+            return
+        expr.valid_llm = 'oui' if is_relevant else 'non'
+        expr.valid_model = model_used
+        if not is_relevant:
+            expr.relevance = 0
+
+    async def _call(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        prompt: str
+    ) -> Dict[str, Any]:
+        async with semaphore:
+            await self._bucket(self.model).acquire()
+            return await self.service._call_openrouter_api_async(client, prompt, self.model)
+
+    def _bucket(self, model: str) -> TokenBucket:
+        if model not in self._buckets:
+            rate = settings.OPENROUTER_MODEL_RATE_LIMITS.get(model, settings.OPENROUTER_REQUESTS_PER_MINUTE)
+            self._buckets[model] = TokenBucket(rate)
+        return self._buckets[model]
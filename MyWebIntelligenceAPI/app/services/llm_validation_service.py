@@ -1,11 +1,16 @@
 """
 LLM Validation Service for expression relevance validation using OpenRouter.
-V2 SYNC-ONLY implementation - No async, based on legacy with modern adaptations.
+V2 SYNC implementation based on legacy with modern adaptations; the async
+call is only used by the batch pipeline (llm_validation_pipeline) in Celery.
 """
+import asyncio
+import hashlib
 import json
+import re
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
+import httpx
 import requests
 from sqlalchemy.orm import Session
 
@@ -16,6 +21,31 @@ from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+SYSTEM_PROMPT = (
+    "Tu es un assistant spécialisé dans l'évaluation de la pertinence de pages web pour des projets de recherche. "
+    "Tu analyses le contenu des pages et détermines si elles correspondent aux objectifs du projet. "
+    "Tu réponds uniquement et exclusivement par 'oui' ou 'non', sans aucun commentaire, explication ou texte additionnel."
+)
+
+
+BATCH_SYSTEM_PROMPT = (
+    "Tu es un assistant spécialisé dans l'évaluation de la pertinence de pages web pour des projets de recherche. "
+    "Tu analyses plusieurs pages identifiées par leur id et détermines pour chacune si elle correspond aux objectifs du projet. "
+    "Tu réponds uniquement par un objet JSON {\"id\": \"oui\" ou \"non\"}, sans aucun commentaire, explication ou texte additionnel."
+)
+
+_VERDICT_LINE_RE = re.compile(r'(?:id\s*=?\s*)?"?(\d+)"?\s*[:=\-]+\s*"?(oui|non|yes|no|true|false)\b', re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for Latin scripts)."""
+    return len(text) // 4 + 1
+
+
+def prompt_hash(prompt: str) -> str:
+    """SHA-256 of the full conversation sent to the model (cache key with the model name)."""
+    return hashlib.sha256(f"{SYSTEM_PROMPT}\n{prompt}".encode("utf-8")).hexdigest()
+
 
 class LLMValidationService:
     """
@@ -102,7 +132,70 @@ class LLMValidationService:
         """
         Build the relevance validation prompt in French (from legacy).
         """
-        # Get land description and keywords
+        land_desc, terms_str = self._project_fields(land)
+        title, description, readable_text = self._page_fields(expression)
+
+        # Build the prompt (same structure as legacy)
+        prompt = f"""Dans le cadre de la constitution d'un corpus de pages Web à des fins d'analyse de contenu,
+nous voulons savoir si la page crawlée est pertinente pour le projet ou non.
+
+Le projet a les caractéristiques suivantes :
+- Nom du projet : {land.name}
+- Description : {land_desc}
+- Mots clés : {terms_str}
+
+La page suivante :
+- URL = {expression.url}
+- Titre : {title}
+- Description : {description}
+- Readable (extrait) : {readable_text}
+
+Tu répondras ABSOLUMENT et uniquement par "oui" ou "non" sans aucun commentaire."""
+
+        return prompt
+
+    def _build_batch_prompt_header(self, land: Land) -> str:
+        """Project part of a multi-page prompt (sent once per request)."""
+        land_desc, terms_str = self._project_fields(land)
+        return f"""Dans le cadre de la constitution d'un corpus de pages Web à des fins d'analyse de contenu,
+nous voulons savoir si chacune des pages crawlées ci-dessous est pertinente pour le projet ou non.
+
+Le projet a les caractéristiques suivantes :
+- Nom du projet : {land.name}
+- Description : {land_desc}
+- Mots clés : {terms_str}
+
+Les pages suivantes :
+"""
+
+    def _build_batch_page_block(self, expression: Expression) -> str:
+        """One page of a multi-page prompt, identified by the expression id."""
+        title, description, readable_text = self._page_fields(expression)
+        return f"""
+[id={expression.id}]
+- URL = {expression.url}
+- Titre : {title}
+- Description : {description}
+- Readable (extrait) : {readable_text}
+"""
+
+    def _build_batch_prompt(self, land: Land, expressions: List[Expression]) -> str:
+        """
+        Build one prompt validating several pages of the same land.
+
+        The model must answer with a JSON object mapping each id to "oui"/"non".
+        """
+        blocks = ''.join(self._build_batch_page_block(expression) for expression in expressions)
+        example = ', '.join(f'"{expression.id}": "oui"' for expression in expressions[:2])
+        return (
+            self._build_batch_prompt_header(land)
+            + blocks
+            + f"""
+Tu répondras ABSOLUMENT et uniquement par un objet JSON associant chaque id à "oui" ou "non" (exemple : {{{example}}}), sans aucun commentaire."""
+        )
+
+    def _project_fields(self, land: Land):
+        """Land description and keyword list used in prompts."""
         land_desc = land.description or "Pas de description disponible"
 
         # Extract keywords from land words (simple array of strings in V2)
@@ -114,13 +207,14 @@ class LLMValidationService:
                         terms.append(word)
 
         terms_str = ', '.join(terms) if terms else "Aucun mot-clé défini"
+        return land_desc, terms_str
 
-        # Get expression content
+    def _page_fields(self, expression: Expression):
+        """Title, description and readable excerpt of a page used in prompts."""
         title = expression.title or "Pas de titre"
         description = expression.description or "Pas de description"
 
         # Limit readable content to avoid token limits
-        readable_text = ""
         if expression.readable:
             # Take first 1000 characters to stay within token limits
             readable_text = expression.readable[:1000]
@@ -128,25 +222,7 @@ class LLMValidationService:
                 readable_text += "..."
         else:
             readable_text = "Pas de contenu lisible disponible"
-
-        # Build the prompt (same structure as legacy)
-        prompt = f"""Dans le cadre de la constitution d'un corpus de pages Web à des fins d'analyse de contenu,
-nous voulons savoir si la page crawlée est pertinente pour le projet ou non.
-
-Le projet a les caractéristiques suivantes :
-- Nom du projet : {land.name}
-- Description : {land_desc}
-- Mots clés : {terms_str}
-
-La page suivante :
-- URL = {expression.url}
-- Titre : {title}
-- Description : {description}
-- Readable (extrait) : {readable_text}
-
-Tu répondras ABSOLUMENT et uniquement par "oui" ou "non" sans aucun commentaire."""
-
-        return prompt
+        return title, description, readable_text
 
     def _call_openrouter_api(
         self,
@@ -163,28 +239,7 @@ Tu répondras ABSOLUMENT et uniquement par "oui" ou "non" sans aucun commentaire
         Returns:
             API response content
         """
-        if not getattr(settings, 'OPENROUTER_API_KEY', None):
-            raise ValueError("OpenRouter API key not configured")
-
-        headers = {
-            "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
-            "Content-Type": "application/json"
-        }
-
-        payload = {
-            "model": model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "Tu es un assistant spécialisé dans l'évaluation de la pertinence de pages web pour des projets de recherche. Tu analyses le contenu des pages et détermines si elles correspondent aux objectifs du projet. Tu réponds uniquement et exclusivement par 'oui' ou 'non', sans aucun commentaire, explication ou texte additionnel."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0  # Deterministic responses
-        }
+        headers, payload = self._build_request(prompt, model)
 
         last_error = None
 
@@ -199,18 +254,7 @@ Tu répondras ABSOLUMENT et uniquement par "oui" ou "non" sans aucun commentaire
                 )
 
                 if response.status_code == 200:
-                    response_data = response.json()
-
-                    if 'choices' in response_data and len(response_data['choices']) > 0:
-                        choice = response_data['choices'][0]
-                        message = choice.get('message', {})
-
-                        return {
-                            'content': message.get('content', ''),
-                            'usage': response_data.get('usage', {})
-                        }
-                    else:
-                        raise ValueError("No choices in API response")
+                    return self._parse_api_response(response.json())
 
                 elif response.status_code == 429:
                     # Rate limit - wait and retry
@@ -242,6 +286,159 @@ Tu répondras ABSOLUMENT et uniquement par "oui" ou "non" sans aucun commentaire
         # All retries failed
         raise Exception(f"OpenRouter API failed after {self.max_retries} attempts. Last error: {last_error}")
 
+    async def _call_openrouter_api_async(
+        self,
+        client: httpx.AsyncClient,
+        prompt: str,
+        model: str,
+        system_prompt: str = SYSTEM_PROMPT
+    ) -> Dict[str, Any]:
+        """
+        Call OpenRouter API with retry logic on a shared async client.
+
+        Same contract as _call_openrouter_api; used by the concurrent
+        validation pipeline so that one connection pool serves every call.
+        """
+        headers, payload = self._build_request(prompt, model, system_prompt)
+        last_error = None
+
+        for attempt in range(self.max_retries):
+            try:
+                response = await client.post(
+                    self.base_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout
+                )
+
+                if response.status_code == 200:
+                    return self._parse_api_response(response.json())
+
+                if response.status_code == 429:
+                    retry_after = response.headers.get('Retry-After')
+                    try:
+                        wait_time = min(float(retry_after), 60) if retry_after else min(2 ** attempt, 10)
+                    except ValueError:
+                        wait_time = min(2 ** attempt, 10)
+                    logger.warning(f"Rate limit hit, waiting {wait_time}s before retry {attempt + 1}")
+                    last_error = f"Rate limit (attempt {attempt + 1})"
+                    await asyncio.sleep(wait_time)
+                    continue
+
+                raise ValueError(f"API error {response.status_code}: {response.text}")
+
+            except httpx.TimeoutException:
+                last_error = f"Timeout (attempt {attempt + 1})"
+                logger.warning(f"OpenRouter API timeout on attempt {attempt + 1}")
+            except Exception as e:
+                last_error = str(e)
+                logger.error(f"OpenRouter API error on attempt {attempt + 1}: {e}")
+
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(1)
+
+        raise Exception(f"OpenRouter API failed after {self.max_retries} attempts. Last error: {last_error}")
+
+    def _build_request(self, prompt: str, model: str, system_prompt: str = SYSTEM_PROMPT):
+        """Build headers and payload of an OpenRouter chat completion."""
+        if not getattr(settings, 'OPENROUTER_API_KEY', None):
+            raise ValueError("OpenRouter API key not configured")
+
+        headers = {
+            "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0  # Deterministic responses
+        }
+        return headers, payload
+
+    def _parse_api_response(self, response_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract content and token usage from an OpenRouter response."""
+        if 'choices' in response_data and len(response_data['choices']) > 0:
+            message = response_data['choices'][0].get('message', {})
+            return {
+                'content': message.get('content', ''),
+                'usage': response_data.get('usage', {})
+            }
+        raise ValueError("No choices in API response")
+
+    def _parse_batch_response(self, response_content: str, expected_ids: List[int]) -> Dict[int, bool]:
+        """
+        Parse a multi-page answer into {expression_id: is_relevant}.
+
+        Accepts a JSON object (possibly wrapped in a code fence or text), a JSON
+        list of {"id", "verdict"} items, or "id: oui" lines. Only expected ids
+        are returned; callers fall back to single-page calls for missing ones.
+        """
+        expected = set(expected_ids)
+        if not response_content:
+            return {}
+
+        verdicts: Dict[int, bool] = {}
+        start, end = response_content.find('{'), response_content.rfind('}')
+        list_start, list_end = response_content.find('['), response_content.rfind(']')
+        candidates = []
+        if 0 <= start < end:
+            candidates.append(response_content[start:end + 1])
+        if 0 <= list_start < list_end:
+            candidates.append(response_content[list_start:list_end + 1])
+
+        for candidate in candidates:
+            try:
+                data = json.loads(candidate)
+            except ValueError:
+                continue
+            if isinstance(data, dict):
+                items = data.items()
+            elif isinstance(data, list):
+                items = [
+                    (item.get('id'), item.get('verdict', item.get('relevant')))
+                    for item in data if isinstance(item, dict)
+                ]
+            else:
+                continue
+            for key, value in items:
+                verdict = self._coerce_verdict(value)
+                try:
+                    expression_id = int(key)
+                except (TypeError, ValueError):
+                    continue
+                if verdict is not None and expression_id in expected:
+                    verdicts[expression_id] = verdict
+            if verdicts:
+                return verdicts
+
+        for key, value in _VERDICT_LINE_RE.findall(response_content):
+            expression_id = int(key)
+            if expression_id in expected:
+                verdicts[expression_id] = value.lower() in ('oui', 'yes', 'true')
+        return verdicts
+
+    @staticmethod
+    def _coerce_verdict(value: Any) -> Optional[bool]:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            normalized = value.strip().lower()
+            if normalized in ('oui', 'yes', 'true'):
+                return True
+            if normalized in ('non', 'no', 'false'):
+                return False
+        return None
+
     def _parse_yes_no_response(self, response_content: str) -> bool:
         """
         Parse the LLM response to extract yes/no decision.
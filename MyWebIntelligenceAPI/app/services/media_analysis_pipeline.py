@@ -0,0 +1,379 @@
+"""
+Analyse concurrente des médias d'un land (V2 SYNC)
+
+Remplace la version projetV3 (tous les médias chargés d'un coup, puis lots de
+50 traités l'un après l'autre) :
+- les médias sont lus par pages triées sur id (pagination par clé) ; le
+  dernier id traité sert de point de reprise après un redémarrage du worker ;
+- les images déjà conservées dans le stockage local (media_store) sont lues
+  sur disque ; les autres sont téléchargées dans une boucle asyncio, avec une
+  limite globale et une limite par hôte (MEDIA_ANALYSIS_CONCURRENCY,
+  MEDIA_ANALYSIS_PER_HOST) et le disjoncteur par hôte, puis conservées ;
+- le décodage et l'analyse (couleurs, empreintes, EXIF) tournent dans un pool
+  de processus dont les workers gardent un MediaProcessorSync prêt ;
+- les résultats d'une page sont écrits par un UPDATE groupé puis committés.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.host_health import get_host_breaker, host_of
+from app.core.media_processor import (
+    STREAM_CHUNK_SIZE,
+    MediaProcessorSync,
+    StreamedBody,
+    keep_stored,
+    load_stored,
+    new_analysis_result,
+)
+from app.core.media_store import get_media_blob_store
+from app.core.metrics import stage
+from app.db import models
+from app.services.land_stats import apply_land_deltas
+from app.services.media_dedup import (
+    ANALYSIS_FIELDS,
+    PERCEPTUAL_REUSE_FIELDS,
+    copy_analysis,
+    find_analysed_by_urls,
+    find_stored_hashes,
+    get_media_hash_index,
+)
+from app.utils.logging import get_logger
+from app.utils.processes import can_spawn_processes
+
+logger = get_logger(__name__)
+
+ProgressCallback = Callable[[int, int, Dict[str, Any]], None]
+Downloaded = Tuple[int, Optional[bytes], Dict[str, Any]]  # (media_id, contenu, résultat partiel)
+
+_worker_processor: Optional[MediaProcessorSync] = None
+
+
+def _init_worker() -> None:
+    """Initialiseur du pool : un processeur sans base ni client HTTP par processus."""
+    global _worker_processor
+    _worker_processor = MediaProcessorSync(None, None)
+    _worker_processor.dedup_index = None
+    _worker_processor.blob_store = None
+
+
+def _analyze_chunk(items: List[Downloaded]) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Analyse d'un lot d'images téléchargées (dans un processus du pool ou en
+    ligne) : les couleurs dominantes du lot sont extraites en un seul appel.
+    """
+    if _worker_processor is None:
+        _init_worker()
+    _worker_processor.analyze_contents([(content, result) for _, content, result in items if content is not None])
+    return [(media_id, result) for media_id, _, result in items]
+
+
+class MediaAnalysisPipeline:
+    """
+    Analyse les images non traitées d'un land, page par page.
+
+    Les petites pages (ou workers=1) sont analysées dans le processus courant.
+    Dans un enfant prefork de Celery (processus daemon), le pool est un pool
+    de threads : PIL libère le GIL pendant le décodage et le redimensionnement.
+
+    Les workers n'ont ni base ni index des pHash : la reprise des couleurs
+    d'une image quasi identique se fait ensuite dans le processus courant.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        max_concurrency: Optional[int] = None,
+        per_host: Optional[int] = None,
+        workers: Optional[int] = None,
+        page_size: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.db = db
+        self.max_concurrency = max(max_concurrency or settings.MEDIA_ANALYSIS_CONCURRENCY, 1)
+        self.per_host = max(per_host or settings.MEDIA_ANALYSIS_PER_HOST, 1)
+        self.workers = workers or settings.MEDIA_ANALYSIS_WORKERS or os.cpu_count() or 1
+        self.page_size = max(page_size or settings.MEDIA_ANALYSIS_PAGE_SIZE, 1)
+        self.max_size = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+        self.transport = transport
+        self.host_breaker = get_host_breaker()
+        self.dedup_index = get_media_hash_index() if settings.MEDIA_DEDUP_ENABLED else None
+        self.blob_store = get_media_blob_store()
+        self._pool: Optional[Executor] = None
+
+    def pending_query(self, land_id: int, depth: int, minrel: float):
+        """Images non traitées des expressions du land retenues par les filtres."""
+        return (
+            select(models.Media.id, models.Media.url)
+            .join(models.Expression, models.Media.expression_id == models.Expression.id)
+            .where(
+                models.Expression.land_id == land_id,
+                models.Expression.depth <= depth,
+                func.coalesce(models.Expression.relevance, 0) >= minrel,
+                models.Media.type == models.MediaType.IMAGE,
+                or_(models.Media.is_processed.is_(None), models.Media.is_processed.is_(False)),
+            )
+        )
+
+    def run(
+        self,
+        land_id: int,
+        depth: int = 999,
+        minrel: float = 0.0,
+        after_id: int = 0,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyse les images du land dont l'id est supérieur à after_id.
+
+        Args:
+            after_id: Dernier media.id déjà traité (reprise)
+            progress: Appelé après chaque page avec (faits, total, stats)
+
+        Returns:
+            Statistiques, dont last_media_id (point de reprise)
+        """
+        query = self.pending_query(land_id, depth, minrel)
+        total = self.db.execute(
+            select(func.count()).select_from(query.where(models.Media.id > after_id).subquery())
+        ).scalar_one()
+
+        stats: Dict[str, Any] = {
+            "land_id": land_id,
+            "total_media": total,
+            "processed": 0,
+            "analyzed_media": 0,
+            "failed_analysis": 0,
+            "reused": 0,
+            "perceptual_reused": 0,
+            "from_store": 0,
+            "last_media_id": after_id,
+            "duration_seconds": 0.0,
+            "media_per_second": 0.0,
+        }
+        started = time.monotonic()
+        last_id = after_id
+
+        try:
+            while True:
+                rows = self.db.execute(
+                    query.where(models.Media.id > last_id).order_by(models.Media.id).limit(self.page_size)
+                ).all()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+
+                results = self._process_page([(media_id, url) for media_id, url in rows], stats)
+                self._store(results, stats, land_id)
+                stats["processed"] += len(rows)
+                stats["last_media_id"] = last_id
+
+                elapsed = time.monotonic() - started
+                stats["duration_seconds"] = round(elapsed, 2)
+                stats["media_per_second"] = round(stats["processed"] / elapsed, 1) if elapsed > 0 else 0.0
+                if progress:
+                    progress(stats["processed"], total, dict(stats))
+        finally:
+            self.close()
+
+        stats["host_breaker"] = self.host_breaker.snapshot()
+        logger.info(
+            f"Media analysis land {land_id}: {stats['analyzed_media']} analyzed, "
+            f"{stats['failed_analysis']} failed, {stats['reused']} reused, {stats['media_per_second']} media/s"
+        )
+        return stats
+
+    def _process_page(self, rows: List[Tuple[int, str]], stats: Dict[str, Any]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Réutilisation par URL, stockage local, téléchargements concurrents puis analyse des octets."""
+        results: List[Tuple[int, Dict[str, Any]]] = []
+        to_fetch: List[Tuple[int, str]] = []
+        stored: List[Downloaded] = []
+
+        with stage("media", "reuse_lookup"):
+            known = find_analysed_by_urls(self.db, [url for _, url in rows]) if self.dedup_index is not None else {}
+        for media_id, url in rows:
+            existing = known.get(url)
+            if existing is not None and existing.id != media_id:
+                results.append((media_id, copy_analysis(existing, new_analysis_result(url))))
+                stats["reused"] += 1
+            else:
+                to_fetch.append((media_id, url))
+
+        if self.blob_store is not None and to_fetch:
+            with stage("media", "store_read"):
+                digests = find_stored_hashes(self.db, [url for _, url in to_fetch])
+                remaining = []
+                for media_id, url in to_fetch:
+                    result = new_analysis_result(url)
+                    content = load_stored(self.blob_store, digests.get(url), result)
+                    if content is not None:
+                        stored.append((media_id, content, result))
+                    else:
+                        remaining.append((media_id, url))
+            to_fetch = remaining
+            stats["from_store"] += len(stored)
+
+        downloaded = []
+        if to_fetch:
+            with stage("media", "download"):
+                downloaded = asyncio.run(self.download_all(to_fetch))
+        with stage("media", "store_write"):
+            for _, content, result in downloaded:
+                if content is not None:
+                    keep_stored(self.blob_store, content, result)
+        with stage("media", "analyze"):
+            analyzed = self.analyze(stored + downloaded)
+        with stage("media", "perceptual_reuse"):
+            self._reuse_near_duplicates(analyzed, stats)
+        results.extend(analyzed)
+        return results
+
+    def _reuse_near_duplicates(self, results: List[Tuple[int, Dict[str, Any]]], stats: Dict[str, Any]) -> None:
+        """
+        Reprend les couleurs d'images quasi identiques déjà analysées (pHash et dHash).
+
+        Les couleurs calculées en lot par les workers sont remplacées par
+        celles du jumeau : une même image garde la même analyse d'un land à
+        l'autre. Une requête pour tous les jumeaux de la page.
+        """
+        if self.dedup_index is None:
+            return
+        self.dedup_index.refresh(self.db)
+        twins: Dict[int, int] = {}
+        for media_id, result in results:
+            if result.get('error') or not result.get('phash'):
+                continue
+            twin_id = self.dedup_index.find(result['phash'], result.get('dhash'))
+            if twin_id is not None and twin_id != media_id:
+                twins[media_id] = twin_id
+        if not twins:
+            return
+
+        rows = self.db.execute(
+            select(models.Media.id, models.Media.dominant_colors, models.Media.websafe_colors)
+            .where(models.Media.id.in_(set(twins.values())))
+        ).all()
+        by_id = {row.id: row for row in rows}
+        for media_id, result in results:
+            twin = by_id.get(twins.get(media_id))
+            if twin is not None and twin.dominant_colors:
+                copy_analysis(twin, result, PERCEPTUAL_REUSE_FIELDS)
+                stats["perceptual_reused"] += 1
+
+    async def download_all(self, rows: List[Tuple[int, str]]) -> List[Downloaded]:
+        """Télécharge les images, au plus max_concurrency à la fois et per_host par hôte."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        host_slots: Dict[Optional[str], asyncio.Semaphore] = {}
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency
+        )
+        async with httpx.AsyncClient(
+            limits=limits, timeout=30.0, follow_redirects=True, transport=self.transport
+        ) as client:
+            return await asyncio.gather(*(
+                self._download(client, semaphore, host_slots.setdefault(host_of(url), asyncio.Semaphore(self.per_host)),
+                               media_id, url)
+                for media_id, url in rows
+            ))
+
+    async def _download(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        host_slot: asyncio.Semaphore,
+        media_id: int,
+        url: str
+    ) -> Downloaded:
+        result = new_analysis_result(url)
+        host = host_of(url)
+        async with host_slot, semaphore:
+            if not self.host_breaker.allow(host):
+                result['error'] = f"skipped: host circuit open for {host}"
+                return media_id, None, result
+            try:
+                async with client.stream("GET", url) as response:
+                    self.host_breaker.record_success(host)
+                    response.raise_for_status()
+                    body = StreamedBody(self.max_size, response.headers, result)
+                    async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                        body.feed(chunk)
+                return media_id, bytes(body.finish(result)), result
+            except httpx.RequestError as exc:
+                self.host_breaker.record(host, exc)
+                result['error'] = str(exc) or exc.__class__.__name__
+            except Exception as exc:  # noqa: BLE001 - l'erreur est stockée sur le média
+                result['error'] = str(exc)
+        return media_id, None, result
+
+    def analyze(self, downloaded: List[Downloaded]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Analyse les octets téléchargés, dans le pool de processus si la page le justifie."""
+        with_content = sum(1 for _, content, _ in downloaded if content is not None)
+        if self.workers <= 1 or with_content <= 1:
+            return _analyze_chunk(downloaded)
+
+        if self._pool is None:
+            if can_spawn_processes():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            else:
+                _init_worker()
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        # Un lot par worker : l'extraction des couleurs reste vectorisée sur le lot
+        size = -(-len(downloaded) // self.workers)
+        chunks = [downloaded[i:i + size] for i in range(0, len(downloaded), size)]
+        results: List[Tuple[int, Dict[str, Any]]] = []
+        for chunk_results in self._pool.map(_analyze_chunk, chunks):
+            results.extend(chunk_results)
+        return results
+
+    def _store(self, results: List[Tuple[int, Dict[str, Any]]], stats: Dict[str, Any], land_id: int) -> None:
+        """Un UPDATE groupé pour la page (et son delta de statistiques), puis alimentation de l'index des pHash."""
+        now = datetime.now(timezone.utc)
+        updates = []
+        analyzed = 0
+        for media_id, result in results:
+            if result.get('error'):
+                stats["failed_analysis"] += 1
+                updates.append({
+                    "id": media_id,
+                    "is_processed": False,
+                    "analysis_error": result['error'],
+                    "processing_error": result['error'],
+                })
+            else:
+                stats["analyzed_media"] += 1
+                analyzed += 1
+                updates.append({
+                    "id": media_id,
+                    **{field: result.get(field) for field in ANALYSIS_FIELDS},
+                    "is_processed": True,
+                    "processed_at": now,
+                    "analysis_error": None,
+                    "processing_error": None,
+                })
+
+        if updates:
+            with stage("media", "db_write"):
+                self.db.execute(update(models.Media), updates)
+                # Les médias de la page étaient non traités (pending_query)
+                apply_land_deltas(self.db, {(land_id, "media", "processed"): analyzed})
+                self.db.commit()
+
+        if self.dedup_index is not None:
+            for media_id, result in results:
+                if not result.get('error') and 'reused_from' not in result:
+                    self.dedup_index.add(media_id, result.get('phash'), result.get('dhash'))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
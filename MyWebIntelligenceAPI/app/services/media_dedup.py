@@ -0,0 +1,214 @@
+"""
+Déduplication des médias entre lands
+
+Avant d'analyser une image, MediaProcessorSync cherche une analyse existante :
+1. même URL déjà analysée (n'importe quel land) : aucune requête HTTP ;
+2. après téléchargement, image quasi identique (pHash et dHash à distance
+   <= MEDIA_DEDUP_MAX_DISTANCE) : l'analyse des couleurs est reprise.
+
+L'index des pHash est partagé par le processus et complété, au plus toutes
+les MEDIA_DEDUP_REFRESH_SECONDS, par les médias analysés (ou ré-analysés)
+depuis le dernier chargement, d'après media.processed_at.
+"""
+
+import datetime
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.perceptual_hash import MultiIndexHashTable, cluster_hashes, from_hex, hamming
+from app.db import models
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+REFRESH_PAGE_SIZE = 10000
+# Relecture des analyses un peu antérieures au dernier chargement : une
+# transaction commencée avant lui peut être validée après
+REFRESH_OVERLAP = datetime.timedelta(minutes=5)
+
+# Champs d'analyse recopiés d'un média déjà analysé (même URL)
+ANALYSIS_FIELDS = (
+    'width', 'height', 'format', 'file_size', 'color_mode', 'has_transparency', 'aspect_ratio',
+    'exif_data', 'image_hash', 'ahash', 'dhash', 'phash', 'dominant_colors', 'websafe_colors', 'mime_type',
+    'file_path',
+)
+# Champs repris d'une image quasi identique (le reste vient du fichier téléchargé)
+PERCEPTUAL_REUSE_FIELDS = ('dominant_colors', 'websafe_colors')
+
+
+class MediaHashIndex:
+    """Index pHash -> media.id des médias analysés, tous lands confondus."""
+
+    def __init__(self, max_distance: Optional[int] = None, refresh_seconds: Optional[float] = None):
+        self.max_distance = settings.MEDIA_DEDUP_MAX_DISTANCE if max_distance is None else max_distance
+        self.refresh_seconds = (
+            settings.MEDIA_DEDUP_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        )
+        self._table = MultiIndexHashTable(self.max_distance)
+        # media.id -> (pHash, dHash) courants ; les entrées de _table remplacées
+        # par une ré-analyse sont ignorées par find()
+        self._hashes: Dict[int, Tuple[int, Optional[int]]] = {}
+        self._processed_since: Optional[datetime.datetime] = None
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, db: Session, force: bool = False) -> None:
+        """Ajoute les médias hachés analysés ou ré-analysés depuis le dernier chargement."""
+        now = time.monotonic()
+        if not force and self._refreshed_at is not None and now - self._refreshed_at < self.refresh_seconds:
+            return
+        with self._lock:
+            query = select(
+                models.Media.id, models.Media.phash, models.Media.dhash, models.Media.processed_at
+            ).where(models.Media.phash.isnot(None))
+            if self._processed_since is not None:
+                query = query.where(models.Media.processed_at >= self._processed_since - REFRESH_OVERLAP)
+            last_id = 0
+            latest = self._processed_since
+            while True:
+                rows = db.execute(
+                    query.where(models.Media.id > last_id).order_by(models.Media.id).limit(REFRESH_PAGE_SIZE)
+                ).all()
+                for media_id, phash, dhash, processed_at in rows:
+                    self._add(media_id, phash, dhash)
+                    if processed_at is not None and (latest is None or processed_at > latest):
+                        latest = processed_at
+                if len(rows) < REFRESH_PAGE_SIZE:
+                    break
+                last_id = rows[-1][0]
+            self._processed_since = latest
+            self._refreshed_at = now
+
+    def add(self, media_id: int, phash: Optional[str], dhash: Optional[str]) -> None:
+        with self._lock:
+            self._add(media_id, phash, dhash)
+
+    def _add(self, media_id: int, phash: Optional[str], dhash: Optional[str]) -> None:
+        if not phash:
+            return
+        phash_value = from_hex(phash)
+        current = self._hashes.get(media_id)
+        if current is None or current[0] != phash_value:
+            self._table.add(media_id, phash_value)
+        self._hashes[media_id] = (phash_value, from_hex(dhash) if dhash else None)
+
+    def find(self, phash: Optional[str], dhash: Optional[str]) -> Optional[int]:
+        """id du média le plus proche dont le pHash et le dHash sont à distance <= max_distance."""
+        if not phash:
+            return None
+        dhash_value = from_hex(dhash) if dhash else None
+        with self._lock:
+            phash_value = from_hex(phash)
+            for media_id, _ in self._table.query(phash_value):
+                current_phash, other = self._hashes[media_id]
+                if hamming(phash_value, current_phash) > self.max_distance:
+                    continue  # pHash remplacé depuis
+                if dhash_value is None or other is None or hamming(dhash_value, other) <= self.max_distance:
+                    return media_id
+        return None
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+_index: Optional[MediaHashIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_media_hash_index() -> MediaHashIndex:
+    """Index partagé du processus."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = MediaHashIndex()
+    return _index
+
+
+def find_analysed_by_url(db: Session, url: str) -> Optional[models.Media]:
+    """Dernier média analysé avec cette URL, quel que soit le land."""
+    return db.execute(
+        select(models.Media)
+        .where(
+            models.Media.url_hash == models.Media.compute_url_hash(url),
+            models.Media.url == url,
+            models.Media.is_processed.is_(True),
+            models.Media.image_hash.isnot(None),
+        )
+        .order_by(models.Media.id.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def find_analysed_by_urls(db: Session, urls: List[str]) -> Dict[str, models.Media]:
+    """Dernier média analysé pour chaque URL (une requête pour toute la liste)."""
+    if not urls:
+        return {}
+    rows = db.execute(
+        select(models.Media)
+        .where(
+            models.Media.url_hash.in_({models.Media.compute_url_hash(url) for url in urls}),
+            models.Media.is_processed.is_(True),
+            models.Media.image_hash.isnot(None),
+        )
+        .order_by(models.Media.id)
+    ).scalars().all()
+    wanted = set(urls)
+    return {media.url: media for media in rows if media.url in wanted}
+
+
+def find_stored_hashes(db: Session, urls: List[str]) -> Dict[str, str]:
+    """SHA-256 (image_hash) connu de chaque URL déjà téléchargée, analysée ou non."""
+    if not urls:
+        return {}
+    rows = db.execute(
+        select(models.Media.url, models.Media.image_hash)
+        .where(
+            models.Media.url_hash.in_({models.Media.compute_url_hash(url) for url in urls}),
+            models.Media.image_hash.isnot(None),
+        )
+        .order_by(models.Media.id)
+    ).all()
+    wanted = set(urls)
+    return {url: image_hash for url, image_hash in rows if url in wanted}
+
+
+def copy_analysis(media: models.Media, result: Dict[str, Any], fields=ANALYSIS_FIELDS) -> Dict[str, Any]:
+    """Recopie l'analyse d'un média existant dans un résultat d'analyse_image."""
+    for field in fields:
+        result[field] = getattr(media, field)
+    result['reused_from'] = media.id
+    return result
+
+
+def build_image_clusters(rows: List[Dict[str, Any]], max_distance: int) -> List[Dict[str, Any]]:
+    """
+    Groupes d'images quasi identiques d'un land.
+
+    Args:
+        rows: médias {'id', 'url', 'expression_id', 'width', 'height', 'phash'}
+    """
+    by_id = {row['id']: row for row in rows if row.get('phash')}
+    groups = cluster_hashes(((media_id, from_hex(row['phash'])) for media_id, row in by_id.items()), max_distance)
+
+    clusters = []
+    for number, group in enumerate(groups, start=1):
+        members = [by_id[media_id] for media_id in group]
+        representative = max(members, key=lambda row: ((row.get('width') or 0) * (row.get('height') or 0), -row['id']))
+        reference = from_hex(representative['phash'])
+        clusters.append({
+            'cluster_id': number,
+            'size': len(members),
+            'representative': representative,
+            'media': sorted(
+                ({**row, 'distance': hamming(reference, from_hex(row['phash']))} for row in members),
+                key=lambda row: (row['distance'], row['id'])
+            ),
+            'expression_ids': sorted({row['expression_id'] for row in members}),
+        })
+    return clusters
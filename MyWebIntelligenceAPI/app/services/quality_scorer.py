@@ -2,7 +2,7 @@
 Quality Scoring Service for MyWebIntelligence API
 
 Computes quality_score based on heuristics and existing metadata.
-Pure function service (no external dependencies, deterministic).
+Pure function service (deterministic; NumPy/pandas only for the batch mode).
 
 Architecture:
     5 scoring blocks with weighted contribution:
@@ -13,6 +13,10 @@ Architecture:
     - Integrity (10%): LLM validation, readable extraction, pipeline completion
 
 Score range: 0.0 (very poor) to 1.0 (excellent)
+
+Two entry points with identical results:
+    - compute_quality_score(): one expression object (crawler)
+    - compute_quality_scores(): a pandas DataFrame of expressions (bulk reprocessing)
 """
 
 import logging
@@ -20,6 +24,9 @@ import math
 from datetime import datetime, timezone
 from typing import TypedDict, Optional
 
+import numpy as np
+import pandas as pd
+
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -34,6 +41,15 @@ WEIGHTS = {
 }
 
 
+# Colonnes lues par le scoring (mêmes noms que les attributs lus par compute_quality_score)
+QUALITY_COLUMNS = (
+    "http_status", "content_type", "crawled_at",
+    "title", "description", "keywords", "canonical_url",
+    "word_count", "content_length", "reading_time",
+    "language", "relevance", "published_at",
+    "validllm", "readable_at", "readable", "approved_at",
+)
+
 class QualityResult(TypedDict):
     """Résultat du calcul de qualité."""
     score: float                    # 0.0 à 1.0
@@ -48,7 +64,7 @@ class QualityScorer:
     Service de calcul du quality_score.
 
     100% déterministe, basé sur métadonnées existantes.
-    Pas de dépendances externes.
+    Pas de dépendances externes (hors NumPy/pandas pour le mode par lots).
     """
 
     def __init__(self, custom_weights: Optional[dict] = None):
@@ -100,7 +116,7 @@ class QualityScorer:
                 "score": 0.0,
                 "category": "Très faible",
                 "flags": all_flags,
-                "reason": f"Accès impossible: {', '.join(all_flags)}",
+                "reason": self._reason(0.0, "Très faible", all_flags, blocked=True),
                 "details": details
             }
 
@@ -149,25 +165,7 @@ class QualityScorer:
             category = "Très faible"
 
         # Générer raison textuelle
-        if final_score >= 0.8:
-            reason = f"Haute qualité ({final_score:.2f}): contenu riche et complet"
-        elif final_score >= 0.6:
-            reason = f"Qualité acceptable ({final_score:.2f}): contenu standard"
-        else:
-            # Identifier principale pénalité
-            main_issues = []
-            if "http_error" in all_flags:
-                main_issues.append("erreur HTTP")
-            if "short_content" in all_flags or "very_short_content" in all_flags:
-                main_issues.append("contenu trop court")
-            if "wrong_language" in all_flags:
-                main_issues.append("langue incorrecte")
-            if "low_relevance" in all_flags:
-                main_issues.append("faible pertinence")
-            if "no_readable" in all_flags:
-                main_issues.append("extraction échouée")
-
-            reason = f"Qualité {category.lower()} ({final_score:.2f}): {', '.join(main_issues or all_flags[:2])}"
+        reason = self._reason(final_score, category, all_flags)
 
         return {
             "score": round(final_score, 3),
@@ -177,6 +175,292 @@ class QualityScorer:
             "details": details
         }
 
+    def compute_quality_scores(
+        self,
+        frame: pd.DataFrame,
+        now: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Calcule le quality_score d'un lot d'expressions en colonnes.
+
+        Mêmes règles (et mêmes résultats) que compute_quality_score, évaluées
+        sur des tableaux NumPy au lieu d'objet par objet.
+
+        Args:
+            frame: Une ligne par expression, colonnes QUALITY_COLUMNS (absente = None)
+                et "land_lang" (valeur de Land.lang de l'expression)
+            now: Référence pour la fraîcheur (défaut: maintenant, UTC)
+
+        Returns:
+            DataFrame indexé comme frame: score, category, flags, reason et un
+            score par bloc (NaN pour les blocs non évalués après un accès bloquant)
+        """
+        n = len(frame)
+        now = now or datetime.now(timezone.utc)
+        flag_masks: list[tuple[str, np.ndarray]] = []
+
+        def column(name: str) -> pd.Series:
+            if name in frame.columns:
+                return frame[name].reset_index(drop=True)
+            return pd.Series([None] * n, dtype=object)
+
+        def objects(name: str) -> list:
+            """Valeurs Python, None pour les manquants (NaN/NA des colonnes pandas)."""
+            return [
+                None if value is None or value is pd.NA or (isinstance(value, float) and value != value) else value
+                for value in column(name).astype(object)
+            ]
+
+        def present(name: str) -> np.ndarray:
+            """Valeur non nulle et non vide (vérité Python des attributs)."""
+            values = column(name)
+            mask = values.notna().to_numpy(dtype=bool, copy=True)
+            if not pd.api.types.is_numeric_dtype(values):
+                mask &= np.array([not (isinstance(value, str) and value == "") for value in values], dtype=bool)
+            return mask
+
+        def stripped_length(name: str) -> np.ndarray:
+            values = column(name)
+            return np.array([len(value.strip()) if isinstance(value, str) else 0 for value in values])
+
+        def numbers(name: str) -> np.ndarray:
+            return pd.to_numeric(column(name), errors="coerce").to_numpy(dtype=float, copy=True)
+
+        # Bloc 1: Accès
+        raw_status = column("http_status")
+        status = numbers("http_status")
+        missing_status = raw_status.isna().to_numpy()
+        invalid_status = ~missing_status & np.isnan(status)
+        if not pd.api.types.is_numeric_dtype(raw_status):
+            for i, value in enumerate(raw_status):
+                if isinstance(value, str):
+                    try:
+                        status[i] = int(value)
+                    except ValueError:
+                        status[i] = np.nan
+                        invalid_status[i] = True
+        ok = ~missing_status & ~invalid_status
+        success = ok & (status >= 200) & (status < 300)
+        redirect = ok & (status >= 300) & (status < 400)
+        http_error = ok & ~success & ~redirect
+        served = success | redirect
+
+        content_type = column("content_type").fillna("").astype(str).str.lower()
+        has_type = served & present("content_type")
+        html = has_type & content_type.str.contains("text/html", regex=False).to_numpy()
+        pdf = has_type & ~html & content_type.str.contains("application/pdf", regex=False).to_numpy()
+        non_html = has_type & ~html & ~pdf
+        not_crawled = served & ~pdf & column("crawled_at").isna().to_numpy()
+
+        access = np.where(success, 1.0, np.where(redirect, 0.5, 0.0))
+        access = np.where(non_html, access * 0.3, access)
+        blocked = missing_status | invalid_status | http_error | pdf | not_crawled
+        access[blocked] = 0.0
+        live = ~blocked
+
+        flag_masks += [
+            ("no_http_status", missing_status),
+            ("invalid_http_status", invalid_status),
+            ("redirect", redirect),
+            ("http_error", http_error),
+            ("non_html_pdf", pdf),
+            ("non_html", non_html),
+            ("not_crawled", not_crawled),
+        ]
+
+        # Bloc 2: Structure
+        has_title = stripped_length("title") > 0
+        has_description = stripped_length("description") > 20
+        has_keywords = stripped_length("keywords") > 0
+        has_canonical = present("canonical_url")
+        structure = (
+            0.0
+            + np.where(has_title, 0.4, 0.0)
+            + np.where(has_description, 0.3, 0.0)
+            + np.where(has_keywords, 0.15, 0.0)
+            + np.where(has_canonical, 0.15, 0.0)
+        )
+        flag_masks += [
+            ("no_title", live & ~has_title),
+            ("no_description", live & ~has_description),
+            ("no_keywords", live & ~has_keywords),
+            ("no_canonical", live & ~has_canonical),
+        ]
+
+        # Bloc 3: Richesse
+        wc = numbers("word_count")
+        no_content = np.isnan(wc) | (wc == 0)
+        wc_ok = np.where(no_content, 1.0, wc)
+        very_short = ~no_content & (wc_ok < 80)
+        short = ~no_content & (wc_ok >= 80) & (wc_ok < 150)
+        optimal = ~no_content & (wc_ok >= 150) & (wc_ok <= 5000)
+        very_long = ~no_content & (wc_ok > 5000)
+        score_wc = np.select(
+            [very_short, short, optimal],
+            [0.1, 0.3, np.exp(-((wc_ok - 1500) ** 2) / (2 * 1500 ** 2))],
+            default=np.maximum(0.5, 0.8 - (wc_ok - 5000) / 50000)
+        )
+
+        cl = numbers("content_length")
+        has_length = ~np.isnan(cl) & (cl > 0)
+        ratio = wc_ok / np.where(has_length, cl, 1.0)
+        poor_ratio = has_length & (ratio < 0.05)
+        low_ratio = has_length & (ratio >= 0.05) & (ratio < 0.1)
+        score_ratio = np.select(
+            [poor_ratio, low_ratio, has_length & (ratio <= 0.3), has_length],
+            [0.2, 0.5, 1.0, 0.9],
+            default=0.5
+        )
+
+        rt = numbers("reading_time")
+        has_rt = ~np.isnan(rt) & (rt != 0)
+        very_short_rt = has_rt & (rt < 0.25)
+        short_rt = has_rt & (rt >= 0.25) & (rt < 0.5)
+        very_long_rt = has_rt & (rt > 25)
+        score_rt = np.select(
+            [very_short_rt, short_rt, has_rt & (rt <= 15), has_rt & (rt <= 25), has_rt],
+            [0.2, 0.5, 1.0, 0.8, 0.3],
+            default=0.5
+        )
+
+        richness = 0.0 + score_wc * 0.5 + score_ratio * 0.3 + score_rt * 0.2
+        richness[no_content] = 0.0
+        rich = live & ~no_content
+        flag_masks += [
+            ("no_content", live & no_content),
+            ("very_short_content", rich & very_short),
+            ("short_content", rich & short),
+            ("very_long_content", rich & very_long & (wc_ok > 10000)),
+            ("poor_text_ratio", rich & poor_ratio),
+            ("low_text_ratio", rich & low_ratio),
+            ("very_short_reading", rich & very_short_rt),
+            ("short_reading", rich & short_rt),
+            ("very_long_reading", rich & very_long_rt),
+        ]
+
+        # Bloc 4: Cohérence
+        expr_langs = objects("language")
+        lang_known = np.array([bool(lang) for lang in expr_langs], dtype=bool)
+        lang_state = np.array([
+            -1 if not (expr_lang and land_lang) else
+            int(expr_lang in (land_lang if isinstance(land_lang, list) else [land_lang]))
+            for expr_lang, land_lang in zip(expr_langs, objects("land_lang"))
+        ], dtype=int)
+        score_lang = np.where(lang_state == 1, 1.0, 0.0)
+
+        relevance = numbers("relevance")
+        has_relevance = ~np.isnan(relevance)
+        norm_relevance = np.minimum(np.where(has_relevance, relevance, 0.0) / 5.0, 1.0)
+
+        published = pd.to_datetime(column("published_at"), utc=True)
+        has_published = published.notna().to_numpy()
+        now_ts = pd.Timestamp(now)
+        now_ts = now_ts.tz_localize("UTC") if now_ts.tzinfo is None else now_ts.tz_convert("UTC")
+        age_days = (now_ts - published).dt.days.to_numpy(dtype=float, na_value=np.nan)
+        future = has_published & (age_days < 0)
+        old = has_published & (age_days >= 1825)
+        score_fresh = np.select(
+            [future, age_days < 365, age_days < 730, age_days < 1825],
+            [0.0, 1.0, 0.9, 0.7],
+            default=0.5
+        )
+
+        coherence = (
+            0.0
+            + np.where(lang_state >= 0, score_lang * 0.4, 0.4 * 0.5)
+            + np.where(has_relevance, norm_relevance * 0.4, 0.4 * 0.5)
+            + np.where(has_published, score_fresh * 0.2, 0.2 * 0.5)
+        )
+        flag_masks += [
+            ("wrong_language", live & (lang_state == 0)),
+            ("no_language", live & ~lang_known),
+            ("low_relevance", live & has_relevance & (np.where(has_relevance, relevance, 1.0) < 0.5)),
+            ("future_date", live & future),
+            ("old_content", live & old),
+        ]
+
+        # Bloc 5: Intégrité
+        validllm = column("validllm")
+        llm_yes = (validllm == "oui").to_numpy()
+        llm_no = (validllm == "non").to_numpy()
+        has_readable = present("readable_at") & present("readable")
+        long_readable = has_readable & (stripped_length("readable") > 100)
+        approved = present("approved_at")
+        integrity = (
+            0.0
+            + np.where(llm_yes, 0.4, np.where(llm_no, 0.0, 0.4 * 0.5))
+            + np.where(long_readable, 0.4, np.where(has_readable, 0.2, 0.0))
+            + np.where(approved, 0.2, 0.0)
+        )
+        flag_masks += [
+            ("llm_rejected", live & llm_no),
+            ("short_readable", live & has_readable & ~long_readable),
+            ("no_readable", live & ~has_readable),
+            ("not_approved", live & ~approved),
+        ]
+
+        # Agrégation pondérée
+        final = (
+            access * self.weights["access"] +
+            structure * self.weights["structure"] +
+            richness * self.weights["richness"] +
+            coherence * self.weights["coherence"] +
+            integrity * self.weights["integrity"]
+        )
+        final = np.clip(final, 0.0, 1.0)
+        final[blocked] = 0.0
+        category = np.select(
+            [final >= 0.8, final >= 0.6, final >= 0.4, final >= 0.2],
+            ["Excellent", "Bon", "Moyen", "Faible"],
+            default="Très faible"
+        )
+
+        flags: list[list[str]] = [[] for _ in range(n)]
+        for name, mask in flag_masks:
+            for i in np.flatnonzero(mask):
+                flags[i].append(name)
+
+        details = {"access": access}
+        for name, values in (("structure", structure), ("richness", richness),
+                             ("coherence", coherence), ("integrity", integrity)):
+            details[name] = np.where(blocked, np.nan, values)
+
+        return pd.DataFrame({
+            "score": [round(float(value), 3) for value in final],
+            "category": category,
+            "flags": flags,
+            "reason": [
+                self._reason(float(score), str(cat), row_flags, bool(is_blocked))
+                for score, cat, row_flags, is_blocked in zip(final, category, flags, blocked)
+            ],
+            **details,
+        }, index=frame.index)
+
+    @staticmethod
+    def _reason(final_score: float, category: str, all_flags: list[str], blocked: bool = False) -> str:
+        """Explication textuelle du score."""
+        if blocked:
+            return f"Accès impossible: {', '.join(all_flags)}"
+        if final_score >= 0.8:
+            return f"Haute qualité ({final_score:.2f}): contenu riche et complet"
+        if final_score >= 0.6:
+            return f"Qualité acceptable ({final_score:.2f}): contenu standard"
+
+        # Identifier principale pénalité
+        main_issues = []
+        if "http_error" in all_flags:
+            main_issues.append("erreur HTTP")
+        if "short_content" in all_flags or "very_short_content" in all_flags:
+            main_issues.append("contenu trop court")
+        if "wrong_language" in all_flags:
+            main_issues.append("langue incorrecte")
+        if "low_relevance" in all_flags:
+            main_issues.append("faible pertinence")
+        if "no_readable" in all_flags:
+            main_issues.append("extraction échouée")
+
+        return f"Qualité {category.lower()} ({final_score:.2f}): {', '.join(main_issues or all_flags[:2])}"
+
     def _score_access(self, expression) -> tuple[float, list[str]]:
         """
         Score d'accessibilité (0.0 à 1.0) - Bloc 1 (30%).
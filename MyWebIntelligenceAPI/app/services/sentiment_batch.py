@@ -0,0 +1,174 @@
+"""
+Batch Sentiment Engine for MyWebIntelligence API
+
+Recomputes TextBlob sentiment for whole lands:
+- texts are read in keyset-ordered chunks (only id, text and language columns)
+- chunks are analyzed in a process pool whose workers keep analyzers warm
+- results are written back with one bulk UPDATE per chunk
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.sentiment_provider import get_textblob_analyzer
+from app.db.models import Expression
+from app.services.sentiment_service import SentimentService
+from app.utils.processes import can_spawn_processes
+
+logger = logging.getLogger(__name__)
+
+SentimentRow = Tuple[int, Optional[str], Optional[str]]  # (expression_id, text, language)
+
+_worker_service: Optional[SentimentService] = None
+
+
+def _init_worker() -> None:
+    """Process pool initializer: build the service and load the analyzers once."""
+    global _worker_service
+    _worker_service = SentimentService()
+    for language in _worker_service.provider.SUPPORTED_LANGUAGES:
+        get_textblob_analyzer(language)
+
+
+def _analyze_rows(rows: List[SentimentRow]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Analyze a chunk of rows (runs in a worker process or inline)."""
+    if _worker_service is None:
+        _init_worker()
+    return [
+        (expression_id, _worker_service.enrich_textblob(None, text, language))
+        for expression_id, text, language in rows
+    ]
+
+
+class BatchSentimentEngine:
+    """
+    Analyze lists of texts with TextBlob in a pool of warm worker processes.
+
+    Small inputs (or workers=1) are analyzed inline in the current process,
+    as is everything inside a Celery prefork child, which cannot start a
+    process pool (TextBlob is pure Python, threads would not help).
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 50):
+        self.workers = workers or settings.SENTIMENT_BATCH_WORKERS or os.cpu_count() or 1
+        self.chunk_size = max(chunk_size, 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def analyze(self, rows: List[SentimentRow]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return (expression_id, sentiment fields) for every row, in order."""
+        if self.workers <= 1 or len(rows) <= self.chunk_size or not can_spawn_processes():
+            return _analyze_rows(rows)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+        chunks = [rows[i:i + self.chunk_size] for i in range(0, len(rows), self.chunk_size)]
+        results: List[Tuple[int, Dict[str, Any]]] = []
+        for chunk_result in self._pool.map(_analyze_rows, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "BatchSentimentEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def reprocess_sentiment(
+    db: Session,
+    land_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    force: bool = False,
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+    progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Recompute TextBlob sentiment for the expressions of a land.
+
+    Args:
+        db: Synchronous session
+        land_id: Filter by land (None = all lands)
+        limit: Max number of expressions
+        force: Recompute even if a sentiment was already stored
+        batch_size: Expressions read, analyzed and written per chunk
+        workers: Worker processes (default SENTIMENT_BATCH_WORKERS or CPU count)
+        dry_run: Analyze without writing
+        progress: Called after each chunk with (done, total, stats)
+
+    Returns:
+        Statistics dict
+    """
+    batch_size = batch_size or settings.SENTIMENT_BATCH_SIZE
+    query = db.query(
+        Expression.id,
+        func.coalesce(Expression.readable, Expression.content),
+        Expression.lang
+    )
+    if land_id:
+        query = query.filter(Expression.land_id == land_id)
+    if not force:
+        query = query.filter(or_(
+            Expression.sentiment_status.is_(None),
+            Expression.sentiment_status == "failed"
+        ))
+
+    total = query.count()
+    if limit:
+        total = min(total, limit)
+
+    stats: Dict[str, Any] = {
+        "total_candidates": total,
+        "processed": 0,
+        "updated": 0,
+        "by_status": {},
+        "duration_seconds": 0.0,
+        "texts_per_second": 0.0,
+    }
+    started = time.monotonic()
+    last_id = 0
+
+    with BatchSentimentEngine(workers=workers) as engine:
+        while stats["processed"] < total:
+            size = min(batch_size, total - stats["processed"])
+            rows = query.filter(Expression.id > last_id).order_by(Expression.id).limit(size).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            results = engine.analyze([tuple(row) for row in rows])
+            for _, fields in results:
+                status = fields["sentiment_status"]
+                stats["by_status"][status] = stats["by_status"].get(status, 0) + 1
+            stats["processed"] += len(results)
+
+            if not dry_run:
+                db.execute(update(Expression), [{"id": expression_id, **fields} for expression_id, fields in results])
+                db.commit()
+                stats["updated"] += len(results)
+
+            elapsed = time.monotonic() - started
+            stats["duration_seconds"] = round(elapsed, 2)
+            stats["texts_per_second"] = round(stats["processed"] / elapsed, 1) if elapsed > 0 else 0.0
+            if progress:
+                progress(stats["processed"], total, dict(stats))
+
+    logger.info(
+        f"Sentiment reprocessing: {stats['processed']} processed, {stats['updated']} updated, "
+        f"{stats['texts_per_second']} texts/s"
+    )
+    return stats
@@ -6,11 +6,14 @@ Integrates with existing text_processing module.
 """
 
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Hashable, List, Tuple, TYPE_CHECKING
 from datetime import datetime, timezone
 
 from app.core.sentiment_provider import SentimentModelProvider
 
+if TYPE_CHECKING:
+    from app.services.llm_sentiment import LLMSentimentAnalyzer
+
 logger = logging.getLogger(__name__)
 
 # Configuration thresholds
@@ -38,24 +41,17 @@ class SentimentService:
         """
         Detect language of text.
 
-        Reuses existing language detection from text_processing if available,
-        otherwise uses langdetect.
+        Uses the shared, cached detector from app.utils.text_utils,
+        defaulting to 'en' when no language can be determined.
         """
-        try:
-            # Try to use existing text_processing module
-            from app.core.text_processing import detect_language
-            return detect_language(text)
-        except (ImportError, AttributeError):
-            # Fallback to langdetect
-            try:
-                import langdetect
-                langdetect.DetectorFactory.seed = 0  # Consistent results
-                detected = langdetect.detect(text)
-                logger.debug(f"Detected language: {detected}")
-                return detected
-            except Exception as e:
-                logger.warning(f"Language detection failed: {e}, defaulting to 'en'")
-                return "en"
+        from app.utils.text_utils import detect_language
+
+        detected = detect_language(text)
+        if not detected:
+            logger.warning("Language detection failed, defaulting to 'en'")
+            return "en"
+        logger.debug(f"Detected language: {detected}")
+        return detected
 
     def _prepare_text(self, content: Optional[str], readable: Optional[str]) -> Optional[str]:
         """
@@ -112,12 +108,72 @@ class SentimentService:
             >>> print(result["sentiment_score"])
             0.87
         """
-        # Prepare text
+        text, language, early = self._prepare(content, readable, language)
+        if early is not None:
+            return early
+
+        # Analyze sentiment
+        result = await self.provider.analyze_sentiment(text, language, use_llm=use_llm)
+        return self._to_fields(result)
+
+    def enrich_textblob(
+        self,
+        content: Optional[str],
+        readable: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Synchronous TextBlob-only variant of enrich_expression_sentiment.
+
+        Used by the batch engine (worker processes, no event loop).
+        """
+        text, language, early = self._prepare(content, readable, language)
+        if early is not None:
+            return early
+
+        if not self.provider.is_language_supported(language):
+            result = {"score": None, "label": None, "confidence": None, "status": "unsupported_lang", "model": None}
+        else:
+            result = self.provider._analyze_textblob(text, language)
+        return self._to_fields(result)
+
+    def enrich_many_llm(
+        self,
+        items: List[Tuple[Hashable, Optional[str], Optional[str], Optional[str]]],
+        analyzer: "LLMSentimentAnalyzer",
+        land_id: Optional[int] = None
+    ) -> Dict[Hashable, Dict[str, Any]]:
+        """
+        LLM variant of enrich_expression_sentiment for many expressions.
+
+        Args:
+            items: (key, content, readable, language) tuples
+            analyzer: LLMSentimentAnalyzer holding cache, budget and rate state
+            land_id: Land whose token budget is charged
+
+        Returns:
+            {key: fields ready for Expression update}
+        """
+        fields: Dict[Hashable, Dict[str, Any]] = {}
+        pending = []
+        for key, content, readable, language in items:
+            text, language, early = self._prepare(content, readable, language)
+            if early is not None:
+                fields[key] = early
+            else:
+                pending.append((key, text, language))
+
+        for key, result in analyzer.analyze_many(pending, land_id).items():
+            fields[key] = self._to_fields(result)
+        return fields
+
+    def _prepare(self, content: Optional[str], readable: Optional[str], language: Optional[str]):
+        """Text and language to analyze, or the no_content result."""
         text = self._prepare_text(content, readable)
 
         if not text or len(text.strip()) < 10:
             logger.debug("No usable content for sentiment analysis")
-            return {
+            return text, language, {
                 "sentiment_score": None,
                 "sentiment_label": None,
                 "sentiment_confidence": None,
@@ -135,10 +191,10 @@ class SentimentService:
                 logger.warning(f"Language detection failed: {e}")
                 language = "en"  # Fallback to English
 
-        # Analyze sentiment
-        result = await self.provider.analyze_sentiment(text, language, use_llm=use_llm)
+        return text, language, None
 
-        # Apply confidence threshold
+    def _to_fields(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the confidence threshold and map a provider result to Expression fields."""
         if result["status"] == "computed" and result["confidence"] is not None:
             if result["confidence"] < MIN_CONFIDENCE_THRESHOLD:
                 logger.info(
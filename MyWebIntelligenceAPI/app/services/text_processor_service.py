@@ -463,7 +463,7 @@ class TextProcessorService:
             Résultats de la mise à jour
         """
         try:
-            from sqlalchemy import select, update
+            from sqlalchemy import select
             from app.db.models import Expression
             
             # Récupérer l'expression
@@ -496,22 +496,19 @@ class TextProcessorService:
                 language=expression.lang or 'fr'
             )
             
-            # Mettre à jour en base
-            await self.db.execute(
-                update(Expression)
-                .where(Expression.id == expression_id)
-                .values(relevance=new_relevance)
-            )
+            # Mettre à jour en base (par l'ORM : les statistiques du land suivent)
+            old_relevance = expression.relevance
+            expression.relevance = new_relevance
             
             await self.db.commit()
             
             return {
                 'success': True,
                 'expression_id': expression_id,
-                'old_relevance': expression.relevance,
+                'old_relevance': old_relevance,
                 'new_relevance': new_relevance,
                 'action': 'updated',
-                'message': f'Relevance updated from {expression.relevance} to {new_relevance}'
+                'message': f'Relevance updated from {old_relevance} to {new_relevance}'
             }
             
         except Exception as e:
@@ -5,9 +5,11 @@ Module des tâches asynchrones Celery (V2 - Sync only)
 from .crawling_task import crawl_land_task
 from .consolidation_task import consolidate_land_task
 from .domain_crawl_task import domain_crawl_task, domain_recrawl_task, domain_crawl_batch_task
-
-# Export tasks temporarily disabled (needs refactoring)
-# from .export_tasks import create_export_task
+from .llm_validation_task import llm_validation_task
+from .sentiment_task import reprocess_sentiment_task
+from .media_analysis_task import analyze_land_media_task
+from .counters_task import reconcile_land_counters_task
+from .export_tasks import create_export_task, batch_export_task, cleanup_export_files_task
 
 __all__ = [
     "crawl_land_task",
@@ -15,4 +17,11 @@ __all__ = [
     "domain_crawl_task",
     "domain_recrawl_task",
     "domain_crawl_batch_task",
+    "llm_validation_task",
+    "reprocess_sentiment_task",
+    "analyze_land_media_task",
+    "reconcile_land_counters_task",
+    "create_export_task",
+    "batch_export_task",
+    "cleanup_export_files_task",
 ]
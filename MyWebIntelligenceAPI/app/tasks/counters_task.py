@@ -0,0 +1,52 @@
+"""
+Tâche Celery de réconciliation des compteurs des lands (V2 SYNC)
+
+Les compteurs Land.total_* et Domain.total_expressions/avg_http_status sont
+maintenus à chaque flush (voir land_counters) ; cette tâche corrige les
+écarts laissés par les écritures SQL directes ou les restaurations.
+Planifiée par Celery beat (LAND_COUNTERS_RECONCILE_INTERVAL).
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import select
+
+from app.core.celery_app import celery_app
+from app.db import models
+from app.db.session import SessionLocal
+from app.services.land_counters import reconcile_land_counters
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="tasks.reconcile_land_counters_task")
+def reconcile_land_counters_task(land_id: Optional[int] = None):
+    """Réconcilie un land, ou tous les lands (un commit par land)."""
+    db = SessionLocal()
+    totals = {"lands_checked": 0, "lands_fixed": 0, "domains_checked": 0, "domains_fixed": 0}
+
+    try:
+        if land_id is not None:
+            land_ids = [land_id]
+        else:
+            land_ids = db.execute(select(models.Land.id).order_by(models.Land.id)).scalars().all()
+
+        for current_id in land_ids:
+            result = reconcile_land_counters(db, current_id)
+            totals["lands_checked"] += 1
+            for key, value in result.items():
+                totals[key] += value
+
+        logger.info(
+            "Counter reconciliation: %s/%s lands and %s/%s domains fixed",
+            totals["lands_fixed"], totals["lands_checked"], totals["domains_fixed"], totals["domains_checked"]
+        )
+        return totals
+
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Counter reconciliation failed: %s", exc)
+        db.rollback()
+        raise
+    finally:
+        db.close()
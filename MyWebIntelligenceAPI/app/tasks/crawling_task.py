@@ -3,26 +3,27 @@ from datetime import datetime, timezone
 
 from app.core.celery_app import celery_app
 from app.core.crawler_engine import SyncCrawlerEngine
+from app.core.job_progress import ProgressPublisher
+from app.core.metrics import collect_job_metrics
 from app.db import models
 from app.db.models import CrawlStatus
 from app.db.session import SessionLocal
 
 logger = logging.getLogger(__name__)
 
-# WebSocket support removed in V2 (moved to projetV3)
-# Crawl progress can be monitored by polling the job status endpoint
-def _send_progress(ws_channel: str | None, processed: int, total: int, message: str) -> None:
-    """Placeholder - WebSocket support removed in V2."""
-    pass
-
 
 @celery_app.task(name="tasks.crawl_land_task", bind=True)
 def crawl_land_task(self, job_id: int, ws_channel: str | None = None) -> None:
     """
     Celery entry point for crawling a land using the synchronous pipeline.
+
+    Progress is published on Redis pub/sub (app.core.job_progress) after each
+    expression, throttled per job, and relayed to the job's WebSocket clients
+    by every API replica. ws_channel is kept for backward compatibility.
     """
     db = SessionLocal()
     engine: SyncCrawlerEngine | None = None
+    progress = ProgressPublisher(job_id)
 
     start_time = datetime.now(timezone.utc)
     logger.info("=" * 80)
@@ -75,7 +76,6 @@ def crawl_land_task(self, job_id: int, ws_channel: str | None = None) -> None:
 
         total_expressions = len(expressions)
         if total_expressions == 0:
-            _send_progress(ws_channel, 0, 0, "Aucune expression à crawler")
             job.status = CrawlStatus.COMPLETED
             job.completed_at = datetime.now(timezone.utc)
             job.result_data = {
@@ -89,15 +89,20 @@ def crawl_land_task(self, job_id: int, ws_channel: str | None = None) -> None:
                 "speed_urls_per_second": 0,
             }
             db.commit()
+            progress.publish(0, 0, "Aucune expression à crawler", status="completed")
             return
 
-        _send_progress(ws_channel, 0, total_expressions, "Début du crawling...")
+        progress.publish(0, total_expressions, "Début du crawling...", force=True)
 
-        processed, errors, http_stats = engine.crawl_expressions(
-            expressions,
-            analyze_media=analyze_media,
-            enable_llm=enable_llm,
-        )
+        with collect_job_metrics() as job_metrics:
+            processed, errors, http_stats = engine.crawl_expressions(
+                expressions,
+                analyze_media=analyze_media,
+                enable_llm=enable_llm,
+                progress=lambda done, failed: progress.publish(
+                    done + failed, total_expressions, f"{done + failed}/{total_expressions}", errors=failed
+                ),
+            )
 
         end_time = datetime.now(timezone.utc)
         duration = (end_time - start_time).total_seconds()
@@ -117,13 +122,6 @@ def crawl_land_task(self, job_id: int, ws_channel: str | None = None) -> None:
         logger.info("HTTP Status Codes: %s", http_stats)
         logger.info("=" * 80)
 
-        _send_progress(
-            ws_channel,
-            processed,
-            total_expressions,
-            f"Crawl terminé: {processed} traités, {errors} erreurs",
-        )
-
         job.status = CrawlStatus.COMPLETED
         job.completed_at = end_time
         job.progress = 1.0
@@ -135,9 +133,20 @@ def crawl_land_task(self, job_id: int, ws_channel: str | None = None) -> None:
             "duration_seconds": duration,
             "speed_urls_per_second": speed,
             "http_status_codes": http_stats,
+            "host_breaker": engine.host_breaker.snapshot(),
+            "stage_timings": job_metrics.summary(),
         }
         db.commit()
 
+        # Publié après le commit : un client qui relit le job voit l'état final
+        progress.publish(
+            processed + errors,
+            total_expressions,
+            f"Crawl terminé: {processed} traités, {errors} erreurs",
+            status="completed",
+            errors=errors,
+        )
+
     except Exception as exc:  # noqa: BLE001
         logger.exception("Crawl failed for job %s: %s", job_id, exc)
         end_time = datetime.now(timezone.utc)
@@ -160,13 +169,9 @@ def crawl_land_task(self, job_id: int, ws_channel: str | None = None) -> None:
         else:
             db.rollback()
 
-        _send_progress(
-            ws_channel,
-            0,
-            0,
-            f"Erreur lors du crawling: {exc}",
-        )
+        progress.publish(0, 0, f"Erreur lors du crawling: {exc}", status="failed")
     finally:
         if engine:
             engine.close()
+        progress.close()
         db.close()
@@ -17,6 +17,7 @@ from app.core.celery_app import celery_app
 from app.db.session import get_sync_db_context
 from app.db.models import Domain
 from app.core.domain_crawler import DomainCrawler
+from app.core.domain_enrichment import DomainEnrichmentEngine
 from app.services.domain_crawl_service import DomainCrawlService
 
 logger = logging.getLogger(__name__)
@@ -49,7 +50,6 @@ def domain_crawl_task(
     )
 
     start_time = datetime.now()
-    crawler = None
 
     # Résultats
     stats = {
@@ -64,7 +64,9 @@ def domain_crawl_task(
             "error": 0
         },
         "start_time": start_time.isoformat(),
-        "end_time": None
+        "end_time": None,
+        "duration_s": None,
+        "domains_per_second": None
     }
 
     try:
@@ -93,28 +95,33 @@ def domain_crawl_task(
                 )
                 return stats
 
-            # Initialiser le crawler
-            crawler = DomainCrawler()
-
-            # Crawler chaque domaine
-            for i, domain in enumerate(domains, 1):
-                try:
-                    logger.info(f"Crawling {i}/{len(domains)}: {domain.name}")
-
-                    # Fetch le domaine
-                    fetch_result = crawler.fetch_domain(domain.name)
-
-                    # Mettre à jour directement le domain object
-                    domain.title = fetch_result.title
-                    domain.description = fetch_result.description
-                    domain.keywords = fetch_result.keywords
-                    domain.language = fetch_result.language
-                    domain.http_status = str(fetch_result.http_status) if fetch_result.http_status else None
-                    domain.fetched_at = fetch_result.fetched_at
-                    domain.last_crawled = fetch_result.fetched_at
-
-                    service.db.commit()
-                    logger.info(f"Saved fetch result for {domain.name}")
+            # Un même nom peut exister dans plusieurs lands : un seul fetch par nom
+            by_name = {}
+            for domain in domains:
+                by_name.setdefault(domain.name, []).append(domain)
+            completed = []
+
+            def save(fetch_result):
+                """Enregistre un domaine dès qu'il est enrichi (thread de la tâche)."""
+                for domain in by_name[fetch_result.domain_name]:
+                    completed.append(domain.id)
+                    try:
+                        # Mettre à jour directement le domain object
+                        domain.title = fetch_result.title
+                        domain.description = fetch_result.description
+                        domain.keywords = fetch_result.keywords
+                        domain.language = fetch_result.language
+                        domain.http_status = str(fetch_result.http_status) if fetch_result.http_status else None
+                        domain.fetched_at = fetch_result.fetched_at
+                        domain.last_crawled = fetch_result.fetched_at
+
+                        service.db.commit()
+                    except Exception as e:
+                        logger.error(f"❌ Error saving {domain.name}: {e}", exc_info=True)
+                        service.db.rollback()
+                        stats["errors"] += 1
+                        stats["by_source"]["error"] += 1
+                        continue
 
                     # Mettre à jour les stats
                     stats["processed"] += 1
@@ -126,38 +133,37 @@ def domain_crawl_task(
 
                     stats["by_source"][fetch_result.source_method] += 1
 
-                    # Mettre à jour la progression du job
-                    progress = int((i / len(domains)) * 100)
-                    self.update_state(
-                        state='PROGRESS',
-                        meta={
-                            'current': i,
-                            'total': len(domains),
-                            'percent': progress,
-                            'domain': domain.name,
-                            'http_status': fetch_result.http_status,
-                            'source': fetch_result.source_method
-                        }
-                    )
-
-                    logger.info(
-                        f"✅ {domain.name} - HTTP {fetch_result.http_status} "
-                        f"via {fetch_result.source_method} ({i}/{len(domains)})"
-                    )
+                # Mettre à jour la progression du job
+                done = len(completed)
+                elapsed = (datetime.now() - start_time).total_seconds()
+                self.update_state(
+                    state='PROGRESS',
+                    meta={
+                        'current': done,
+                        'total': len(domains),
+                        'percent': int((done / len(domains)) * 100),
+                        'domain': fetch_result.domain_name,
+                        'http_status': fetch_result.http_status,
+                        'source': fetch_result.source_method,
+                        'domains_per_second': round(done / elapsed, 3) if elapsed > 0 else None
+                    }
+                )
 
-                except Exception as e:
-                    logger.error(f"❌ Error crawling {domain.name}: {e}", exc_info=True)
-                    stats["errors"] += 1
-                    stats["by_source"]["error"] += 1
-                    continue
+                logger.info(
+                    f"✅ {fetch_result.domain_name} - HTTP {fetch_result.http_status} "
+                    f"via {fetch_result.source_method} ({done}/{len(domains)})"
+                )
 
-            # Fermer le crawler
-            if crawler:
-                crawler.close()
+            # Enrichir tous les domaines en parallèle
+            engine = DomainEnrichmentEngine()
+            engine.run(list(by_name), on_result=save)
 
             # Mettre à jour le job à "completed"
             end_time = datetime.now()
             stats["end_time"] = end_time.isoformat()
+            stats["duration_s"] = engine.stats["duration_s"]
+            stats["domains_per_second"] = engine.stats["domains_per_second"]
+            stats["host_breaker"] = engine.host_breaker.snapshot()
 
             service.update_job_status(
                 job_id,
@@ -167,7 +173,7 @@ def domain_crawl_task(
 
             logger.info(
                 f"✅ Domain crawl completed: {stats['success']}/{stats['total']} successful "
-                f"({stats['errors']} errors)"
+                f"({stats['errors']} errors, {stats['domains_per_second']} domains/s)"
             )
 
             return stats
@@ -175,13 +181,6 @@ def domain_crawl_task(
     except Exception as e:
         logger.error(f"❌ Domain crawl task failed: {e}", exc_info=True)
 
-        # Fermer le crawler en cas d'erreur
-        if crawler:
-            try:
-                crawler.close()
-            except:
-                pass
-
         # Mettre le job à "failed"
         try:
             with get_sync_db_context() as db:
@@ -286,62 +285,56 @@ def domain_crawl_batch_task(
     """
     logger.info(f"🕷️  Batch crawling {len(domain_names)} domain(s)")
 
-    crawler = None
     stats = {
         "total": len(domain_names),
         "processed": 0,
         "success": 0,
-        "errors": 0
+        "errors": 0,
+        "duration_s": None,
+        "domains_per_second": None
     }
 
     try:
-        crawler = DomainCrawler()
-
         with get_sync_db_context() as db:
             service = DomainCrawlService(db)
 
-            for domain_name in domain_names:
+            def save(fetch_result):
+                """Sauvegarde un domaine dès qu'il est enrichi."""
                 try:
-                    # Fetch le domaine
-                    fetch_result = crawler.fetch_domain(domain_name)
-
-                    # Sauvegarder en DB
                     service.save_fetch_result(fetch_result)
+                except Exception as e:
+                    logger.error(f"❌ Error saving {fetch_result.domain_name}: {e}")
+                    service.db.rollback()
+                    stats["errors"] += 1
+                    return
 
-                    stats["processed"] += 1
+                stats["processed"] += 1
 
-                    if fetch_result.http_status == 200:
-                        stats["success"] += 1
-                    else:
-                        stats["errors"] += 1
+                if fetch_result.http_status == 200:
+                    stats["success"] += 1
+                else:
+                    stats["errors"] += 1
 
-                    logger.info(
-                        f"✅ {domain_name} - HTTP {fetch_result.http_status} "
-                        f"({stats['processed']}/{stats['total']})"
-                    )
+                logger.info(
+                    f"✅ {fetch_result.domain_name} - HTTP {fetch_result.http_status} "
+                    f"({stats['processed']}/{stats['total']})"
+                )
 
-                except Exception as e:
-                    logger.error(f"❌ Error crawling {domain_name}: {e}")
-                    stats["errors"] += 1
-                    continue
+            # Enrichir tous les domaines en parallèle
+            engine = DomainEnrichmentEngine()
+            engine.run(domain_names, on_result=save)
 
-        # Fermer le crawler
-        if crawler:
-            crawler.close()
+        stats["duration_s"] = engine.stats["duration_s"]
+        stats["domains_per_second"] = engine.stats["domains_per_second"]
+        stats["host_breaker"] = engine.host_breaker.snapshot()
 
         logger.info(
-            f"✅ Batch crawl completed: {stats['success']}/{stats['total']} successful"
+            f"✅ Batch crawl completed: {stats['success']}/{stats['total']} successful "
+            f"({stats['domains_per_second']} domains/s)"
         )
 
         return stats
 
     except Exception as e:
         logger.error(f"❌ Batch crawl failed: {e}", exc_info=True)
-
-        if crawler:
-            try:
-                crawler.close()
-            except:
-                pass
-
         raise
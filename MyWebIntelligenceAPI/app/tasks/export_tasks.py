@@ -5,12 +5,15 @@ Based on the old crawler export functionality
 
 import os
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from celery import current_task
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.core.celery_app import celery_app
+from app.core.metrics import collect_job_metrics
 from app.db.session import SessionLocal
+from app.services.export_cache import SyncExportCache
 from app.services.export_service_sync import SyncExportService
 from app.crud.crud_land import land as land_crud
 
@@ -22,17 +25,21 @@ def create_export_task(
     land_id: int,
     minimum_relevance: int = 1,
     user_id: int = None,
-    filename: str = None
+    filename: str = None,
+    options: Optional[Dict[str, Any]] = None,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
     Celery task for creating exports
     
     Args:
-        export_type: Type of export (pagecsv, fullpagecsv, nodecsv, mediacsv, pagegexf, nodegexf, corpus)
+        export_type: Type of export (pagecsv, fullpagecsv, nodecsv, mediacsv, pagegexf, nodegexf, corpus, shardedcorpus, embeddings)
         land_id: ID of the land to export
         minimum_relevance: Minimum relevance filter
         user_id: ID of the user requesting the export
         filename: Optional custom filename
+        options: Writer specific options (e.g. {"shards": 8, "shard_format": "zip"})
+        use_cache: Reuse a previous identical export when the land data has not changed
         
     Returns:
         Dictionary with export results
@@ -66,6 +73,28 @@ def create_export_task(
             if not land:
                 raise ValueError(f"Land with ID {land_id} not found")
             
+            # Serve the previous file when nothing changed since the last identical export
+            export_cache = None
+            fingerprint = None
+            if use_cache and settings.EXPORT_CACHE_ENABLED:
+                export_cache = SyncExportCache(db)
+                fingerprint = export_cache.compute_fingerprint(
+                    export_type, land_id, minimum_relevance, options, filename
+                )
+                cached = export_cache.lookup(fingerprint)
+                if cached:
+                    return {
+                        'progress': 100,
+                        'message': 'Export served from cache',
+                        'export_type': export_type,
+                        'land_id': land_id,
+                        'file_path': cached.file_path,
+                        'record_count': cached.total_records,
+                        'task_id': task_id,
+                        'cached': True,
+                        'fingerprint': fingerprint
+                    }
+            
             # Update progress
             self.update_state(
                 state='PROGRESS',
@@ -95,12 +124,14 @@ def create_export_task(
             )
             
             # Perform export
-            file_path, record_count = export_service.export_data(
-                export_type=export_type,
-                land_id=land_id,
-                minimum_relevance=minimum_relevance,
-                filename=filename
-            )
+            with collect_job_metrics() as job_metrics:
+                file_path, record_count = export_service.export_data(
+                    export_type=export_type,
+                    land_id=land_id,
+                    minimum_relevance=minimum_relevance,
+                    filename=filename,
+                    **(options or {})
+                )
             
             # Update progress
             self.update_state(
@@ -114,6 +145,18 @@ def create_export_task(
                 }
             )
             
+            if export_cache:
+                export_cache.store(
+                    fingerprint=fingerprint,
+                    export_type=export_type,
+                    land_id=land_id,
+                    user_id=user_id or land.owner_id,
+                    minimum_relevance=minimum_relevance,
+                    file_path=file_path,
+                    record_count=record_count,
+                    options=options
+                )
+            
             # Final success state
             result = {
                 'progress': 100,
@@ -122,7 +165,10 @@ def create_export_task(
                 'land_id': land_id,
                 'file_path': file_path,
                 'record_count': record_count,
-                'task_id': task_id
+                'task_id': task_id,
+                'cached': False,
+                'fingerprint': fingerprint,
+                'stage_timings': job_metrics.summary()
             }
             
             return result
@@ -240,16 +286,26 @@ def batch_export_task(
 
 
 @celery_app.task(bind=True)
-def cleanup_export_files_task(self, max_age_hours: int = 24) -> Dict[str, Any]:
+def cleanup_export_files_task(
+    self,
+    max_age_hours: int = 24,
+    max_cache_bytes: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Celery task to clean up old export files
     
+    Files registered in the export cache are aged from their last use
+    rather than their creation, then evicted least-recently-used first
+    until the cache fits in its size budget.
+    
     Args:
-        max_age_hours: Maximum age of files to keep in hours
+        max_age_hours: Maximum age (or idle time for cached exports) of files to keep in hours
+        max_cache_bytes: Size budget for cached exports (defaults to EXPORT_CACHE_MAX_BYTES)
         
     Returns:
         Dictionary with cleanup results
     """
+    import shutil
     import tempfile
     import time
     from pathlib import Path
@@ -272,11 +328,30 @@ def cleanup_export_files_task(self, max_age_hours: int = 24) -> Dict[str, Any]:
         deleted_files = []
         total_size_freed = 0
         
+        # Cached exports: evict by idle time and LRU under the size budget
+        cached_paths = {}
+        if settings.EXPORT_CACHE_ENABLED:
+            db = SessionLocal()
+            try:
+                export_cache = SyncExportCache(db)
+                evicted = export_cache.evict(
+                    max_bytes=max_cache_bytes if max_cache_bytes is not None else settings.EXPORT_CACHE_MAX_BYTES,
+                    max_idle_hours=max_age_hours
+                )
+                for entry in evicted:
+                    deleted_files.append(entry)
+                    total_size_freed += entry['size']
+                cached_paths = export_cache.cached_paths()
+            finally:
+                db.close()
+        
         # Find export files
         export_patterns = [
             'export_*_*.csv',
             'export_*_*.gexf', 
-            'export_*_*.zip'
+            'export_*_*.zip',
+            'export_shardedcorpus_*',
+            'export_embeddings_*'
         ]
         
         files_to_check = []
@@ -298,12 +373,19 @@ def cleanup_export_files_task(self, max_age_hours: int = 24) -> Dict[str, Any]:
                     }
                 )
                 
-                # Check file age
+                # Check file age (cached exports still in use are kept)
                 file_age = current_time - file_path.stat().st_mtime
+                if str(file_path) in cached_paths or str(file_path / 'manifest.json') in cached_paths:
+                    continue
                 
                 if file_age > max_age_seconds:
-                    file_size = file_path.stat().st_size
-                    file_path.unlink()
+                    if file_path.is_dir():
+                        # Sharded corpus and embeddings exports are directories
+                        file_size = sum(f.stat().st_size for f in file_path.iterdir() if f.is_file())
+                        shutil.rmtree(file_path)
+                    else:
+                        file_size = file_path.stat().st_size
+                        file_path.unlink()
                     
                     deleted_files.append({
                         'filename': str(file_path.name),
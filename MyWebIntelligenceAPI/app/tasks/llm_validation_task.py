@@ -0,0 +1,99 @@
+"""
+Tâche Celery pour la validation LLM d'un land (V2 SYNC)
+
+La tâche reste synchrone côté Celery/DB ; seuls les appels OpenRouter
+passent par un pool HTTP asynchrone borné (voir llm_validation_pipeline).
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.celery_app import celery_app
+from app.db import models
+from app.db.models import CrawlStatus
+from app.db.session import SessionLocal
+from app.services.llm_validation_pipeline import LLMValidationPipeline
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="tasks.llm_validation_task", bind=True)
+def llm_validation_task(
+    self,
+    job_id: int,
+    limit: Optional[int] = None,
+    force: bool = False,
+    batch_size: int = 50,
+    model: Optional[str] = None,
+    batched: bool = False
+):
+    """
+    Valide par LLM les expressions pertinentes du land d'un job.
+
+    La progression (pourcentage, débit en pages/min, tokens consommés)
+    est écrite dans le CrawlJob après chaque lot. Avec batched=True,
+    plusieurs pages sont validées par requête.
+    """
+    db = SessionLocal()
+    start_time = datetime.now(timezone.utc)
+    job: Optional[models.CrawlJob] = None
+
+    try:
+        job = db.query(models.CrawlJob).filter(models.CrawlJob.id == job_id).first()
+        if not job:
+            logger.error("LLM validation job with id %s not found.", job_id)
+            return None
+
+        job.status = CrawlStatus.RUNNING
+        job.started_at = start_time
+        job.error_message = None
+        db.commit()
+
+        def report(done: int, total: int, stats: dict) -> None:
+            job.progress = done / total if total else 1.0
+            job.current_step = f"LLM validation {done}/{total}"
+            job.result_data = stats
+            db.commit()
+            self.update_state(
+                state='PROGRESS',
+                meta={'current': done, 'total': total, **stats}
+            )
+
+        pipeline = LLMValidationPipeline(db, model=model, batched=batched)
+        stats = pipeline.run(
+            land_id=job.land_id,
+            limit=limit,
+            force=force,
+            batch_size=batch_size,
+            progress=report
+        )
+
+        end_time = datetime.now(timezone.utc)
+        stats.update({
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+        })
+        job.status = CrawlStatus.COMPLETED
+        job.progress = 1.0
+        job.completed_at = end_time
+        job.result_data = stats
+        db.commit()
+
+        logger.info(
+            "LLM validation job %s completed: %s validated, %s rejected, %s pages/min, %s tokens",
+            job_id, stats["validated"], stats["rejected"], stats["pages_per_minute"], stats["total_tokens"]
+        )
+        return stats
+
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("LLM validation failed for job %s: %s", job_id, exc)
+        db.rollback()
+        if job:
+            job.status = CrawlStatus.FAILED
+            job.error_message = str(exc)
+            job.completed_at = datetime.now(timezone.utc)
+            db.commit()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,116 @@
+"""
+Tâche Celery pour l'analyse des médias d'un land (V2 SYNC)
+
+La tâche reste synchrone côté Celery/DB ; les téléchargements passent par
+une boucle asyncio bornée par hôte et l'analyse par un pool de processus
+(voir media_analysis_pipeline). Le dernier media.id traité est enregistré
+dans le CrawlJob après chaque page : une tâche relancée reprend à ce point.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.celery_app import celery_app
+from app.core.metrics import collect_job_metrics
+from app.db import models
+from app.db.models import CrawlStatus
+from app.db.session import SessionLocal
+from app.services.media_analysis_pipeline import MediaAnalysisPipeline
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    name="tasks.analyze_land_media_task",
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True
+)
+def analyze_land_media_task(
+    self,
+    job_id: int,
+    land_id: int,
+    depth: int = 999,
+    minrel: float = 0.0,
+    batch_size: int = 50
+):
+    """
+    Analyse les images non traitées d'un land.
+
+    acks_late : un worker arrêté en cours de tâche laisse le message dans la
+    file, la tâche est relancée et repart du last_media_id du job.
+    batch_size est conservé pour compatibilité ; la taille des pages vient de
+    MEDIA_ANALYSIS_PAGE_SIZE.
+    """
+    db = SessionLocal()
+    start_time = datetime.now(timezone.utc)
+    job: Optional[models.CrawlJob] = None
+
+    try:
+        job = db.query(models.CrawlJob).filter(models.CrawlJob.id == job_id).first()
+        if not job:
+            logger.error("Media analysis job with id %s not found.", job_id)
+            return None
+
+        previous = job.result_data or {}
+        after_id = int(previous.get("last_media_id") or 0) if job.status == CrawlStatus.RUNNING else 0
+        if after_id:
+            logger.info("Media analysis job %s resumes after media %s", job_id, after_id)
+
+        job.status = CrawlStatus.RUNNING
+        job.started_at = job.started_at if after_id else start_time
+        job.error_message = None
+        db.commit()
+
+        def report(done: int, total: int, stats: dict) -> None:
+            job.progress = done / total if total else 1.0
+            job.current_step = f"Media analysis {done}/{total}"
+            job.result_data = stats
+            db.commit()
+            self.update_state(
+                state='PROGRESS',
+                meta={'current': done, 'total': total, **stats}
+            )
+
+        pipeline = MediaAnalysisPipeline(db)
+        with collect_job_metrics() as job_metrics:
+            stats = pipeline.run(
+                land_id=land_id,
+                depth=depth if depth is not None else 999,
+                minrel=minrel if minrel is not None else 0.0,
+                after_id=after_id,
+                progress=report
+            )
+
+        end_time = datetime.now(timezone.utc)
+        stats.update({
+            "resumed_after_media_id": after_id or None,
+            "filters_applied": {"depth": depth, "minrel": minrel},
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "stage_timings": job_metrics.summary(),
+        })
+        job.status = CrawlStatus.COMPLETED
+        job.progress = 1.0
+        job.completed_at = end_time
+        job.result_data = stats
+        db.commit()
+
+        logger.info(
+            "Media analysis job %s completed: %s analyzed, %s failed, %s reused, %s media/s",
+            job_id, stats["analyzed_media"], stats["failed_analysis"], stats["reused"], stats["media_per_second"]
+        )
+        return stats
+
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Media analysis failed for job %s: %s", job_id, exc)
+        db.rollback()
+        if job:
+            job.status = CrawlStatus.FAILED
+            job.error_message = str(exc)
+            job.completed_at = datetime.now(timezone.utc)
+            db.commit()
+        raise
+    finally:
+        db.close()
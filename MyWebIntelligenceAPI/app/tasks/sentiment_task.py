@@ -0,0 +1,55 @@
+"""
+Tâche Celery de retraitement du sentiment (V2 SYNC)
+
+Recalcule le sentiment TextBlob d'un land par lots : analyse dans un pool
+de processus aux analyseurs préchargés, écriture par UPDATE groupés.
+"""
+
+import logging
+from typing import Optional
+
+from app.core.celery_app import celery_app
+from app.db.session import get_sync_db_context
+from app.services.sentiment_batch import reprocess_sentiment
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="tasks.reprocess_sentiment", bind=True)
+def reprocess_sentiment_task(
+    self,
+    land_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    force: bool = False,
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None
+):
+    """
+    Recalcule le sentiment des expressions d'un land (ou de tous les lands).
+
+    Returns:
+        Dict de statistiques (traitées, mises à jour, répartition des statuts, débit)
+    """
+    logger.info(f"Starting sentiment reprocessing (land_id={land_id}, limit={limit}, force={force})")
+
+    def report(done: int, total: int, stats: dict) -> None:
+        self.update_state(
+            state='PROGRESS',
+            meta={
+                'current': done,
+                'total': total,
+                'percent': int(done / total * 100) if total else 100,
+                'texts_per_second': stats["texts_per_second"]
+            }
+        )
+
+    with get_sync_db_context() as db:
+        return reprocess_sentiment(
+            db,
+            land_id=land_id,
+            limit=limit,
+            force=force,
+            batch_size=batch_size,
+            workers=workers,
+            progress=report
+        )
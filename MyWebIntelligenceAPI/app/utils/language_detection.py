@@ -0,0 +1,295 @@
+"""
+Détection de langue rapide, déterministe et mise en cache
+
+Moteurs disponibles (LANGUAGE_DETECTION_ENGINE):
+- "profile" (défaut): classifieur bayésien naïf sur les profils n-grammes
+  fournis avec langdetect, évalué sur tous les n-grammes de l'échantillon
+  (pas de tirage aléatoire), avec un a priori pour les langues attendues
+  qui départage les textes courts
+- "langdetect": langdetect à graine fixe (référence pour les comparaisons)
+
+Les deux moteurs n'analysent que les LANGUAGE_DETECTION_MAX_CHARS premiers
+caractères et mettent en cache les résultats par empreinte du texte.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import langdetect
+    from langdetect import DetectorFactory, LangDetectException
+    from langdetect.detector_factory import PROFILES_DIRECTORY
+    from langdetect.utils.ngram import NGram
+    from langdetect.utils.unicode_block import unicode_block
+except ImportError:  # pragma: no cover - optional dependency
+    langdetect = None
+
+URL_RE = re.compile(r'https?://[-_.?&~;+=/#0-9A-Za-z]{1,2076}')
+MAIL_RE = re.compile(r'[-_.0-9A-Za-z]{1,64}@[-_0-9A-Za-z]{1,255}[-_.0-9A-Za-z]{1,255}')
+
+# Codes non standard renvoyés par les profils langdetect
+LANG_MAPPING = {
+    'zh-cn': 'zh',  # Chinois simplifié
+    'zh-tw': 'zh',  # Chinois traditionnel
+    'no': 'nb',     # Norvégien
+}
+
+MIN_TEXT_LENGTH = 10
+
+
+class LanguageDetector:
+    """
+    Interface commune des moteurs: échantillonnage, cache, détection par lot.
+
+    Les sous-classes implémentent _detect_sample().
+    """
+
+    name = "base"
+
+    def __init__(self, max_chars: int = 2000, cache_size: int = 10000):
+        self.max_chars = max_chars
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def sample(self, text: str) -> str:
+        """Texte réellement analysé: URLs et emails retirés, espaces fusionnés, tronqué."""
+        text = URL_RE.sub(' ', text)
+        text = MAIL_RE.sub(' ', text)
+        text = re.sub(r'\s+', ' ', text).strip()
+        return text[:self.max_chars]
+
+    def detect(self, text: Optional[str]) -> Optional[str]:
+        """Code ISO 639-1 de la langue du texte, ou None."""
+        if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+            return None
+        sample = self.sample(text)
+        if len(sample) < MIN_TEXT_LENGTH:
+            return None
+
+        key = hashlib.blake2b(sample.encode('utf-8'), digest_size=16).digest()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        language = self._detect_sample(sample)
+        language = LANG_MAPPING.get(language, language) if language else None
+
+        with self._lock:
+            self._cache[key] = language
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return language
+
+    def detect_many(self, texts: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """Détection par lot (paragraphes): les textes identiques ne sont analysés qu'une fois."""
+        return [self.detect(text) for text in texts]
+
+    def _detect_sample(self, sample: str) -> Optional[str]:
+        raise NotImplementedError
+
+
+class ProfileLanguageDetector(LanguageDetector):
+    """
+    Bayésien naïf sur les profils n-grammes (1 à 3 caractères) de langdetect.
+
+    Même modèle que langdetect (produit des (alpha/BASE_FREQ + p) par n-gramme),
+    mais sur tous les n-grammes de l'échantillon au lieu de tirages aléatoires:
+    le résultat est déterministe et une seule passe suffit.
+    """
+
+    name = "profile"
+    ALPHA = 0.5
+    BASE_FREQ = 10000
+    MIN_NGRAMS = 3
+
+    _model = None
+    _model_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_chars: int = 2000,
+        cache_size: int = 10000,
+        prior_languages: Sequence[str] = (),
+        prior_weight: float = 2.0
+    ):
+        super().__init__(max_chars, cache_size)
+        self.prior_languages = tuple(prior_languages)
+        self.prior_weight = prior_weight
+        self._prior: Optional[np.ndarray] = None
+
+    @classmethod
+    def load_model(cls):
+        """Charge les profils une fois par processus: (langues, index n-gramme, CSR)."""
+        if cls._model is None:
+            with cls._model_lock:
+                if cls._model is None:
+                    cls._model = cls._build_model()
+        return cls._model
+
+    @classmethod
+    def _build_model(cls):
+        if langdetect is None:
+            raise RuntimeError("langdetect profiles are not available")
+
+        weight = cls.ALPHA / cls.BASE_FREQ
+        languages: List[str] = []
+        entries: Dict[str, List[tuple]] = {}
+        for filename in sorted(os.listdir(PROFILES_DIRECTORY)):
+            path = os.path.join(PROFILES_DIRECTORY, filename)
+            if filename.startswith('.') or not os.path.isfile(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                profile = json.load(f)
+            index = len(languages)
+            languages.append(profile['name'])
+            n_words = profile['n_words']
+            for gram, count in profile['freq'].items():
+                if 1 <= len(gram) <= 3 and n_words[len(gram) - 1]:
+                    entries.setdefault(gram, []).append((index, math.log1p(count / n_words[len(gram) - 1] / weight)))
+
+        vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for gram, values in entries.items():
+            vocabulary[gram] = len(vocabulary)
+            for index, value in values:
+                indices.append(index)
+                data.append(value)
+            indptr.append(len(indices))
+
+        logger.debug(f"Language profiles loaded: {len(languages)} languages, {len(vocabulary)} n-grams")
+        return (
+            languages,
+            vocabulary,
+            np.array(indptr, dtype=np.int64),
+            np.array(indices, dtype=np.int64),
+            np.array(data, dtype=np.float64),
+        )
+
+    def sample(self, text: str) -> str:
+        text = super().sample(NGram.normalize_vi(text) if langdetect else text)
+
+        # Comme langdetect: ignorer l'alphabet latin dans un texte majoritairement non latin
+        latin_count = sum(1 for ch in text if 'A' <= ch <= 'z')
+        non_latin_count = sum(
+            1 for ch in text
+            if ch >= '̀' and unicode_block(ch) != 'Latin Extended Additional'
+        )
+        if latin_count * 2 < non_latin_count:
+            text = ''.join(ch for ch in text if ch < 'A' or 'z' < ch)
+        return text
+
+    def ngrams(self, sample: str) -> Dict[str, int]:
+        """N-grammes connus de l'échantillon avec leur nombre d'occurrences."""
+        vocabulary = self.load_model()[1]
+        counts: Dict[str, int] = {}
+        ngram = NGram()
+        for ch in sample:
+            ngram.add_char(ch)
+            if ngram.capitalword:
+                continue
+            grams = ngram.grams
+            for n in (1, 2, 3):
+                if len(grams) < n:
+                    break
+                gram = grams[-n:]
+                if gram != ' ' and gram in vocabulary:
+                    counts[gram] = counts.get(gram, 0) + 1
+        return counts
+
+    def scores(self, sample: str) -> Optional[np.ndarray]:
+        """Log-vraisemblance (à une constante près) de chaque langue, None sans indice."""
+        languages, vocabulary, indptr, indices, data = self.load_model()
+        counts = self.ngrams(sample)
+        if sum(counts.values()) < self.MIN_NGRAMS:
+            return None
+
+        rows = np.fromiter((vocabulary[gram] for gram in counts), dtype=np.int64, count=len(counts))
+        occurrences = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        starts, ends = indptr[rows], indptr[rows + 1]
+        lengths = ends - starts
+        # Positions CSR de toutes les lignes concernées, à plat
+        flat = np.repeat(ends - lengths.cumsum(), lengths) + np.arange(lengths.sum())
+        scores = np.bincount(
+            indices[flat],
+            weights=data[flat] * np.repeat(occurrences, lengths),
+            minlength=len(languages)
+        )
+        return scores + self._prior_vector(languages)
+
+    def _prior_vector(self, languages: List[str]) -> np.ndarray:
+        if self._prior is None:
+            prior = np.zeros(len(languages))
+            for i, language in enumerate(languages):
+                if LANG_MAPPING.get(language, language) in self.prior_languages:
+                    prior[i] = self.prior_weight
+            self._prior = prior
+        return self._prior
+
+    def _detect_sample(self, sample: str) -> Optional[str]:
+        scores = self.scores(sample)
+        if scores is None:
+            return None
+        return self.load_model()[0][int(np.argmax(scores))]
+
+
+class LangdetectLanguageDetector(LanguageDetector):
+    """langdetect avec graine fixe (résultats reproductibles)."""
+
+    name = "langdetect"
+
+    def _detect_sample(self, sample: str) -> Optional[str]:
+        if langdetect is None:
+            return None
+        DetectorFactory.seed = 0
+        try:
+            return langdetect.detect(sample)
+        except LangDetectException:
+            return None
+
+
+ENGINES = {
+    ProfileLanguageDetector.name: ProfileLanguageDetector,
+    LangdetectLanguageDetector.name: LangdetectLanguageDetector,
+}
+
+_detectors: Dict[str, LanguageDetector] = {}
+
+
+def get_language_detector(engine: Optional[str] = None) -> Optional[LanguageDetector]:
+    """Détecteur partagé du processus pour un moteur (défaut: LANGUAGE_DETECTION_ENGINE)."""
+    from app.config import settings
+
+    engine = engine or settings.LANGUAGE_DETECTION_ENGINE
+    if langdetect is None:
+        return None
+    if engine not in _detectors:
+        options = {
+            "max_chars": settings.LANGUAGE_DETECTION_MAX_CHARS,
+            "cache_size": settings.LANGUAGE_DETECTION_CACHE_SIZE,
+        }
+        if engine == ProfileLanguageDetector.name:
+            options["prior_languages"] = [
+                lang.strip() for lang in settings.LANGUAGE_DETECTION_PRIOR_LANGUAGES.split(",") if lang.strip()
+            ]
+        _detectors[engine] = ENGINES[engine](**options)
+    return _detectors[engine]
@@ -0,0 +1,100 @@
+"""
+Utilitaires de pagination par curseur (keyset) et de comptage estimé.
+
+Les curseurs sont opaques pour les clients : un JSON encodé en base64
+url-safe contenant les valeurs de la clé de tri du dernier élément servi.
+La page suivante filtre sur « clé > curseur » au lieu d'un OFFSET, ce qui
+garde un coût constant quelle que soit la profondeur.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+COUNT_MODES = ("exact", "estimate", "none")
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode les valeurs de la clé de tri du dernier élément en curseur opaque."""
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Décode un curseur produit par encode_cursor.
+
+    Raises:
+        ValueError: curseur illisible ou de taille inattendue
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+
+    if not isinstance(payload, list) or len(payload) != size:
+        raise ValueError("Invalid pagination cursor")
+
+    values = []
+    for value in payload:
+        if isinstance(value, dict) and set(value) == {"dt"}:
+            values.append(datetime.fromisoformat(value["dt"]))
+        elif isinstance(value, (int, float, str)) and not isinstance(value, bool):
+            values.append(value)
+        else:
+            raise ValueError("Invalid pagination cursor")
+    return values
+
+
+def _explain_sql(db_bind: Any, statement: Select) -> str:
+    """Construit la requête EXPLAIN d'un SELECT de comptage."""
+    compiled = statement.compile(
+        dialect=db_bind.dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    return f"EXPLAIN (FORMAT JSON) {compiled}"
+
+
+def _plan_rows(plan: Any) -> int:
+    """Extrait l'estimation de lignes du plan JSON Postgres."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(db: Session, statement: Select) -> int:
+    """
+    Estime le nombre de lignes d'un SELECT via le planificateur Postgres.
+
+    S'appuie sur les statistiques (pg_class.reltuples, histogrammes) au lieu
+    d'un COUNT(*) : coût constant, précision de l'ordre de celle d'ANALYZE.
+    """
+    plan = db.execute(text(_explain_sql(db.get_bind(), statement))).scalar()
+    return _plan_rows(plan)
+
+
+async def estimate_count_async(db: Any, statement: Select) -> int:
+    """Variante AsyncSession de estimate_count."""
+    plan = (await db.execute(text(_explain_sql(db.get_bind(), statement)))).scalar()
+    return _plan_rows(plan)
+
+
+def cursor_headers(next_cursor: Optional[str], total: Optional[int]) -> Dict[str, str]:
+    """En-têtes de pagination pour les endpoints qui renvoient une liste brute."""
+    headers = {}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    return headers
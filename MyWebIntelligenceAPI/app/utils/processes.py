@@ -0,0 +1,16 @@
+"""
+Pools de processus et workers Celery
+"""
+import multiprocessing
+
+
+def can_spawn_processes() -> bool:
+    """
+    Indique si le processus courant peut créer un pool de processus.
+
+    Les enfants du pool prefork de Celery sont des processus daemon :
+    ProcessPoolExecutor y échoue avec « daemonic processes are not allowed
+    to have children ». Les appelants se replient alors sur une exécution en
+    ligne ou dans des threads.
+    """
+    return not multiprocessing.current_process().daemon
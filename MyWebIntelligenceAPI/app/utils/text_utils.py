@@ -7,16 +7,16 @@ import string
 from typing import Dict, List, Optional, Tuple, Any
 import logging
 
+from app.utils.language_detection import get_language_detector
+
 logger = logging.getLogger(__name__)
 
-try:
-    from langdetect import detect as _langdetect_detect, LangDetectException as _LangDetectException
-except ImportError:  # pragma: no cover - optional dependency
-    _langdetect_detect = None
-    _LangDetectException = None
+def analyze_text_metrics(text: str, language: Optional[str] = None) -> Dict[str, any]:
+    """
+    Analyse complète des métriques d'un texte.
 
-def analyze_text_metrics(text: str) -> Dict[str, any]:
-    """Analyse complète des métriques d'un texte."""
+    Si la langue est déjà connue (détection par lot), elle n'est pas recalculée.
+    """
     
     # Nettoyage de base
     clean_text = text.strip()
@@ -30,7 +30,8 @@ def analyze_text_metrics(text: str) -> Dict[str, any]:
     sentence_count = len(sentence_endings) if sentence_endings else 1
     
     # Détection de langue
-    language = detect_language(clean_text)
+    if language is None:
+        language = detect_language(clean_text)
     
     # Score de lisibilité (approximation française du Flesch Reading Ease)
     reading_level = calculate_reading_level(clean_text, word_count, sentence_count)
@@ -47,60 +48,48 @@ def detect_language(text: str) -> Optional[str]:
     """
     Détecte la langue d'un texte de manière robuste.
 
-    Supporte 55+ langues via langdetect (basé sur le détecteur de Google):
+    Supporte 55+ langues via le moteur LANGUAGE_DETECTION_ENGINE
+    (voir app.utils.language_detection):
     - Langues européennes: fr, en, es, de, it, pt, nl, pl, ru, etc.
-    - Langues asiatiques: zh-cn, zh-tw, ja, ko, th, vi, etc.
+    - Langues asiatiques: zh, ja, ko, th, vi, etc.
     - Langues du Moyen-Orient: ar, he, fa, tr, etc.
 
     Returns:
         Code ISO 639-1 de la langue (ex: 'fr', 'en', 'es') ou None si échec
     """
-    # Minimum 10 caractères pour une détection fiable (réduit de 20 à 10)
-    if not text or len(text.strip()) < 10:
-        logger.info(f"Text too short for language detection: {len(text.strip()) if text else 0} chars")
-        return None
+    return detect_languages([text])[0]
 
-    # Nettoyer le texte (enlever URLs, emails, etc.)
-    original_length = len(text)
-    clean_text = re.sub(r'http[s]?://\S+', '', text)
-    clean_text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '', clean_text)
-    clean_text = clean_text.strip()
-
-    logger.info(f"Language detection: original={original_length} chars, cleaned={len(clean_text)} chars")
-
-    if len(clean_text) < 10:
-        logger.warning(f"Text too short after cleaning ({len(clean_text)} chars), using fallback")
-        return _detect_language_fallback(text)
-
-    if not _langdetect_detect:
-        logger.warning("langdetect library not installed, using fallback method")
-        return _detect_language_fallback(text)
+def detect_languages(texts: List[Optional[str]]) -> List[Optional[str]]:
+    """
+    Détection de langue par lot (paragraphes d'une expression, retraitements).
 
-    try:
-        detected_lang = _langdetect_detect(clean_text)
-    except _LangDetectException as e:  # type: ignore[misc]
-        logger.warning(f"LangDetectException: {e}, using fallback method")
-        return _detect_language_fallback(text)
-    except Exception as e:
-        logger.warning(f"Unexpected error in language detection: {e}, using fallback method")
-        return _detect_language_fallback(text)
-
-    # Normaliser certains codes (langdetect retourne parfois des codes non-standard)
-    lang_mapping = {
-        'zh-cn': 'zh',  # Chinois simplifié
-        'zh-tw': 'zh',  # Chinois traditionnel
-        'no': 'nb',     # Norvégien
-    }
+    Un seul détecteur partagé (profils chargés une fois, cache par empreinte);
+    la méthode de fallback fr/en prend le relais texte par texte.
+    """
+    detector = get_language_detector()
+    if detector is None:
+        logger.debug("Language detector unavailable, using fallback method")
 
-    detected_lang = lang_mapping.get(detected_lang, detected_lang)
+    results: List[Optional[str]] = []
+    for text in texts:
+        # Minimum 10 caractères pour une détection fiable
+        if not text or len(text.strip()) < 10:
+            results.append(None)
+            continue
 
-    # Valider que c'est un code ISO 639-1 valide (2 lettres)
-    if detected_lang and len(detected_lang) <= 3:
-        logger.info(f"Language detected by langdetect: {detected_lang}")
-        return detected_lang
+        detected_lang = None
+        if detector is not None:
+            try:
+                detected_lang = detector.detect(text)
+            except Exception as e:
+                logger.warning(f"Unexpected error in language detection: {e}, using fallback method")
 
-    logger.warning(f"Invalid language code from langdetect: {detected_lang}")
-    return _detect_language_fallback(text)
+        # Valider que c'est un code ISO 639-1 valide (2 lettres)
+        if detected_lang and len(detected_lang) <= 3:
+            results.append(detected_lang)
+        else:
+            results.append(_detect_language_fallback(text))
+    return results
 
 def _detect_language_fallback(text: str) -> Optional[str]:
     """
@@ -109,7 +98,7 @@ def _detect_language_fallback(text: str) -> Optional[str]:
     """
     try:
         if not text or len(text.strip()) < 10:
-            logger.info(f"Fallback: text too short ({len(text.strip()) if text else 0} chars)")
+            logger.debug(f"Fallback: text too short ({len(text.strip()) if text else 0} chars)")
             return None
 
         # Mots français courants
@@ -130,39 +119,39 @@ def _detect_language_fallback(text: str) -> Optional[str]:
         words = re.findall(r'\b[a-zA-ZàâäéèêëïîôùûüÿñçÀÂÄÉÈÊËÏÎÔÙÛÜŸÑÇ]+\b', text.lower())
 
         if len(words) < 3:
-            logger.info(f"Fallback: not enough words ({len(words)})")
+            logger.debug(f"Fallback: not enough words ({len(words)})")
             # Pour du contenu substantiel sans mots reconnus, retourner 'en' par défaut
             if len(text.strip()) > 50:
-                logger.info("Fallback: defaulting to 'en' for substantial text")
+                logger.debug("Fallback: defaulting to 'en' for substantial text")
                 return 'en'
             return None
 
         french_score = sum(1 for word in words if word in french_words)
         english_score = sum(1 for word in words if word in english_words)
 
-        logger.info(f"Fallback scores: fr={french_score}, en={english_score}, total_words={len(words)}")
+        logger.debug(f"Fallback scores: fr={french_score}, en={english_score}, total_words={len(words)}")
 
         # Si suffisamment de mots détectés (seuil réduit de 3 à 2)
         if french_score + english_score >= 2:
             if french_score > english_score:
-                logger.info("Fallback: detected 'fr' by word matching")
+                logger.debug("Fallback: detected 'fr' by word matching")
                 return 'fr'
             elif english_score > french_score:
-                logger.info("Fallback: detected 'en' by word matching")
+                logger.debug("Fallback: detected 'en' by word matching")
                 return 'en'
 
         # Détection par caractères spéciaux français
         french_chars = re.findall(r'[àâäéèêëïîôùûüÿñç]', text.lower())
         if len(french_chars) > len(words) * 0.02:  # 2% de caractères français
-            logger.info(f"Fallback: detected 'fr' by accent chars ({len(french_chars)} accents)")
+            logger.debug(f"Fallback: detected 'fr' by accent chars ({len(french_chars)} accents)")
             return 'fr'
 
         # Pour du contenu substantiel, retourner 'en' par défaut
         if len(text.strip()) > 50:
-            logger.info("Fallback: defaulting to 'en' for unidentified text")
+            logger.debug("Fallback: defaulting to 'en' for unidentified text")
             return 'en'
 
-        logger.info("Fallback: no language detected")
+        logger.debug("Fallback: no language detected")
         return None
 
     except Exception as e:
@@ -0,0 +1,21 @@
+-- Migration: Add export cache fields to exports table
+-- Date: 2026-10-19
+-- Description: Content fingerprint and LRU bookkeeping for export reuse
+
+BEGIN;
+
+-- Add cache fields
+ALTER TABLE exports ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(64);
+ALTER TABLE exports ADD COLUMN IF NOT EXISTS hit_count INTEGER DEFAULT 0;
+ALTER TABLE exports ADD COLUMN IF NOT EXISTS last_accessed_at TIMESTAMP WITH TIME ZONE;
+
+-- Add comments for documentation
+COMMENT ON COLUMN exports.fingerprint IS 'SHA-256 of (land, export type, relevance, options, max(updated_at), row counts)';
+COMMENT ON COLUMN exports.hit_count IS 'Number of times the cached file was reused';
+COMMENT ON COLUMN exports.last_accessed_at IS 'Last time the file was produced or reused (LRU eviction)';
+
+-- Lookup by fingerprint and LRU scan
+CREATE INDEX IF NOT EXISTS ix_exports_fingerprint ON exports(fingerprint);
+CREATE INDEX IF NOT EXISTS ix_exports_last_accessed ON exports(last_accessed_at);
+
+COMMIT;
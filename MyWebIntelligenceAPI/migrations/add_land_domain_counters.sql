@@ -0,0 +1,36 @@
+-- Migration: Maintain land and domain counters
+-- Date: 2026-10-19
+-- Description: Base column for Domain.avg_http_status and backfill of lands/domains counters (maintained on every flush afterwards)
+
+BEGIN;
+
+ALTER TABLE domains ADD COLUMN IF NOT EXISTS http_status_count INTEGER DEFAULT 0;
+
+-- Backfill (same computation as the reconcile_land_counters task)
+UPDATE lands SET
+    total_expressions = (SELECT COUNT(*) FROM expressions e WHERE e.land_id = lands.id),
+    total_domains = (SELECT COUNT(*) FROM domains d WHERE d.land_id = lands.id);
+
+UPDATE domains SET
+    total_expressions = stats.total,
+    http_status_count = stats.with_status,
+    avg_http_status = stats.avg_status
+FROM (
+    SELECT d.id,
+           COUNT(e.id) AS total,
+           COUNT(e.http_status) AS with_status,
+           AVG(e.http_status) AS avg_status
+    FROM domains d
+    LEFT JOIN expressions e ON e.domain_id = d.id
+    GROUP BY d.id
+) AS stats
+WHERE stats.id = domains.id;
+
+-- Add comments for documentation
+COMMENT ON COLUMN domains.http_status_count IS 'Number of expressions with an http_status (weight of avg_http_status)';
+COMMENT ON COLUMN domains.avg_http_status IS 'Average http_status of the domain expressions, maintained incrementally';
+COMMENT ON COLUMN domains.total_expressions IS 'Number of expressions of the domain, maintained incrementally';
+COMMENT ON COLUMN lands.total_expressions IS 'Number of expressions of the land, maintained incrementally';
+COMMENT ON COLUMN lands.total_domains IS 'Number of domains of the land, maintained incrementally';
+
+COMMIT;
@@ -0,0 +1,22 @@
+-- Migration: Add land statistics aggregates
+-- Date: 2026-10-19
+-- Description: Incrementally maintained counters behind GET /api/v2/lands/{id}/stats and /pipeline-stats
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS land_stat_counters (
+    land_id INTEGER NOT NULL REFERENCES lands(id) ON DELETE CASCADE,
+    metric VARCHAR(50) NOT NULL,
+    bucket VARCHAR(100) NOT NULL DEFAULT '',
+    value DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (land_id, metric, bucket)
+);
+
+-- Add comments for documentation
+COMMENT ON TABLE land_stat_counters IS 'Per-land aggregates (counts and sums), updated in the transaction that changes expressions, media, jobs or exports';
+COMMENT ON COLUMN land_stat_counters.metric IS 'Aggregate name (expressions, depth, lang, http_status, relevance, quality, media, jobs, exports, ...)';
+COMMENT ON COLUMN land_stat_counters.bucket IS 'Group within the metric (status, depth, language code, HTTP status, day, ...)';
+COMMENT ON COLUMN land_stat_counters.value IS 'Count, sum or high-water mark (epoch seconds for last_* metrics)';
+
+COMMIT;
@@ -0,0 +1,27 @@
+-- Migration: Add LLM response cache table
+-- Date: 2026-10-19
+-- Description: Cache OpenRouter responses by (model, prompt hash) for LLM validation re-runs
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS llm_responses (
+    id SERIAL PRIMARY KEY,
+    model VARCHAR(100) NOT NULL,
+    prompt_hash VARCHAR(64) NOT NULL,
+    content TEXT,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    hit_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    last_used_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT uq_llm_responses_model_prompt UNIQUE (model, prompt_hash)
+);
+
+-- Add comments for documentation
+COMMENT ON TABLE llm_responses IS 'OpenRouter responses reused when the same prompt is sent to the same model';
+COMMENT ON COLUMN llm_responses.prompt_hash IS 'SHA-256 of system prompt + user prompt';
+COMMENT ON COLUMN llm_responses.hit_count IS 'Number of API calls saved by this entry';
+
+CREATE INDEX IF NOT EXISTS ix_llm_responses_id ON llm_responses(id);
+
+COMMIT;
@@ -0,0 +1,20 @@
+-- Migration: Add perceptual hashes to media
+-- Date: 2026-10-19
+-- Description: aHash/dHash/pHash of analysed images, used to reuse analyses of near-identical images across lands
+
+BEGIN;
+
+ALTER TABLE media ADD COLUMN IF NOT EXISTS ahash VARCHAR(16);
+ALTER TABLE media ADD COLUMN IF NOT EXISTS dhash VARCHAR(16);
+ALTER TABLE media ADD COLUMN IF NOT EXISTS phash VARCHAR(16);
+
+-- Add comments for documentation
+COMMENT ON COLUMN media.ahash IS '64-bit average hash (hex)';
+COMMENT ON COLUMN media.dhash IS '64-bit difference hash (hex)';
+COMMENT ON COLUMN media.phash IS '64-bit DCT perceptual hash (hex), indexed for near-duplicate lookup';
+
+CREATE INDEX IF NOT EXISTS ix_media_phash ON media(phash);
+-- Incremental refresh of the in-process hash index
+CREATE INDEX IF NOT EXISTS ix_media_processed_at ON media(processed_at);
+
+COMMIT;
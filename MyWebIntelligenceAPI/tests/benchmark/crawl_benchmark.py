@@ -0,0 +1,329 @@
+"""
+Benchmark de crawl hors ligne
+
+    python -m tests.benchmark.crawl_benchmark --pages 2000 --latency-ms 20 \\
+        --error-rate 0.02 --output bench.json --baseline previous.json
+
+Crawle le corpus de tests.benchmark.fixture_server de bout en bout, avec
+SyncCrawlerEngine (--mode engine) ou la tâche crawl_land_task exécutée
+localement (--mode task, un job par passe), contre SQLite (base temporaire
+par défaut) ou une base Postgres locale dédiée (--database ...). Les pages
+découvertes par les liens sont crawlées par passes successives jusqu'à
+--pages URLs ; --seed-all crée toutes les pages du corpus d'emblée.
+
+Rapport JSON : URLs/s, durée par étape (app.core.metrics), requêtes SQL par
+URL, pic de RSS, codes HTTP et compteurs du serveur. Avec --baseline, le
+code de sortie vaut 1 quand le débit baisse, ou que les requêtes par URL ou
+le pic de RSS augmentent, de plus de --tolerance.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.core.metrics import collect_job_metrics
+from tests.benchmark.fixture_server import TOPIC_WORDS, CorpusConfig, FixtureServer
+
+MAX_PASSES = 100
+OFFLINE_ENV = ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy", "NO_PROXY", "no_proxy")
+
+
+@dataclass
+class BenchmarkConfig:
+    corpus: CorpusConfig = field(default_factory=CorpusConfig)
+    database: Optional[str] = None  # URL SQLAlchemy synchrone ; None = SQLite temporaire
+    mode: str = "engine"  # engine | task
+    max_urls: Optional[int] = None  # Défaut : taille du corpus
+    seed_all: bool = False
+    analyze_media: bool = False
+
+
+def peak_rss_mb() -> float:
+    """Pic de RSS du processus (ru_maxrss : Ko sous Linux, octets sous macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+@contextmanager
+def offline_network(proxy_url: str) -> Iterator[None]:
+    """Toute requête vers un hôte autre que 127.0.0.1 passe par le serveur de fixtures."""
+    saved = {name: os.environ.get(name) for name in OFFLINE_ENV}
+    for name in ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"):
+        os.environ[name] = proxy_url
+    os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1,localhost"
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+class QueryCounter:
+    """Requêtes SQL exécutées sur un moteur."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+def create_schema(engine) -> None:
+    from app.db import models
+    from app.db.base import Base
+
+    tables = Base.metadata.sorted_tables
+    if engine.dialect.name == "sqlite":
+        # Colonne embedding (ARRAY) sans équivalent SQLite ; les paragraphes ne sont pas écrits par le crawl
+        tables = [table for table in tables if table.name != models.Paragraph.__tablename__]
+    Base.metadata.create_all(engine, tables=tables)
+
+
+def seed_land(db: Session, urls: List[str], start_urls: List[str]) -> int:
+    """Utilisateur, land (mots du corpus dans le dictionnaire) et expressions de départ."""
+    from app.core.crawler_engine import SyncCrawlerEngine
+    from app.core.text_processing import get_lemma
+    from app.db import models
+
+    suffix = str(time.time_ns())
+    user = models.User(username=f"bench-{suffix}", hashed_password="-")
+    db.add(user)
+    db.flush()
+    land = models.Land(
+        name=f"benchmark-{suffix}", description="Offline crawl benchmark",
+        owner_id=user.id, start_urls=start_urls, lang=["fr"],
+    )
+    db.add(land)
+    db.flush()
+    for term in TOPIC_WORDS:
+        word = db.query(models.Word).filter(models.Word.word == term).first()
+        if word is None:
+            word = models.Word(word=term, lemma=get_lemma(term, "fr"), language="fr")
+            db.add(word)
+            db.flush()
+        db.add(models.LandDictionary(land_id=land.id, word_id=word.id, weight=1.0))
+    db.commit()
+
+    crawler = SyncCrawlerEngine(db)
+    for url in urls:
+        crawler._get_or_create_expression(land.id, url, depth=0)
+    crawler.close()
+    db.commit()
+    return land.id
+
+
+def crawl_passes(config: BenchmarkConfig, sessions: sessionmaker, land_id: int, max_urls: int) -> Dict[str, Any]:
+    """Passes de crawl jusqu'à max_urls URLs traitées ou plus rien à crawler."""
+    from app.core.crawler_engine import SyncCrawlerEngine
+    from app.db import models
+    from app.tasks import crawling_task
+
+    totals = {"processed": 0, "errors": 0, "passes": 0}
+    statuses: Counter = Counter()
+    db = sessions()
+    crawler = SyncCrawlerEngine(db) if config.mode == "engine" else None
+    task_sessions = crawling_task.SessionLocal
+    if config.mode == "task":
+        crawling_task.SessionLocal = sessions  # La tâche ouvre ses sessions sur la base du benchmark
+    try:
+        while totals["processed"] + totals["errors"] < max_urls and totals["passes"] < MAX_PASSES:
+            remaining = max_urls - totals["processed"] - totals["errors"]
+            if crawler is not None:
+                _, expressions = crawler.prepare_crawl(land_id, limit=remaining)
+                if not expressions:
+                    break
+                processed, errors, http_stats = crawler.crawl_expressions(
+                    expressions, analyze_media=config.analyze_media
+                )
+            else:
+                job = models.CrawlJob(
+                    land_id=land_id, job_type="crawl",
+                    parameters={"limit": remaining, "analyze_media": config.analyze_media},
+                )
+                db.add(job)
+                db.commit()
+                crawling_task.crawl_land_task.apply(args=(job.id,))
+                db.expire_all()
+                result = db.get(models.CrawlJob, job.id).result_data or {}
+                if result.get("error"):
+                    raise RuntimeError(f"crawl_land_task failed: {result['error']}")
+                processed, errors = result.get("processed", 0), result.get("errors", 0)
+                http_stats = result.get("http_status_codes", {})
+            if processed + errors == 0:
+                break
+            totals["passes"] += 1
+            totals["processed"] += processed
+            totals["errors"] += errors
+            statuses.update(http_stats)
+    finally:
+        crawling_task.SessionLocal = task_sessions
+        if crawler is not None:
+            crawler.close()
+        db.close()
+    totals["http_status_codes"] = dict(statuses)
+    return totals
+
+
+def run_benchmark(config: BenchmarkConfig) -> Dict[str, Any]:
+    """Exécute le benchmark et renvoie le rapport JSON."""
+    settings.JOB_PROGRESS_ENABLED = False
+    workdir = tempfile.TemporaryDirectory(prefix="mwi-bench-")
+    database = config.database or f"sqlite:///{os.path.join(workdir.name, 'bench.db')}"
+    engine = create_engine(database)
+    create_schema(engine)
+    sessions = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+    try:
+        with FixtureServer(config.corpus) as server, offline_network(server.proxy_url):
+            with sessions() as db:
+                urls = server.page_urls if config.seed_all else server.start_urls
+                land_id = seed_land(db, urls, server.start_urls)
+            max_urls = config.max_urls or len(server.page_urls)
+
+            queries = QueryCounter(engine)
+            rss_before = peak_rss_mb()
+            started = time.perf_counter()
+            with collect_job_metrics() as metrics:
+                totals = crawl_passes(config, sessions, land_id, max_urls)
+            wall = time.perf_counter() - started
+            server_stats = server.stats()
+    finally:
+        engine.dispose()
+        workdir.cleanup()
+
+    urls = totals["processed"] + totals["errors"]
+    return {
+        "benchmark": {
+            "mode": config.mode,
+            "database": engine.dialect.name,
+            "seed_all": config.seed_all,
+            "analyze_media": config.analyze_media,
+            "max_urls": max_urls,
+            "corpus": asdict(config.corpus),
+        },
+        "results": {
+            "urls": urls,
+            "processed": totals["processed"],
+            "errors": totals["errors"],
+            "passes": totals["passes"],
+            "wall_seconds": round(wall, 3),
+            "urls_per_second": round(urls / wall, 2) if wall > 0 else 0.0,
+            "db_queries": queries.count,
+            "db_queries_per_url": round(queries.count / urls, 2) if urls else 0.0,
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_rss_before_crawl_mb": rss_before,
+            "http_status_codes": totals["http_status_codes"],
+        },
+        "stage_timings": metrics.summary()["stages"],
+        "server": server_stats,
+        "environment": {
+            "app_version": settings.APP_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+    }
+
+
+# Métriques comparées à la référence : (clé de results, True si plus haut = mieux)
+COMPARED_METRICS = (
+    ("urls_per_second", True),
+    ("db_queries_per_url", False),
+    ("peak_rss_mb", False),
+)
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Régressions de report par rapport à baseline au-delà de la tolérance relative."""
+    regressions = []
+    for key, higher_is_better in COMPARED_METRICS:
+        current, reference = report["results"].get(key), baseline.get("results", {}).get(key)
+        if not current or not reference:
+            continue
+        if higher_is_better and current < reference * (1 - tolerance):
+            regressions.append(f"{key}: {current} < {reference} (-{1 - current / reference:.0%})")
+        elif not higher_is_better and current > reference * (1 + tolerance):
+            regressions.append(f"{key}: {current} > {reference} (+{current / reference - 1:.0%})")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline crawl benchmark against a local fixture server")
+    parser.add_argument("--pages", type=int, default=1000, help="Generated corpus size")
+    parser.add_argument("--sites", type=int, default=4, help="Hosts serving the corpus (one port each)")
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--extra-links", type=int, default=3)
+    parser.add_argument("--images-per-page", type=int, default=1)
+    parser.add_argument("--words-per-page", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of pages answering 503")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--corpus-dir", help="Recorded corpus directory served instead of the generated one")
+    parser.add_argument("--database", help="Sync SQLAlchemy URL of a dedicated database (default: temporary SQLite)")
+    parser.add_argument("--mode", choices=("engine", "task"), default="engine")
+    parser.add_argument("--max-urls", type=int, help="URLs to crawl (default: corpus size)")
+    parser.add_argument("--seed-all", action="store_true", help="Create every corpus page as a start expression")
+    parser.add_argument("--analyze-media", action="store_true")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Previous JSON report to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Relative regression allowed")
+    parser.add_argument("--log-level", default="WARNING")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper())
+    logging.getLogger().setLevel(args.log_level.upper())
+
+    config = BenchmarkConfig(
+        corpus=CorpusConfig(
+            pages=args.pages, sites=args.sites, fanout=args.fanout, extra_links=args.extra_links,
+            images_per_page=args.images_per_page, words_per_page=args.words_per_page,
+            latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+            seed=args.seed, corpus_dir=args.corpus_dir,
+        ),
+        database=args.database,
+        mode=args.mode,
+        max_urls=args.max_urls,
+        seed_all=args.seed_all,
+        analyze_media=args.analyze_media,
+    )
+    report = run_benchmark(config)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare_with_baseline(report, json.load(file), args.tolerance)
+        report["regressions"] = regressions
+        status = 1 if regressions else 0
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    print(output)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
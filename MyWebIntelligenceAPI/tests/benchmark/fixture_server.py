@@ -0,0 +1,345 @@
+"""
+Serveur HTTP local du benchmark de crawl
+
+Sert un corpus généré (pages HTML liées entre elles, images PNG) ou
+enregistré (répertoire de fichiers) sans accès réseau :
+- un port par « site » : chaque site est un domaine distinct du land ;
+- latence (fixe + gigue) et taux d'erreurs (503) configurables ; les pages
+  en erreur sont tirées d'une graine, donc identiques d'une exécution à
+  l'autre ;
+- le serveur tourne dans un processus séparé : son CPU et sa mémoire ne sont
+  pas comptés dans les mesures du crawl ;
+- il sert aussi de proxy sortant (HTTP_PROXY) : une requête vers un autre
+  hôte (fallback Archive.org de l'extraction, ...) reçoit une réponse locale
+  au lieu de partir sur Internet.
+
+Corpus généré : pages 0..sites-1 = racines des sites ; la page i >= sites
+est l'enfant de (i - sites) // fanout, donc toutes les pages sont
+atteignables depuis les racines, plus extra_links liens tirés au hasard
+(souvent vers d'autres sites).
+"""
+
+import json
+import mimetypes
+import multiprocessing
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+TOPIC_WORDS = [
+    "climat", "énergie", "transition", "carbone", "renouvelable",
+    "pollution", "biodiversité", "agriculture", "eau", "océan",
+]
+FILLER_WORDS = [
+    "le", "la", "les", "des", "une", "dans", "pour", "avec", "sur", "entre",
+    "politique", "ville", "région", "projet", "rapport", "étude", "données",
+    "public", "citoyens", "acteurs", "territoire", "économie", "santé",
+    "recherche", "analyse", "mesure", "effet", "évolution", "gouvernement",
+    "europe", "france", "nouveau", "important", "récent", "local", "national",
+]
+IMAGE_VARIANTS = 16
+PAGE_PATH = re.compile(r"^/page/(\d+)\.html$")
+IMAGE_PATH = re.compile(r"^/img/(\d+)\.png$")
+
+
+@dataclass
+class CorpusConfig:
+    """Corpus servi et comportement du serveur."""
+
+    pages: int = 1000
+    sites: int = 4
+    fanout: int = 5
+    extra_links: int = 3
+    images_per_page: int = 1
+    words_per_page: int = 400
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 42
+    corpus_dir: Optional[str] = None  # Corpus enregistré : servi tel quel sur un seul site
+
+
+def page_site(config: CorpusConfig, page_id: int) -> int:
+    return page_id % config.sites
+
+
+def page_path(page_id: int) -> str:
+    return f"/page/{page_id}.html"
+
+
+def is_error_path(config: CorpusConfig, path: str) -> bool:
+    """Tirage déterministe des pages en erreur."""
+    return config.error_rate > 0 and random.Random(f"{config.seed}:{path}").random() < config.error_rate
+
+
+def page_links(config: CorpusConfig, page_id: int) -> List[int]:
+    first_child = config.sites + page_id * config.fanout
+    links = list(range(first_child, min(first_child + config.fanout, config.pages)))
+    rng = random.Random(f"{config.seed}:links:{page_id}")
+    links.extend(rng.randrange(config.pages) for _ in range(config.extra_links))
+    return [link for link in dict.fromkeys(links) if link != page_id]
+
+
+def generate_page(config: CorpusConfig, page_id: int, ports: List[int]) -> bytes:
+    rng = random.Random(f"{config.seed}:page:{page_id}")
+
+    def url(target: int) -> str:
+        return f"http://127.0.0.1:{ports[page_site(config, target)]}{page_path(target)}"
+
+    def sentence(length: int) -> str:
+        words = [rng.choice(TOPIC_WORDS if rng.random() < 0.15 else FILLER_WORDS) for _ in range(length)]
+        return " ".join(words).capitalize() + "."
+
+    paragraphs = []
+    remaining = config.words_per_page
+    while remaining > 0:
+        sentences = [sentence(rng.randint(8, 20)) for _ in range(rng.randint(3, 6))]
+        remaining -= sum(len(text.split()) for text in sentences)
+        paragraphs.append(sentences)
+
+    # Liens dans le texte : l'extraction (trafilatura) écarte les listes de liens
+    for index, target in enumerate(page_links(config, page_id)):
+        paragraphs[index % len(paragraphs)].append(
+            f'Voir <a href="{url(target)}">{sentence(4)[:-1].lower()}</a>.'
+        )
+    paragraphs = [f"<p>{' '.join(sentences)}</p>" for sentences in paragraphs]
+    images = "".join(
+        f'<p><img src="/img/{rng.randrange(IMAGE_VARIANTS)}.png" alt="{sentence(3)[:-1]}"></p>'
+        for _ in range(config.images_per_page)
+    )
+    title = sentence(6)[:-1]
+    html = (
+        '<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">'
+        f"<title>{title}</title>"
+        f'<meta name="description" content="{sentence(12)}">'
+        f'<meta name="keywords" content="{", ".join(rng.sample(TOPIC_WORDS, 3))}">'
+        f'<link rel="canonical" href="{url(page_id)}">'
+        '<meta property="article:published_time" content="2026-01-15T08:00:00Z">'
+        "</head><body><nav><a href=\"/\">Accueil</a></nav>"
+        f"<main><article><h1>{title}</h1>{paragraphs[0]}{images}{''.join(paragraphs[1:])}"
+        "</article></main>"
+        "<footer>Corpus de benchmark</footer></body></html>"
+    )
+    return html.encode("utf-8")
+
+
+def generate_image(variant: int) -> bytes:
+    from PIL import Image
+
+    rng = random.Random(variant)
+    image = Image.new("RGB", (96, 64), tuple(rng.randrange(256) for _ in range(3)))
+    image.paste(tuple(rng.randrange(256) for _ in range(3)), (16, 16, 64, 48))
+    buffer = BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def load_recorded_corpus(corpus_dir: str) -> Dict[str, Tuple[bytes, str]]:
+    """Fichiers d'un corpus enregistré, indexés par chemin d'URL."""
+    files = {}
+    for root, _, names in os.walk(corpus_dir):
+        for name in names:
+            full_path = os.path.join(root, name)
+            path = "/" + os.path.relpath(full_path, corpus_dir).replace(os.sep, "/")
+            content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if content_type.startswith("text/"):
+                content_type += "; charset=utf-8"
+            with open(full_path, "rb") as file:
+                files[path] = (file.read(), content_type)
+    return files
+
+
+def recorded_pages(corpus_dir: str) -> List[str]:
+    """Chemins des pages HTML d'un corpus enregistré, triés."""
+    return sorted(path for path in load_recorded_corpus(corpus_dir) if path.endswith((".html", ".htm")))
+
+
+class _FixtureState:
+    """État partagé par les sites du processus serveur."""
+
+    def __init__(self, config: CorpusConfig, ports: List[int]):
+        self.config = config
+        self.ports = ports
+        self.recorded = load_recorded_corpus(config.corpus_dir) if config.corpus_dir else None
+        self.pages: Dict[int, bytes] = {}
+        self.images: Dict[int, bytes] = {}
+        self.lock = threading.Lock()
+        self.counts: Dict[str, int] = {"requests": 0, "pages": 0, "images": 0, "errors": 0, "offsite": 0, "not_found": 0}
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.counts["requests"] += 1
+            self.counts[key] += 1
+
+    def resolve(self, path: str) -> Optional[Tuple[bytes, str, str]]:
+        """(corps, content-type, compteur) du chemin, None si inconnu."""
+        if self.recorded is not None:
+            if path == "/":
+                path = "/index.html"
+            if path not in self.recorded:
+                return None
+            body, content_type = self.recorded[path]
+            return body, content_type, "images" if content_type.startswith("image/") else "pages"
+
+        match = PAGE_PATH.match(path)
+        if match and int(match.group(1)) < self.config.pages:
+            page_id = int(match.group(1))
+            if page_id not in self.pages:
+                self.pages[page_id] = generate_page(self.config, page_id, self.ports)
+            return self.pages[page_id], "text/html; charset=utf-8", "pages"
+        match = IMAGE_PATH.match(path)
+        if match and int(match.group(1)) < IMAGE_VARIANTS:
+            variant = int(match.group(1))
+            if variant not in self.images:
+                self.images[variant] = generate_image(variant)
+            return self.images[variant], "image/png", "images"
+        return None
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: _FixtureState = None
+
+    def do_GET(self) -> None:
+        if self.path.startswith(("http://", "https://")):
+            self._offsite()
+            return
+        path = self.path.split("?", 1)[0]
+        if path == "/__stats":
+            self._send(200, json.dumps(self.state.counts).encode(), "application/json")
+            return
+
+        config = self.state.config
+        delay = config.latency_ms + (random.uniform(0, config.jitter_ms) if config.jitter_ms else 0.0)
+        if delay:
+            time.sleep(delay / 1000)
+
+        resolved = self.state.resolve(path)
+        if resolved is None:
+            self.state.count("not_found")
+            self._send(404, b"Not found", "text/plain")
+        elif resolved[2] == "pages" and is_error_path(config, path):
+            self.state.count("errors")
+            self._send(503, b"Service unavailable", "text/plain")
+        else:
+            body, content_type, counter = resolved
+            self.state.count(counter)
+            self._send(200, body, content_type)
+
+    def do_CONNECT(self) -> None:
+        # HTTPS sortant : refusé sans tunnel
+        self.state.count("offsite")
+        self._send(502, b"Offline benchmark", "text/plain")
+
+    def _offsite(self) -> None:
+        self.state.count("offsite")
+        if "/wayback/available" in self.path:
+            self._send(200, b'{"archived_snapshots": {}}', "application/json")
+        else:
+            self._send(502, b"Offline benchmark", "text/plain")
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - signature de BaseHTTPRequestHandler
+        pass
+
+
+def _serve(config: CorpusConfig, connection) -> None:
+    """Processus serveur : un ThreadingHTTPServer par site, jusqu'à la fermeture du pipe."""
+    sites = 1 if config.corpus_dir else config.sites
+    servers = [ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler) for _ in range(sites)]
+    ports = [server.server_address[1] for server in servers]
+    _FixtureHandler.state = _FixtureState(config, ports)
+    for server in servers:
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection.send(ports)
+    try:
+        connection.recv()
+    except EOFError:
+        pass
+    for server in servers:
+        server.shutdown()
+
+
+class FixtureServer:
+    """
+    Corpus de benchmark servi en local (processus séparé).
+
+        with FixtureServer(CorpusConfig(pages=500, latency_ms=20)) as server:
+            server.start_urls, server.page_urls, server.proxy_url, server.stats()
+    """
+
+    def __init__(self, config: CorpusConfig):
+        self.config = config
+        self.ports: List[int] = []
+        self._process = None
+        self._connection = None
+
+    def start(self) -> "FixtureServer":
+        context = multiprocessing.get_context("spawn")
+        self._connection, child = context.Pipe()
+        self._process = context.Process(target=_serve, args=(self.config, child), daemon=True)
+        self._process.start()
+        if not self._connection.poll(30):
+            self.stop()
+            raise RuntimeError("Fixture server did not start")
+        self.ports = self._connection.recv()
+        return self
+
+    def url(self, path: str, site: int = 0) -> str:
+        return f"http://127.0.0.1:{self.ports[site]}{path}"
+
+    @property
+    def start_urls(self) -> List[str]:
+        if self.config.corpus_dir:
+            pages = recorded_pages(self.config.corpus_dir)
+            return [self.url("/index.html" if "/index.html" in pages else pages[0])] if pages else []
+        return [self.url(page_path(site), site) for site in range(min(self.config.sites, self.config.pages))]
+
+    @property
+    def page_urls(self) -> List[str]:
+        if self.config.corpus_dir:
+            return [self.url(path) for path in recorded_pages(self.config.corpus_dir)]
+        return [self.url(page_path(page), page_site(self.config, page)) for page in range(self.config.pages)]
+
+    @property
+    def proxy_url(self) -> str:
+        return self.url("")
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs du serveur (requêtes, pages, images, erreurs servies, hors site)."""
+        response = httpx.get(self.url("/__stats"), trust_env=False, timeout=5.0)
+        return response.json()
+
+    def stop(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.send("stop")
+            except (BrokenPipeError, OSError):
+                pass
+        if self._process is not None:
+            self._process.join(5)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._process = None
+        self._connection = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
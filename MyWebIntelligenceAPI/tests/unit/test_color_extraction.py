@@ -0,0 +1,73 @@
+"""
+Tests unitaires de l'extraction vectorisée des couleurs dominantes.
+"""
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFilter
+
+from app.core.color_extraction import (
+    COLOR_TOLERANCE,
+    RMS_TOLERANCE,
+    extract_dominant_colors,
+    image_pixels,
+    to_web_safe,
+)
+
+
+def _scene(seed):
+    rng = np.random.default_rng(seed)
+    img = Image.new("RGB", (320, 240), tuple(int(v) for v in rng.integers(0, 256, 3)))
+    draw = ImageDraw.Draw(img)
+    for _ in range(int(rng.integers(2, 7))):
+        x, y = int(rng.integers(0, 300)), int(rng.integers(0, 220))
+        draw.ellipse([x, y, x + int(rng.integers(30, 160)), y + int(rng.integers(30, 160))],
+                     fill=tuple(int(v) for v in rng.integers(0, 256, 3)))
+    if seed % 2:
+        img = img.filter(ImageFilter.GaussianBlur(4))
+    if seed % 3 == 0:
+        noisy = np.asarray(img, dtype=float) + rng.normal(0, 15, (240, 320, 3))
+        img = Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8))
+    return img
+
+
+def _rms(pixels, colours):
+    distances = ((pixels[:, None, :].astype(float) - np.asarray(colours, float)[None]) ** 2).sum(-1).min(1)
+    return float(np.sqrt(distances.mean()))
+
+
+def test_web_safe_lookup_matches_palette_scan():
+    levels = [0, 51, 102, 153, 204, 255]
+    palette = [(r, g, b) for r in levels for g in levels for b in levels]
+    rng = np.random.default_rng(0)
+    for rgb in rng.integers(0, 256, (500, 3)):
+        expected = min(palette, key=lambda c: sum((int(a) - b) ** 2 for a, b in zip(rgb, c)))
+        assert to_web_safe(rgb) == expected
+
+
+def test_flat_image_has_single_colour():
+    result = extract_dominant_colors([Image.new("RGB", (50, 80), (12, 200, 90))], 5)[0]
+
+    assert result["dominant_colors"] == [{"rgb": (12, 200, 90), "percentage": 100.0}]
+    assert result["websafe_colors"] == {"#00cc66": 100.0}
+
+
+def test_batch_results_match_single_image_calls():
+    images = [_scene(seed) for seed in range(12)]
+
+    assert extract_dominant_colors(images, 5) == [extract_dominant_colors([img], 5)[0] for img in images]
+
+
+def test_within_documented_tolerance_of_sklearn_kmeans():
+    KMeans = pytest.importorskip("sklearn.cluster").KMeans
+    images = [_scene(seed) for seed in range(24)]
+
+    for img, result in zip(images, extract_dominant_colors(images, 5)):
+        pixels = image_pixels(img).astype(float)
+        kmeans = KMeans(n_clusters=5, n_init="auto", random_state=42).fit(pixels)
+        counts = np.bincount(kmeans.labels_, minlength=5)
+        ours = [item["rgb"] for item in result["dominant_colors"]]
+
+        nearest = np.sqrt(((kmeans.cluster_centers_[:, None] - np.asarray(ours, float)[None]) ** 2).sum(-1)).min(1)
+        assert (nearest * counts).sum() / counts.sum() <= COLOR_TOLERANCE
+        assert _rms(pixels, ours) <= _rms(pixels, kmeans.cluster_centers_) + RMS_TOLERANCE
+        assert sum(item["percentage"] for item in result["dominant_colors"]) == pytest.approx(100, abs=0.05)
@@ -0,0 +1,29 @@
+"""
+Tests unitaires du benchmark de crawl hors ligne (tests/benchmark).
+"""
+from tests.benchmark.crawl_benchmark import BenchmarkConfig, compare_with_baseline, run_benchmark
+from tests.benchmark.fixture_server import CorpusConfig, is_error_path, page_path
+
+
+def test_offline_crawl_reports_throughput_and_stages():
+    corpus = CorpusConfig(pages=6, sites=2, words_per_page=120, latency_ms=2, error_rate=0.3, seed=7)
+    # Extraction des liens désactivée sous pytest : toutes les pages sont créées d'emblée
+    report = run_benchmark(BenchmarkConfig(corpus=corpus, seed_all=True))
+
+    results = report["results"]
+    failing = sum(is_error_path(corpus, page_path(page)) for page in range(6))
+    assert (results["urls"], results["errors"], results["passes"]) == (6, 0, 1)
+    assert results["http_status_codes"].get("503", 0) == failing == report["server"]["errors"]
+    assert report["server"]["pages"] == 6 - failing
+    assert results["urls_per_second"] > 0 and results["db_queries_per_url"] > 0 and results["peak_rss_mb"] > 0
+    assert report["stage_timings"]["crawl.fetch"]["count"] == 6
+
+
+def test_baseline_comparison_flags_regressions():
+    baseline = {"results": {"urls_per_second": 10.0, "db_queries_per_url": 20.0, "peak_rss_mb": 300.0}}
+    report = {"results": {"urls_per_second": 8.0, "db_queries_per_url": 21.0, "peak_rss_mb": 400.0}}
+
+    regressions = compare_with_baseline(report, baseline, tolerance=0.1)
+
+    assert [line.split(":")[0] for line in regressions] == ["urls_per_second", "peak_rss_mb"]
+    assert compare_with_baseline(report, baseline, tolerance=0.5) == []
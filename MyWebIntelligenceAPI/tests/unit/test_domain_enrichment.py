@@ -0,0 +1,115 @@
+"""
+Tests unitaires pour l'enrichissement concurrent des domaines.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.domain_enrichment import DomainEnrichmentEngine
+
+
+HOME = (
+    "<html lang='fr'><head><title>Accueil {name}</title>"
+    "<meta name='description' content='Site {name}'>"
+    "<meta name='keywords' content='veille, web'></head>"
+    "<body><p>Contenu de la page d'accueil de {name}.</p></body></html>"
+)
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    host = request.url.host
+    if host == "archive.org":
+        target = request.url.params["url"]
+        if target == "dead.example":
+            closest = {"url": "http://web.archive.org/web/2020/dead.example"}
+            return httpx.Response(200, json={"archived_snapshots": {"closest": closest}})
+        return httpx.Response(200, json={"archived_snapshots": {}})
+    if host == "web.archive.org":
+        return httpx.Response(200, text=HOME.format(name="dead.example"))
+    if host == "live.example":
+        return httpx.Response(200, text=HOME.format(name=host))
+    if host == "plain.example":
+        if request.url.scheme == "https":
+            raise httpx.ConnectError("SSL: certificate verify failed", request=request)
+        return httpx.Response(200, text=HOME.format(name=host))
+    return httpx.Response(404)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = DomainEnrichmentEngine(
+        max_concurrency=4, timeout=1, probe_timeout=0.1, transport=httpx.MockTransport(handler)
+    )
+
+    async def probe(domain_name):
+        await asyncio.sleep(0.05)
+        if domain_name.startswith("dead") or domain_name.startswith("gone"):
+            return False, "DNS resolution failed"
+        return True, None
+
+    monkeypatch.setattr(engine, "probe", probe)
+    return engine
+
+
+def test_strategies_are_short_circuited(engine):
+    seen = []
+    results = {r.domain_name: r for r in engine.run(
+        ["live.example", "plain.example", "dead.example", "gone.example", "missing.example", "live.example"],
+        on_result=seen.append
+    )}
+
+    assert len(seen) == len(results) == 5
+    live = results["live.example"]
+    assert (live.http_status, live.source_method, live.retry_count) == (200, "trafilatura", 0)
+    assert live.title == "Accueil live.example"
+    assert live.description == "Site live.example"
+    assert live.keywords == "veille, web"
+    assert live.language == "fr"
+
+    assert results["plain.example"].source_method == "http_direct"
+
+    # Hôte mort : pas de stratégie live, Archive.org directement
+    dead = results["dead.example"]
+    assert (dead.http_status, dead.source_method, dead.retry_count) == (200, "archive_org", 1)
+    gone = results["gone.example"]
+    assert (gone.http_status, gone.error_code, gone.retry_count) == (0, "ERR_PROBE", 2)
+
+    missing = results["missing.example"]
+    assert (missing.http_status, missing.error_code) == (404, "ERR_HTTP_404")
+
+
+def test_domains_are_enriched_concurrently(engine):
+    names = [f"live{i}.example" for i in range(8)]
+    engine.run(names)
+
+    # 8 sondes de 50 ms, 4 en parallèle : ~0.1 s au lieu de 0.4 s
+    assert engine.stats["domains"] == 8
+    assert engine.stats["duration_s"] < 0.35
+    assert engine.stats["domains_per_second"] > 8 / 0.35
+
+
+def test_probe_tries_every_resolved_address(monkeypatch):
+    engine = DomainEnrichmentEngine(probe_timeout=0.1)
+    attempts = []
+
+    async def getaddrinfo(host, port, **kwargs):
+        return [(None, None, None, "", ("2001:db8::1", port)), (None, None, None, "", ("192.0.2.1", port))]
+
+    class Writer:
+        def close(self):
+            pass
+
+    async def open_connection(host, port):
+        attempts.append((host, port))
+        if host == "2001:db8::1":
+            raise OSError("Network is unreachable")
+        return None, Writer()
+
+    async def run():
+        monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo)
+        return await engine.probe("dual.example")
+
+    monkeypatch.setattr(asyncio, "open_connection", open_connection)
+    assert asyncio.run(run()) == (True, None)
+    assert attempts == [("2001:db8::1", 443), ("192.0.2.1", 443)]
@@ -0,0 +1,143 @@
+"""
+Tests unitaires pour le cache des exports
+"""
+
+import datetime
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Domain, Export, Expression, ExpressionLink, Media
+from app.services.export_cache import SyncExportCache
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = [model.__table__ for model in (Domain, Expression, Media, ExpressionLink, Export)]
+    Export.metadata.create_all(engine, tables=tables)
+    with engine.begin() as connection:
+        # paragraphs.embedding est un ARRAY PostgreSQL : seules les colonnes lues par l'empreinte
+        connection.execute(text(
+            "CREATE TABLE paragraphs (id INTEGER PRIMARY KEY, expression_id INTEGER NOT NULL, "
+            "created_at DATETIME, updated_at DATETIME, embedding_computed_at DATETIME)"
+        ))
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def export_dir():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield tmp_dir
+
+
+def _write(path: str, size: int) -> str:
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return path
+
+
+class TestSyncExportCache:
+    """Tests du cache d'exports adressé par empreinte"""
+
+    def test_fingerprint_changes_with_land_data(self, db):
+        cache = SyncExportCache(db)
+        db.add(Domain(id=1, land_id=1, name="example.com"))
+        db.add(Expression(id=1, land_id=1, domain_id=1, url="https://example.com/a", url_hash="a", relevance=3))
+        db.commit()
+
+        first = cache.compute_fingerprint("pagecsv", 1, 1)
+        assert first == cache.compute_fingerprint("pagecsv", 1, 1)
+        assert first != cache.compute_fingerprint("nodegexf", 1, 1)
+        assert first != cache.compute_fingerprint("pagecsv", 1, 2)
+        assert first != cache.compute_fingerprint("pagecsv", 1, 1, filename="projet.csv")
+
+        db.add(Expression(id=2, land_id=1, domain_id=1, url="https://example.com/b", url_hash="b", relevance=3))
+        db.commit()
+        assert first != cache.compute_fingerprint("pagecsv", 1, 1)
+
+    def test_fingerprint_changes_with_paragraphs(self, db):
+        cache = SyncExportCache(db)
+        db.add(Domain(id=1, land_id=1, name="example.com"))
+        db.add(Expression(id=1, land_id=1, domain_id=1, url="https://example.com/a", url_hash="a", relevance=3))
+        db.commit()
+        created = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        db.execute(
+            text("INSERT INTO paragraphs (id, expression_id, created_at) VALUES (1, 1, :created)"),
+            {"created": created},
+        )
+        db.commit()
+
+        first = cache.compute_fingerprint("shardedcorpus", 1, 1)
+        db.execute(
+            text("UPDATE paragraphs SET embedding_computed_at = :computed WHERE id = 1"),
+            {"computed": created + datetime.timedelta(days=1)},
+        )
+        db.commit()
+        second = cache.compute_fingerprint("shardedcorpus", 1, 1)
+        assert first != second
+
+        db.execute(text("INSERT INTO paragraphs (id, expression_id, created_at) VALUES (2, 1, :created)"), {"created": created})
+        db.commit()
+        assert second != cache.compute_fingerprint("shardedcorpus", 1, 1)
+
+    def test_store_then_lookup_hits(self, db, export_dir):
+        cache = SyncExportCache(db)
+        path = _write(os.path.join(export_dir, "export_pagecsv_1.csv"), 10)
+        cache.store("abc", "pagecsv", 1, 1, 1, path, 4)
+
+        entry = cache.lookup("abc")
+        assert entry is not None
+        assert entry.file_path == path
+        assert entry.total_records == 4
+        assert entry.hit_count == 1
+        assert entry.mime_type == "text/csv"
+        assert cache.lookup("other") is None
+
+    def test_lookup_ignores_missing_file(self, db, export_dir):
+        cache = SyncExportCache(db)
+        path = _write(os.path.join(export_dir, "gone.csv"), 10)
+        cache.store("abc", "pagecsv", 1, 1, 1, path, 4)
+        os.unlink(path)
+
+        assert cache.lookup("abc") is None
+        assert db.query(Export).one().status == "evicted"
+
+    def test_evict_lru_under_size_budget(self, db, export_dir):
+        cache = SyncExportCache(db)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for index in range(3):
+            path = _write(os.path.join(export_dir, f"export_{index}.csv"), 100)
+            entry = cache.store(f"fp{index}", "pagecsv", 1, 1, 1, path, 1)
+            entry.last_accessed_at = now - datetime.timedelta(minutes=10 - index)
+        db.commit()
+
+        # Most recently used first
+        cache.lookup("fp0")
+        evicted = cache.evict(max_bytes=200)
+
+        assert [e["filename"] for e in evicted] == ["export_1.csv"]
+        assert evicted[0]["reason"] == "size_budget"
+        assert not os.path.exists(os.path.join(export_dir, "export_1.csv"))
+        assert os.path.exists(os.path.join(export_dir, "export_0.csv"))
+        assert set(cache.cached_paths()) == {
+            os.path.join(export_dir, "export_0.csv"),
+            os.path.join(export_dir, "export_2.csv"),
+        }
+
+    def test_evict_idle_entries(self, db, export_dir):
+        cache = SyncExportCache(db)
+        path = _write(os.path.join(export_dir, "old.csv"), 10)
+        entry = cache.store("old", "pagecsv", 1, 1, 1, path, 1)
+        entry.last_accessed_at = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=48)
+        db.commit()
+
+        evicted = cache.evict(max_bytes=10 ** 9, max_idle_hours=24)
+
+        assert [e["reason"] for e in evicted] == ["idle"]
+        assert not os.path.exists(path)
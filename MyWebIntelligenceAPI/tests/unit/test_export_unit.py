@@ -326,6 +326,177 @@ class TestExportServiceUnit:
             assert filename.endswith('.csv')
             assert count == 5
 
+    
+    @patch('app.services.export_service_sync.SyncExportService.get_sql_data')
+    def test_write_shardedcorpus_manifest(self, mock_get_sql):
+        """Test de l'export corpus en shards avec manifest"""
+        import json
+        mock_get_sql.return_value = [
+            {'id': i, 'title': f'Page {i}', 'url': f'https://example.com/{i}',
+             'description': '', 'readable': f'Contenu {i}', 'domain': 'example.com'}
+            for i in range(1, 8)
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            directory = os.path.join(tmp_dir, 'corpus')
+            count = self.service.write_shardedcorpus(directory, 1, 1, shards=3, workers=1)
+            
+            assert count == 7
+            with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+                manifest = json.load(f)
+            
+            assert [s['records'] for s in manifest['shards']] == [3, 3, 1]
+            assert len(manifest['expressions']) == 7
+            
+            entry = manifest['expressions']['5']
+            shard = manifest['shards'][entry['shard']]
+            with ZipFile(os.path.join(directory, shard['filename'])) as archive:
+                content = archive.read(entry['member']).decode('utf-8')
+            assert 'Identifier: "5"' in content
+            assert content.endswith('Contenu 5')
+    
+    @patch('app.services.export_service_sync.SyncExportService.get_sql_data')
+    def test_write_shardedcorpus_matches_plain_corpus(self, mock_get_sql):
+        """Les shards construits en parallèle contiennent les mêmes fichiers que le corpus simple"""
+        mock_get_sql.return_value = [
+            {'id': i, 'title': f'Titre {i}', 'url': f'https://example.com/{i}',
+             'description': 'desc', 'readable': 'texte ' * i, 'domain': 'example.com'}
+            for i in range(1, 11)
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plain_path = os.path.join(tmp_dir, 'plain.zip')
+            self.service.write_corpus(plain_path, 1, 1)
+            with ZipFile(plain_path) as archive:
+                expected = {name: archive.read(name) for name in archive.namelist()}
+            
+            directory = os.path.join(tmp_dir, 'sharded')
+            self.service.write_shardedcorpus(directory, 1, 1, shards=4, workers=2)
+            
+            actual = {}
+            for name in sorted(os.listdir(directory)):
+                if name.endswith('.zip'):
+                    with ZipFile(os.path.join(directory, name)) as archive:
+                        actual.update({member: archive.read(member) for member in archive.namelist()})
+            
+            assert actual == expected
+    
+    @patch('app.services.export_service_sync.can_spawn_processes', return_value=False)
+    @patch('app.services.export_service_sync.SyncExportService.get_sql_data')
+    def test_write_shardedcorpus_in_daemon_process(self, mock_get_sql, mock_can_spawn):
+        """Dans un enfant prefork de Celery (daemon), les shards sont construits dans des threads"""
+        mock_get_sql.return_value = [
+            {'id': i, 'title': f'Page {i}', 'url': f'https://example.com/{i}',
+             'description': '', 'readable': f'Contenu {i}', 'domain': 'example.com'}
+            for i in range(1, 5)
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                patch('app.services.export_service_sync.ProcessPoolExecutor') as process_pool:
+            count = self.service.write_shardedcorpus(os.path.join(tmp_dir, 'corpus'), 1, 1, shards=2, workers=2)
+        
+        assert count == 4
+        process_pool.assert_not_called()
+        sql = mock_get_sql.call_args.args[0]
+        assert 'FROM expressions AS e' in sql and 'JOIN domains AS d' in sql
+    
+    def test_write_shardedcorpus_invalid_format(self):
+        """Un format de shard inconnu est refusé"""
+        with pytest.raises(ValueError):
+            self.service.write_shardedcorpus('/tmp/unused', 1, 1, shard_format='rar')
+    
+    @patch('app.services.export_service_sync.SyncExportService.write_shardedcorpus', return_value=3)
+    def test_export_data_shardedcorpus_returns_manifest(self, mock_write):
+        """export_data renvoie le manifest pour les exports shardés"""
+        file_path, count = self.service.export_data(
+            export_type='shardedcorpus',
+            land_id=1,
+            filename='sharded_test',
+            shards=2
+        )
+        
+        assert file_path.endswith(os.path.join('sharded_test', 'manifest.json'))
+        assert count == 3
+        assert mock_write.call_args.kwargs == {'shards': 2}
+
+    
+    def _mock_embedding_rows(self, dimension_rows, rows):
+        """Configure la session mockée pour write_embeddings"""
+        dims_result = MagicMock()
+        dims_result.all.return_value = dimension_rows
+        rows_result = MagicMock()
+        rows_result.partitions.return_value = iter([rows[:2], rows[2:]])
+        self.mock_db.execute.side_effect = [dims_result, rows_result]
+    
+    def test_write_embeddings_npy_and_sidecar(self):
+        """Test de l'export binaire des embeddings (npy + parquet)"""
+        import json
+        import numpy as np
+        import pandas as pd
+        
+        rows = [
+            MagicMock(id=10 + i, expression_id=100 + i, embedding_provider='openai',
+                      embedding_model='text-embedding-3-small', embedding=[float(i), 0.5, -1.0])
+            for i in range(3)
+        ]
+        self._mock_embedding_rows([(3, 3)], rows)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            count = self.service.write_embeddings(tmp_dir, 1, 1, batch_size=2)
+            
+            assert count == 3
+            matrix = np.load(os.path.join(tmp_dir, 'embeddings.npy'), mmap_mode='r')
+            assert matrix.shape == (3, 3)
+            assert matrix.dtype == np.float32
+            assert matrix[2].tolist() == [2.0, 0.5, -1.0]
+            
+            sidecar = pd.read_parquet(os.path.join(tmp_dir, 'paragraphs.parquet'))
+            assert sidecar['row'].tolist() == [0, 1, 2]
+            assert sidecar['paragraph_id'].tolist() == [10, 11, 12]
+            assert sidecar['expression_id'].tolist() == [100, 101, 102]
+            
+            with open(os.path.join(tmp_dir, 'manifest.json'), encoding='utf-8') as f:
+                manifest = json.load(f)
+            assert manifest['shape'] == [3, 3]
+            assert manifest['files'] == ['embeddings.npy', 'paragraphs.parquet']
+            del matrix
+    
+    def test_write_embeddings_truncates_rows_deleted_during_export(self):
+        """Paragraphes supprimés entre le COUNT et le parcours : matrice tronquée"""
+        import json
+        import numpy as np
+        import pandas as pd
+        
+        rows = [
+            MagicMock(id=10 + i, expression_id=100 + i, embedding_provider='openai',
+                      embedding_model='text-embedding-3-small', embedding=[float(i + 1), 0.5])
+            for i in range(3)
+        ]
+        # COUNT a vu 5 paragraphes, 2 ont été supprimés avant le parcours
+        self._mock_embedding_rows([(2, 5)], rows)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            count = self.service.write_embeddings(tmp_dir, 1, 1, batch_size=2)
+            
+            assert count == 3
+            matrix = np.load(os.path.join(tmp_dir, 'embeddings.npy'), mmap_mode='r')
+            assert matrix.shape == (3, 2)
+            assert matrix[:, 0].tolist() == [1.0, 2.0, 3.0]
+            sidecar = pd.read_parquet(os.path.join(tmp_dir, 'paragraphs.parquet'))
+            assert len(sidecar) == matrix.shape[0]
+            with open(os.path.join(tmp_dir, 'manifest.json'), encoding='utf-8') as f:
+                assert json.load(f)['shape'] == [3, 2]
+            assert os.listdir(tmp_dir).count('embeddings.npy.tmp') == 0
+            del matrix
+    
+    def test_write_embeddings_rejects_mixed_dimensions(self):
+        """Des dimensions hétérogènes exigent un filtre provider/model"""
+        self._mock_embedding_rows([(768, 5), (1536, 2)], [])
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with pytest.raises(ValueError, match="Mixed embedding dimensions"):
+                self.service.write_embeddings(tmp_dir, 1, 1)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Tests unitaires du cache DNS et du disjoncteur par hôte.
+"""
+import socket
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.core.host_health import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    HostCircuitBreaker,
+    ResolverCache,
+    get_host_breaker,
+    host_of,
+)
+from app.core.media_processor import MediaProcessorSync
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_breaker():
+    get_host_breaker().reset()
+    yield
+    get_host_breaker().reset()
+
+
+def test_host_of_normalises_urls_and_bare_domains():
+    assert host_of("https://Example.COM:8443/page?q=1") == "example.com"
+    assert host_of("example.org") == "example.org"
+    assert host_of(None) is None
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_timeout():
+    clock = FakeClock()
+    breaker = HostCircuitBreaker(failure_threshold=3, reset_timeout=60, clock=clock)
+
+    for _ in range(2):
+        assert breaker.allow("dead.test")
+        breaker.record("dead.test", httpx.ConnectError("refused"))
+    assert breaker.state("dead.test") == CLOSED
+
+    breaker.record_failure("dead.test")
+    assert breaker.state("dead.test") == OPEN
+    assert not breaker.allow("dead.test")
+    assert breaker.allow("alive.test")
+
+    clock.now += 61
+    assert breaker.allow("dead.test")  # requête de test
+    assert breaker.state("dead.test") == HALF_OPEN
+    assert not breaker.allow("dead.test")  # une seule à la fois
+
+    breaker.record_failure("dead.test")
+    assert breaker.state("dead.test") == OPEN
+
+    clock.now += 61
+    assert breaker.allow("dead.test")
+    breaker.record_success("dead.test")
+    assert breaker.state("dead.test") == CLOSED
+
+    snapshot = breaker.snapshot()
+    assert snapshot["trips"] == 2
+    assert snapshot["skipped"] == 2
+    assert snapshot["skipped_by_host"] == {"dead.test": 2}
+    assert snapshot["open"] == []
+
+
+def test_http_errors_do_not_count_as_connection_failures():
+    breaker = HostCircuitBreaker(failure_threshold=1)
+    request = httpx.Request("GET", "https://example.com")
+    response = httpx.Response(503, request=request)
+
+    breaker.record("example.com", httpx.HTTPStatusError("503", request=request, response=response))
+    assert breaker.state("example.com") == CLOSED
+
+    breaker.record("example.com", httpx.ConnectTimeout("timeout"))
+    assert breaker.state("example.com") == OPEN
+
+
+def test_half_open_probe_is_released_after_non_connection_error():
+    clock = FakeClock()
+    breaker = HostCircuitBreaker(failure_threshold=1, reset_timeout=60, clock=clock)
+    breaker.record("flaky.test", httpx.ConnectError("refused"))
+    assert breaker.state("flaky.test") == OPEN
+
+    clock.now += 61
+    assert breaker.allow("flaky.test")
+    breaker.record("flaky.test", httpx.ReadError("connection reset"))
+    assert breaker.state("flaky.test") == CLOSED
+    assert breaker.allow("flaky.test")
+
+
+def test_resolver_cache_caches_positive_and_negative_results():
+    clock = FakeClock()
+    cache = ResolverCache(ttl=300, negative_ttl=60, clock=clock)
+    calls = []
+
+    def resolve(host, port, *args):
+        calls.append(host)
+        if host == "nxdomain.test":
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", port))]
+
+    cache._resolve = resolve
+
+    assert cache.getaddrinfo("example.test", 443)[0][4] == ("192.0.2.1", 443)
+    assert cache.getaddrinfo("example.test", 443)[0][4] == ("192.0.2.1", 443)
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            cache.getaddrinfo("nxdomain.test", 80)
+    assert calls == ["example.test", "nxdomain.test"]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    clock.now += 61  # échec expiré, succès encore valide
+    with pytest.raises(socket.gaierror):
+        cache.getaddrinfo("nxdomain.test", 80)
+    cache.getaddrinfo("example.test", 443)
+    assert calls == ["example.test", "nxdomain.test", "nxdomain.test"]
+
+
+def test_media_processor_skips_hosts_with_open_circuit(monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_DEDUP_ENABLED", False)
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.host)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    processor = MediaProcessorSync(MagicMock(), client)
+    threshold = processor.host_breaker.failure_threshold
+
+    for index in range(threshold + 2):
+        result = processor.analyze_image(f"https://dead-cdn.test/img{index}.png")
+        assert result["error"]
+
+    assert len(calls) == threshold
+    assert result["error"] == "skipped: host circuit open for dead-cdn.test"
+    snapshot = processor.host_breaker.snapshot()
+    assert snapshot["open"] == ["dead-cdn.test"]
+    assert snapshot["skipped_by_host"] == {"dead-cdn.test": 2}
@@ -0,0 +1,135 @@
+"""
+Tests unitaires de la progression des jobs via Redis pub/sub.
+"""
+import asyncio
+import json
+
+from app.core import job_progress
+from app.core.job_progress import ProgressFanout, ProgressPublisher, last_state_key, progress_channel
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def set(self, key, value, ex=None):
+        self.commands.append(("set", key, value))
+
+    def publish(self, channel, value):
+        self.commands.append(("publish", channel, value))
+
+    def execute(self):
+        if self.client.fail:
+            raise ConnectionError("redis down")
+        for command, key, value in self.commands:
+            if command == "set":
+                self.client.values[key] = value
+            else:
+                self.client.published.append((key, json.loads(value)))
+
+
+class FakeRedis:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.values = {}
+        self.published = []
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+
+def test_updates_are_throttled_and_coalesced(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(job_progress.time, "monotonic", lambda: clock[0])
+    client = FakeRedis()
+    publisher = ProgressPublisher(7, client=client, min_interval=0.5)
+
+    for done in range(1, 11):
+        publisher.publish(done, 50)
+        clock[0] += 0.01
+    assert [message["processed"] for _, message in client.published] == [1]
+
+    clock[0] += 0.5
+    publisher.publish(11, 50)
+    publisher.publish(12, 50)
+    publisher.publish(50, 50, "done", status="completed")
+
+    assert [message["processed"] for _, message in client.published] == [1, 11, 50]
+    assert client.published[-1][0] == progress_channel(7)
+    assert json.loads(client.values[last_state_key(7)])["status"] == "completed"
+    assert publisher.coalesced == 10
+
+
+def test_redis_failure_never_breaks_the_job():
+    publisher = ProgressPublisher(7, client=FakeRedis(fail=True), min_interval=0)
+
+    assert publisher.publish(1, 2) is False
+    assert publisher.publish(2, 2, status="completed") is False
+    publisher.close()
+
+
+class FakePubSub:
+    def __init__(self):
+        self.channels = set()
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.channels.add(channel)
+
+    async def unsubscribe(self, channel):
+        self.channels.discard(channel)
+
+    async def get_message(self, timeout=0.0):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        pass
+
+
+class FakeAsyncRedis:
+    def __init__(self):
+        self.pubsub_connection = FakePubSub()
+        self.values = {}
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        return self.pubsub_connection
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def aclose(self):
+        pass
+
+
+def test_fanout_relays_only_subscribed_jobs():
+    async def scenario():
+        received = []
+
+        async def dispatch(job_id, message):
+            received.append((job_id, message["processed"]))
+
+        client = FakeAsyncRedis()
+        client.values[last_state_key("3")] = json.dumps({"processed": 4})
+        fanout = ProgressFanout(dispatch, client=client)
+
+        assert await fanout.subscribe("3") == {"processed": 4}
+        await fanout.subscribe("3")
+        pubsub = client.pubsub_connection
+        assert pubsub.channels == {progress_channel("3")}
+
+        await pubsub.queue.put({"type": "message", "channel": progress_channel("3").encode(),
+                                "data": json.dumps({"processed": 5})})
+        await asyncio.sleep(0.05)
+        assert received == [("3", 5)]
+
+        await fanout.unsubscribe("3")
+        assert pubsub.channels == {progress_channel("3")}
+        await fanout.unsubscribe("3")
+        assert pubsub.channels == set()
+        await fanout.close()
+
+    asyncio.run(scenario())
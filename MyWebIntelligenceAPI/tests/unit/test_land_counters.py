@@ -0,0 +1,112 @@
+"""
+Tests unitaires des compteurs dénormalisés des lands et des domaines.
+"""
+import pytest
+from sqlalchemy import create_engine, event, inspect, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db.models import Domain, Expression, Land
+from app.services.land_counters import reconcile_land_counters
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Land.metadata.create_all(engine, tables=[Land.__table__, Domain.__table__, Expression.__table__])
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session.add(Land(id=1, name="Projet", description="Recherche", owner_id=1))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _expression(expression_id, domain_id, **values):
+    return Expression(id=expression_id, land_id=1, domain_id=domain_id,
+                      url=f"https://example.com/{expression_id}", url_hash=str(expression_id), **values)
+
+
+def test_counters_follow_crawl_writes(db):
+    land = db.get(Land, 1)
+    db.add_all([Domain(id=1, land_id=1, name="a.test"), Domain(id=2, land_id=1, name="b.test")])
+    db.add_all([_expression(1, 1, http_status=200), _expression(2, 1), _expression(3, 2, http_status=404)])
+    db.commit()
+
+    assert (land.total_expressions, land.total_domains) == (3, 2)
+    first = db.get(Domain, 1)
+    assert (first.total_expressions, first.avg_http_status) == (2, 200)
+
+    db.get(Expression, 2).http_status = 500
+    db.get(Expression, 3).domain_id = 1
+    db.commit()
+    assert (first.total_expressions, first.http_status_count, first.avg_http_status) == (3, 3, 368)
+    assert (db.get(Domain, 2).total_expressions, db.get(Domain, 2).avg_http_status) == (0, None)
+
+    removed = db.get(Expression, 1)
+    for relationship in inspect(Expression).relationships:
+        if relationship.uselist:  # collections vides : pas de tables media, paragraphs... dans ce test
+            set_committed_value(removed, relationship.key, [])
+    db.delete(removed)
+    db.commit()
+    assert land.total_expressions == 2
+    assert first.avg_http_status == 452
+
+    assert reconcile_land_counters(db, 1) == {"lands_fixed": 0, "domains_checked": 2, "domains_fixed": 0}
+
+
+def test_reconcile_fixes_drift(db):
+    db.add(Domain(id=1, land_id=1, name="a.test"))
+    db.add_all([_expression(1, 1, http_status=200), _expression(2, 1, http_status=301)])
+    db.commit()
+    db.execute(update(Land.__table__).values(total_expressions=10, total_domains=0))
+    db.execute(update(Domain.__table__).values(total_expressions=0, avg_http_status=None))
+    db.commit()
+
+    assert reconcile_land_counters(db, 1) == {"lands_fixed": 1, "domains_checked": 1, "domains_fixed": 1}
+
+    db.expire_all()
+    land, domain = db.get(Land, 1), db.get(Domain, 1)
+    assert (land.total_expressions, land.total_domains) == (2, 1)
+    assert (domain.total_expressions, domain.http_status_count, domain.avg_http_status) == (2, 2, 250.5)
+
+
+def test_domains_are_updated_in_id_order(db):
+    db.add_all([Domain(id=domain_id, land_id=1, name=f"{domain_id}.test") for domain_id in (3, 1, 2)])
+    db.commit()
+
+    updated = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE domains"):
+            updated.append(parameters[-1])
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    try:
+        db.add_all([_expression(1, 3), _expression(2, 1), _expression(3, 2)])
+        db.commit()
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", capture)
+
+    assert updated == [1, 2, 3]
+
+
+def test_failed_flush_does_not_leak_into_next_flush(db):
+    db.add(Domain(id=1, land_id=1, name="a.test"))
+    db.add(_expression(1, 1))
+    db.commit()
+
+    # Même clé primaire : l'INSERT échoue après before_flush
+    db.expunge_all()
+    db.add_all([_expression(2, 1), _expression(1, 1)])
+    with pytest.raises(Exception):
+        db.flush()
+    db.rollback()
+
+    db.add(_expression(3, 1))
+    db.commit()
+
+    land = db.get(Land, 1)
+    db.refresh(land)
+    assert db.query(Expression).count() == 2
+    assert land.total_expressions == 2
+    assert db.get(Domain, 1).total_expressions == 2
@@ -0,0 +1,176 @@
+"""
+Tests unitaires des statistiques de land maintenues par agrégats.
+"""
+import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import (
+    CrawlJob, CrawlStatus, Domain, Export, Expression, Land, LandStatCounter, Media, MediaType,
+)
+from app.services import land_stats
+from app.services.land_stats import (
+    MAX_METRICS, apply_counters, get_land_stats, read_counters, refresh_land_stats,
+)
+
+NOW = datetime.datetime(2026, 10, 19, 12, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = [model.__table__ for model in (Land, Domain, Expression, Media, CrawlJob, Export, LandStatCounter)]
+    Land.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session.add(Land(id=1, name="Projet", description="Recherche", owner_id=1))
+    session.add(Domain(id=1, land_id=1, name="example.com"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _expression(expression_id, **values):
+    defaults = dict(land_id=1, domain_id=1, url=f"https://example.com/{expression_id}",
+                    url_hash=str(expression_id), depth=0, created_at=NOW)
+    return Expression(id=expression_id, **{**defaults, **values})
+
+
+def _populate(db):
+    db.add_all([
+        _expression(1, relevance=3, crawled_at=NOW, approved_at=NOW, http_status=200, lang="fr",
+                    readable="# Titre", quality_score=0.8),
+        _expression(2, depth=1, relevance=0, crawled_at=NOW, http_status=404),
+        _expression(3, depth=1),
+    ])
+    db.add(Media(id=1, expression_id=1, url="https://cdn.test/a.png", url_hash="m1",
+                 type=MediaType.IMAGE, is_processed=False))
+    db.add(CrawlJob(id=1, land_id=1, job_type="crawl", status=CrawlStatus.PENDING))
+    db.add(Export(id=1, land_id=1, created_by=1, export_type="pagecsv", filename="a.csv",
+                  file_path="/tmp/a.csv", total_records=3, created_at=NOW))
+    db.commit()
+
+
+def _snapshot(db):
+    """Compteurs additifs (les maximums ne diminuent qu'au recalcul)."""
+    return {
+        (metric, bucket): round(value, 6)
+        for metric, buckets in read_counters(db, 1).items()
+        for bucket, value in buckets.items()
+        if metric != "meta" and metric not in MAX_METRICS and round(value, 6)
+    }
+
+
+def test_counters_follow_inserts_updates_and_deletes(db):
+    _populate(db)
+
+    stats = get_land_stats(db, 1)
+    assert stats["expressions"]["total"] == 3
+    assert stats["expressions"]["fetched"] == 2
+
+    expression = db.get(Expression, 3)
+    expression.crawled_at = NOW
+    expression.relevance = 5
+    expression.lang = "en"
+    db.get(Expression, 2).readable = "texte"
+    db.get(Media, 1).is_processed = True
+    job = db.get(CrawlJob, 1)
+    job.status = CrawlStatus.COMPLETED
+    job.started_at = NOW
+    job.completed_at = NOW + datetime.timedelta(seconds=90)
+    db.add(_expression(4, depth=2, relevance=1.5))
+    db.commit()
+    db.delete(db.get(Export, 1))
+    db.commit()
+
+    incremental = _snapshot(db)
+    stats = get_land_stats(db, 1)
+    assert stats["expressions"] == {
+        "total": 4, "fetched": 3, "not_fetched": 1, "approved": 1, "relevant": 3, "readable": 2,
+        "fetched_not_relevant": 1, "relevant_not_approved": 1, "inconsistent": 1,
+    }
+    assert stats["by_lang"] == {"unknown": 2, "fr": 1, "en": 1}
+    assert stats["relevance"]["max"] == 5
+    assert stats["media"]["processed"] == 1
+    assert stats["jobs"]["crawl"]["by_status"] == {"completed": 1}
+    assert stats["jobs"]["crawl"]["avg_duration_seconds"] == 90
+    assert stats["exports"]["total"] == 0
+
+    refresh_land_stats(db, 1)
+    assert _snapshot(db) == incremental
+
+
+def test_stats_are_computed_on_first_read(db):
+    _populate(db)
+    db.execute(LandStatCounter.__table__.delete())
+    db.commit()
+
+    stats = get_land_stats(db, 1)
+
+    assert stats["refreshed_at"] is not None
+    assert [(row["depth"], row["count"]) for row in stats["by_depth"]] == [(0, 1), (1, 2)]
+    assert stats["timeline"][0] == {"date": "2026-10-19", "created_count": 3, "crawled_count": 2, "approved_count": 1}
+    assert stats["exports"]["records"] == 3
+
+
+def test_tracking_is_skipped_without_counter_table():
+    engine = create_engine("sqlite://")
+    Land.metadata.create_all(engine, tables=[Domain.__table__, Expression.__table__])
+    session = sessionmaker(bind=engine)()
+    session.add(_expression(1, relevance=2))
+    session.commit()
+
+    session.get(Expression, 1).relevance = 4
+    session.commit()
+
+    assert session.get(Expression, 1).relevance == 4
+    session.close()
+
+
+def test_failed_flush_does_not_leak_into_next_flush(db):
+    db.add(_expression(1))
+    db.commit()
+
+    # Même clé primaire : l'INSERT échoue après before_flush
+    db.expunge_all()
+    db.add_all([_expression(2), _expression(1)])
+    with pytest.raises(Exception):
+        db.flush()
+    db.rollback()
+
+    db.add(_expression(3))
+    db.commit()
+
+    assert db.query(Expression).count() == 2
+    assert read_counters(db, 1)["expressions"]["total"] == 2
+
+
+def test_counters_without_on_conflict_support(db, monkeypatch):
+    monkeypatch.setattr(land_stats, "UPSERT_DIALECTS", ())
+    connection = db.connection()
+
+    apply_counters(connection, {(1, "lang", "fr"): 2}, {(1, "relevance_max", ""): 3})
+    apply_counters(connection, {(1, "lang", "fr"): 1, (1, "lang", "en"): 1}, {(1, "relevance_max", ""): 2})
+    db.commit()
+
+    counters = read_counters(db, 1)
+    assert counters["lang"] == {"fr": 3, "en": 1}
+    assert counters["relevance_max"][""] == 3
+
+
+def test_counter_rows_are_written_in_key_order():
+    connection = MagicMock()
+    connection.dialect.name = "sqlite"
+    deltas = {(2, "lang", "fr"): 1, (1, "lang", "fr"): 1, (1, "depth", "0"): 2, (1, "lang", "en"): 1}
+    maxima = {(2, "relevance_max", ""): 5, (1, "relevance_max", ""): 3}
+
+    apply_counters(connection, deltas, maxima)
+
+    written = [[(row["land_id"], row["metric"], row["bucket"]) for row in call.args[1]]
+               for call in connection.execute.call_args_list]
+    assert written == [
+        [(1, "depth", "0"), (1, "lang", "en"), (1, "lang", "fr"), (2, "lang", "fr")],
+        [(1, "relevance_max", ""), (2, "relevance_max", "")],
+    ]
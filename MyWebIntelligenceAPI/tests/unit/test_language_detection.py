@@ -0,0 +1,85 @@
+"""
+Tests unitaires pour la détection de langue rapide et mise en cache.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from app.utils import text_utils
+from app.utils.language_detection import (
+    LangdetectLanguageDetector,
+    ProfileLanguageDetector,
+    get_language_detector,
+)
+
+
+SAMPLES = {
+    "fr": "Le gouvernement a annoncé hier une nouvelle réforme des retraites qui inquiète les syndicats.",
+    "en": "The government announced yesterday a new pension reform that worries the unions.",
+    "es": "El gobierno anunció ayer una nueva reforma de las pensiones que preocupa a los sindicatos.",
+    "de": "Die Regierung hat gestern eine neue Rentenreform angekündigt, die die Gewerkschaften beunruhigt.",
+    "it": "Il governo ha annunciato ieri una nuova riforma delle pensioni che preoccupa i sindacati.",
+    "ru": "Правительство вчера объявило о новой пенсионной реформе, которая беспокоит профсоюзы.",
+    "zh": "政府昨天宣布了一项新的养老金改革，引起了工会的严重关切。",
+    "ar": "أعلنت الحكومة أمس عن إصلاح جديد للمعاشات التقاعدية يثير مخاوف النقابات.",
+}
+
+
+@pytest.fixture
+def detector():
+    return ProfileLanguageDetector(max_chars=2000, cache_size=100, prior_languages=("fr", "en"))
+
+
+def test_profile_engine_matches_langdetect_on_labelled_sample(detector):
+    reference = LangdetectLanguageDetector(cache_size=0)
+
+    for expected, text in SAMPLES.items():
+        assert detector.detect(text) == expected
+        assert reference.detect(text) == expected
+
+
+def test_short_texts_favour_prior_languages(detector):
+    assert detector.detect("Bonjour à tous") == "fr"
+    assert detector.detect("Hello world, how are you") == "en"
+    assert detector.detect("court") is None
+    assert detector.detect("1234567890 !!!") is None
+
+
+def test_cache_is_keyed_by_sampled_text(detector):
+    text = SAMPLES["de"]
+    assert detector.detect(text) == "de"
+
+    with patch.object(detector, "_detect_sample", side_effect=AssertionError("not cached")):
+        assert detector.detect(text) == "de"
+        # Seuls les max_chars premiers caractères comptent (URLs et espaces ignorés)
+        assert detector.detect(text + " https://example.com/page") == "de"
+    assert detector.hits == 2 and detector.misses == 1
+
+
+def test_max_chars_caps_analysed_text():
+    detector = ProfileLanguageDetector(max_chars=120)
+    text = SAMPLES["fr"] + " " + SAMPLES["en"] * 20
+
+    assert len(detector.sample(text)) <= 120
+    assert detector.detect(text) == "fr"
+
+
+def test_detect_languages_batch_and_fallback():
+    texts = [SAMPLES["fr"], None, "court", SAMPLES["en"], SAMPLES["fr"]]
+    assert text_utils.detect_languages(texts) == ["fr", None, None, "en", "fr"]
+    assert text_utils.detect_language(SAMPLES["es"]) == "es"
+
+    with patch.object(text_utils, "get_language_detector", return_value=None):
+        assert text_utils.detect_languages([SAMPLES["fr"], SAMPLES["en"]]) == ["fr", "en"]
+
+
+def test_analyze_text_metrics_reuses_known_language():
+    with patch.object(text_utils, "detect_language", side_effect=AssertionError("detected")):
+        metrics = text_utils.analyze_text_metrics(SAMPLES["fr"], language="fr")
+    assert metrics["language"] == "fr"
+    assert metrics["word_count"] == len(SAMPLES["fr"].split())
+
+
+def test_get_language_detector_is_shared_per_engine():
+    assert get_language_detector("profile") is get_language_detector("profile")
+    assert isinstance(get_language_detector("langdetect"), LangdetectLanguageDetector)
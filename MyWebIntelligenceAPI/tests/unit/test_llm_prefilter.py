@@ -0,0 +1,88 @@
+"""
+Tests unitaires pour la cascade de pré-filtrage LLM.
+"""
+from types import SimpleNamespace
+
+from app.services.llm_prefilter import DuplicateIndex, LLMPrefilter, simhash
+
+
+BASE = (
+    "Les politiques publiques de transition énergétique reposent sur la rénovation "
+    "des bâtiments, le développement des réseaux de chaleur et la sobriété des usages. "
+    "Les collectivités locales financent ces programmes avec l'appui de l'État."
+)
+TEXT = " ".join(f"Section {index}. {BASE}" for index in range(6))
+
+
+def _expression(expr_id=1, relevance=2.0, lang="fr", readable=TEXT, **extra):
+    values = dict(
+        id=expr_id, relevance=relevance, lang=lang, readable=readable,
+        http_status=200, content_type="text/html", word_count=400
+    )
+    values.update(extra)
+    return SimpleNamespace(**values)
+
+
+LAND = SimpleNamespace(id=1, lang=["fr", "en"])
+
+
+def _prefilter(**kwargs):
+    options = dict(min_relevance=0.0, accept_relevance=None, reject_flags=["http_error", "very_short_content"],
+                   check_language=True, duplicate_distance=3)
+    options.update(kwargs)
+    return LLMPrefilter(**options)
+
+
+class TestLLMPrefilter:
+
+    def test_relevance_band(self):
+        prefilter = _prefilter(min_relevance=0.5, accept_relevance=5.0)
+
+        assert prefilter.decide(_expression(relevance=0.2), LAND).verdict is False
+        assert prefilter.decide(_expression(relevance=8.0), LAND).verdict is True
+        assert prefilter.decide(_expression(relevance=2.0), LAND).verdict is None
+        assert prefilter.stats["relevance"] == 2
+        assert prefilter.stats["llm"] == 1
+        assert prefilter.calls_saved == 2
+
+    def test_quality_flags(self):
+        decision = _prefilter().decide(_expression(http_status=404), LAND)
+
+        assert decision.verdict is False
+        assert decision.stage == "quality"
+        assert decision.reason == "http_error"
+        assert decision.model_label == "prefilter/quality"
+
+    def test_language_mismatch(self):
+        prefilter = _prefilter()
+
+        assert prefilter.decide(_expression(lang="de"), LAND).stage == "language"
+        assert prefilter.decide(_expression(lang="en-US"), LAND).verdict is None
+        assert prefilter.decide(_expression(lang="de"), SimpleNamespace(lang="fr,de")).verdict is None
+
+    def test_near_duplicate_reuses_verdict(self):
+        prefilter = _prefilter()
+        prefilter.remember(_expression(expr_id=1), False)
+
+        near = _expression(expr_id=2, readable=TEXT + " Partager cet article sur les réseaux sociaux.")
+        decision = prefilter.decide(near, LAND)
+        assert decision.verdict is False
+        assert decision.stage == "duplicate"
+
+        # An expression is never a duplicate of itself (force re-validation)
+        assert prefilter.decide(_expression(expr_id=1), LAND).verdict is None
+
+    def test_duplicate_check_disabled(self):
+        prefilter = _prefilter(duplicate_distance=-1)
+        prefilter.remember(_expression(expr_id=1), True)
+
+        assert prefilter.decide(_expression(expr_id=2), LAND).verdict is None
+
+
+def test_duplicate_index_distance():
+    index = DuplicateIndex(max_distance=3)
+    index.add(1, TEXT, True)
+
+    assert index.find(2, TEXT) == (1, True)
+    assert index.find(2, "Un tout autre texte sur la pêche au saumon en Bretagne et ailleurs.") is None
+    assert simhash("") is None
@@ -0,0 +1,138 @@
+"""
+Tests unitaires pour le sentiment LLM par lots (cache, budget, repli TextBlob).
+"""
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import LLMResponse
+from app.services.llm_sentiment import LLMSentimentAnalyzer, SentimentRateLimited
+from app.services.sentiment_service import SentimentService
+
+
+TEXTS = [
+    (1, "Une excellente nouvelle pour toute la région.", "fr"),
+    (2, "A terrible and disappointing result for everyone.", "en"),
+    (3, "Le conseil municipal se réunit mardi prochain.", "fr"),
+]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    LLMResponse.metadata.create_all(engine, tables=[LLMResponse.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture(autouse=True)
+def openrouter_configured():
+    with patch("app.services.llm_sentiment.settings.OPENROUTER_ENABLED", True), \
+            patch("app.services.llm_sentiment.settings.OPENROUTER_API_KEY", "test-key"):
+        yield
+
+
+def _fake_post(tokens=100):
+    labels = {"excellente": "positive", "terrible": "negative"}
+
+    async def post(client, prompt):
+        answer = {}
+        for block in prompt.split("\n\n")[1:-1]:
+            number = block[1:block.index("]")]
+            label = next((value for word, value in labels.items() if word in block), "neutral")
+            score = {"positive": 0.8, "negative": -0.7, "neutral": 0.0}[label]
+            answer[number] = {"sentiment": label, "score": score, "confidence": 0.9}
+        return {"content": json.dumps(answer), "usage": {"prompt_tokens": tokens, "completion_tokens": 10}}
+    return AsyncMock(side_effect=post)
+
+
+class TestLLMSentimentAnalyzer:
+
+    def test_texts_are_batched_and_cached(self, db):
+        analyzer = LLMSentimentAnalyzer(db, model="test/model", texts_per_request=2, token_budget=0)
+        analyzer.bucket.rate = 1000.0
+        fake = _fake_post()
+
+        with patch.object(analyzer, "_post", fake):
+            results = analyzer.analyze_many(TEXTS, land_id=1)
+        db.commit()
+
+        assert fake.await_count == 2
+        assert [results[key]["label"] for key in (1, 2, 3)] == ["positive", "negative", "neutral"]
+        assert results[1]["model"] == "llm/test/model"
+        assert db.query(LLMResponse).count() == 3
+
+        rerun = LLMSentimentAnalyzer(db, model="test/model", texts_per_request=2)
+        fake = _fake_post()
+        with patch.object(rerun, "_post", fake):
+            cached = rerun.analyze_many(TEXTS, land_id=1)
+
+        assert fake.await_count == 0
+        assert rerun.stats["cache_hits"] == 3
+        assert cached[2]["score"] == -0.7
+
+    def test_token_budget_degrades_to_textblob(self):
+        analyzer = LLMSentimentAnalyzer(texts_per_request=1, max_concurrency=1, token_budget=400)
+        analyzer.bucket.rate = 1000.0
+        fake = _fake_post(tokens=250)
+
+        with patch.object(analyzer, "_post", fake):
+            results = analyzer.analyze_many(TEXTS, land_id=7)
+
+        assert fake.await_count == 1
+        assert results[1]["model"].startswith("llm/")
+        assert results[2]["model"] == "textblob"
+        assert results[2]["label"] == "negative"
+        assert analyzer.budget.exhausted(7)
+        assert not analyzer.budget.exhausted(8)
+
+    def test_rate_limit_degrades_without_waiting(self):
+        analyzer = LLMSentimentAnalyzer(texts_per_request=3)
+        fake = AsyncMock(side_effect=SentimentRateLimited(30))
+
+        with patch.object(analyzer, "_post", fake):
+            results = analyzer.analyze_many(TEXTS)
+            again = analyzer.analyze_many(TEXTS[:1])
+
+        assert fake.await_count == 1
+        assert {result["model"] for result in results.values()} == {"textblob"}
+        assert again[1]["model"] == "textblob"
+        assert analyzer.stats["rate_limited"] == 1
+
+    def test_unconfigured_openrouter_uses_textblob(self):
+        analyzer = LLMSentimentAnalyzer()
+        with patch("app.services.llm_sentiment.settings.OPENROUTER_ENABLED", False):
+            results = analyzer.analyze_many([(1, "Short", "fr"), (2, TEXTS[0][1], "de"), (3, TEXTS[1][1], "en")])
+
+        assert results[1]["status"] == "no_content"
+        assert results[2]["status"] == "unsupported_lang"
+        assert results[3]["model"] == "textblob"
+
+    def test_parse_response_variants(self):
+        parse = LLMSentimentAnalyzer.parse_response
+        fenced = '```json\n{"1": {"sentiment": "positive", "score": 2, "confidence": 0.5}, "2": {"sentiment": "bad"}}\n```'
+
+        assert parse(fenced, 2) == {0: {"sentiment": "positive", "score": 1.0, "confidence": 0.5}}
+        assert parse('{"sentiment": "negative", "score": -0.4, "confidence": 0.8}', 1)[0]["sentiment"] == "negative"
+        assert parse('[{"sentiment": "neutral", "score": 0}]', 1)[0]["confidence"] == 0.0
+        assert parse("not json", 2) == {}
+
+
+class TestSentimentServiceBatch:
+
+    def test_enrich_many_llm_maps_fields(self):
+        analyzer = LLMSentimentAnalyzer(texts_per_request=5)
+        analyzer.bucket.rate = 1000.0
+        items = [(1, None, TEXTS[0][1], "fr"), (2, None, "", "fr")]
+
+        with patch.object(analyzer, "_post", _fake_post()):
+            fields = SentimentService().enrich_many_llm(items, analyzer, land_id=1)
+
+        assert fields[1]["sentiment_label"] == "positive"
+        assert fields[1]["sentiment_status"] == "computed"
+        assert fields[1]["sentiment_computed_at"] is not None
+        assert fields[2]["sentiment_status"] == "no_content"
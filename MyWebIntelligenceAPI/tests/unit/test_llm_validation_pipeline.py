@@ -0,0 +1,206 @@
+"""
+Tests unitaires pour le pipeline concurrent de validation LLM.
+"""
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Domain, Expression, Land, LandDictionary, LLMResponse, Word
+from app.services.llm_validation_pipeline import LLMResponseCache, LLMValidationPipeline, TokenBucket
+from app.services.llm_validation_service import LLMValidationService
+
+
+READABLE = "Un texte lisible suffisamment long pour être soumis à la validation par le modèle."
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = [model.__table__ for model in (Land, Word, LandDictionary, Domain, Expression, LLMResponse)]
+    Land.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    session.add(Land(id=1, name="Projet", description="Recherche", owner_id=1))
+    session.add(Domain(id=1, land_id=1, name="example.com"))
+    # Expressions 1 and 2 are duplicates (same URL, title and content)
+    for expr_id, url, title in ((1, "https://example.com/a", "A"), (2, "https://example.com/a", "A"), (3, "https://example.com/b", "B")):
+        session.add(Expression(
+            id=expr_id, land_id=1, domain_id=1, url=url, url_hash=f"h{expr_id}",
+            title=title, readable=READABLE, relevance=2
+        ))
+    session.add(Expression(id=4, land_id=1, domain_id=1, url="https://example.com/c", url_hash="h4", readable="court", relevance=2))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _fake_api():
+    async def call(client, prompt, model):
+        answer = "non" if "Titre : B" in prompt else "oui"
+        return {"content": answer, "usage": {"prompt_tokens": 100, "completion_tokens": 1}}
+    return AsyncMock(side_effect=call)
+
+
+class TestLLMValidationPipeline:
+
+    def test_run_dedupes_and_updates_expressions(self, db):
+        pipeline = LLMValidationPipeline(db, model="test/model", max_concurrency=4)
+        pipeline._bucket("test/model").rate = 1000.0
+        fake = _fake_api()
+
+        with patch.object(pipeline.service, "_call_openrouter_api_async", fake):
+            progress = []
+            stats = pipeline.run(land_id=1, batch_size=10, progress=lambda *args: progress.append(args[:2]))
+
+        assert fake.await_count == 2
+        assert stats["api_calls"] == 2
+        assert stats["processed"] == 3
+        assert stats["validated"] == 2
+        assert stats["rejected"] == 1
+        assert stats["skipped"] == 1
+        assert stats["total_tokens"] == 202
+        assert progress == [(4, 4)]
+
+        assert db.get(Expression, 1).valid_llm == "oui"
+        assert db.get(Expression, 3).valid_llm == "non"
+        assert db.get(Expression, 3).relevance == 0
+        assert db.get(Expression, 3).valid_model == "test/model"
+        assert db.query(LLMResponse).count() == 2
+
+    @patch("app.services.llm_validation_pipeline.settings.LLM_PREFILTER_ENABLED", False)
+    def test_rerun_is_served_from_cache(self, db):
+        pipeline = LLMValidationPipeline(db, model="test/model")
+        with patch.object(pipeline.service, "_call_openrouter_api_async", _fake_api()):
+            pipeline.run(land_id=1)
+
+        rerun = LLMValidationPipeline(db, model="test/model")
+        fake = _fake_api()
+        with patch.object(rerun.service, "_call_openrouter_api_async", fake):
+            stats = rerun.run(land_id=1, force=True)
+
+        assert fake.await_count == 0
+        assert stats["cache_hits"] == 2
+        assert stats["api_calls"] == 0
+        assert stats["validated"] == 2  # Expression 3 was zeroed by the first run
+
+    def test_failed_calls_leave_expression_unvalidated(self, db):
+        pipeline = LLMValidationPipeline(db, model="test/model", use_cache=False)
+        failing = AsyncMock(side_effect=Exception("boom"))
+        with patch.object(pipeline.service, "_call_openrouter_api_async", failing):
+            stats = pipeline.run(land_id=1)
+
+        assert stats["errors"] == 3
+        assert stats["processed"] == 0
+        assert db.get(Expression, 1).valid_llm is None
+
+    def test_prefilter_decides_before_llm(self, db):
+        db.get(Expression, 3).lang = "de"
+        db.get(Land, 1).lang = ["fr"]
+        db.commit()
+
+        pipeline = LLMValidationPipeline(db, model="test/model", use_cache=False)
+        fake = _fake_api()
+        with patch.object(pipeline.service, "_call_openrouter_api_async", fake):
+            stats = pipeline.run(land_id=1, batch_size=1)
+
+        # Expression 3 is rejected on language; 2 is a near-duplicate of 1 validated in the previous batch
+        assert fake.await_count == 1
+        assert stats["prefilter"]["language"] == 1
+        assert stats["prefilter"]["duplicate"] == 1
+        assert stats["prefilter"]["llm"] == 1
+        assert stats["llm_calls_saved"] == 2
+        assert db.get(Expression, 3).valid_model == "prefilter/language"
+        assert db.get(Expression, 2).valid_llm == "oui"
+        assert db.get(Expression, 2).valid_model == "prefilter/duplicate"
+
+
+    @patch("app.services.llm_validation_pipeline.settings.LLM_PREFILTER_ENABLED", False)
+    def test_batched_mode_packs_pages(self, db):
+        pipeline = LLMValidationPipeline(db, model="test/model", batched=True)
+
+        async def call(client, prompt, model, system_prompt=None):
+            assert "[id=1]" in prompt and "[id=3]" in prompt
+            return {"content": '```json\n{"1": "oui", "3": "non"}\n```', "usage": {"prompt_tokens": 150, "completion_tokens": 10}}
+
+        fake = AsyncMock(side_effect=call)
+        with patch.object(pipeline.service, "_call_openrouter_api_async", fake):
+            stats = pipeline.run(land_id=1)
+
+        assert fake.await_count == 1
+        assert stats["batched_requests"] == 1
+        assert stats["batch_fallbacks"] == 0
+        assert stats["validated"] == 2 and stats["rejected"] == 1
+        assert db.get(Expression, 3).valid_llm == "non"
+        # Verdicts are cached under the single-page prompt hash
+        assert db.query(LLMResponse).count() == 2
+
+    @patch("app.services.llm_validation_pipeline.settings.LLM_PREFILTER_ENABLED", False)
+    def test_batched_mode_falls_back_on_partial_answer(self, db):
+        pipeline = LLMValidationPipeline(db, model="test/model", batched=True, use_cache=False)
+        single = _fake_api()
+
+        async def call(client, prompt, model, system_prompt=None):
+            if "[id=" in prompt:
+                return {"content": '{"1": "oui", "3": "peut-être"}', "usage": {}}
+            return await single(client, prompt, model)
+
+        with patch.object(pipeline.service, "_call_openrouter_api_async", AsyncMock(side_effect=call)):
+            stats = pipeline.run(land_id=1)
+
+        assert stats["batch_fallbacks"] == 1
+        assert single.await_count == 1
+        assert stats["api_calls"] == 2
+        assert db.get(Expression, 3).valid_llm == "non"
+
+
+def test_cache_store_keeps_existing_entry(db):
+    # Another worker already stored the same prompt
+    db.add(LLMResponse(model="test/model", prompt_hash="k", content="oui", hit_count=3))
+    db.commit()
+
+    cache = LLMResponseCache(db)
+    cache.store("test/model", "k", {"content": "non", "usage": {"prompt_tokens": 10}})
+    cache.store("test/model", "k2", {"content": "non"})
+    db.commit()
+
+    entries = {entry.prompt_hash: entry for entry in db.query(LLMResponse).all()}
+    assert entries["k"].content == "oui"
+    assert entries["k"].hit_count == 3
+    assert entries["k2"].content == "non"
+
+
+def test_cache_is_disabled_without_on_conflict_support():
+    db = MagicMock()
+    db.get_bind.return_value.dialect.name = "mysql"
+
+    cache = LLMResponseCache(db)
+    cache.store("test/model", "k", {"content": "oui"})
+
+    assert not cache.enabled
+    assert cache.get_many("test/model", ["k"]) == {}
+    db.execute.assert_not_called()
+    db.query.assert_not_called()
+
+
+def test_parse_batch_response_formats():
+    service = LLMValidationService()
+
+    assert service._parse_batch_response('{"12": "oui", "15": "Non", "99": "oui"}', [12, 15]) == {12: True, 15: False}
+    assert service._parse_batch_response('Voici : [{"id": 12, "verdict": "non"}]', [12, 15]) == {12: False}
+    assert service._parse_batch_response('12: oui\nid=15 - non', [12, 15]) == {12: True, 15: False}
+    assert service._parse_batch_response("je ne sais pas", [12]) == {}
+
+
+def test_token_bucket_limits_rate():
+    async def acquire_many():
+        bucket = TokenBucket(rate_per_minute=600, capacity=2)  # 10 per second
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(acquire_many())
+    assert 0.15 <= elapsed < 1.0
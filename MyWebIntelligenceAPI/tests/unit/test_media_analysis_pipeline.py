@@ -0,0 +1,162 @@
+"""
+Tests unitaires de l'analyse concurrente des médias d'un land.
+"""
+import asyncio
+import io
+
+import httpx
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.core.host_health import get_host_breaker
+from app.db.models import Domain, Expression, Land, Media, MediaType
+from app.services.media_analysis_pipeline import MediaAnalysisPipeline
+
+
+def _png(colour):
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 30), colour).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_DEDUP_ENABLED", False)
+    get_host_breaker().reset()
+    yield
+    get_host_breaker().reset()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = [model.__table__ for model in (Land, Domain, Expression, Media)]
+    Land.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    session.add(Land(id=1, name="Projet", description="Recherche", owner_id=1))
+    session.add(Domain(id=1, land_id=1, name="example.com"))
+    session.add(Expression(id=1, land_id=1, domain_id=1, url="https://example.com/a", url_hash="a",
+                           depth=0, relevance=3))
+    session.add(Expression(id=2, land_id=1, domain_id=1, url="https://example.com/b", url_hash="b",
+                           depth=5, relevance=3))
+    media = (
+        (1, 1, "https://cdn.test/1.png"),
+        (2, 1, "https://cdn.test/2.png"),
+        (3, 1, "https://other.test/missing.png"),
+        (4, 1, "https://cdn.test/4.png"),
+        (5, 2, "https://cdn.test/deep.png"),  # hors profondeur
+    )
+    for media_id, expression_id, url in media:
+        session.add(Media(id=media_id, expression_id=expression_id, url=url,
+                          url_hash=Media.compute_url_hash(url), type=MediaType.IMAGE, is_processed=False))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _handler(request):
+    if request.url.host == "other.test":
+        return httpx.Response(404)
+    return httpx.Response(200, content=_png((20, 200, 40)), headers={"Content-Type": "image/png"})
+
+
+def test_downloads_are_bounded_per_host_and_globally():
+    in_flight = {}
+    peaks = {"global": 0}
+
+    async def handler(request):
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peaks[host] = max(peaks.get(host, 0), in_flight[host])
+        peaks["global"] = max(peaks["global"], sum(in_flight.values()))
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return httpx.Response(200, content=b"x", headers={"Content-Type": "image/png"})
+
+    pipeline = MediaAnalysisPipeline(None, max_concurrency=5, per_host=2, workers=1,
+                                     transport=httpx.MockTransport(handler))
+    rows = [(i, f"https://{host}/{i}.png") for i, host in enumerate(["a.test", "b.test", "c.test", "d.test"] * 6)]
+
+    downloaded = asyncio.run(pipeline.download_all(rows))
+
+    assert [media_id for media_id, _, _ in downloaded] == [media_id for media_id, _ in rows]
+    assert all(content == b"x" for _, content, _ in downloaded)
+    assert max(peaks[host] for host in ("a.test", "b.test", "c.test", "d.test")) == 2
+    assert peaks["global"] <= 5
+
+
+def test_run_updates_pages_in_bulk_and_records_resume_point(db):
+    progress = []
+    pipeline = MediaAnalysisPipeline(db, page_size=2, workers=1, transport=httpx.MockTransport(_handler))
+
+    stats = pipeline.run(land_id=1, depth=1, progress=lambda done, total, s: progress.append((done, total)))
+
+    assert progress == [(2, 4), (4, 4)]
+    assert (stats["analyzed_media"], stats["failed_analysis"], stats["last_media_id"]) == (3, 1, 4)
+
+    analysed = db.get(Media, 1)
+    assert analysed.is_processed and analysed.processed_at is not None
+    assert (analysed.width, analysed.height, analysed.format) == (40, 30, "PNG")
+    assert analysed.phash and analysed.dominant_colors[0]["rgb"][1] > 150
+
+    failed = db.get(Media, 3)
+    assert not failed.is_processed and "404" in failed.analysis_error
+    assert not db.get(Media, 5).is_processed
+
+
+def test_run_resumes_after_last_processed_media(db):
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path)
+        return _handler(request)
+
+    pipeline = MediaAnalysisPipeline(db, page_size=10, workers=1, transport=httpx.MockTransport(handler))
+    stats = pipeline.run(land_id=1, depth=1, after_id=2)
+
+    assert requested == ["/missing.png", "/4.png"]
+    assert stats["total_media"] == 2
+    assert not db.get(Media, 1).is_processed
+
+
+def test_analysis_uses_threads_in_daemon_process(monkeypatch):
+    import app.services.media_analysis_pipeline as pipeline_module
+
+    def no_process_pool(*args, **kwargs):
+        pytest.fail("process pool started in a daemon process")
+
+    monkeypatch.setattr(pipeline_module, "can_spawn_processes", lambda: False)
+    monkeypatch.setattr(pipeline_module, "ProcessPoolExecutor", no_process_pool)
+    pipeline = MediaAnalysisPipeline(None, workers=2)
+    downloaded = [(media_id, _png((10 * media_id, 0, 0)), {}) for media_id in (1, 2, 3)]
+    try:
+        results = pipeline.analyze(downloaded)
+    finally:
+        pipeline.close()
+
+    assert [media_id for media_id, _ in results] == [1, 2, 3]
+    assert all(result.get("width") == 40 for _, result in results)
+
+
+def test_run_reuses_colours_of_near_identical_media(db):
+    from app.core.perceptual_hash import compute_hashes
+    from app.services.media_dedup import MediaHashIndex
+
+    hashes = compute_hashes(Image.open(io.BytesIO(_png((20, 200, 40)))).convert("RGB"))
+    twin_colours = [{"rgb": [1, 2, 3], "percentage": 100.0}]
+    db.add(Media(id=9, expression_id=2, url="https://elsewhere.test/copy.png", url_hash="copy",
+                 type=MediaType.IMAGE, is_processed=True, phash=hashes["phash"], dhash=hashes["dhash"],
+                 dominant_colors=twin_colours, websafe_colors={"#000000": 100.0}))
+    db.commit()
+
+    pipeline = MediaAnalysisPipeline(db, page_size=10, workers=1, transport=httpx.MockTransport(_handler))
+    pipeline.dedup_index = MediaHashIndex(refresh_seconds=3600)
+    stats = pipeline.run(land_id=1, depth=1)
+
+    assert stats["perceptual_reused"] == 3
+    analysed = db.get(Media, 1)
+    assert analysed.dominant_colors == twin_colours
+    assert (analysed.width, analysed.height) == (40, 30)
@@ -0,0 +1,169 @@
+"""
+Tests unitaires des empreintes perceptuelles et de la déduplication des médias.
+"""
+import datetime
+import io
+import random
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFilter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import media_processor as media_processor_module
+from app.core.host_health import get_host_breaker
+from app.core.media_processor import MediaProcessorSync
+from app.core.perceptual_hash import (
+    MultiIndexHashTable,
+    compute_hashes,
+    from_hex,
+    hamming,
+)
+from app.db.models import Domain, Expression, Media
+from app.services.media_dedup import ANALYSIS_FIELDS, MediaHashIndex, build_image_clusters
+
+
+def _photo(seed, size=(480, 360)):
+    rng = np.random.default_rng(seed)
+    img = Image.new("RGB", size, tuple(int(v) for v in rng.integers(0, 256, 3)))
+    draw = ImageDraw.Draw(img)
+    for _ in range(8):
+        x, y = int(rng.integers(0, size[0])), int(rng.integers(0, size[1]))
+        draw.rectangle([x, y, x + int(rng.integers(40, 240)), y + int(rng.integers(40, 240))],
+                       fill=tuple(int(v) for v in rng.integers(0, 256, 3)))
+    return img.filter(ImageFilter.GaussianBlur(2))
+
+
+def _reencode(img, scale, quality):
+    resized = img.resize((int(img.width * scale), int(img.height * scale)))
+    buffer = io.BytesIO()
+    resized.save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def test_hashes_survive_resize_and_recompression():
+    for seed in range(6):
+        original = compute_hashes(_photo(seed))
+        variant = compute_hashes(Image.open(io.BytesIO(_reencode(_photo(seed), 0.4, 60))))
+        for name in ("dhash", "phash"):
+            assert hamming(from_hex(original[name]), from_hex(variant[name])) <= 6
+
+    assert hamming(from_hex(compute_hashes(_photo(1))["phash"]), from_hex(compute_hashes(_photo(2))["phash"])) > 6
+
+
+def test_multi_index_query_matches_brute_force():
+    rng = random.Random(0)
+    values = [rng.getrandbits(64) for _ in range(400)]
+    # Variantes proches de quelques empreintes
+    values += [value ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for value in values[:50]]
+    table = MultiIndexHashTable(max_distance=6)
+    for key, value in enumerate(values):
+        table.add(key, value)
+
+    for probe in values[:80]:
+        expected = sorted(k for k, v in enumerate(values) if hamming(probe, v) <= 6)
+        assert sorted(key for key, _ in table.query(probe)) == expected
+
+
+def test_index_requires_dhash_confirmation():
+    index = MediaHashIndex(max_distance=4, refresh_seconds=3600)
+    index.add(1, "00000000000000ff", "ffff000000000000")
+    index.add(2, "00000000000000fe", "0000000000000000")
+
+    assert index.find("00000000000000ff", "0000000000000001") == 2
+    assert index.find("00000000000000ff", "ffff000000000001") == 1
+    assert index.find("ffffffffffffffff", "0000000000000000") is None
+
+
+def test_index_refresh_picks_up_reanalysed_media():
+    engine = create_engine("sqlite://")
+    Media.metadata.create_all(engine, tables=[Domain.__table__, Expression.__table__, Media.__table__])
+    db = sessionmaker(bind=engine)()
+    analysed = datetime.datetime(2026, 1, 1)
+    db.add(Domain(id=1, land_id=1, name="example.com"))
+    db.add(Expression(id=1, land_id=1, domain_id=1, url="https://example.com/", url_hash="h"))
+    db.add(Media(id=1, expression_id=1, url="https://example.com/a.jpg", type="img",
+                 phash="00000000000000ff", processed_at=analysed))
+    db.add(Media(id=2, expression_id=1, url="https://example.com/b.jpg", type="img"))
+    db.commit()
+
+    index = MediaHashIndex(max_distance=4, refresh_seconds=3600)
+    index.refresh(db)
+    assert index.find("00000000000000ff", None) == 1
+
+    # Lower ids analysed or re-analysed after the first load are picked up
+    media_1, media_2 = db.get(Media, 1), db.get(Media, 2)
+    media_1.phash, media_1.processed_at = "ffffffffffffff00", analysed + datetime.timedelta(hours=1)
+    media_2.phash, media_2.processed_at = "0f0f0f0f0f0f0f0f", analysed + datetime.timedelta(hours=1)
+    db.commit()
+    index.refresh(db, force=True)
+
+    assert index.find("00000000000000ff", None) is None
+    assert index.find("ffffffffffffff00", None) == 1
+    assert index.find("0f0f0f0f0f0f0f0f", None) == 2
+    assert len(index) == 2
+    db.close()
+
+
+def test_build_image_clusters_groups_near_identical_media():
+    rows = [
+        {"id": 1, "url": "a.jpg", "expression_id": 10, "width": 800, "height": 600, "phash": "00000000000000ff"},
+        {"id": 2, "url": "a-300.jpg", "expression_id": 11, "width": 300, "height": 225, "phash": "00000000000000fe"},
+        {"id": 3, "url": "a-150.jpg", "expression_id": 12, "width": 150, "height": 112, "phash": "00000000000001fe"},
+        {"id": 4, "url": "b.jpg", "expression_id": 10, "width": 800, "height": 600, "phash": "ffffffff00000000"},
+        {"id": 5, "url": "c.jpg", "expression_id": 13, "width": 10, "height": 10, "phash": None},
+    ]
+
+    clusters = build_image_clusters(rows, max_distance=2)
+
+    assert len(clusters) == 1
+    assert [row["id"] for row in clusters[0]["media"]] == [1, 2, 3]
+    assert clusters[0]["representative"]["id"] == 1
+    assert clusters[0]["expression_ids"] == [10, 11, 12]
+
+
+@pytest.fixture
+def processor_factory():
+    get_host_breaker().reset()
+    yield lambda handler, index: MediaProcessorSync(
+        MagicMock(), httpx.Client(transport=httpx.MockTransport(handler)), dedup_index=index
+    )
+    get_host_breaker().reset()
+
+
+def test_same_url_reuses_stored_analysis_without_download(processor_factory):
+    stored = SimpleNamespace(id=7, **{field: None for field in ANALYSIS_FIELDS})
+    stored.width, stored.image_hash, stored.phash = 640, "abc", "00000000000000ff"
+    processor = processor_factory(lambda request: pytest.fail("downloaded"), MediaHashIndex(refresh_seconds=3600))
+
+    with patch.object(media_processor_module, "find_analysed_by_url", return_value=stored):
+        result = processor.analyze_image("https://cdn.test/logo.png")
+
+    assert result["reused_from"] == 7
+    assert (result["width"], result["image_hash"], result["phash"]) == (640, "abc", "00000000000000ff")
+
+
+def test_near_identical_image_reuses_colour_analysis(processor_factory):
+    original = _photo(3)
+    index = MediaHashIndex(refresh_seconds=3600)
+    hashes = compute_hashes(original)
+    index.add(42, hashes["phash"], hashes["dhash"])
+    twin = SimpleNamespace(id=42, dominant_colors=[{"rgb": (1, 2, 3), "percentage": 100.0}],
+                           websafe_colors={"#000000": 100.0})
+
+    content = _reencode(original, 0.5, 70)
+    processor = processor_factory(lambda request: httpx.Response(200, content=content), index)
+    processor.db.get.return_value = twin
+    processor._extract_colors = MagicMock(side_effect=AssertionError("colours recomputed"))
+
+    with patch.object(media_processor_module, "find_analysed_by_url", return_value=None):
+        result = processor.analyze_image("https://other-cdn.test/photo-240.jpg")
+
+    assert result["error"] is None
+    assert result["reused_from"] == 42
+    assert result["dominant_colors"] == twin.dominant_colors
+    assert result["width"] == 240 and result["phash"]
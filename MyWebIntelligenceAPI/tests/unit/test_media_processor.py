@@ -0,0 +1,101 @@
+"""
+Tests unitaires du téléchargement en flux et du décodage réduit des images.
+"""
+import hashlib
+import io
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from PIL import Image
+
+from app.config import settings
+from app.core.host_health import get_host_breaker
+from app.core.media_processor import MediaProcessorSync
+
+
+def _jpeg(width, height, colour=(200, 30, 30)):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), colour).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_DEDUP_ENABLED", False)
+    get_host_breaker().reset()
+    yield
+    get_host_breaker().reset()
+
+
+def _processor(handler, max_size=None):
+    processor = MediaProcessorSync(MagicMock(), httpx.Client(transport=httpx.MockTransport(handler)))
+    if max_size is not None:
+        processor.max_size = max_size
+    return processor
+
+
+def test_analyze_image_streams_hash_and_decodes_jpeg_reduced():
+    content = _jpeg(2400, 1600)
+    decoded_sizes = []
+    processor = _processor(lambda request: httpx.Response(200, content=content, headers={"Content-Type": "image/jpeg"}))
+    original = processor._extract_colors
+    processor._extract_colors = lambda pending: (decoded_sizes.extend(img.size for img, _ in pending), original(pending))
+
+    result = processor.analyze_image("https://cdn.test/photo.jpg")
+
+    assert result["error"] is None
+    assert (result["width"], result["height"], result["format"]) == (2400, 1600, "JPEG")
+    assert result["file_size"] == len(content)
+    assert result["image_hash"] == hashlib.sha256(content).hexdigest()
+    assert max(decoded_sizes[0]) <= 256
+    assert result["dominant_colors"][0]["rgb"][0] > 150
+
+
+def test_declared_content_length_over_budget_is_rejected_before_reading():
+    processor = _processor(
+        lambda request: httpx.Response(200, headers={"Content-Length": "5000000"}, stream=httpx.ByteStream(b"")),
+        max_size=1_000_000,
+    )
+    result = processor.analyze_image("https://cdn.test/huge.jpg")
+
+    assert result["error"] == "File size exceeds limit (5000000 bytes)"
+    assert result["image_hash"] is None
+
+
+def test_undeclared_body_is_aborted_once_over_budget():
+    chunks_sent = []
+
+    class Endless(httpx.SyncByteStream):
+        def __iter__(self):
+            while True:
+                chunks_sent.append(1)
+                yield b"\0" * 65536
+
+    processor = _processor(lambda request: httpx.Response(200, stream=Endless()), max_size=256 * 1024)
+    result = processor.analyze_image("https://cdn.test/video.jpg")
+
+    assert result["error"].startswith("File size exceeds limit")
+    assert len(chunks_sent) <= 6
+
+
+def test_non_image_content_type_is_rejected():
+    processor = _processor(lambda request: httpx.Response(200, content=b"x" * 10, headers={"Content-Type": "video/mp4"}))
+    result = processor.analyze_image("https://cdn.test/clip.jpg")
+
+    assert result["error"] == "Not an image (video/mp4)"
+    assert result["file_size"] is None
+
+
+def test_analyze_contents_extracts_colours_in_one_batch():
+    processor = _processor(lambda request: httpx.Response(404))
+    batches = []
+    original = processor._extract_colors
+    processor._extract_colors = lambda pending: (batches.append(len(pending)), original(pending))
+    items = [(_jpeg(400, 300), {"error": None}) for _ in range(3)] + [(b"not an image", {"error": None})]
+
+    results = processor.analyze_contents(items)
+
+    assert batches == [3]
+    assert all(result["dominant_colors"] for result in results[:3])
+    assert results[3]["error"]
@@ -0,0 +1,104 @@
+"""
+Tests unitaires du stockage local des médias (adressé par contenu).
+"""
+import io
+import os
+import time
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from PIL import Image
+
+from app.config import settings
+from app.core import media_processor as media_processor_module
+from app.core.host_health import get_host_breaker
+from app.core.media_processor import MediaProcessorSync
+from app.core.media_store import MediaBlobStore
+
+
+def _png(size, colour=(10, 120, 220)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, colour).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def isolated_settings(monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_DEDUP_ENABLED", False)
+    get_host_breaker().reset()
+    yield
+    get_host_breaker().reset()
+
+
+def test_put_is_content_addressed_and_sharded(tmp_path):
+    store = MediaBlobStore(root=str(tmp_path), max_bytes=0)
+    content = _png((20, 20))
+
+    digest = store.put(content)
+
+    assert store.put(content) == digest
+    assert store.relative_path(digest) == f"blobs/{digest[:2]}/{digest[2:4]}/{digest}"
+    assert store.get(digest) == content
+    assert store.usage() == {"blobs": 1, "thumbnails": 0, "bytes": len(content)}
+    assert store.get("0" * 64) is None
+    with pytest.raises(ValueError):
+        store.blob_path("../../etc/passwd")
+
+
+def test_thumbnail_is_webp_and_bounded(tmp_path):
+    store = MediaBlobStore(root=str(tmp_path), max_bytes=0, thumbnail_size=64)
+    digest = store.put(_png((800, 400)))
+
+    path = store.thumbnail(digest)
+
+    with Image.open(path) as thumb:
+        assert thumb.format == "WEBP"
+        assert max(thumb.size) == 64
+    assert store.thumbnail(store.put(b"not an image")) is None
+
+
+def test_evict_removes_least_recently_used_blobs_with_thumbnails(tmp_path):
+    store = MediaBlobStore(root=str(tmp_path), max_bytes=0)
+    digests = [store.put(_png((30 + i, 30), (i * 40, 0, 0))) for i in range(3)]
+    store.thumbnail(digests[0])
+    now = time.time()
+    for age, digest in zip((300, 200, 100), digests):
+        os.utime(store.blob_path(digest), (now - age, now - age))
+    os.utime(store.thumbnail_path(digests[0]), (now - 50, now - 50))  # miniature servie récemment
+
+    sizes = {digest: os.path.getsize(store.blob_path(digest)) for digest in digests}
+    budget = sizes[digests[2]] + os.path.getsize(store.thumbnail_path(digests[0])) + sizes[digests[0]]
+    report = store.evict(max_bytes=budget)
+
+    assert report["evicted"] == 1
+    assert not store.has(digests[1])
+    assert store.has(digests[0]) and store.has(digests[2])
+
+
+def test_analyze_image_reads_stored_blob_before_downloading(tmp_path, monkeypatch):
+    content = _png((40, 30))
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, content=content, headers={"Content-Type": "image/png"})
+
+    store = MediaBlobStore(root=str(tmp_path), max_bytes=0)
+    processor = MediaProcessorSync(MagicMock(), httpx.Client(transport=httpx.MockTransport(handler)))
+    processor.blob_store = store
+    known = {}
+    monkeypatch.setattr(media_processor_module, "find_stored_hashes", lambda db, urls: {
+        url: known[url] for url in urls if url in known
+    })
+
+    first = processor.analyze_image("https://cdn.test/a.png")
+    assert first["error"] is None and calls == ["/a.png"]
+    assert first["file_path"] == store.relative_path(first["image_hash"])
+    assert store.get(first["image_hash"]) == content
+
+    known["https://cdn.test/a.png"] = first["image_hash"]
+    second = processor.analyze_image("https://cdn.test/a.png")
+
+    assert calls == ["/a.png"]
+    assert (second["width"], second["file_size"], second["file_path"]) == (40, len(content), first["file_path"])
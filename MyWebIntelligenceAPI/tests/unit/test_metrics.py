@@ -0,0 +1,43 @@
+"""
+Tests unitaires de l'instrumentation des étapes des pipelines.
+"""
+import pytest
+
+from app.core import metrics
+from app.core.metrics import collect_job_metrics, render_metrics, stage
+
+
+def test_stages_are_summarised_per_job(monkeypatch):
+    clock = [10.0]
+    monkeypatch.setattr(metrics.time, "perf_counter", lambda: clock[0])
+
+    with collect_job_metrics() as job:
+        with collect_job_metrics() as inner:
+            for seconds in (0.2, 0.4):
+                with stage("crawl", "fetch"):
+                    clock[0] += seconds
+        with stage("crawl", "extract"):
+            clock[0] += 1.0
+        clock[0] += 0.4
+    with stage("crawl", "fetch"):  # hors du job : non compté
+        clock[0] += 5.0
+
+    summary = job.summary()
+    assert summary["wall_seconds"] == 2.0
+    assert list(summary["stages"]) == ["crawl.extract", "crawl.fetch"]
+    assert summary["stages"]["crawl.fetch"] == {
+        "count": 2, "total_seconds": 0.6, "avg_ms": 300.0, "max_ms": 400.0, "share": 0.3, "failures": 0,
+    }
+    assert list(inner.summary()["stages"]) == ["crawl.fetch"]
+
+
+def test_failures_are_counted_and_propagated():
+    with collect_job_metrics() as job:
+        with pytest.raises(ValueError):
+            with stage("export", "csv_write"):
+                raise ValueError("disk full")
+
+    assert job.summary()["stages"]["export.csv_write"]["failures"] == 1
+    content, _ = render_metrics()
+    assert b'mwi_stage_failures_total{pipeline="export",stage="csv_write"}' in content
+    assert b'mwi_stage_duration_seconds_count{pipeline="export",stage="csv_write"}' in content
@@ -0,0 +1,66 @@
+"""
+Tests unitaires pour la pagination par curseur et le comptage estimé
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from app.db.models import Land
+from app.utils.pagination import (
+    cursor_headers,
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+)
+
+
+def test_cursor_round_trip_with_datetime():
+    fetched_at = datetime(2025, 10, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor([fetched_at, 42])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == [fetched_at, 42]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor([1, 2]), encode_cursor([[1]])])
+def test_decode_cursor_rejects_invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 1)
+
+
+def test_estimate_count_uses_planner_rows():
+    db = MagicMock()
+    db.get_bind.return_value.dialect = postgresql.dialect()
+    db.execute.return_value.scalar.return_value = [{"Plan": {"Plan Rows": 1234}}]
+
+    total = estimate_count(db, select(Land.id).where(Land.owner_id == 7))
+
+    assert total == 1234
+    sql = str(db.execute.call_args.args[0])
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT lands.id")
+    assert "lands.owner_id = 7" in sql
+
+
+def test_cursor_headers():
+    assert cursor_headers(None, None) == {}
+    assert cursor_headers("abc", 10) == {"X-Next-Cursor": "abc", "X-Total-Count": "10"}
+
+
+def test_paragraph_keyset_filter():
+    from app.crud.crud_paragraph import paragraph as paragraph_crud
+
+    def compiled_sql(query):
+        return str(query.statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        ))
+
+    with patch.object(Query, "all", compiled_sql):
+        sql = paragraph_crud.get_by_land(Session(), 1, skip=500, after=(10, 3))
+
+    assert "(paragraphs.expression_id, paragraphs.position) > (10, 3)" in sql
+    assert "OFFSET 0" in sql
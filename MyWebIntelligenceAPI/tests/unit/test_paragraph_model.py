@@ -33,3 +33,44 @@ def test_paragraph_preview_text_truncates_long_input():
     preview = paragraph.preview_text
     assert len(preview) == 103  # 100 chars + "..."
     assert preview.endswith("...")
+
+
+def test_get_by_land_defers_embedding_column():
+    from unittest.mock import patch
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.orm import Query, Session
+    from app.crud.crud_paragraph import paragraph as paragraph_crud
+
+    def compiled_sql(query):
+        return str(query.statement.compile(dialect=postgresql.dialect()))
+
+    with patch.object(Query, "all", compiled_sql):
+        lean_sql = paragraph_crud.get_by_land(Session(), 1, include_embeddings=False)
+        full_sql = paragraph_crud.get_by_land(Session(), 1)
+
+    assert "paragraphs.embedding," in full_sql
+    assert "paragraphs.embedding," not in lean_sql
+    assert "paragraphs.embedding_dimensions" in lean_sql
+
+
+def test_paragraph_summary_omits_vector():
+    from datetime import datetime
+    from app.schemas.paragraph import ParagraphSummary
+
+    paragraph = Paragraph(
+        id=3,
+        expression_id=1,
+        text="Sample text",
+        text_hash="hash3",
+        position=0,
+        embedding=[0.1, 0.2],
+        embedding_dimensions=2,
+        created_at=datetime(2025, 1, 1),
+    )
+
+    summary = ParagraphSummary.model_validate(paragraph)
+    payload = summary.model_dump()
+
+    assert "embedding" not in payload
+    assert payload["has_embedding"] is True
+    assert payload["embedding_dimensions"] == 2
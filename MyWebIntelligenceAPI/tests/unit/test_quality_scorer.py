@@ -508,3 +508,80 @@ class TestEdgeCases:
         )
         result = scorer.compute_quality_score(expr, test_land)
         assert "future_date" in result["flags"]
+
+
+class TestColumnarScoring:
+    """compute_quality_scores doit reproduire compute_quality_score ligne à ligne"""
+
+    def test_matches_scalar_path(self, scorer):
+        import itertools
+        import pandas as pd
+
+        now = datetime.now(timezone.utc)
+        variants = itertools.product(
+            [None, 200, 301, 404, "200", "abc"],
+            [None, "", "text/html", "application/pdf", "image/png"],
+            [None, 0, 60, 120, 1500, 7000, 12000],
+            [None, 500, 20000],
+            [None, 0.2, 7],
+            [None, "fr", "en"],
+            [None, now - timedelta(days=30), (now - timedelta(days=2000)).replace(tzinfo=None)],
+        )
+        rows = []
+        for status, ctype, wc, length, rt, lang, published in variants:
+            rows.append(dict(
+                http_status=status, content_type=ctype, crawled_at=now,
+                title="Titre" if wc else " ", description="d" * 25, keywords=None,
+                canonical_url="https://example.com" if rt else None,
+                word_count=wc, content_length=length, reading_time=rt,
+                language=lang, relevance=rt, published_at=published,
+                validllm="oui" if lang == "fr" else None, readable_at=now,
+                readable="r" * (150 if length else 50), approved_at=None,
+                land_lang=["fr"] if length else "en",
+            ))
+
+        results = scorer.compute_quality_scores(pd.DataFrame(rows), now=now)
+
+        for row, (_, got) in zip(rows, results.iterrows()):
+            land = MockLand(lang=row.pop("land_lang"))
+            expected = scorer.compute_quality_score(MockExpression(**row), land)
+            details = {block: got[block] for block in expected["details"]}
+            assert got["score"] == expected["score"]
+            assert got["category"] == expected["category"]
+            assert got["flags"] == expected["flags"]
+            assert got["reason"] == expected["reason"]
+            assert details == expected["details"]
+
+    def test_reprocess_script_bulk_updates(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from app.db.models import Domain, Expression, Land
+        from app.scripts.reprocess_quality_scores import reprocess_quality_scores_in_session
+
+        engine = create_engine("sqlite://")
+        Land.metadata.create_all(engine, tables=[Land.__table__, Domain.__table__, Expression.__table__])
+        session = sessionmaker(bind=engine)()
+        session.add(Land(id=1, name="Projet", description="Recherche", owner_id=1, lang=["fr"]))
+        session.add(Domain(id=1, land_id=1, name="example.com"))
+        now = datetime.now(timezone.utc)
+        for expr_id, status in ((1, 200), (2, 404), (3, None), (4, 200)):
+            session.add(Expression(
+                id=expr_id, land_id=1, domain_id=1, url=f"https://example.com/{expr_id}",
+                url_hash=f"h{expr_id}", http_status=status, content_type="text/html",
+                crawled_at=now, title="Titre", word_count=800, lang="fr", relevance=3
+            ))
+        session.commit()
+
+        stats = reprocess_quality_scores_in_session(session, land_id=1, batch_size=2)
+
+        assert stats["total_candidates"] == 4
+        assert stats["processed"] == 3
+        assert stats["skipped"] == 1
+        assert stats["updated"] == 3
+        session.expire_all()
+        expected = QualityScorer().compute_quality_score(session.get(Expression, 1), session.get(Land, 1))
+        assert session.get(Expression, 1).quality_score == expected["score"]
+        assert session.get(Expression, 2).quality_score == 0.0
+        assert session.get(Expression, 3).quality_score is None
+        session.close()
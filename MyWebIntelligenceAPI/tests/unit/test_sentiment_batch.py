@@ -0,0 +1,114 @@
+"""
+Tests unitaires pour le moteur de sentiment par lots.
+"""
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.sentiment_provider import get_textblob_analyzer, textblob_polarity
+from app.db.models import Domain, Expression, Land
+from app.services.sentiment_batch import BatchSentimentEngine, reprocess_sentiment
+
+
+POSITIVE_FR = "Ce produit est vraiment excellent, je suis très content et satisfait."
+NEGATIVE_EN = "This is a terrible, awful and disappointing experience. I hate it."
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = [model.__table__ for model in (Land, Domain, Expression)]
+    Land.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    session.add(Land(id=1, name="Projet", description="Recherche", owner_id=1))
+    session.add(Land(id=2, name="Autre", description="Autre", owner_id=1))
+    session.add(Domain(id=1, land_id=1, name="example.com"))
+    rows = (
+        (1, 1, POSITIVE_FR, "fr", None),
+        (2, 1, NEGATIVE_EN, "en", None),
+        (3, 1, None, "fr", None),
+        (4, 1, POSITIVE_FR, "fr", "computed"),
+        (5, 2, NEGATIVE_EN, "en", None),
+    )
+    for expr_id, land_id, readable, lang, status in rows:
+        session.add(Expression(
+            id=expr_id, land_id=land_id, domain_id=1, url=f"https://example.com/{expr_id}",
+            url_hash=f"h{expr_id}", readable=readable, lang=lang, sentiment_status=status
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestWarmAnalyzers:
+
+    def test_analyzer_is_built_once_per_language(self):
+        assert get_textblob_analyzer("fr") is get_textblob_analyzer("fr")
+
+    def test_polarity_sign(self):
+        assert textblob_polarity(POSITIVE_FR, "fr") > 0
+        assert textblob_polarity(NEGATIVE_EN, "en") < 0
+
+
+class TestBatchSentimentEngine:
+
+    def test_inline_analysis_keeps_order(self):
+        with BatchSentimentEngine(workers=1) as engine:
+            results = engine.analyze([(7, POSITIVE_FR, "fr"), (8, NEGATIVE_EN, "en"), (9, "", "fr")])
+
+        assert [expression_id for expression_id, _ in results] == [7, 8, 9]
+        assert results[0][1]["sentiment_label"] == "positive"
+        assert results[1][1]["sentiment_label"] == "negative"
+        assert results[2][1]["sentiment_status"] == "no_content"
+        assert results[0][1]["sentiment_model"] == "textblob"
+
+    def test_inline_in_daemon_process(self):
+        rows = [(i, POSITIVE_FR, "fr") for i in range(5)]
+        with patch("app.services.sentiment_batch.can_spawn_processes", return_value=False), \
+                patch("app.services.sentiment_batch.ProcessPoolExecutor") as pool:
+            with BatchSentimentEngine(workers=4, chunk_size=2) as engine:
+                results = engine.analyze(rows)
+
+        pool.assert_not_called()
+        assert [expression_id for expression_id, _ in results] == [0, 1, 2, 3, 4]
+
+
+class TestReprocessSentiment:
+
+    def test_updates_pending_expressions_of_land(self, db):
+        progress = []
+        stats = reprocess_sentiment(
+            db, land_id=1, batch_size=2, workers=1,
+            progress=lambda done, total, _: progress.append((done, total))
+        )
+
+        assert stats["total_candidates"] == 3
+        assert stats["processed"] == 3
+        assert stats["updated"] == 3
+        assert stats["by_status"]["no_content"] == 1
+        assert progress == [(2, 3), (3, 3)]
+
+        db.expire_all()
+        assert db.get(Expression, 1).sentiment_label == "positive"
+        assert db.get(Expression, 2).sentiment_label == "negative"
+        assert db.get(Expression, 3).sentiment_status == "no_content"
+        assert db.get(Expression, 4).sentiment_score is None  # already computed, skipped
+        assert db.get(Expression, 5).sentiment_status is None  # other land
+
+    def test_force_and_dry_run(self, db):
+        stats = reprocess_sentiment(db, land_id=1, force=True, workers=1, dry_run=True)
+
+        assert stats["processed"] == 4
+        assert stats["updated"] == 0
+        db.expire_all()
+        assert db.get(Expression, 1).sentiment_status is None
+
+    def test_limit(self, db):
+        stats = reprocess_sentiment(db, limit=1, workers=1)
+
+        assert stats["processed"] == 1
+        db.expire_all()
+        assert db.get(Expression, 1).sentiment_status is not None
+        assert db.get(Expression, 2).sentiment_status is None
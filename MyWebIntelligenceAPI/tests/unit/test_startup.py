@@ -0,0 +1,104 @@
+"""
+Tests du coût de démarrage de l'API et des workers (python -X importtime).
+"""
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Budget d'import cumulé (ms), surchargeable pour les machines lentes
+IMPORT_BUDGET_MS = {
+    "app.main": int(os.environ.get("MWI_IMPORT_BUDGET_API_MS", 6000)),
+    "app.core.celery_app": int(os.environ.get("MWI_IMPORT_BUDGET_WORKER_MS", 1500)),
+}
+
+# Chargés au premier usage uniquement
+LAZY_MODULES = ("nltk", "sklearn", "scipy")
+
+
+def _import_profile(module: str):
+    """Cumulative import time (µs) per module and modules loaded after importing module."""
+    code = f"import sys, {module}; print(','.join(sorted(sys.modules)))"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)$", line)
+        if match:
+            cumulative[match.group(3)] = int(match.group(1))
+    loaded = set(completed.stdout.strip().splitlines()[-1].split(","))
+    return cumulative, loaded
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGET_MS))
+def test_import_time_budget(module):
+    cumulative, loaded = _import_profile(module)
+
+    assert not [name for name in LAZY_MODULES if name in loaded]
+    assert cumulative[module] / 1000 < IMPORT_BUDGET_MS[module]
+
+
+def test_worker_registers_every_task():
+    # Le worker ne connaît que les tâches importées par app.tasks (autodiscover_tasks)
+    code = (
+        "import app.tasks; from app.core.celery_app import celery_app; "
+        "print(','.join(entry['task'] for entry in celery_app.conf.beat_schedule.values())); "
+        "print(','.join(sorted(celery_app.tasks)))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    scheduled, registered = (set(line.split(",")) for line in completed.stdout.strip().splitlines()[-2:])
+
+    assert "app.tasks.export_tasks.cleanup_export_files_task" in scheduled
+    assert scheduled <= registered
+    assert {
+        "app.tasks.export_tasks.create_export_task",
+        "tasks.analyze_land_media_task",
+        "tasks.reconcile_land_counters_task",
+    } <= registered
+
+
+def test_text_processing_import_has_no_side_effects():
+    cumulative, loaded = _import_profile("app.core.text_processing")
+
+    assert "nltk" not in loaded
+    assert "nltk.downloader" not in loaded
+
+
+def test_nlp_resources_load_lazily_without_download(monkeypatch):
+    import nltk
+    from app.core import text_processing
+
+    monkeypatch.setattr(text_processing.settings, "NLTK_AUTO_DOWNLOAD", False)
+    monkeypatch.setattr(text_processing, "_NLTK_STATE", {})
+    monkeypatch.setattr(nltk, "download", lambda *args, **kwargs: pytest.fail("download at runtime"))
+    text_processing.get_lemmatizer.cache_clear()
+    text_processing.get_stopwords.cache_clear()
+
+    text_processing.warmup_nlp_resources()
+
+    assert text_processing.get_lemma("Recherches", "fr") == "recherch"
+    assert text_processing.get_lemma("running", "en")
+    assert text_processing.extract_keywords("Les chercheurs publient des recherches", "fr")
+    text_processing.get_lemmatizer.cache_clear()
+    text_processing.get_stopwords.cache_clear()